@@ -7,7 +7,6 @@ import os
 import sys
 from flask import Flask, render_template, jsonify, request, send_file
 import json
-import requests
 from datetime import datetime, timedelta
 import pytz
 import io
@@ -15,20 +14,16 @@ from pathlib import Path
 import logging
 from functools import wraps
 import time
-from config import CAFE24_API_VERSION, DEFAULT_MALL_ID, API_CACHE_DURATION
+from config import CAFE24_API_VERSION, DEFAULT_MALL_ID, API_CACHE_DURATION, api_base_url
+from logging_setup import setup_logging, lazy_json
+from csv_stream import CSVFormatError, CSVReadError, read_csv_chunks, to_int_prices
+import upstream
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+# 로깅 설정 - 파일/콘솔 기록은 백그라운드 스레드에서 (logging_setup.py)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # 자동 토큰 관리자 import
@@ -40,6 +35,14 @@ from margin_management import margin_bp, MarginManager, register_margin_routes
 from vendor_management_debug import vendor_bp, VendorManager, register_vendor_routes
 from oauth_routes import oauth_bp, register_oauth_routes
 from sales_analytics import sales_bp, SalesAnalytics, register_sales_routes
+from health_monitor import health_bp, HealthMonitor, register_health_routes
+from shared_cache import get_shared_cache
+from live_updates import live_bp, LiveSyncHub, register_live_routes
+from report_scheduler import scheduler_bp, ReportScheduler, register_scheduler_routes
+from metrics import metrics_bp, register_metrics_routes, bulk_job
+from upstream_trace import trace_bp, register_trace_routes
+from profiler import profiler_bp, RequestProfiler, register_profiler_routes
+from quota_ledger import quota_bp, QuotaBudgetExceeded, register_quota_routes
 
 # 토큰 매니저 초기화 및 자동 갱신 시작
 token_manager = get_token_manager()
@@ -50,6 +53,25 @@ app = Flask(__name__,
     template_folder='templates',
     static_folder='static'
 )
+# preload_app이면 마스터에서 한 번 import되므로 워커가 재시작되어도 서버 시작 시각 유지
+SERVER_STARTED_AT = time.time()
+
+# Prometheus 메트릭 (/metrics) 및 라우트별 응답 시간 측정
+register_metrics_routes(metrics_bp)
+app.register_blueprint(metrics_bp)
+
+# 요청 단위 Cafe24 호출 추적 - 요약 로그, N+1 의심 경고 (/api/debug/upstream)
+register_trace_routes(trace_bp)
+app.register_blueprint(trace_bp)
+
+# 운영 중 프로파일링 (ADMIN_TOKEN 설정 시에만 활성)
+request_profiler = RequestProfiler(get_shared_cache())
+register_profiler_routes(profiler_bp, request_profiler)
+app.register_blueprint(profiler_bp, url_prefix='/api/admin/profile')
+
+# 기능별 Cafe24 호출 할당량 장부와 예산 (/api/quota/report, 예산 초과 시 429)
+register_quota_routes(quota_bp)
+app.register_blueprint(quota_bp, url_prefix='/api/quota')
 
 # 에러 핸들러 데코레이터
 def handle_errors(f):
@@ -57,6 +79,8 @@ def handle_errors(f):
     def decorated_function(*args, **kwargs):
         try:
             return f(*args, **kwargs)
+        except QuotaBudgetExceeded:
+            raise  # 429 응답은 quota_ledger의 에러 핸들러가 만든다
         except Exception as e:
             logger.error(f"Error in {f.__name__}: {str(e)}", exc_info=True)
             return jsonify({
@@ -66,22 +90,20 @@ def handle_errors(f):
             }), 500
     return decorated_function
 
-# API 응답 캐싱
-cache = {}
+# API 응답 캐싱 - 워커 간 공유 (REDIS_URL 있으면 Redis, 없으면 파일)
+cache = get_shared_cache()
 CACHE_DURATION = API_CACHE_DURATION  # config.py에서 관리
 
 def get_cached_or_fetch(key, fetch_function, *args, **kwargs):
     """캐시에서 가져오거나 새로 fetch"""
-    now = time.time()
-    if key in cache:
-        data, timestamp = cache[key]
-        if now - timestamp < CACHE_DURATION:
-            logger.info(f"Cache hit for {key}")
-            return data
-    
-    logger.info(f"Cache miss for {key}, fetching...")
+    data = cache.get(key)
+    if data is not None:
+        logger.debug("Cache hit for %s", key)
+        return data
+    
+    logger.debug("Cache miss for %s, fetching...", key)
     data = fetch_function(*args, **kwargs)
-    cache[key] = (data, now)
+    cache.set(key, data, CACHE_DURATION)
     return data
 
 @app.route('/')
@@ -104,12 +126,8 @@ def index():
 
 @app.route('/health')
 def health():
-    """헬스체크 엔드포인트"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'token_status': token_manager.get_valid_token() is not None
-    }), 200
+    """헬스체크 엔드포인트 (liveness - I/O 없음, Cafe24 호출 없음)"""
+    return jsonify(health_monitor.liveness()), 200
 
 @app.route('/dashboard')
 def dashboard():
@@ -169,24 +187,28 @@ def process_command():
             'parsed': result
         }), 400
 
-@app.route('/api/report/<report_type>', methods=['GET'])
-@handle_errors
-def generate_report(report_type):
-    """리포트 생성"""
+def build_report(report_type, days=30):
+    """리포트 계산 (사전 계산 스케줄러와 API가 함께 사용)"""
     from report_generator import ReportGenerator
     
     generator = ReportGenerator(app.test_client())
     
     if report_type == 'daily':
-        report = generator.generate_daily_report()
+        return generator.generate_daily_report()
     elif report_type == 'inventory':
-        report = generator.generate_inventory_report()
-    elif report_type == 'sales':
-        days = request.args.get('days', 30, type=int)
-        report = generator.generate_sales_report(days)
-    else:
+        return generator.generate_inventory_report()
+    return generator.generate_sales_report(days)
+
+@app.route('/api/report/<report_type>', methods=['GET'])
+@handle_errors
+def generate_report(report_type):
+    """리포트 생성 (사전 계산된 결과가 있으면 사용)"""
+    if report_type not in ('daily', 'inventory', 'sales'):
         return jsonify({'success': False, 'error': 'Invalid report type'}), 400
     
+    days = request.args.get('days', 30, type=int) if report_type == 'sales' else 30
+    report = cached_report(report_type, days)
+    
     return jsonify({'success': True, 'report': report})
 
 @app.route('/api/status')
@@ -211,24 +233,14 @@ def api_status():
         except:
             pass
     
-    # API 테스트
-    api_test = {}
-    try:
-        headers = get_headers()
-        mall_id = get_mall_id()
-        test_url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products/count"
-        response = requests.get(test_url, headers=headers, timeout=5)
-        api_test = {
-            'reachable': response.status_code < 500,
-            'authenticated': response.status_code != 401,
-            'status_code': response.status_code
-        }
-    except:
-        api_test = {
-            'reachable': False,
-            'authenticated': False,
-            'status_code': 0
-        }
+    # API 테스트 - 백그라운드 헬스체크가 캐시한 결과 사용 (요청마다 Cafe24 호출하지 않음)
+    cafe24_check = health_monitor.readiness()['checks'].get('cafe24_api') or {}
+    api_test = {
+        'reachable': cafe24_check.get('reachable', False),
+        'authenticated': cafe24_check.get('authenticated', False),
+        'status_code': cafe24_check.get('status_code', 0),
+        'checked_at': cafe24_check.get('checked_at')
+    }
     
     status = {
         'status': 'ok' if token_valid else 'token_invalid',
@@ -243,7 +255,8 @@ def api_status():
         },
         'api_test': api_test,
         'server': {
-            'uptime': time.time(),
+            'uptime': round(time.time() - SERVER_STARTED_AT, 1),
+            'started_at': datetime.fromtimestamp(SERVER_STARTED_AT, KST).isoformat(),
             'version': '2.0'
         }
     }
@@ -279,9 +292,9 @@ def get_today_orders():
     now_kst = utc_now.astimezone(KST)
     today = now_kst.strftime('%Y-%m-%d')
     
-    logger.info(f"Fetching orders for today (KST): {today} ({now_kst.strftime('%Y-%m-%d %H:%M:%S %Z')})")
+    logger.info("Fetching orders for today (KST): %s (%s)", today, now_kst)
     
-    url = f"https://{mall_id}.cafe24api.com/api/v2/admin/orders"
+    url = f"{api_base_url(mall_id)}/admin/orders"
     params = {
         'start_date': today,
         'end_date': today,
@@ -298,18 +311,17 @@ def get_today_orders():
     # 페이징 처리
     while True:
         params['offset'] = offset
-        response = requests.get(url, headers=headers, params=params)
+        response = upstream.get(url, headers=headers, params=params)
         
-        logger.info(f"Today orders API: {response.status_code}")
+        logger.debug("Today orders API: %s", response.status_code)
         
         if response.status_code == 200:
             data = response.json()
             orders = data.get('orders', [])
             
-            # 첫 번째 주문 상세 로깅
+            # 첫 번째 주문 상세 로깅 (DEBUG에서만 직렬화)
             if orders and offset == 0:
-                logger.info(f"Sample order keys: {list(orders[0].keys())}")
-                logger.info(f"Sample order data: {json.dumps(orders[0], ensure_ascii=False)[:500]}...")
+                logger.debug("Sample order data: %s", lazy_json(orders[0], limit=500))
             
             # 총액 계산 - 정확한 필드 사용
             for order in orders:
@@ -339,7 +351,7 @@ def get_today_orders():
                         amount = 0
                 
                 if amount > 0:
-                    logger.debug(f"Order {order.get('order_id')}: {amount} ({order_status})")
+                    logger.debug("Order %s: %s (%s)", order.get('order_id'), amount, order_status)
                 
                 total_amount += amount
             
@@ -361,7 +373,7 @@ def get_today_orders():
                 }), response.status_code
     
     # 루프 종료 후 결과 반환
-    logger.info(f"Today total: {total_amount} from {len(all_orders)} orders")
+    logger.info("Today total: %s from %d orders", total_amount, len(all_orders))
     
     return jsonify({
         'success': True,
@@ -378,7 +390,7 @@ def get_low_stock():
     headers = get_headers()
     mall_id = get_mall_id()
     
-    url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+    url = f"{api_base_url(mall_id)}/admin/products"
     params = {
         'limit': 500,
         'fields': 'product_no,product_name,price,quantity,display,product_code'
@@ -390,7 +402,7 @@ def get_low_stock():
     
     while True:
         params['offset'] = offset
-        response = requests.get(url, headers=headers, params=params)
+        response = upstream.get(url, headers=headers, params=params)
         
         if response.status_code == 200:
             data = response.json()
@@ -469,6 +481,7 @@ def download_template():
 
 @app.route('/api/upload-price-csv', methods=['POST'])
 @handle_errors
+@bulk_job('price_csv_upload')
 def upload_price_csv():
     """CSV 파일로 가격 일괄 수정"""
     try:
@@ -483,74 +496,94 @@ def upload_price_csv():
         if not file.filename.endswith('.csv'):
             return jsonify({'success': False, 'error': 'CSV 파일만 업로드 가능합니다'}), 400
         
-        # CSV 파일 읽기
-        df = pd.read_csv(file, encoding='utf-8-sig')
-        
-        # 필수 컬럼 확인
+        # CSV 조각 단위로 읽기 (인코딩 자동 판별, 필요한 컬럼만)
         required_columns = ['상품코드', '판매가']
-        if not all(col in df.columns for col in required_columns):
-            return jsonify({
-                'success': False, 
-                'error': f'필수 컬럼이 없습니다. 필요: {required_columns}'
-            }), 400
+        try:
+            chunks = read_csv_chunks(file.stream, required=required_columns, columns=required_columns)
+        except CSVFormatError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         success_count = 0
         failed_count = 0
-        errors = []
+        errors = []  # 처음 10개 에러만 보관
+        
+        def fail(message):
+            nonlocal failed_count
+            failed_count += 1
+            if len(errors) < 10:
+                errors.append(message)
         
         headers = get_headers()
         mall_id = get_mall_id()
         
-        # 각 행 처리
-        for idx, row in df.iterrows():
-            try:
-                product_code = str(row['상품코드'])  # P00000IB 형식
-                new_price = str(int(float(row['판매가'])))
-                
-                # 상품코드로 product_no 찾기
-                search_url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
-                params = {'product_code': product_code, 'limit': 1}
-                response = requests.get(search_url, headers=headers, params=params)
-                
-                if response.status_code == 200:
-                    products = response.json().get('products', [])
-                    if products:
-                        product_no = products[0].get('product_no')
-                        
-                        # 가격 수정
-                        update_url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products/{product_no}"
-                        update_data = {
-                            "request": {
-                                "product": {
-                                    "price": new_price
-                                }
-                            }
-                        }
-                        
-                        response = requests.put(update_url, headers=headers, json=update_data)
+        # 조각마다 열 단위로 검증/변환한 뒤 바로 반영 - 파일 전체를 메모리에 올리지 않는다
+        read_error = None
+        try:
+            for chunk in chunks:
+                codes = chunk['상품코드'].fillna('').str.strip()  # P00000IB 형식
+                prices = to_int_prices(chunk['판매가'])
+            
+                for idx, product_code, new_price in zip(chunk.index, codes, prices):
+                    if not product_code or pd.isna(new_price):
+                        fail(f"행 {idx+1}: 상품코드 또는 판매가 형식 오류")
+                        continue
+                    try:
+                        # 상품코드로 product_no 찾기
+                        search_url = f"{api_base_url(mall_id)}/admin/products"
+                        params = {'product_code': product_code, 'limit': 1}
+                        response = upstream.get(search_url, headers=headers, params=params)
+                    
                         if response.status_code == 200:
-                            success_count += 1
+                            products = response.json().get('products', [])
+                            if products:
+                                product_no = products[0].get('product_no')
+                            
+                                # 가격 수정
+                                update_url = f"{api_base_url(mall_id)}/admin/products/{product_no}"
+                                update_data = {
+                                    "request": {
+                                        "product": {
+                                            "price": str(new_price)
+                                        }
+                                    }
+                                }
+                            
+                                response = upstream.put(update_url, headers=headers, json=update_data)
+                                if response.status_code == 200:
+                                    success_count += 1
+                                else:
+                                    fail(f"상품 {product_code}: API 오류 {response.status_code}")
+                            else:
+                                fail(f"상품 {product_code}: 상품을 찾을 수 없음")
                         else:
-                            failed_count += 1
-                            errors.append(f"상품 {product_code}: API 오류 {response.status_code}")
-                    else:
-                        failed_count += 1
-                        errors.append(f"상품 {product_code}: 상품을 찾을 수 없음")
-                else:
-                    failed_count += 1
-                    errors.append(f"상품 {product_code}: 조회 실패")
-                    
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"행 {idx+1}: {str(e)}")
+                            fail(f"상품 {product_code}: 조회 실패")
+                        
+                    except QuotaBudgetExceeded:
+                        raise
+                    except Exception as e:
+                        fail(f"행 {idx+1}: {str(e)}")
+        except CSVReadError as e:
+            read_error = str(e)
+        
+        if read_error:
+            # 이미 반영한 행이 있으므로 그때까지의 결과와 함께 실패로 응답
+            return jsonify({
+                'success': False,
+                'error': read_error,
+                'success_count': success_count,
+                'failed_count': failed_count,
+                'errors': errors
+            }), 400
         
         return jsonify({
             'success': True,
             'success_count': success_count,
             'failed_count': failed_count,
-            'errors': errors[:10]  # 처음 10개 에러만
+            'errors': errors
         })
         
+    except QuotaBudgetExceeded:
+        raise
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -565,13 +598,13 @@ def generate_price_excel():
         # 현재 상품 정보 가져오기
         headers = get_headers()
         mall_id = get_mall_id()
-        url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+        url = f"{api_base_url(mall_id)}/admin/products"
         params = {
             'limit': 100,
             'fields': 'product_no,product_name,price,supply_price,retail_price,product_code'
         }
         
-        response = requests.get(url, headers=headers, params=params)
+        response = upstream.get(url, headers=headers, params=params)
         
         if response.status_code != 200:
             return jsonify({
@@ -623,6 +656,8 @@ def generate_price_excel():
             'count': len(excel_data)
         })
         
+    except QuotaBudgetExceeded:
+        raise
     except Exception as e:
         logger.error(f"Excel generation error: {str(e)}")
         return jsonify({
@@ -639,8 +674,8 @@ def get_categories():
     
     def fetch():
         try:
-            response = requests.get(
-                f"https://{get_mall_id()}.cafe24api.com/api/v2/admin/products",
+            response = upstream.get(
+                f"{api_base_url(get_mall_id())}/admin/products",
                 headers=get_headers(),
                 params={'limit': 100}
             )
@@ -671,6 +706,8 @@ def get_categories():
             else:
                 return {'success': False, 'error': 'API 오류'}
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return {'success': False, 'error': f'카테고리 생성 실패: {str(e)}'}
     
@@ -710,7 +747,7 @@ def get_headers():
     try:
         access_token = persistent_token_manager.get_token()
         if access_token:
-            logger.info(f"Using token from persistent storage: ***{access_token[-10:]}")
+            logger.debug("Using token from persistent storage: ***%s", access_token[-10:])
     except Exception as e:
         logger.error(f"Failed to get token from persistent storage: {str(e)}")
     
@@ -719,7 +756,7 @@ def get_headers():
         try:
             access_token = token_manager.get_valid_token()
             if access_token:
-                logger.info(f"Using token from token manager: ***{access_token[-10:]}")
+                logger.debug("Using token from token manager: ***%s", access_token[-10:])
                 # 영구 저장소에 저장
                 token_data = token_manager.token_data
                 if token_data:
@@ -731,7 +768,7 @@ def get_headers():
     if not access_token:
         access_token = os.environ.get('CAFE24_ACCESS_TOKEN')
         if access_token:
-            logger.info(f"Using token from environment variable: ***{access_token[-10:]}")
+            logger.debug("Using token from environment variable: ***%s", access_token[-10:])
     
     if not access_token:
         raise Exception("유효한 토큰을 가져올 수 없습니다")
@@ -742,13 +779,33 @@ def get_headers():
         'X-Cafe24-Api-Version': CAFE24_API_VERSION  # config.py에서 관리
     }
 
+# 헬스체크 (readiness/diagnostics) 초기화
+health_monitor = HealthMonitor(get_headers, get_mall_id, token_manager)
+register_health_routes(health_bp, health_monitor)
+app.register_blueprint(health_bp, url_prefix='/health')
+
+# 리포트 사전 계산 스케줄러 (작업은 아래 매니저들이 모두 초기화된 뒤 등록)
+report_scheduler = ReportScheduler(app, get_shared_cache())
+register_scheduler_routes(scheduler_bp, report_scheduler)
+app.register_blueprint(scheduler_bp, url_prefix='/api/precompute')
+cached_report = report_scheduler.cached('report', build_report)
+
 # Enhanced Product API 초기화 (함수 정의 후에)
 product_api = ProductAPI(get_headers, get_mall_id)
 register_routes(products_bp, product_api)
 app.register_blueprint(products_bp, url_prefix='/api/products')
 
+# 대시보드 실시간 업데이트 (SSE) - 재고는 상품 인덱스를 재사용
+live_hub = LiveSyncHub(get_headers, get_mall_id, product_index=product_api.index, shared_cache=get_shared_cache())
+register_live_routes(live_bp, live_hub)
+app.register_blueprint(live_bp, url_prefix='/api/live')
+
 # Margin Management API 초기화
 margin_manager = MarginManager(get_headers, get_mall_id)
+report_scheduler.register('margin_analysis', margin_manager.get_margin_analysis, json_response=True)
+margin_manager.get_margin_analysis = report_scheduler.cached(
+    'margin_analysis', margin_manager.get_margin_analysis, json_response=True
+)
 register_margin_routes(margin_bp, margin_manager)
 app.register_blueprint(margin_bp, url_prefix='/api/margin')
 
@@ -762,6 +819,11 @@ register_oauth_routes(app)
 
 # Sales Analytics API 초기화
 sales_analytics = SalesAnalytics(get_headers, get_mall_id)
+# 성과 분석/베스트·워스트셀러는 기본 기간(대시보드가 요청하는 값)만 사전 계산
+for name, args in (('get_best_sellers', (30,)), ('get_worst_sellers', (30,)),
+                   ('get_daily_sales_trend', (30,)), ('get_monthly_sales_comparison', ())):
+    report_scheduler.register(f'sales_{name}', getattr(sales_analytics, name), args)
+    setattr(sales_analytics, name, report_scheduler.cached(f'sales_{name}', getattr(sales_analytics, name)))
 register_sales_routes(sales_bp, sales_analytics)
 app.register_blueprint(sales_bp, url_prefix='/api/sales')
 
@@ -777,6 +839,19 @@ margin_export_manager = MarginExportManager(get_headers, get_mall_id)
 register_margin_export_routes(margin_export_bp, margin_export_manager)
 app.register_blueprint(margin_export_bp, url_prefix='/api/margin')
 
+# 사전 계산 작업 등록 - 리포트, 재고
+for report_type in ('daily', 'inventory', 'sales'):
+    report_scheduler.register('report', build_report, (report_type, 30))
+
+@app.after_request
+def invalidate_precomputed(response):
+    """상품/가격 변경 후에는 상품 기반 사전 계산 결과를 버린다"""
+    if request.method in ('POST', 'PUT', 'DELETE') and response.status_code < 400 \
+            and request.path.startswith(('/api/products', '/api/margin', '/api/csv', '/api/upload-price-csv')):
+        report_scheduler.invalidate('report')
+        report_scheduler.invalidate('margin')
+    return response
+
 
 # OAuth Callback 엔드포인트
 @app.route('/callback')
@@ -872,6 +947,8 @@ def debug_orders():
             }
         })
         
+    except QuotaBudgetExceeded:
+        raise
     except Exception as e:
         return jsonify({
             'success': False,
@@ -943,4 +1020,5 @@ if __name__ == '__main__':
     print("[OK] API caching: 1 minute")
     print("==" * 30)
     
+    report_scheduler.start()
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
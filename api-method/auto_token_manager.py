@@ -7,12 +7,15 @@
 - 토큰 만료 전 자동 갱신
 """
 import json
-import requests
 import os
 import threading
 import time
 from datetime import datetime, timedelta
 import schedule
+from config import api_base_url
+import upstream
+from quota_ledger import feature
+from metrics import TOKEN_REFRESHES
 
 class Cafe24AutoTokenManager:
     def __init__(self, token_file=None):
@@ -52,7 +55,13 @@ class Cafe24AutoTokenManager:
         return None
     
     def refresh_token(self):
-        """리프레시 토큰으로 액세스 토큰 갱신"""
+        """리프레시 토큰으로 액세스 토큰 갱신 (결과는 cafe24_token_refresh_total로 집계)"""
+        with feature('token_refresh'):
+            refreshed = self._refresh_token()
+        TOKEN_REFRESHES.inc(result='success' if refreshed else 'failure')
+        return refreshed
+
+    def _refresh_token(self):
         if not self.token_data:
             print("[FAIL] 토큰 데이터가 없습니다.")
             return False
@@ -76,8 +85,8 @@ class Cafe24AutoTokenManager:
         
         # 토큰 갱신 요청
         try:
-            response = requests.post(
-                f"https://{self.token_data['mall_id']}.cafe24api.com/api/v2/oauth/token",
+            response = upstream.post(
+                f"{api_base_url(self.token_data['mall_id'])}/oauth/token",
                 data={
                     'grant_type': 'refresh_token',
                     'refresh_token': self.token_data['refresh_token']
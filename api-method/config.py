@@ -19,6 +19,16 @@ OAUTH_CONFIG = {
 # 기본 Mall ID
 DEFAULT_MALL_ID = 'manwonyori'
 
+# API 주소 - 로컬 시뮬레이터(benchmarks/cafe24_simulator.py)로 돌릴 때만 지정 (예: http://127.0.0.1:8089)
+CAFE24_API_BASE_URL = os.environ.get('CAFE24_API_BASE_URL', '').rstrip('/')
+
+
+def api_base_url(mall_id):
+    """Cafe24 Admin API v2 기본 주소 (CAFE24_API_BASE_URL이 있으면 그쪽으로)"""
+    if CAFE24_API_BASE_URL:
+        return f"{CAFE24_API_BASE_URL}/api/v2"
+    return f"https://{mall_id}.cafe24api.com/api/v2"
+
 # 토큰 설정
 TOKEN_REFRESH_INTERVAL = 30  # 분 단위
 TOKEN_REFRESH_BUFFER = 30    # 만료 전 갱신할 시간 (분)
@@ -27,6 +37,13 @@ TOKEN_REFRESH_BUFFER = 30    # 만료 전 갱신할 시간 (분)
 API_CACHE_DURATION = 60  # 초 단위
 API_TIMEOUT = 10  # 초 단위
 
+# 상품 로컬 인덱스 설정
+PRODUCT_INDEX_TTL = int(os.environ.get('PRODUCT_INDEX_TTL', 60))  # 초 단위
+PRODUCT_INDEX_MAX_SIZE = int(os.environ.get('PRODUCT_INDEX_MAX_SIZE', 10000))  # 인덱스 최대 상품 수
+
 # 로깅 설정
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
-LOG_FILE = 'app.log'
\ No newline at end of file
+LOG_FILE = 'app.log'
+# 같은 로그 메시지(템플릿)는 창(초)마다 최대 건수까지만 기록 - ERROR 이상은 제한 없음
+LOG_RATE_LIMIT = int(os.environ.get('LOG_RATE_LIMIT', 20))
+LOG_RATE_WINDOW = int(os.environ.get('LOG_RATE_WINDOW', 60))
\ No newline at end of file
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대용량 CSV 스트리밍 읽기
+업로드된 상품/가격 CSV를 한 번에 DataFrame으로 올리지 않고 CSV_CHUNK_ROWS행씩 읽는다.
+10만 행 Cafe24 내보내기 파일도 메모리 사용량이 조각 크기만큼으로 일정하다.
+
+- 인코딩은 파일 앞부분 바이트로 한 번만 판별 (utf-8-sig → cp949, cp949는 euc-kr 포함)
+- 필요한 컬럼만 읽는다 (Cafe24 내보내기는 컬럼이 100개 가까이 된다)
+- 값은 모두 문자열로 읽고 빈 칸은 NaN - 변환/검증은 조각 단위 열 연산으로
+- 판별은 앞부분만 보므로 뒤쪽에서 인코딩/형식 오류가 나면 CSVReadError로 멈춘다.
+  이미 반영한 행은 되돌릴 수 없으니 호출한 쪽은 그때까지의 결과와 오류를 함께 돌려준다
+  (selenium-method/utils/csv_stream.py와 같은 규약)
+"""
+import codecs
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+CSV_CHUNK_ROWS = int(os.environ.get('CSV_CHUNK_ROWS', 5000))
+SNIFF_BYTES = 64 * 1024
+ENCODINGS = ('utf-8-sig', 'cp949')
+
+
+class CSVFormatError(ValueError):
+    """인코딩 판별 실패 또는 필수 컬럼 누락"""
+
+
+class CSVReadError(CSVFormatError):
+    """CSV를 끝까지 읽을 수 없음 (rows: 오류 전까지 읽은 데이터 행 수)"""
+
+    def __init__(self, message, rows=0):
+        super().__init__(message)
+        self.rows = rows
+
+
+class CSVChunks:
+    """조각 반복자 - 중간에 인코딩/형식 오류가 나면 CSVReadError를 던진다 (그 전 조각들은 이미 넘겨짐)"""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.rows = 0  # 지금까지 넘긴 데이터 행 수
+
+    def __iter__(self):
+        import pandas as pd
+
+        try:
+            for chunk in self.reader:
+                self.rows += len(chunk)
+                yield chunk
+        except (UnicodeDecodeError, pd.errors.ParserError) as e:
+            logger.warning("CSV 읽기 중단 (%d행 처리 후): %s", self.rows, e)
+            raise CSVReadError(f'{self.rows + 1}번째 데이터 행 이후를 읽을 수 없어 중단했습니다: {e}', self.rows)
+
+
+def sniff_encoding(stream, sample_size=SNIFF_BYTES):
+    """바이너리 스트림 앞부분으로 인코딩 판별 (스트림 위치는 그대로 둔다)"""
+    position = stream.tell()
+    head = stream.read(sample_size)
+    stream.seek(position)
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    for encoding in ENCODINGS:
+        try:
+            head.decode(encoding)
+            return encoding
+        except UnicodeDecodeError as e:
+            # 샘플 경계에서 잘린 멀티바이트 문자는 판별 실패로 보지 않는다
+            if len(head) == sample_size and e.start >= len(head) - 3:
+                return encoding
+    raise CSVFormatError('CSV 인코딩을 판별할 수 없습니다 (UTF-8 또는 CP949/EUC-KR만 지원)')
+
+
+def read_csv_chunks(stream, required=(), columns=None, chunk_rows=CSV_CHUNK_ROWS):
+    """CSV를 chunk_rows행씩 읽는 CSVChunks 반복자
+
+    헤더는 바로 확인해 읽을 수 없거나 required 컬럼이 없으면 CSVFormatError를 던진다 (작업 시작 전).
+    columns를 주면 그중 헤더에 있는 컬럼만 읽는다. 조각의 index는 파일 전체 기준 행 번호(0부터).
+    파일 중간에서 읽을 수 없으면 반복 중에 CSVReadError를 던진다.
+    """
+    import pandas as pd
+
+    encoding = sniff_encoding(stream)
+    start = stream.tell()
+    try:
+        header = list(pd.read_csv(stream, encoding=encoding, nrows=0).columns)
+    except (UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        raise CSVFormatError(f'CSV 헤더를 읽을 수 없습니다: {e}')
+    stream.seek(start)
+
+    missing = [column for column in required if column not in header]
+    if missing:
+        raise CSVFormatError(f'필수 컬럼이 없습니다. 필요: {list(required)}')
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns) | set(required)
+        usecols = [column for column in header if column in wanted]
+    return CSVChunks(pd.read_csv(stream, encoding=encoding, dtype=str, usecols=usecols, chunksize=chunk_rows))
+
+
+def to_int_prices(values):
+    """'12,000' / '12000.0' → 12000 (Int64, 소수점 버림). 빈 칸과 형식 오류는 <NA>"""
+    import numpy as np
+    import pandas as pd
+
+    numbers = pd.to_numeric(values.str.replace(',', '', regex=False).str.strip(), errors='coerce')
+    numbers = numbers.where(np.isfinite(numbers))
+    return np.trunc(numbers).astype('Int64')
@@ -5,24 +5,35 @@ Enhanced Product API with ALL Cafe24 features
 완전한 상품 API 구현 - 모든 기능 포함
 """
 from flask import Blueprint, request, jsonify, send_file
-import requests
 from datetime import datetime
 import json
-import pandas as pd
 import io
 from urllib.parse import quote
+from product_index import ProductIndex, CursorError, FilterError, INDEX_FILTERS, parse_fields, parse_filters
+from shared_cache import get_shared_cache
+from config import api_base_url
+import upstream
+from quota_ledger import QuotaBudgetExceeded
+from metrics import bulk_job
 
 products_bp = Blueprint('products', __name__)
 
+# 로컬 인덱스로 처리할 수 없는 필터 - 이 필터가 있으면 Cafe24에 그대로 전달
+UPSTREAM_ONLY_FILTERS = ['manufacturer_codes', 'supplier_codes', 'category_no', 'shop_no']
+
+# /all 기본 필드셋
+ALL_PRODUCTS_FIELDS = 'product_no,product_code,product_name,price,quantity,display,created_date,brand_code'
+
 class ProductAPI:
     def __init__(self, get_headers, get_mall_id):
         self.get_headers = get_headers
         self.get_mall_id = get_mall_id
         self.base_url = None
+        self.index = ProductIndex(get_headers, get_mall_id, shared_cache=get_shared_cache())
         
     def _get_base_url(self):
         if not self.base_url:
-            self.base_url = f"https://{self.get_mall_id()}.cafe24api.com/api/v2/admin/products"
+            self.base_url = f"{api_base_url(self.get_mall_id())}/admin/products"
         return self.base_url
     
     def calculate_margin(self, supply_price, selling_price):
@@ -33,7 +44,61 @@ class ProductAPI:
         return round(margin_rate, 2)
     
     def get_products_advanced(self):
-        """고급 필터링, 정렬, 페이지네이션을 포함한 상품 목록 조회"""
+        """
+        고급 필터링, 정렬, 페이지네이션을 포함한 상품 목록 조회
+
+        로컬 인덱스에서 정렬/필터 후 요청한 페이지와 필드만 반환한다.
+        - page_size(또는 limit): 페이지 크기
+        - cursor: 이전 응답의 pagination.next_cursor (offset 대신 사용, 정렬 순서 고정)
+        - fields: 쉼표로 구분한 필드 목록 (인덱스에 없는 필드는 Cafe24 fields로 추가 조회)
+        """
+        if any(request.args.get(k) for k in UPSTREAM_ONLY_FILTERS):
+            return self._get_products_upstream()
+
+        try:
+            limit = request.args.get('page_size', request.args.get('limit', 1000, type=int), type=int)
+            limit = max(1, min(limit, 10000))
+            offset = request.args.get('offset', 0, type=int)
+            cursor = request.args.get('cursor')
+            fields = parse_fields(request.args.get('fields'))
+            sort_by = request.args.get('sort_by', 'created_date')
+            sort_order = request.args.get('sort_order', 'desc')
+            filters = {k: request.args.get(k) for k in INDEX_FILTERS}
+            parse_filters(filters)  # 잘못된 숫자 필터는 인덱스를 갱신하기 전에 400
+
+            self.index.ensure_fresh()
+            rows, next_cursor, stats, start = self.index.query(
+                filters, sort_by, sort_order, limit=limit, cursor=cursor, offset=offset
+            )
+            products = self.index.project(rows, fields)
+
+            return jsonify({
+                'success': True,
+                'products': products,
+                'count': len(products),
+                'stats': stats,
+                'pagination': {
+                    'offset': start,
+                    'limit': limit,
+                    'total': stats['total_products'],
+                    'has_more': next_cursor is not None,
+                    'next_cursor': next_cursor
+                },
+                'filters_applied': {k: v for k, v in filters.items() if v},
+                'index': self.index.stats()
+            })
+
+        except FilterError as e:
+            return jsonify({'success': False, 'error': str(e), 'parameter': e.parameter}), 400
+        except CursorError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except QuotaBudgetExceeded:
+            raise
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    def _get_products_upstream(self):
+        """인덱스가 지원하지 않는 필터(카테고리, 제조사, 공급사, 멀티샵)는 Cafe24에서 직접 조회"""
         try:
             headers = self.get_headers()
             url = self._get_base_url()
@@ -124,7 +189,7 @@ class ProductAPI:
                 params['shop_no'] = request.args.get('shop_no')
             
             # API 호출
-            response = requests.get(url, headers=headers, params=params)
+            response = upstream.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -190,6 +255,8 @@ class ProductAPI:
                     'message': response.text
                 }), response.status_code
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -225,7 +292,7 @@ class ProductAPI:
                 params['quantity_min'] = 1
             
             # API 호출
-            response = requests.get(url, headers=headers, params=params)
+            response = upstream.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -276,6 +343,8 @@ class ProductAPI:
                     'error': f'API 오류: {response.status_code}'
                 }), response.status_code
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -283,9 +352,9 @@ class ProductAPI:
         """상품 옵션/변형 조회"""
         try:
             headers = self.get_headers()
-            url = f"https://{self.get_mall_id()}.cafe24api.com/api/v2/admin/products/{product_no}/variants"
+            url = f"{api_base_url(self.get_mall_id())}/admin/products/{product_no}/variants"
             
-            response = requests.get(url, headers=headers)
+            response = upstream.get(url, headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -300,9 +369,12 @@ class ProductAPI:
                     'error': f'API 오류: {response.status_code}'
                 }), response.status_code
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @bulk_job('bulk_update')
     def bulk_update_products(self):
         """대량 상품 업데이트"""
         try:
@@ -318,7 +390,7 @@ class ProductAPI:
                 if not product_no:
                     continue
                 
-                url = f"https://{self.get_mall_id()}.cafe24api.com/api/v2/admin/products/{product_no}"
+                url = f"{api_base_url(self.get_mall_id())}/admin/products/{product_no}"
                 
                 # 업데이트 데이터 준비
                 update_data = {}
@@ -331,7 +403,7 @@ class ProductAPI:
                 if 'selling' in update:
                     update_data['selling'] = update['selling']
                 
-                response = requests.put(
+                response = upstream.put(
                     url,
                     headers=headers,
                     json={'product': update_data}
@@ -351,6 +423,9 @@ class ProductAPI:
                         'error': response.text
                     })
             
+            if success_count:
+                self.index.invalidate()
+
             return jsonify({
                 'success': True,
                 'total': len(updates),
@@ -359,12 +434,16 @@ class ProductAPI:
                 'results': results
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
     def export_products(self):
         """상품 데이터 내보내기"""
         try:
+            import pandas as pd
+
             format_type = request.args.get('format', 'excel')
             
             # 모든 상품 가져오기
@@ -382,7 +461,7 @@ class ProductAPI:
                     'fields': request.args.get('fields', 'product_no,product_code,product_name,price,quantity,display')
                 }
                 
-                response = requests.get(url, headers=headers, params=params)
+                response = upstream.get(url, headers=headers, params=params)
                 if response.status_code != 200:
                     break
                 
@@ -453,6 +532,8 @@ class ProductAPI:
                     'products': all_products
                 })
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -460,9 +541,9 @@ class ProductAPI:
         """상품 이미지 관리"""
         try:
             headers = self.get_headers()
-            url = f"https://{self.get_mall_id()}.cafe24api.com/api/v2/admin/products/{product_no}/images"
+            url = f"{api_base_url(self.get_mall_id())}/admin/products/{product_no}/images"
             
-            response = requests.get(url, headers=headers)
+            response = upstream.get(url, headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -477,6 +558,8 @@ class ProductAPI:
                     'error': f'API 오류: {response.status_code}'
                 }), response.status_code
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -484,9 +567,9 @@ class ProductAPI:
         """상품 SEO 메타데이터"""
         try:
             headers = self.get_headers()
-            url = f"https://{self.get_mall_id()}.cafe24api.com/api/v2/admin/products/{product_no}/seo"
+            url = f"{api_base_url(self.get_mall_id())}/admin/products/{product_no}/seo"
             
-            response = requests.get(url, headers=headers)
+            response = upstream.get(url, headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -501,6 +584,8 @@ class ProductAPI:
                     'error': f'API 오류: {response.status_code}'
                 }), response.status_code
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -511,7 +596,7 @@ class ProductAPI:
             headers = self.get_headers()
             url = self._get_base_url()
             
-            response = requests.get(url, headers=headers, params={'limit': 500})
+            response = upstream.get(url, headers=headers, params={'limit': 500})
             
             if response.status_code == 200:
                 data = response.json()
@@ -635,64 +720,53 @@ class ProductAPI:
                     'error': f'API 오류: {response.status_code}'
                 }), response.status_code
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
     def get_all_products(self):
-        """모든 상품 가져오기 (페이지네이션 자동 처리)"""
+        """
+        모든 상품 가져오기 (로컬 인덱스)
+
+        page_size 또는 cursor를 지정하면 상품번호 순 커서 페이지네이션으로 나눠서 반환한다.
+        """
         try:
-            headers = self.get_headers()
-            url = self._get_base_url()
-            
-            all_products = []
-            offset = 0
-            limit = 100
-            
-            while True:
-                params = {
-                    'limit': limit,
-                    'offset': offset,
-                    'fields': 'product_no,product_code,product_name,price,quantity,display,created_date,brand_code'
-                }
-                
-                response = requests.get(url, headers=headers, params=params)
-                if response.status_code != 200:
-                    break
-                
-                data = response.json()
-                products = data.get('products', [])
-                
-                if not products:
-                    break
-                
-                all_products.extend(products)
-                offset += limit
-                
-                # 더 이상 상품이 없으면 중단
-                if len(products) < limit:
-                    break
-                
-                # 안전 장치: 최대 10000개까지만
-                if len(all_products) >= 10000:
-                    break
-            
-            # 통계 계산
-            stats = {
-                'total_products': len(all_products),
-                'out_of_stock': len([p for p in all_products if int(p.get('quantity', 0)) == 0]),
-                'low_stock': len([p for p in all_products if 0 < int(p.get('quantity', 0)) < 10]),
-                'displayed': len([p for p in all_products if p.get('display') == 'T']),
-                'hidden': len([p for p in all_products if p.get('display') == 'F'])
-            }
-            
-            return jsonify({
+            fields = parse_fields(request.args.get('fields', ALL_PRODUCTS_FIELDS))
+            page_size = request.args.get('page_size', type=int)
+            cursor = request.args.get('cursor')
+
+            self.index.ensure_fresh()
+            if page_size or cursor:
+                limit = max(1, min(page_size or 1000, 10000))
+            else:
+                limit = len(self.index.products)
+
+            rows, next_cursor, stats, _ = self.index.query(
+                sort_by='product_no', sort_order='asc', limit=limit, cursor=cursor
+            )
+            all_products = self.index.project(rows, fields)
+
+            result = {
                 'success': True,
                 'products': all_products,
                 'count': len(all_products),
                 'stats': stats,
-                'message': f'전체 {len(all_products)}개 상품을 불러왔습니다.'
-            })
-            
+                'message': f'전체 {stats["total_products"]}개 상품 중 {len(all_products)}개를 불러왔습니다.'
+            }
+            if page_size or cursor:
+                result['pagination'] = {
+                    'limit': limit,
+                    'total': stats['total_products'],
+                    'has_more': next_cursor is not None,
+                    'next_cursor': next_cursor
+                }
+            return jsonify(result)
+
+        except CursorError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
 
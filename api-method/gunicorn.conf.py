@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Gunicorn 설정 - 운영 서버
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+모든 값은 환경변수로 바꿀 수 있다.
+"""
+import multiprocessing
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# 워커(프로세스)는 CPU 작업, 스레드는 Cafe24 API 응답 대기를 나눠 맡는다
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+# 대시보드 SSE 스트림은 연결 내내 스레드 하나를 점유한다 - 워커당 LIVE_MAX_STREAMS개까지 (기본 threads // 2)
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+worker_class = 'gthread'
+
+# fork 전에 앱 import + 상품 인덱스 적재를 한 번만 수행
+# 토큰 자동 갱신 스레드는 마스터에서만 실행되고, 워커는 영구 저장소의 토큰을 읽는다
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = 100
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+
+# 워커별 메트릭 스냅샷 디렉터리 - /metrics가 모든 워커 값을 합산한다 (metrics.py)
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'cafe24_metrics'))
+
+
+def on_starting(server):
+    """이전 실행의 메트릭 스냅샷 삭제, 이번 배포의 사전 계산 워밍업 허용"""
+    from metrics import REGISTRY
+    from shared_cache import get_shared_cache
+    REGISTRY.clear_directory()
+    get_shared_cache().delete('precompute:warmed')
+
+
+def post_fork(server, worker):
+    """워커마다 리포트 사전 계산 스케줄러 시작 (fork 전 마스터의 스레드는 워커로 넘어오지 않는다)
+
+    워밍업은 warmed 플래그로 배포당 한 워커만, 예약 작업은 구간(slot)당 한 번만 실행된다 (report_scheduler.py)
+    """
+    from app import report_scheduler
+    report_scheduler.start()
+
+
+def worker_exit(server, worker):
+    """종료 직전 마지막 메트릭 스냅샷과 할당량 장부 미기록분 기록"""
+    from metrics import REGISTRY
+    from quota_ledger import LEDGER
+    REGISTRY.flush()
+    LEDGER.flush()
+
+
+def child_exit(server, worker):
+    """종료된 워커의 카운터를 보존하고 스냅샷 파일 정리 (마스터에서 실행)"""
+    from metrics import REGISTRY
+    REGISTRY.mark_process_dead(worker.pid)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계별 헬스체크
+- liveness (/health): I/O 없음, 프로세스가 응답하는지만 확인
+- readiness (/health/ready): 백그라운드 점검 결과를 캐시에서 반환
+- diagnostics (/health/deep): 실제 Cafe24 호출 포함, 호출 빈도 제한
+헬스체크 트래픽이 Cafe24 API 호출 한도와 CPU를 소모하지 않도록 한다.
+"""
+from flask import Blueprint, jsonify
+import threading
+import logging
+import time
+import os
+from datetime import datetime
+
+from config import API_TIMEOUT, api_base_url
+import upstream
+from quota_ledger import tagged
+
+logger = logging.getLogger(__name__)
+
+health_bp = Blueprint('health', __name__)
+
+# 점검 주기 (초)
+HEALTH_CHECK_INTERVAL = int(os.environ.get('HEALTH_CHECK_INTERVAL', 30))
+HEALTH_UPSTREAM_INTERVAL = int(os.environ.get('HEALTH_UPSTREAM_INTERVAL', 300))
+HEALTH_DEEP_MIN_INTERVAL = int(os.environ.get('HEALTH_DEEP_MIN_INTERVAL', 300))
+
+
+class HealthMonitor:
+    def __init__(self, get_headers, get_mall_id, token_manager):
+        self.get_headers = get_headers
+        self.get_mall_id = get_mall_id
+        self.token_manager = token_manager
+        self.started_at = time.time()
+
+        self._readiness = None
+        self._upstream = None
+        self._upstream_at = 0
+        self._diagnostics = None
+        self._diagnostics_at = 0
+
+        self._lock = threading.Lock()
+        self._deep_lock = threading.Lock()
+        # _upstream / _upstream_at 보호 - 백그라운드 점검과 /health/deep이 동시에 갱신한다
+        self._upstream_lock = threading.Lock()
+        self._thread = None
+
+    def liveness(self):
+        """I/O 없는 생존 확인"""
+        return {
+            'status': 'healthy',
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'timestamp': datetime.now().isoformat(),
+            # 토큰 갱신을 유발하지 않도록 보유 여부만 확인
+            'token_status': bool(self.token_manager.token_data)
+        }
+
+    def check_token(self):
+        """토큰 만료 시각만 로컬에서 확인 (갱신/네트워크 없음)"""
+        try:
+            remaining = self.token_manager.get_remaining_time()
+        except Exception as e:
+            return {'passed': False, 'message': f'토큰 확인 오류: {str(e)}'}
+        return {
+            'passed': remaining > 0,
+            'expires_in': int(remaining),
+            'auto_refresh': self.token_manager.running,
+            'message': 'OK' if remaining > 0 else '토큰 없음 또는 만료'
+        }
+
+    @tagged('health_check')
+    def check_upstream(self):
+        """Cafe24 API 연결 확인 (products/count 1회 호출)"""
+        started = time.time()
+        try:
+            url = f"{api_base_url(self.get_mall_id())}/admin/products/count"
+            response = upstream.get(url, headers=self.get_headers(), timeout=API_TIMEOUT)
+            return {
+                'passed': response.status_code == 200,
+                'reachable': response.status_code < 500,
+                'authenticated': response.status_code != 401,
+                'status_code': response.status_code,
+                'latency_ms': round((time.time() - started) * 1000, 1),
+                'checked_at': datetime.now().isoformat()
+            }
+        except Exception as e:
+            return {
+                'passed': False,
+                'reachable': False,
+                'authenticated': False,
+                'status_code': 0,
+                'message': str(e),
+                'checked_at': datetime.now().isoformat()
+            }
+
+    def refresh(self):
+        """readiness 점검 실행 - Cafe24 호출은 HEALTH_UPSTREAM_INTERVAL마다 한 번만"""
+        now = time.time()
+        with self._upstream_lock:
+            if self._upstream is None or now - self._upstream_at >= HEALTH_UPSTREAM_INTERVAL:
+                self._upstream = self.check_upstream()
+                self._upstream_at = now
+            cafe24_check = self._upstream
+
+        checks = {
+            'token': self.check_token(),
+            'cafe24_api': cafe24_check
+        }
+        readiness = {
+            'status': 'ready' if all(c.get('passed') for c in checks.values()) else 'not_ready',
+            'checks': checks,
+            'checked_at': now
+        }
+        with self._lock:
+            self._readiness = readiness
+        return readiness
+
+    def _loop(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"헬스체크 백그라운드 점검 실패: {str(e)}")
+            time.sleep(HEALTH_CHECK_INTERVAL)
+
+    def start(self):
+        """백그라운드 점검 스레드 시작 (프로세스당 한 번)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='health-monitor', daemon=True)
+            self._thread.start()
+
+    def readiness(self):
+        """캐시된 readiness 결과"""
+        self.start()
+        with self._lock:
+            readiness = self._readiness
+
+        if readiness is None:
+            return {'status': 'starting', 'checks': {}, 'age_seconds': None}
+
+        age = time.time() - readiness['checked_at']
+        result = dict(readiness, age_seconds=round(age, 1))
+        if age > HEALTH_CHECK_INTERVAL * 3:
+            result['status'] = 'stale'
+        return result
+
+    def diagnostics(self):
+        """상세 진단 - HEALTH_DEEP_MIN_INTERVAL 안에서는 이전 결과 반환"""
+        with self._deep_lock:
+            now = time.time()
+            wait = HEALTH_DEEP_MIN_INTERVAL - (now - self._diagnostics_at)
+            if self._diagnostics is not None and wait > 0:
+                return dict(self._diagnostics, cached=True, next_run_in=round(wait, 1))
+
+            cafe24_check = self.check_upstream()
+            # 방금 확인한 결과를 readiness에도 반영
+            with self._upstream_lock:
+                self._upstream = cafe24_check
+                self._upstream_at = now
+
+            checks = {
+                'token': self.check_token(),
+                'cafe24_api': cafe24_check,
+                'log_writable': self._check_log_writable()
+            }
+            self._diagnostics = {
+                'status': 'healthy' if all(c.get('passed') for c in checks.values()) else 'unhealthy',
+                'checks': checks,
+                'timestamp': datetime.now().isoformat()
+            }
+            self._diagnostics_at = now
+            return dict(self._diagnostics, cached=False, next_run_in=HEALTH_DEEP_MIN_INTERVAL)
+
+    def _check_log_writable(self):
+        writable = os.access(os.getcwd(), os.W_OK)
+        return {'passed': writable, 'message': 'OK' if writable else '작업 디렉터리에 쓸 수 없음'}
+
+
+def register_health_routes(bp, monitor):
+    """헬스체크 라우트 등록 (/health 는 app.py에서 liveness로 제공)"""
+
+    def health_ready():
+        readiness = monitor.readiness()
+        return jsonify(readiness), 200 if readiness['status'] == 'ready' else 503
+
+    def health_deep():
+        diagnostics = monitor.diagnostics()
+        return jsonify(diagnostics), 200 if diagnostics['status'] == 'healthy' else 503
+
+    bp.add_url_rule('/ready', 'health_ready', health_ready, methods=['GET'])
+    bp.add_url_rule('/deep', 'health_deep', health_deep, methods=['GET'])
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대시보드 실시간 업데이트 (Server-Sent Events)
+- 백그라운드 동기화 루프 하나가 Cafe24 변경사항을 감지해 변경분(이벤트)만 발행
+- 신규 주문, 오늘 누적 매출, 재고 임계값 통과(부족/품절/회복)
+- 대시보드 N개가 열려 있어도 Cafe24 조회는 동기화 루프 하나뿐
+- gunicorn 워커가 여럿이면 공유 캐시 락을 잡은 워커 하나만 Cafe24를 조회하고,
+  나머지 워커는 공유 캐시의 이벤트 로그를 읽어 자기 구독자에게 전달한다
+"""
+from flask import Blueprint, Response, jsonify, stream_with_context
+from datetime import datetime
+import threading
+import logging
+import queue
+import json
+import time
+import os
+import pytz
+
+from config import API_TIMEOUT, api_base_url
+import upstream
+from quota_ledger import tagged
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+live_bp = Blueprint('live', __name__)
+
+LIVE_SYNC_INTERVAL = int(os.environ.get('LIVE_SYNC_INTERVAL', 30))  # 초 단위
+LIVE_STOCK_THRESHOLD = int(os.environ.get('LIVE_STOCK_THRESHOLD', 10))
+LIVE_KEEPALIVE = 15  # 초 단위 - 프록시 연결 유지용 주석 전송 주기
+EVENT_LOG_SIZE = 200
+# SSE 스트림 하나가 연결 내내 gthread 스레드 하나를 점유한다 - 워커당 동시 스트림 상한
+# 기본값은 GUNICORN_THREADS의 절반이라 나머지 스레드는 일반 API 요청용으로 남는다
+LIVE_MAX_STREAMS = int(os.environ.get(
+    'LIVE_MAX_STREAMS', max(1, int(os.environ.get('GUNICORN_THREADS', 8)) // 2)))
+
+# 정상 주문 상태 (취소/환불 제외) - /api/orders/today 와 동일
+ORDER_STATUSES = 'N00,N10,N20,N21,N22,N30,N40'
+
+
+def order_amount(order):
+    """주문 금액 (실결제금액 > 결제금액 > 주문금액 순)"""
+    for field in ('actual_payment_amount', 'payment_amount', 'order_price_amount'):
+        if field in order:
+            try:
+                return float(str(order.get(field) or '0').replace(',', ''))
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+def format_sse(event_type, data, event_id=None):
+    """SSE 메시지 포맷"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class LiveSyncHub:
+    def __init__(self, get_headers, get_mall_id, product_index=None, shared_cache=None,
+                 interval=LIVE_SYNC_INTERVAL, threshold=LIVE_STOCK_THRESHOLD,
+                 max_streams=LIVE_MAX_STREAMS):
+        self.get_headers = get_headers
+        self.get_mall_id = get_mall_id
+        # 상품 재고는 상품 인덱스를 재사용해 별도 전체 조회를 하지 않는다
+        self.product_index = product_index
+        self.shared_cache = shared_cache
+        self.interval = interval
+        self.threshold = threshold
+        self.max_streams = max_streams
+
+        # 동기화 상태 (리더 워커에서만 사용)
+        self.sync_state = None
+
+        # 이벤트 로그 / 구독자 (워커별)
+        self.events = []
+        self.seq = 0
+        # None = 아직 로그를 읽지 않음 (첫 로드 때 기존 로그를 다시 보내지 않도록)
+        self.last_published = None
+        self.state = {}
+        self.subscribers = set()
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # 구독
+    # ------------------------------------------------------------------
+    def subscribe(self):
+        """구독 큐 반환 (워커당 동시 스트림 상한을 넘으면 None)"""
+        q = queue.Queue(maxsize=100)
+        with self._lock:
+            if len(self.subscribers) >= self.max_streams:
+                return None
+            self.subscribers.add(q)
+        self.start()
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self.subscribers.discard(q)
+
+    def _publish_local(self, event):
+        with self._lock:
+            subscribers = list(self.subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # 느린 클라이언트는 이벤트를 건너뛰고 다음 스냅샷으로 따라잡는다
+                logger.debug("SSE 구독자 큐가 가득 참 - 이벤트 건너뜀")
+
+    # ------------------------------------------------------------------
+    # Cafe24 동기화
+    # ------------------------------------------------------------------
+    def _fetch_today_orders(self, today):
+        url = f"{api_base_url(self.get_mall_id())}/admin/orders"
+        headers = self.get_headers()
+        params = {
+            'start_date': today,
+            'end_date': today,
+            'limit': 500,
+            'order_status': ORDER_STATUSES,
+            'date_type': 'order_date'
+        }
+        orders = []
+        offset = 0
+        while True:
+            params['offset'] = offset
+            response = upstream.get(url, headers=headers, params=params, timeout=API_TIMEOUT)
+            if response.status_code == 422:
+                break
+            if response.status_code != 200:
+                raise RuntimeError(f'주문 조회 실패: {response.status_code}')
+            page = response.json().get('orders', [])
+            orders.extend(page)
+            if len(page) < params['limit']:
+                break
+            offset += params['limit']
+        return [o for o in orders if not str(o.get('order_status', '')).startswith('C')]
+
+    def _stock_level(self, quantity):
+        if quantity <= 0:
+            return 'out'
+        if quantity < self.threshold:
+            return 'low'
+        return 'ok'
+
+    @tagged('live_sync')
+    def sync_once(self):
+        """Cafe24를 한 번 조회해 이전 상태와 비교한 변경 이벤트 목록 반환"""
+        today = datetime.now(KST).strftime('%Y-%m-%d')
+        previous = self.sync_state
+        # 최초 동기화(또는 날짜 변경)는 상태만 채우고 신규 주문 이벤트는 내지 않는다
+        priming = previous is None or previous['date'] != today
+        events = []
+
+        orders = self._fetch_today_orders(today)
+        order_ids = set(o.get('order_id') for o in orders)
+        total_amount = sum(order_amount(o) for o in orders)
+
+        if not priming:
+            new_orders = [o for o in orders if o.get('order_id') not in previous['order_ids']]
+            if new_orders:
+                events.append(('new_orders', {
+                    'count': len(new_orders),
+                    'orders': [{
+                        'order_id': o.get('order_id'),
+                        'order_date': o.get('order_date'),
+                        'amount': order_amount(o),
+                        'buyer_name': o.get('buyer_name')
+                    } for o in new_orders[:20]]
+                }))
+
+        if priming or total_amount != previous['total_amount'] or len(order_ids) != len(previous['order_ids']):
+            events.append(('today_total', {
+                'date': today,
+                'total_amount': total_amount,
+                'count': len(order_ids)
+            }))
+
+        stock = previous['stock'] if previous else {}
+        if self.product_index is not None:
+            self.product_index.ensure_fresh()
+            products = self.product_index.products
+            levels = {}
+            for p in products:
+                try:
+                    quantity = int(float(p.get('quantity') or 0))
+                except (TypeError, ValueError):
+                    quantity = 0
+                no = str(p.get('product_no'))
+                level = self._stock_level(quantity)
+                levels[no] = level
+                before = stock.get(no)
+                if before is not None and before != level:
+                    events.append(('stock_' + ('recovered' if level == 'ok' else level), {
+                        'product_no': p.get('product_no'),
+                        'product_name': p.get('product_name'),
+                        'product_code': p.get('product_code'),
+                        'quantity': quantity,
+                        'threshold': self.threshold
+                    }))
+
+            summary = {
+                'total_products': len(levels),
+                'low_stock_count': sum(1 for level in levels.values() if level == 'low'),
+                'out_of_stock_count': sum(1 for level in levels.values() if level == 'out'),
+                'threshold': self.threshold
+            }
+            if summary != (previous or {}).get('stock_summary'):
+                events.append(('stock_summary', summary))
+            stock = levels
+        else:
+            summary = (previous or {}).get('stock_summary')
+
+        self.sync_state = {
+            'date': today,
+            'order_ids': order_ids,
+            'total_amount': total_amount,
+            'stock': stock,
+            'stock_summary': summary
+        }
+        return events
+
+    # ------------------------------------------------------------------
+    # 이벤트 로그 (워커 간 공유)
+    # ------------------------------------------------------------------
+    def _is_leader(self):
+        """공유 캐시 락을 잡은 워커만 Cafe24를 조회"""
+        if self.shared_cache is None:
+            return True
+        pid = os.getpid()
+        ttl = self.interval * 3
+        if self.shared_cache.add('live:leader', pid, ttl):
+            return True
+        if self.shared_cache.get('live:leader') == pid:
+            self.shared_cache.set('live:leader', pid, ttl)
+            return True
+        return False
+
+    def _append_events(self, events):
+        """이벤트를 로그에 추가하고 현재 상태(스냅샷)를 갱신"""
+        log = {'seq': self.seq, 'events': self.events, 'state': self.state}
+        if self.shared_cache is not None:
+            log = self.shared_cache.get('live:events') or log
+        if self.last_published is None:
+            # 첫 로드: 다른 워커(이전 리더)가 이미 보낸 이벤트는 건너뛰고 이번 이벤트부터 전달
+            self.last_published = log['seq']
+
+        for event_type, data in events:
+            log['seq'] += 1
+            log['events'].append({'id': log['seq'], 'type': event_type, 'data': data, 'ts': time.time()})
+            if event_type in ('today_total', 'stock_summary'):
+                log['state'][event_type] = data
+        log['events'] = log['events'][-EVENT_LOG_SIZE:]
+
+        if self.shared_cache is not None:
+            self.shared_cache.set('live:events', log, 24 * 3600)
+        self._apply_log(log)
+
+    def _apply_log(self, log):
+        """로그에서 아직 보내지 않은 이벤트를 이 워커의 구독자에게 전달"""
+        self.seq = log['seq']
+        self.events = log['events']
+        self.state = log['state']
+        if self.last_published is None:
+            # 첫 로드: 기존 로그는 이미 다른 워커가 보낸 것 - 현재 상태는 접속 시 스냅샷으로 전달된다
+            self.last_published = log['seq']
+        for event in log['events']:
+            if event['id'] > self.last_published:
+                self._publish_local(event)
+        self.last_published = log['seq']
+
+    def _loop(self):
+        while True:
+            with self._lock:
+                idle = not self.subscribers
+            if not idle:
+                try:
+                    if self._is_leader():
+                        self._append_events(self.sync_once())
+                    elif self.shared_cache is not None:
+                        log = self.shared_cache.get('live:events')
+                        if log:
+                            self._apply_log(log)
+                except Exception as e:
+                    logger.error(f"실시간 동기화 실패: {str(e)}")
+            time.sleep(self.interval)
+
+    def start(self):
+        """동기화 루프 시작 (워커당 한 번, 첫 구독 시)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='live-sync', daemon=True)
+            self._thread.start()
+
+    def snapshot(self):
+        if self.shared_cache is not None:
+            log = self.shared_cache.get('live:events')
+            if log:
+                return dict(log['state'], seq=log['seq'])
+        return dict(self.state, seq=self.seq)
+
+
+def register_live_routes(bp, hub):
+    """실시간 업데이트 라우트 등록"""
+
+    def stream():
+        q = hub.subscribe()
+        if q is None:
+            response = jsonify({'success': False, 'error': '실시간 연결 수 초과 - 잠시 후 다시 시도하세요'})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(int(hub.interval))
+            return response
+
+        def generate():
+            try:
+                # 접속 직후 현재 상태를 먼저 보낸다
+                snapshot = hub.snapshot()
+                for event_type in ('today_total', 'stock_summary'):
+                    if event_type in snapshot:
+                        yield format_sse(event_type, snapshot[event_type])
+                yield f"retry: {int(hub.interval * 1000)}\n\n"
+                while True:
+                    try:
+                        event = q.get(timeout=LIVE_KEEPALIVE)
+                        yield format_sse(event['type'], event['data'], event['id'])
+                    except queue.Empty:
+                        yield ': keepalive\n\n'
+            finally:
+                hub.unsubscribe(q)
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    def snapshot():
+        return jsonify({'success': True, 'state': hub.snapshot(), 'subscribers': len(hub.subscribers)})
+
+    bp.add_url_rule('/stream', 'live_stream', stream, methods=['GET'])
+    bp.add_url_rule('/snapshot', 'live_snapshot', snapshot, methods=['GET'])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+비동기 로깅 설정
+요청 스레드에서 로그 파일 I/O와 메시지 문자열 생성을 뺀다.
+
+- 로거는 QueueHandler로 레코드를 큐에 넣기만 하고, 백그라운드 QueueListener가
+  포맷해서 app.log/콘솔에 기록한다
+- 메시지는 %-스타일(logger.info("... %s", value))로 넘기면 실제로 기록될 때
+  리스너 스레드에서 포맷된다
+- 같은 메시지 템플릿은 LOG_RATE_WINDOW초마다 LOG_RATE_LIMIT건까지만 기록하고,
+  생략된 건수는 다음 기록에 붙인다 (ERROR 이상은 제한 없음)
+- extra={'sample': 100}을 주면 그 메시지는 100건 중 1건만 기록
+- 주문/상품 전체 덤프는 logger.debug("... %s", lazy_json(order)) - DEBUG일 때만 직렬화
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from config import LOG_FILE, LOG_LEVEL, LOG_RATE_LIMIT, LOG_RATE_WINDOW
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+_queue_handler = None
+
+
+class lazy_json:
+    """문자열로 바뀔 때만 json.dumps (기록되지 않는 로그는 직렬화 비용 없음)"""
+
+    def __init__(self, value, limit=1000):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        text = json.dumps(self.value, ensure_ascii=False, default=str)
+        return text if len(text) <= self.limit else text[:self.limit] + '...'
+
+
+class DeferredQueueHandler(QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣는다 (포맷은 리스너 스레드에서)
+
+    같은 프로세스 안의 큐라서 pickle할 필요가 없다. 인자 객체를 로그 호출 뒤에
+    바꾸면 바뀐 값이 기록될 수 있다.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """메시지 템플릿별 샘플링과 기록 건수 제한"""
+
+    MAX_KEYS = 2048
+
+    def __init__(self, limit=LOG_RATE_LIMIT, window=LOG_RATE_WINDOW, exempt_level=logging.ERROR):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.exempt_level = exempt_level
+        self._windows = {}  # (logger, 템플릿) -> [창 시작, 기록 수, 생략 수, 샘플 카운터]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.exempt_level:
+            return True
+        sample = getattr(record, 'sample', None)
+        now = time.monotonic()
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg).__name__)
+
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None:
+                if len(self._windows) >= self.MAX_KEYS:
+                    self._windows.clear()
+                state = self._windows[key] = [now, 0, 0, 0]
+            elif now - state[0] >= self.window:
+                state[0], state[1] = now, 0
+
+            if sample and sample > 1:
+                state[3] += 1
+                if state[3] % sample != 1:
+                    return False
+
+            if self.limit and state[1] >= self.limit:
+                state[2] += 1
+                return False
+            state[1] += 1
+            suppressed, state[2] = state[2], 0
+
+        if suppressed:
+            # 드물게만 발생 - 생략 건수를 붙이려면 여기서 포맷
+            record.msg = f"{record.getMessage()} (같은 로그 {suppressed}건 생략)"
+            record.args = None
+        return True
+
+
+def setup_logging(log_file=LOG_FILE, level=LOG_LEVEL):
+    """루트 로거를 큐 기반 비동기 로깅으로 설정 (여러 번 호출해도 한 번만 적용)"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(log_file, encoding='utf-8'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    _queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(str(level).upper())
+
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_restart_after_fork)
+    return _queue_handler
+
+
+def _stop_listener():
+    """종료 시 큐에 남은 로그를 모두 기록"""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_after_fork():
+    """fork한 워커에는 리스너 스레드가 없으므로 새 큐와 리스너를 시작"""
+    global _listener
+    if _queue_handler is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
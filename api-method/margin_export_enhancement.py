@@ -4,11 +4,13 @@
 마진 대시보드 가격 수정 및 CSV Export 기능 개선
 """
 from flask import Blueprint, request, jsonify, send_file
-import pandas as pd
-import requests
 import io
 from datetime import datetime
 from csv_folder_structure import CSVFolderManager
+from config import api_base_url
+import upstream
+from quota_ledger import QuotaBudgetExceeded
+from metrics import bulk_job
 
 margin_export_bp = Blueprint('margin_export', __name__)
 
@@ -33,8 +35,8 @@ class MarginExportManager:
             mall_id = self.get_mall_id()
             
             # 현재 상품 정보 조회
-            url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products/{product_no}"
-            response = requests.get(url, headers=headers)
+            url = f"{api_base_url(mall_id)}/admin/products/{product_no}"
+            response = upstream.get(url, headers=headers)
             
             if response.status_code != 200:
                 return jsonify({'success': False, 'error': '상품 정보 조회 실패'}), 500
@@ -64,7 +66,7 @@ class MarginExportManager:
                 }
             
             # 가격 업데이트
-            response = requests.put(url, headers=headers, json=update_data)
+            response = upstream.put(url, headers=headers, json=update_data)
             
             if response.status_code == 200:
                 return jsonify({
@@ -81,12 +83,17 @@ class MarginExportManager:
                     'error': response.text
                 }), 500
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @bulk_job('margin_export')
     def export_margin_updated_products(self):
         """마진율 수정된 상품들을 Cafe24 CSV 형식으로 Export"""
         try:
+            import pandas as pd
+
             data = request.json
             product_nos = data.get('product_nos', [])
             target_margin = data.get('target_margin')
@@ -109,8 +116,8 @@ class MarginExportManager:
             for product_no in product_nos:
                 try:
                     # 상품 정보 조회
-                    url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products/{product_no}"
-                    response = requests.get(url, headers=headers)
+                    url = f"{api_base_url(mall_id)}/admin/products/{product_no}"
+                    response = upstream.get(url, headers=headers)
                     
                     if response.status_code != 200:
                         continue
@@ -168,6 +175,8 @@ class MarginExportManager:
                     
                     export_df = pd.concat([export_df, pd.DataFrame([row_data])], ignore_index=True)
                     
+                except QuotaBudgetExceeded:
+                    raise
                 except Exception as e:
                     continue
             
@@ -196,6 +205,8 @@ class MarginExportManager:
                 download_name=filename
             )
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -214,8 +225,8 @@ class MarginExportManager:
             
             for product_no in product_nos[:10]:  # 최대 10개만 미리보기
                 try:
-                    url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products/{product_no}"
-                    response = requests.get(url, headers=headers)
+                    url = f"{api_base_url(mall_id)}/admin/products/{product_no}"
+                    response = upstream.get(url, headers=headers)
                     
                     if response.status_code == 200:
                         product = response.json().get('product', {})
@@ -243,6 +254,8 @@ class MarginExportManager:
                             'change_percent': round(change_percent, 1)
                         })
                         
+                except QuotaBudgetExceeded:
+                    raise
                 except Exception as e:
                     continue
             
@@ -253,6 +266,8 @@ class MarginExportManager:
                 'preview_count': len(preview_results)
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -7,9 +7,11 @@
 - 가격 수정 기능
 """
 from flask import Blueprint, request, jsonify
-import requests
 from datetime import datetime
-import pandas as pd
+from config import api_base_url
+import upstream
+from quota_ledger import QuotaBudgetExceeded
+from metrics import bulk_job
 
 margin_bp = Blueprint('margin', __name__)
 
@@ -39,7 +41,7 @@ class MarginManager:
             mall_id = self.get_mall_id()
             
             # 모든 상품 가져오기
-            url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+            url = f"{api_base_url(mall_id)}/admin/products"
             all_products = []
             offset = 0
             limit = 100
@@ -51,7 +53,7 @@ class MarginManager:
                     'fields': 'product_no,product_code,product_name,price,supply_price,retail_price,quantity,display,selling,cost_price,purchase_price'
                 }
                 
-                response = requests.get(url, headers=headers, params=params)
+                response = upstream.get(url, headers=headers, params=params)
                 if response.status_code != 200:
                     break
                 
@@ -162,9 +164,12 @@ class MarginManager:
                 'generated_at': datetime.now().isoformat()
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @bulk_job('margin_price_update')
     def update_prices_by_margin(self):
         """마진율 기준으로 가격 일괄 수정"""
         try:
@@ -186,8 +191,8 @@ class MarginManager:
             for product_no in product_nos:
                 try:
                     # 현재 상품 정보 조회
-                    url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products/{product_no}"
-                    response = requests.get(url, headers=headers)
+                    url = f"{api_base_url(mall_id)}/admin/products/{product_no}"
+                    response = upstream.get(url, headers=headers)
                     
                     if response.status_code != 200:
                         results.append({
@@ -242,7 +247,7 @@ class MarginManager:
                         new_price = new_supply_price
                     
                     # 가격 업데이트
-                    response = requests.put(url, headers=headers, json=update_data)
+                    response = upstream.put(url, headers=headers, json=update_data)
                     
                     if response.status_code == 200:
                         success_count += 1
@@ -262,6 +267,8 @@ class MarginManager:
                             'error': response.text
                         })
                         
+                except QuotaBudgetExceeded:
+                    raise
                 except Exception as e:
                     failed_count += 1
                     results.append({
@@ -278,6 +285,8 @@ class MarginManager:
                 'results': results
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -291,13 +300,13 @@ class MarginManager:
             mall_id = self.get_mall_id()
             
             # 모든 상품 조회
-            url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+            url = f"{api_base_url(mall_id)}/admin/products"
             params = {
                 'limit': 100,
                 'fields': 'product_no,product_code,product_name,price,supply_price,cost_price,purchase_price,quantity,display'
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = upstream.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -346,6 +355,8 @@ class MarginManager:
                     'error': f'API 오류: {response.status_code}'
                 }), response.status_code
                 
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -9,7 +9,6 @@ import sys
 from datetime import datetime, timedelta
 import pytz
 import json
-import anthropic
 from collections import defaultdict
 import logging
 from secure_api_manager import SecureAPIManager
@@ -32,6 +31,8 @@ class MarketIntelligenceSystem:
         api_key = api_manager.get_api_key("anthropic")
         
         if api_key:
+            # anthropic SDK는 AI 기능을 쓸 때만 로드 (앱 기동 시간 단축)
+            import anthropic
             self.claude = anthropic.Anthropic(api_key=api_key)
             logger.info("Claude AI initialized successfully")
         else:
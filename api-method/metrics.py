@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prometheus 텍스트 형식 메트릭 (GET /metrics)
+
+- 라우트별 응답 시간 히스토그램
+- Cafe24 엔드포인트별 호출 시간 히스토그램, 상태 코드별 호출 수
+- 캐시별 조회 수와 적중률
+- Cafe24 호출 제한 버킷 사용량 (X-Api-Call-Limit 헤더)
+- 진행 중인 대량 작업 수, 토큰 갱신 횟수
+
+gunicorn 워커마다 값이 따로 쌓이므로 METRICS_DIR이 설정되어 있으면(gunicorn.conf.py)
+프로세스마다 스냅샷 파일을 주기적으로 쓰고, /metrics는 모든 파일을 합산해서 응답한다.
+종료된 워커(max_requests 재시작)의 카운터는 마스터가 archive.json에 합쳐 보존한다.
+
+범위: api-method 앱만 계측한다. Procfile/render.yaml이 띄우는 루트 wsgi.py(src/web_app.py)와
+src/의 Cafe24APIClient는 src/utils/metrics.py가 따로 계측하고 그 앱의 /metrics로 노출한다.
+"""
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from flask import Blueprint, Response, g, request
+
+import upstream
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+ARCHIVE_FILE = 'archive.json'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def describe(self):
+        return {'kind': self.kind, 'help': self.documentation, 'labels': list(self.labelnames)}
+
+    def samples(self):
+        return [[list(key), value] for key, value in self.values.items()]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        self.registry.touch()
+
+
+class Gauge(Metric):
+    """merge='sum'은 워커 값을 합산, 'latest'는 가장 최근에 기록된 값을 사용"""
+    kind = 'gauge'
+
+    def __init__(self, registry, name, documentation, labelnames=(), merge='sum'):
+        super().__init__(registry, name, documentation, labelnames)
+        self.merge = merge
+
+    def set(self, value, **labels):
+        with self.registry.lock:
+            self.values[self._key(labels)] = [value, time.time()]
+        self.registry.touch()
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            current = self.values.get(key, [0, 0])[0]
+            self.values[key] = [current + amount, time.time()]
+        self.registry.touch()
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def describe(self):
+        return dict(super().describe(), merge=self.merge)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            # [버킷별 개수..., +Inf 개수, 합계] - 누적은 출력할 때 계산
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            else:
+                entry[len(self.buckets)] += 1
+            entry[-1] += value
+        self.registry.touch()
+
+    def samples(self):
+        return [[list(key), list(value)] for key, value in self.values.items()]
+
+    def describe(self):
+        return dict(super().describe(), buckets=list(self.buckets))
+
+
+class MetricsRegistry:
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), merge='sum'):
+        return self._add(Gauge(self, name, documentation, labelnames, merge))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(self, name, documentation, labelnames, buckets))
+
+    # ------------------------------------------------------------------
+    # 스냅샷 / 워커 간 합산
+    # ------------------------------------------------------------------
+    def snapshot(self):
+        with self.lock:
+            return {name: dict(metric.describe(), samples=metric.samples())
+                    for name, metric in self.metrics.items()}
+
+    def reset(self):
+        """fork 직후 자식 프로세스에서 부모 값 제거 (부모 값은 부모가 따로 기록)"""
+        # fork 시점에 다른 스레드가 잡고 있던 락은 자식에서 풀리지 않으므로 새로 만든다
+        self.lock = threading.Lock()
+        self._flusher_lock = threading.Lock()
+        self._flusher = None
+        for metric in self.metrics.values():
+            metric.values = {}
+
+    def touch(self):
+        """파일 모드에서는 첫 기록 시 주기적 스냅샷 스레드 시작"""
+        if self.directory and self._flusher is None:
+            with self._flusher_lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            self.flush()
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f'{pid}.json')
+
+    def _write(self, path, snapshot):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def flush(self):
+        """현재 프로세스의 스냅샷 파일 갱신"""
+        if not self.directory:
+            return
+        try:
+            self._write(self._path(os.getpid()), self.snapshot())
+        except Exception as e:
+            logger.warning(f"메트릭 스냅샷 저장 실패: {str(e)}")
+
+    def _read(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def collect(self):
+        """모든 프로세스의 스냅샷을 합산한 결과"""
+        if not self.directory:
+            return merge_snapshots([self.snapshot()])
+        self.flush()
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.json'):
+                snapshot = self._read(os.path.join(self.directory, filename))
+                if snapshot:
+                    snapshots.append(snapshot)
+        return merge_snapshots(snapshots)
+
+    def mark_process_dead(self, pid):
+        """종료된 워커의 카운터/히스토그램을 archive에 합치고 스냅샷 파일 삭제 (마스터에서 호출)"""
+        if not self.directory:
+            return
+        path = self._path(pid)
+        snapshot = self._read(path)
+        if snapshot:
+            cumulative = {name: data for name, data in snapshot.items() if data['kind'] != 'gauge'}
+            archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+            archive = self._read(archive_path) or {}
+            self._write(archive_path, merge_snapshots([archive, cumulative]))
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear_directory(self):
+        """서버 시작 시 이전 실행의 스냅샷 삭제"""
+        if not self.directory:
+            return
+        for filename in os.listdir(self.directory):
+            if filename.endswith(('.json', '.tmp')):
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+
+def merge_snapshots(snapshots):
+    """스냅샷 합산 - 카운터/히스토그램/합산 게이지는 더하고 latest 게이지는 최신 값 사용"""
+    merged = {}
+    for snapshot in snapshots:
+        for name, data in snapshot.items():
+            target = merged.setdefault(name, dict(data, samples={}))
+            samples = target['samples']
+            for labelvalues, value in data['samples']:
+                key = tuple(labelvalues)
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = list(value) if isinstance(value, list) else value
+                elif data['kind'] == 'histogram':
+                    samples[key] = [a + b for a, b in zip(current, value)]
+                elif data['kind'] == 'gauge':
+                    if data.get('merge') == 'latest':
+                        samples[key] = max(current, value, key=lambda v: v[1])
+                    else:
+                        samples[key] = [current[0] + value[0], max(current[1], value[1])]
+                else:
+                    samples[key] = current + value
+    for data in merged.values():
+        data['samples'] = [[list(key), value] for key, value in data['samples'].items()]
+    return merged
+
+
+def add_cache_hit_ratio(merged):
+    """cache_requests_total에서 캐시별 적중률 게이지 계산"""
+    requests_total = merged.get('cache_requests_total')
+    if not requests_total:
+        return merged
+    totals = {}
+    for (cache, result), value in requests_total['samples']:
+        hits, count = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (value if result == 'hit' else 0), count + value)
+    merged['cache_hit_ratio'] = {
+        'kind': 'gauge', 'help': 'Cache hit ratio per cache', 'labels': ['cache'],
+        'samples': [[[cache], [hits / count if count else 0.0, 0]] for cache, (hits, count) in totals.items()]
+    }
+    return merged
+
+
+def render(merged):
+    """Prometheus 텍스트 노출 형식"""
+    lines = []
+    for name in sorted(merged):
+        data = merged[name]
+        if not data['samples']:
+            continue
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['kind']}")
+        names = data['labels']
+        for labelvalues, value in sorted(data['samples']):
+            if data['kind'] == 'histogram':
+                cumulative = 0
+                for bound, count in zip(list(data['buckets']) + [float('inf')], value[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(names, labelvalues, [('le', _number(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(names, labelvalues)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(names, labelvalues)} {cumulative}")
+            elif data['kind'] == 'gauge':
+                lines.append(f"{name}{_labels(names, labelvalues)} {_number(value[0])}")
+            else:
+                lines.append(f"{name}{_labels(names, labelvalues)} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+# ----------------------------------------------------------------------
+# 앱 공통 메트릭
+# ----------------------------------------------------------------------
+REGISTRY = MetricsRegistry(os.environ.get('METRICS_DIR') or None)
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Inbound request latency by route', ('method', 'route', 'status'))
+UPSTREAM_REQUEST_DURATION = REGISTRY.histogram(
+    'cafe24_upstream_request_duration_seconds', 'Cafe24 API call latency by endpoint', ('method', 'endpoint'))
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    'cafe24_upstream_requests_total', 'Cafe24 API calls by endpoint and status code (0 = no response)',
+    ('method', 'endpoint', 'status'))
+API_BUCKET_USED = REGISTRY.gauge(
+    'cafe24_api_bucket_used', 'Cafe24 call limit bucket usage from X-Api-Call-Limit', merge='latest')
+API_BUCKET_SIZE = REGISTRY.gauge(
+    'cafe24_api_bucket_size', 'Cafe24 call limit bucket size from X-Api-Call-Limit', merge='latest')
+CACHE_REQUESTS = REGISTRY.counter(
+    'cache_requests_total', 'Cache lookups per cache and result', ('cache', 'result'))
+BULK_JOBS_IN_FLIGHT = REGISTRY.gauge(
+    'bulk_jobs_in_flight', 'Bulk jobs currently running', ('job',))
+TOKEN_REFRESHES = REGISTRY.counter(
+    'cafe24_token_refresh_total', 'Access token refresh attempts', ('result',))
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=REGISTRY.reset)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def bulk_job(job):
+    """대량 작업 함수 데코레이터 - 실행 중인 동안 bulk_jobs_in_flight 증가"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            BULK_JOBS_IN_FLIGHT.inc(job=job)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                BULK_JOBS_IN_FLIGHT.dec(job=job)
+        return wrapper
+    return decorator
+
+
+def observe_upstream(call):
+    UPSTREAM_REQUEST_DURATION.observe(call['duration'], method=call['method'], endpoint=call['endpoint'])
+    UPSTREAM_REQUESTS.inc(method=call['method'], endpoint=call['endpoint'], status=call['status'])
+    response = call['response']
+    limit = response.headers.get('X-Api-Call-Limit') if response is not None else None
+    if limit and '/' in limit:
+        used, size = limit.split('/', 1)
+        try:
+            API_BUCKET_USED.set(int(used))
+            API_BUCKET_SIZE.set(int(size))
+        except ValueError:
+            pass
+
+
+upstream.add_observer(observe_upstream)
+
+
+def register_metrics_routes(bp, registry=REGISTRY):
+    """/metrics 라우트와 앱 전체 요청 시간 측정 훅 등록"""
+
+    @bp.before_app_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @bp.after_app_request
+    def record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            # 라벨은 경로 대신 라우트 규칙 (상품번호 등으로 라벨이 늘어나지 않도록)
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method=request.method,
+                                          route=route, status=response.status_code)
+        return response
+
+    @bp.route('/metrics')
+    def metrics():
+        body = render(add_cache_hit_ratio(registry.collect()))
+        return Response(body, mimetype='text/plain; version=0.0.4; charset=utf-8')
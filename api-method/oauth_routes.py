@@ -4,12 +4,12 @@
 OAuth 인증 라우트
 """
 from flask import Blueprint, request, redirect, jsonify, render_template_string
-import requests
 import json
 import os
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
-from config import OAUTH_CONFIG
+from config import OAUTH_CONFIG, api_base_url
+import upstream
 
 oauth_bp = Blueprint('oauth', __name__)
 
@@ -173,7 +173,7 @@ def auth_callback():
     mall_id = state
     client_secret = os.environ.get('CAFE24_CLIENT_SECRET', '')
     
-    token_url = f"https://{mall_id}.cafe24api.com/api/v2/oauth/token"
+    token_url = f"{api_base_url(mall_id)}/oauth/token"
     token_data = {
         'grant_type': 'authorization_code',
         'code': code,
@@ -181,7 +181,7 @@ def auth_callback():
     }
     
     try:
-        response = requests.post(
+        response = upstream.post(
             token_url,
             data=token_data,
             auth=(OAUTH_CONFIG['client_id'], client_secret)
@@ -5,14 +5,20 @@ Cafe24 CSV 템플릿 호환 Import/Export 기능 구현
 manwonyori_20250805_201_f879_producr_template.csv 형식 지원
 """
 from flask import Blueprint, request, jsonify, send_file
-import pandas as pd
-import requests
 import json
 import io
 from datetime import datetime
+from config import api_base_url
+import upstream
+from quota_ledger import QuotaBudgetExceeded
+from metrics import bulk_job
+from csv_stream import CSVFormatError, CSVReadError, read_csv_chunks, to_int_prices
 
 csv_bp = Blueprint('csv', __name__)
 
+# 가져오기 결과에 담는 오류 상세 최대 건수 (건수 집계는 전체)
+MAX_IMPORT_ERRORS = 100
+
 class CSVProductManager:
     def __init__(self, get_headers, get_mall_id):
         self.get_headers = get_headers
@@ -41,19 +47,38 @@ class CSVProductManager:
             '네이버페이 사용': 'use_naverpay'
         }
         
-        # 값 변환 규칙
-        self.value_converters = {
-            'display': lambda x: 'T' if x == 'Y' else 'F',
-            'selling': lambda x: 'T' if x == 'Y' else 'F',
-            'tax_type': lambda x: x.split('|')[0] if '|' in x else x,
-            'price': lambda x: str(int(float(x))),
-            'supply_price': lambda x: str(int(float(x))),
-            'retail_price': lambda x: str(int(float(x)))
-        }
+        # 값 변환 규칙 (조각 단위 열 연산 - _convert_chunk)
+        self.flag_fields = ('display', 'selling')  # Y → T, 그 외 → F
+        self.price_fields = ('price', 'supply_price', 'retail_price')  # 소수점 버린 정수 문자열
+    
+    def _convert_chunk(self, chunk):
+        """CSV 조각 → (API 필드 DataFrame, 행별 변환 오류 Series) - 빈 칸은 NaN 유지"""
+        import pandas as pd
+
+        data = chunk.rename(columns=self.field_mapping)
+        errors = pd.Series('', index=data.index)
+        
+        for field in self.flag_fields:
+            if field in data:
+                data[field] = data[field].map({'Y': 'T'}).fillna('F').where(data[field].notna())
+        
+        if 'tax_type' in data:
+            data['tax_type'] = data['tax_type'].str.split('|', n=1).str[0]
+        
+        for field in self.price_fields:
+            if field in data:
+                numbers = to_int_prices(data[field])
+                errors = errors.mask(data[field].notna() & numbers.isna() & errors.eq(''),
+                                     f'{field} 형식 오류: ' + data[field].astype(str))
+                data[field] = numbers.astype('string')
+        
+        return data, errors
     
     def export_to_cafe24_csv(self):
         """현재 상품을 Cafe24 CSV 형식으로 내보내기"""
         try:
+            import pandas as pd
+
             headers = self.get_headers()
             mall_id = self.get_mall_id()
             
@@ -63,7 +88,7 @@ class CSVProductManager:
             limit = 100
             
             while True:
-                url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+                url = f"{api_base_url(mall_id)}/admin/products"
                 params = {
                     'limit': limit,
                     'offset': offset,
@@ -77,7 +102,7 @@ class CSVProductManager:
                     ])
                 }
                 
-                response = requests.get(url, headers=headers, params=params)
+                response = upstream.get(url, headers=headers, params=params)
                 if response.status_code != 200:
                     break
                 
@@ -149,12 +174,17 @@ class CSVProductManager:
                 download_name=f'cafe24_products_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
             )
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @bulk_job('csv_import')
     def import_from_cafe24_csv(self):
         """Cafe24 CSV 형식 파일 업로드 및 상품 등록/수정"""
         try:
+            import pandas as pd
+
             if 'file' not in request.files:
                 return jsonify({'success': False, 'error': '파일이 없습니다'}), 400
             
@@ -162,106 +192,125 @@ class CSVProductManager:
             if file.filename == '':
                 return jsonify({'success': False, 'error': '파일이 선택되지 않았습니다'}), 400
             
-            # CSV 파일 읽기
-            df = pd.read_csv(file, encoding='utf-8-sig')
+            # CSV 조각 단위로 읽기 (인코딩 자동 판별, 매핑된 컬럼만)
+            try:
+                chunks = read_csv_chunks(file.stream, columns=self.field_mapping)
+            except CSVFormatError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
             
             headers = self.get_headers()
             mall_id = self.get_mall_id()
             
             results = {
-                'total': len(df),
+                'total': 0,
                 'created': 0,
                 'updated': 0,
                 'failed': 0,
                 'errors': []
             }
             
-            for idx, row in df.iterrows():
-                try:
-                    # API 데이터 준비
-                    api_data = {}
-                    
-                    # 필드 매핑 및 변환
-                    for csv_field, api_field in self.field_mapping.items():
-                        if csv_field in row and pd.notna(row[csv_field]):
-                            value = row[csv_field]
-                            
-                            # 값 변환
-                            if api_field in self.value_converters:
-                                value = self.value_converters[api_field](value)
-                            
-                            api_data[api_field] = value
-                    
-                    # 상품코드 확인
-                    product_code = row.get('상품코드', '')
-                    
-                    if product_code and product_code.startswith('P'):
-                        # 기존 상품 수정
-                        product_no = product_code  # 상품번호 추출 필요
-                        url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products/{product_no}"
-                        
-                        response = requests.put(
-                            url,
-                            headers=headers,
-                            json={'product': api_data}
-                        )
-                        
-                        if response.status_code == 200:
-                            results['updated'] += 1
-                        else:
-                            results['failed'] += 1
-                            results['errors'].append({
-                                'row': idx + 2,
-                                'product_code': product_code,
-                                'error': response.text
-                            })
-                    else:
-                        # 신규 상품 등록
-                        url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
-                        
-                        # 필수 필드 확인
-                        if 'product_name' not in api_data or 'price' not in api_data:
-                            results['failed'] += 1
-                            results['errors'].append({
-                                'row': idx + 2,
-                                'error': '필수 필드 누락 (상품명, 판매가)'
-                            })
+            def fail(error):
+                results['failed'] += 1
+                if len(results['errors']) < MAX_IMPORT_ERRORS:
+                    results['errors'].append(error)
+            
+            # 조각마다 열 단위로 변환한 뒤 바로 등록/수정 - 파일 전체를 메모리에 올리지 않는다
+            read_error = None
+            try:
+                for chunk in chunks:
+                    results['total'] += len(chunk)
+                    data, conversion_errors = self._convert_chunk(chunk)
+                
+                    for idx, record, conversion_error in zip(data.index, data.to_dict('records'), conversion_errors):
+                        if conversion_error:
+                            fail({'row': idx + 2, 'error': conversion_error})
                             continue
+                        try:
+                            # API 데이터 준비 (빈 칸 제외)
+                            api_data = {field: value for field, value in record.items() if pd.notna(value)}
+                        
+                            # 상품코드 확인
+                            product_code = api_data.get('product_code', '')
                         
-                        response = requests.post(
-                            url,
-                            headers=headers,
-                            json={'product': api_data}
-                        )
+                            if product_code.startswith('P'):
+                                # 기존 상품 수정
+                                product_no = product_code  # 상품번호 추출 필요
+                                url = f"{api_base_url(mall_id)}/admin/products/{product_no}"
+                            
+                                response = upstream.put(
+                                    url,
+                                    headers=headers,
+                                    json={'product': api_data}
+                                )
+                            
+                                if response.status_code == 200:
+                                    results['updated'] += 1
+                                else:
+                                    fail({
+                                        'row': idx + 2,
+                                        'product_code': product_code,
+                                        'error': response.text
+                                    })
+                            else:
+                                # 신규 상품 등록
+                                url = f"{api_base_url(mall_id)}/admin/products"
+                            
+                                # 필수 필드 확인
+                                if 'product_name' not in api_data or 'price' not in api_data:
+                                    fail({
+                                        'row': idx + 2,
+                                        'error': '필수 필드 누락 (상품명, 판매가)'
+                                    })
+                                    continue
+                            
+                                response = upstream.post(
+                                    url,
+                                    headers=headers,
+                                    json={'product': api_data}
+                                )
+                            
+                                if response.status_code == 201:
+                                    results['created'] += 1
+                                else:
+                                    fail({
+                                        'row': idx + 2,
+                                        'product_name': api_data.get('product_name'),
+                                        'error': response.text
+                                    })
                         
-                        if response.status_code == 201:
-                            results['created'] += 1
-                        else:
-                            results['failed'] += 1
-                            results['errors'].append({
+                        except QuotaBudgetExceeded:
+                            raise
+                        except Exception as e:
+                            fail({
                                 'row': idx + 2,
-                                'product_name': api_data.get('product_name'),
-                                'error': response.text
+                                'error': str(e)
                             })
-                    
-                except Exception as e:
-                    results['failed'] += 1
-                    results['errors'].append({
-                        'row': idx + 2,
-                        'error': str(e)
-                    })
+            except CSVReadError as e:
+                read_error = str(e)
+            
+            if read_error:
+                # 이미 반영한 행이 있으므로 그때까지의 결과와 함께 실패로 응답
+                return jsonify({
+                    'success': False,
+                    'error': read_error,
+                    'results': results
+                }), 400
             
             return jsonify({
                 'success': True,
                 'results': results
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
     def get_template(self):
         """Cafe24 CSV 템플릿 다운로드"""
         try:
+            import pandas as pd
+
             template_path = "static/excel_templates/manwonyori_20250805_201_f879_producr_template.csv"
             
             # 템플릿에서 헤더만 가져오기
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상품 로컬 인덱스 - 커서 페이지네이션, 필드 선택, 서버측 정렬/필터
+전체 상품을 한 번 가져와 메모리에 보관하고, 대시보드 요청은 인덱스에서 바로 응답한다.
+"""
+import base64
+import bisect
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from config import PRODUCT_INDEX_TTL, PRODUCT_INDEX_MAX_SIZE, API_TIMEOUT, api_base_url
+import upstream
+from quota_ledger import tagged
+from metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# 인덱스에 보관하는 필드 (기존 기본 필드셋과 동일)
+INDEX_FIELDS = [
+    'product_no',
+    'product_code',
+    'product_name',
+    'price',
+    'quantity',
+    'display',
+    'selling',
+    'created_date',
+    'updated_date',
+    'list_image',
+    'brand_code',
+    'supply_price',
+    'retail_price'
+]
+
+# 인덱스 생성 시 계산해 두는 필드
+COMPUTED_FIELDS = ['margin_rate', 'profit']
+
+
+def _to_float(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _to_int(value):
+    try:
+        return int(float(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+# 정렬 기준별 키 함수 (동일 값은 product_no로 순서 고정)
+SORT_KEYS = {
+    'price': lambda p: _to_float(p.get('price')),
+    'name': lambda p: p.get('product_name') or '',
+    'stock': lambda p: _to_int(p.get('quantity')),
+    'created_date': lambda p: p.get('created_date') or '',
+    'updated_date': lambda p: p.get('updated_date') or '',
+    'margin': lambda p: _to_float(p.get('margin_rate')),
+    'product_no': lambda p: _to_int(p.get('product_no')),
+}
+
+# 인덱스에서 처리 가능한 필터 (요청 파라미터 이름 기준)
+INDEX_FILTERS = [
+    'price_min', 'price_max', 'stock_min', 'stock_max',
+    'display', 'selling', 'search', 'product_codes', 'brand_codes',
+    'created_start', 'created_end', 'updated_start', 'updated_end'
+]
+
+# 숫자로 해석하는 필터와 변환 함수
+NUMERIC_FILTERS = {'price_min': float, 'price_max': float, 'stock_min': int, 'stock_max': int}
+
+
+class CursorError(ValueError):
+    """잘못되었거나 다른 조회 조건으로 만들어진 커서"""
+
+
+class FilterError(ValueError):
+    """숫자 필터 값을 해석할 수 없음 (parameter: 문제가 된 요청 파라미터 이름)"""
+
+    def __init__(self, parameter, value):
+        super().__init__(f'{parameter} 값이 올바르지 않습니다: {value}')
+        self.parameter = parameter
+
+
+def parse_filters(filters):
+    """빈 값을 빼고 숫자 필터를 변환 (해석할 수 없으면 FilterError)"""
+    parsed = {k: v for k, v in (filters or {}).items() if v not in (None, '')}
+    for name, convert in NUMERIC_FILTERS.items():
+        if name not in parsed:
+            continue
+        try:
+            value = convert(parsed[name])
+        except (TypeError, ValueError):
+            raise FilterError(name, parsed[name])
+        if not math.isfinite(value):
+            raise FilterError(name, parsed[name])
+        parsed[name] = value
+    return parsed
+
+
+def encode_cursor(sort_by, sort_order, signature, key, product_no):
+    """정렬 키와 마지막 상품번호를 불투명 커서 문자열로 변환"""
+    payload = json.dumps(
+        {'s': sort_by, 'o': sort_order, 'f': signature, 'k': key, 'n': product_no},
+        separators=(',', ':'), ensure_ascii=False
+    )
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열 해석"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        return payload['s'], payload['o'], payload['f'], payload['k'], payload['n']
+    except Exception:
+        raise CursorError('잘못된 커서입니다')
+
+
+def parse_fields(fields):
+    """fields 파라미터를 필드 목록으로 변환 (product_no는 항상 포함)"""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    if 'product_no' not in requested:
+        requested.insert(0, 'product_no')
+    return requested
+
+
+class ProductIndex:
+    """전체 상품 스냅샷과 정렬 뷰를 보관하는 로컬 인덱스"""
+
+    def __init__(self, get_headers, get_mall_id, ttl=PRODUCT_INDEX_TTL, max_size=PRODUCT_INDEX_MAX_SIZE,
+                 shared_cache=None):
+        self.get_headers = get_headers
+        self.get_mall_id = get_mall_id
+        self.ttl = ttl
+        self.max_size = max_size
+        # 워커 간 스냅샷 공유 (한 워커만 Cafe24에서 전체 조회)
+        self.shared_cache = shared_cache
+
+        self.products = []
+        self.built_at = 0
+        self.version = 0
+
+        self._sorted_views = {}
+        self._results = OrderedDict()
+        self._max_results = 32
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _base_url(self):
+        return f"{api_base_url(self.get_mall_id())}/admin/products"
+
+    # ------------------------------------------------------------------
+    # 인덱스 구성
+    # ------------------------------------------------------------------
+    @tagged('product_index')
+    def _fetch_all(self):
+        """Cafe24에서 인덱스 필드만 페이지 단위로 전체 조회"""
+        headers = self.get_headers()
+        url = self._base_url()
+        products = []
+        offset = 0
+        limit = 100
+
+        while len(products) < self.max_size:
+            params = {'limit': limit, 'offset': offset, 'fields': ','.join(INDEX_FIELDS)}
+            response = upstream.get(url, headers=headers, params=params, timeout=API_TIMEOUT)
+            if response.status_code != 200:
+                if not products:
+                    raise RuntimeError(f'상품 인덱스 조회 실패: {response.status_code}')
+                logger.warning(f"상품 인덱스 조회 중단 (offset={offset}): {response.status_code}")
+                break
+
+            page = response.json().get('products', [])
+            products.extend(page)
+            if len(page) < limit:
+                break
+            offset += limit
+
+        return products[:self.max_size]
+
+    def _prepare(self, product):
+        """마진율/이익을 미리 계산"""
+        supply_price = _to_float(product.get('supply_price'))
+        selling_price = _to_float(product.get('price'))
+        if supply_price > 0:
+            product['margin_rate'] = round((selling_price - supply_price) / supply_price * 100, 2)
+            product['profit'] = selling_price - supply_price
+        else:
+            product['margin_rate'] = 0
+            product['profit'] = 0
+        return product
+
+    def _load_snapshot(self):
+        """다른 워커가 만든 최신 스냅샷이 있으면 반환"""
+        if self.shared_cache is None:
+            return None
+        snapshot = self.shared_cache.get(f"product_index:{self.get_mall_id()}")
+        if snapshot and time.time() - snapshot['built_at'] < self.ttl:
+            return snapshot
+        return None
+
+    def _build_snapshot(self):
+        """Cafe24에서 전체 조회 - 공유 캐시가 있으면 워커 중 하나만 실행"""
+        if self.shared_cache is None:
+            return {'built_at': time.time(), 'products': self._fetch_all()}
+
+        mall_id = self.get_mall_id()
+        lock_key = f"product_index_lock:{mall_id}"
+        if not self.shared_cache.add(lock_key, os.getpid(), ttl=120):
+            # 다른 워커가 조회 중이면 스냅샷이 올라올 때까지 잠시 대기
+            for _ in range(60):
+                time.sleep(0.5)
+                snapshot = self._load_snapshot()
+                if snapshot:
+                    return snapshot
+        try:
+            snapshot = {'built_at': time.time(), 'products': self._fetch_all()}
+            self.shared_cache.set(f"product_index:{mall_id}", snapshot, self.ttl)
+            return snapshot
+        finally:
+            self.shared_cache.delete(lock_key)
+
+    def refresh(self):
+        """인덱스를 새로 구성"""
+        started = time.time()
+        snapshot = self._load_snapshot()
+        source = 'shared'
+        if snapshot is None:
+            snapshot = self._build_snapshot()
+            source = 'cafe24'
+        products = [self._prepare(p) for p in snapshot['products']]
+
+        with self._lock:
+            self.products = products
+            self.built_at = snapshot['built_at']
+            self.version += 1
+            self._sorted_views = {}
+            self._results.clear()
+
+        logger.info(f"상품 인덱스 구성 완료 ({source}): {len(products)}개 ({time.time() - started:.2f}초)")
+        return len(products)
+
+    def ensure_fresh(self):
+        """TTL이 지났으면 갱신 (갱신 중인 다른 요청은 이전 스냅샷 사용)"""
+        if self.built_at and time.time() - self.built_at < self.ttl:
+            return
+
+        if not self.built_at:
+            # 최초 구성은 모든 요청이 기다린다
+            with self._refresh_lock:
+                if not self.built_at:
+                    self.refresh()
+            return
+
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"상품 인덱스 갱신 실패, 이전 스냅샷 사용: {str(e)}")
+            finally:
+                self._refresh_lock.release()
+
+    def invalidate(self):
+        """다음 조회 시 인덱스를 다시 구성하도록 표시"""
+        if self.shared_cache is not None:
+            self.shared_cache.delete(f"product_index:{self.get_mall_id()}")
+        with self._lock:
+            self.built_at = 0 if not self.products else self.built_at - self.ttl
+
+    def stats(self):
+        return {
+            'size': len(self.products),
+            'version': self.version,
+            'built_at': self.built_at,
+            'age_seconds': round(time.time() - self.built_at, 1) if self.built_at else None
+        }
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def _sorted_view(self, sort_by):
+        """정렬 기준별 (키, 상품번호) 오름차순 뷰 - 인덱스 버전마다 한 번만 정렬"""
+        view = self._sorted_views.get(sort_by)
+        if view is None:
+            key_func = SORT_KEYS[sort_by]
+            view = sorted(self.products, key=lambda p: (key_func(p), _to_int(p.get('product_no'))))
+            self._sorted_views[sort_by] = view
+        return view
+
+    @staticmethod
+    def _build_predicate(filters):
+        """필터 조건을 하나의 판별 함수로 변환 (숫자 필터는 parse_filters로 변환된 값)"""
+        checks = []
+
+        if filters.get('price_min') is not None:
+            price_min = filters['price_min']
+            checks.append(lambda p: _to_float(p.get('price')) >= price_min)
+        if filters.get('price_max') is not None:
+            price_max = filters['price_max']
+            checks.append(lambda p: _to_float(p.get('price')) <= price_max)
+        if filters.get('stock_min') is not None:
+            stock_min = filters['stock_min']
+            checks.append(lambda p: _to_int(p.get('quantity')) >= stock_min)
+        if filters.get('stock_max') is not None:
+            stock_max = filters['stock_max']
+            checks.append(lambda p: _to_int(p.get('quantity')) <= stock_max)
+        if filters.get('display'):
+            display = filters['display']
+            checks.append(lambda p: p.get('display') == display)
+        if filters.get('selling'):
+            selling = filters['selling']
+            checks.append(lambda p: p.get('selling') == selling)
+        if filters.get('search'):
+            keyword = filters['search'].lower()
+            checks.append(lambda p: keyword in (p.get('product_name') or '').lower())
+        if filters.get('product_codes'):
+            codes = set(c.strip() for c in filters['product_codes'].split(','))
+            checks.append(lambda p: p.get('product_code') in codes)
+        if filters.get('brand_codes'):
+            brands = set(c.strip() for c in filters['brand_codes'].split(','))
+            checks.append(lambda p: p.get('brand_code') in brands)
+        if filters.get('created_start'):
+            created_start = filters['created_start']
+            checks.append(lambda p: (p.get('created_date') or '')[:10] >= created_start)
+        if filters.get('created_end'):
+            created_end = filters['created_end']
+            checks.append(lambda p: (p.get('created_date') or '')[:10] <= created_end)
+        if filters.get('updated_start'):
+            updated_start = filters['updated_start']
+            checks.append(lambda p: (p.get('updated_date') or '')[:10] >= updated_start)
+        if filters.get('updated_end'):
+            updated_end = filters['updated_end']
+            checks.append(lambda p: (p.get('updated_date') or '')[:10] <= updated_end)
+
+        if not checks:
+            return None
+        return lambda p: all(check(p) for check in checks)
+
+    @staticmethod
+    def signature(filters):
+        """필터 조합의 짧은 해시 (커서가 다른 조회에 재사용되는 것을 막는다)"""
+        raw = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+    def _filtered(self, sort_by, filters):
+        """정렬 뷰에 필터를 적용한 결과와 통계 (인덱스 버전 단위로 캐시)"""
+        cache_key = (self.version, sort_by, self.signature(filters))
+        with self._lock:
+            cached = self._results.get(cache_key)
+            record_cache('product_index_results', cached is not None)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                return cached
+
+            view = self._sorted_view(sort_by)
+            predicate = self._build_predicate(filters)
+            rows = view if predicate is None else [p for p in view if predicate(p)]
+            key_func = SORT_KEYS[sort_by]
+            keys = [(key_func(p), _to_int(p.get('product_no'))) for p in rows]
+
+            result = (rows, keys, self._summarize(rows))
+            self._results[cache_key] = result
+            if len(self._results) > self._max_results:
+                self._results.popitem(last=False)
+            return result
+
+    @staticmethod
+    def _summarize(rows):
+        total_value = 0
+        out_of_stock = low_stock = displayed = hidden = 0
+        for p in rows:
+            quantity = _to_int(p.get('quantity'))
+            total_value += _to_float(p.get('price')) * quantity
+            if quantity == 0:
+                out_of_stock += 1
+            elif quantity < 10:
+                low_stock += 1
+            if p.get('display') == 'T':
+                displayed += 1
+            elif p.get('display') == 'F':
+                hidden += 1
+        return {
+            'total_products': len(rows),
+            'total_value': total_value,
+            'out_of_stock': out_of_stock,
+            'low_stock': low_stock,
+            'displayed': displayed,
+            'hidden': hidden
+        }
+
+    def query(self, filters=None, sort_by='created_date', sort_order='desc',
+              limit=50, cursor=None, offset=0):
+        """
+        인덱스 조회
+
+        Returns:
+            rows, next_cursor, stats, 시작 위치
+
+        Raises:
+            FilterError: 숫자 필터 값을 해석할 수 없음
+            CursorError: 잘못된 커서
+        """
+        filters = parse_filters(filters)
+        if sort_by not in SORT_KEYS:
+            sort_by = 'created_date'
+        sort_order = 'asc' if sort_order == 'asc' else 'desc'
+        signature = self.signature(filters)
+
+        rows, keys, stats = self._filtered(sort_by, filters)
+        total = len(rows)
+
+        if cursor:
+            c_sort, c_order, c_signature, c_key, c_no = decode_cursor(cursor)
+            if (c_sort, c_order, c_signature) != (sort_by, sort_order, signature):
+                raise CursorError('커서가 현재 정렬/필터 조건과 일치하지 않습니다')
+            seek = (c_key, c_no)
+            if sort_order == 'asc':
+                start = bisect.bisect_right(keys, seek)
+            else:
+                start = total - bisect.bisect_left(keys, seek)
+        else:
+            start = max(offset, 0)
+
+        # 내림차순은 오름차순 뷰를 뒤에서부터 읽는다
+        if sort_order == 'asc':
+            page = rows[start:start + limit]
+        else:
+            end = total - start
+            page = rows[max(end - limit, 0):max(end, 0)][::-1]
+
+        next_cursor = None
+        if page and start + len(page) < total:
+            last = page[-1]
+            next_cursor = encode_cursor(
+                sort_by, sort_order, signature,
+                SORT_KEYS[sort_by](last), _to_int(last.get('product_no'))
+            )
+
+        return page, next_cursor, stats, start
+
+    # ------------------------------------------------------------------
+    # 필드 선택
+    # ------------------------------------------------------------------
+    def project(self, rows, fields):
+        """
+        요청한 필드만 남긴다.
+        인덱스에 없는 필드는 해당 페이지 상품번호만 Cafe24 fields 파라미터로 추가 조회한다.
+        """
+        if not fields:
+            return [dict(p) for p in rows]
+
+        local = set(INDEX_FIELDS) | set(COMPUTED_FIELDS)
+        remote_fields = [f for f in fields if f not in local]
+        extra = self._fetch_fields(rows, remote_fields) if remote_fields and rows else {}
+
+        projected = []
+        for p in rows:
+            item = {f: p.get(f) for f in fields if f in local}
+            if extra:
+                item.update(extra.get(_to_int(p.get('product_no')), {}))
+            projected.append(item)
+        return projected
+
+    def _fetch_fields(self, rows, remote_fields):
+        """인덱스에 없는 필드를 상품번호 목록으로 한 번에 조회"""
+        extra = {}
+        product_nos = [str(_to_int(p.get('product_no'))) for p in rows]
+        fields = ','.join(['product_no'] + remote_fields)
+
+        for i in range(0, len(product_nos), 100):
+            chunk = product_nos[i:i + 100]
+            response = upstream.get(
+                self._base_url(),
+                headers=self.get_headers(),
+                params={'product_no': ','.join(chunk), 'fields': fields, 'limit': len(chunk)},
+                timeout=API_TIMEOUT
+            )
+            if response.status_code != 200:
+                logger.warning(f"추가 필드 조회 실패: {response.status_code}")
+                continue
+            for product in response.json().get('products', []):
+                no = _to_int(product.get('product_no'))
+                extra[no] = {f: product.get(f) for f in remote_fields}
+        return extra
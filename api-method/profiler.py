@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운영 중 프로파일링 (관리자 전용)
+재시작 없이 느린 라우트의 시간이 어디에 쓰이는지 확인한다.
+
+- POST /api/admin/profile/requests  {"route": "/api/margin/analysis", "count": 5}
+  다음 N개 요청을 cProfile로 측정해 합산 (GET으로 결과 조회)
+- POST /api/admin/profile/sample    {"seconds": 10, "format": "collapsed"}
+  T초 동안 모든 스레드 스택을 주기적으로 샘플링 - 핫 함수 목록 또는
+  flamegraph.pl / speedscope용 collapsed stack 텍스트
+
+ADMIN_TOKEN 환경변수가 설정되어 있어야 하며 X-Admin-Token 헤더로 인증한다.
+요청 측정은 해당 요청을 받은 워커에서만 동작한다 (결과는 공유 캐시로 어느 워커에서나 조회).
+측정을 걸지 않았을 때의 비용은 요청당 전역 변수 확인 한 번뿐이다.
+"""
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+
+import pytz
+from flask import Blueprint, Response, g, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+profiler_bp = Blueprint('profiler', __name__)
+
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+PROFILE_MAX_REQUESTS = 50
+PROFILE_MAX_SECONDS = 60
+PROFILE_RESULT_TTL = 3600
+SORT_KEYS = {'cumulative': 3, 'tottime': 2, 'calls': 1}
+
+
+def _function_label(filename, lineno, name):
+    """site-packages 등 긴 경로는 파일명만 남긴다"""
+    if filename.startswith('<') or filename == '~':
+        return name
+    return f"{os.path.basename(filename)}:{lineno}({name})"
+
+
+def hot_functions(stats, sort='cumulative', limit=30):
+    """pstats.Stats → 상위 함수 목록"""
+    index = SORT_KEYS.get(sort, 3)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][index], reverse=True)[:limit]
+    return [{
+        'function': _function_label(*func),
+        'calls': nc,
+        'primitive_calls': cc,
+        'self_ms': round(tt * 1000, 2),
+        'cumulative_ms': round(ct * 1000, 2)
+    } for func, (cc, nc, tt, ct, _callers) in rows]
+
+
+class StackSampler:
+    """sys._current_frames() 주기 샘플링 (측정 요청 스레드 자신은 제외)"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = 0
+        self.stacks = Counter()  # 'thread;root;...;leaf' -> 횟수
+
+    @staticmethod
+    def _stack(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return names[::-1]
+
+    def run(self, seconds):
+        me = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = [thread_names.get(ident, str(ident))] + self._stack(frame)
+                self.stacks[';'.join(stack)] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+        return self
+
+    def collapsed(self):
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + '\n'
+
+    def hot_functions(self, limit=30):
+        """자기 시간(스택 맨 끝) / 누적 시간(스택에 포함) 샘플 수 기준"""
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for name in set(frames):
+                total[name] += count
+        all_samples = sum(self.stacks.values()) or 1
+        return [{
+            'function': name,
+            'self_samples': own[name],
+            'total_samples': count,
+            'total_pct': round(count / all_samples * 100, 1)
+        } for name, count in total.most_common(limit)]
+
+
+class RequestProfiler:
+    """지정 라우트의 다음 N개 요청을 cProfile로 측정"""
+
+    def __init__(self, shared_cache=None):
+        self.shared_cache = shared_cache
+        self.armed = None  # 측정 중이 아니면 None - 요청 훅은 이 값만 확인한다
+        self.stats = None
+        self.result = None
+        self._lock = threading.Lock()
+        self._active = threading.Lock()  # 인터프리터당 프로파일러는 하나만 동작
+
+    def arm(self, route, count=5, method=None, sort='cumulative', limit=30):
+        with self._lock:
+            self.stats = None
+            self.armed = {
+                'route': route,
+                'method': method.upper() if method else None,
+                'count': max(1, min(int(count), PROFILE_MAX_REQUESTS)),
+                'profiled': 0,
+                'sort': sort if sort in SORT_KEYS else 'cumulative',
+                'limit': int(limit),
+                'pid': os.getpid(),
+                'armed_at': datetime.now(KST).isoformat()
+            }
+            return dict(self.armed)
+
+    def disarm(self):
+        with self._lock:
+            armed, self.armed = self.armed, None
+            return armed
+
+    def start(self, route, method):
+        """요청 시작 훅 - 대상 요청이면 Profile 반환"""
+        armed = self.armed
+        if armed is None or route != armed['route'] or (armed['method'] and method != armed['method']):
+            return None
+        if not self._active.acquire(blocking=False):
+            return None  # 다른 요청을 측정 중 - 이번 요청은 건너뜀
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 다른 프로파일링 도구가 이미 동작 중
+            self._active.release()
+            return None
+        return profile
+
+    def finish(self, profile, elapsed):
+        profile.disable()
+        self._active.release()
+        with self._lock:
+            armed = self.armed
+            if armed is None:
+                return
+            if self.stats is None:
+                self.stats = pstats.Stats(profile)
+            else:
+                self.stats.add(profile)
+            armed['profiled'] += 1
+            armed.setdefault('request_ms', []).append(round(elapsed * 1000, 1))
+            if armed['profiled'] >= armed['count']:
+                self.armed = None
+                self._publish(armed)
+
+    def _publish(self, armed):
+        result = dict(armed, finished_at=datetime.now(KST).isoformat(),
+                      functions=hot_functions(self.stats, armed['sort'], armed['limit']))
+        buffer = io.StringIO()
+        self.stats.stream = buffer
+        self.stats.sort_stats(armed['sort']).print_stats(armed['limit'])
+        result['text'] = buffer.getvalue()
+        self.result = result
+        if self.shared_cache is not None:
+            self.shared_cache.set('profile:requests', result, PROFILE_RESULT_TTL)
+        logger.info("요청 프로파일링 완료: %s %d건", armed['route'], armed['profiled'])
+
+    def status(self):
+        with self._lock:
+            if self.armed is not None:
+                return {'status': 'armed', **self.armed}
+        result = self.shared_cache.get('profile:requests') if self.shared_cache is not None else self.result
+        if result is None:
+            return {'status': 'idle'}
+        return {'status': 'done', **result}
+
+
+def admin_required(func):
+    """ADMIN_TOKEN이 없으면 비활성, 있으면 X-Admin-Token 헤더 확인"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({'success': False, 'error': 'ADMIN_TOKEN이 설정되지 않아 비활성화됨'}), 404
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+            return jsonify({'success': False, 'error': '관리자 인증 실패'}), 403
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def register_profiler_routes(bp, profiler):
+    """프로파일링 라우트와 요청 측정 훅 등록"""
+
+    @bp.before_app_request
+    def start_profile():
+        if profiler.armed is None or request.url_rule is None:
+            return
+        profile = profiler.start(request.url_rule.rule, request.method)
+        if profile is not None:
+            g.profile = (profile, time.perf_counter())
+
+    @bp.teardown_app_request
+    def finish_profile(exc):
+        started = g.pop('profile', None)
+        if started is not None:
+            profile, started_at = started
+            profiler.finish(profile, time.perf_counter() - started_at)
+
+    @admin_required
+    def arm_requests():
+        data = request.get_json(silent=True) or {}
+        if not data.get('route'):
+            return jsonify({'success': False, 'error': 'route가 필요합니다 (예: /api/margin/analysis)'}), 400
+        armed = profiler.arm(data['route'], data.get('count', 5), data.get('method'),
+                             data.get('sort', 'cumulative'), data.get('limit', 30))
+        return jsonify({'success': True, 'armed': armed,
+                        'message': '이 워커로 들어오는 다음 요청들을 측정합니다'}), 202
+
+    @admin_required
+    def request_profile():
+        status = profiler.status()
+        if request.args.get('format') == 'text' and status['status'] == 'done':
+            return Response(status['text'], mimetype='text/plain; charset=utf-8')
+        status.pop('text', None)
+        return jsonify({'success': True, **status})
+
+    @admin_required
+    def disarm_requests():
+        return jsonify({'success': True, 'disarmed': profiler.disarm()})
+
+    @admin_required
+    def sample_threads():
+        data = request.get_json(silent=True) or {}
+        seconds = max(0.1, min(float(data.get('seconds', 10)), PROFILE_MAX_SECONDS))
+        interval = max(1, int(data.get('interval_ms', 10))) / 1000
+        sampler = StackSampler(interval).run(seconds)
+        if data.get('format') == 'collapsed':
+            return Response(sampler.collapsed(), mimetype='text/plain; charset=utf-8', headers={
+                'Content-Disposition': f'attachment; filename=stacks_{os.getpid()}_{int(time.time())}.txt'
+            })
+        return jsonify({
+            'success': True,
+            'pid': os.getpid(),
+            'seconds': seconds,
+            'samples': sampler.samples,
+            'functions': sampler.hot_functions(int(data.get('limit', 30)))
+        })
+
+    bp.add_url_rule('/requests', 'profile_requests_arm', arm_requests, methods=['POST'])
+    bp.add_url_rule('/requests', 'profile_requests_result', request_profile, methods=['GET'])
+    bp.add_url_rule('/requests', 'profile_requests_disarm', disarm_requests, methods=['DELETE'])
+    bp.add_url_rule('/sample', 'profile_sample', sample_threads, methods=['POST'])
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cafe24 호출 할당량 장부
+모든 Cafe24 호출에 호출을 일으킨 기능(feature)을 붙여 시간대(KST 1시간)별로 집계하고
+디스크(QUOTA_LEDGER_FILE)에 누적한다. 어떤 기능이 할당량을 얼마나 쓰는지 보고,
+기능별 시간당 예산(QUOTA_BUDGETS)을 넘으면 호출을 막는다.
+
+- 인바운드 요청은 Flask 엔드포인트 이름이 기능이 된다 (예: margin.preview_changes)
+- 백그라운드 작업은 with feature('live_sync'): 로 직접 붙인다 (안쪽 태그 우선)
+- 워커별로 메모리에 모았다가 QUOTA_LEDGER_FLUSH_INTERVAL초마다 파일 잠금 후 합산 기록
+- QUOTA_BUDGETS="live_sync=600,precompute=300" - 시간당 호출 수 상한.
+  'precompute'처럼 ':' 앞 그룹 이름으로 주면 그룹 전체 합계에 적용된다.
+  다른 워커의 호출은 마지막 기록 시점까지만 반영되므로 상한은 근사치다
+- GET /api/quota/report?hours=24 - 기능별 호출 수, 점유율, 오류/429/차단 건수
+"""
+import atexit
+import contextvars
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import wraps
+
+import pytz
+from flask import Blueprint, g, jsonify, request
+
+import upstream
+
+try:
+    import fcntl  # Windows에는 없음 - 단일 프로세스 개발 환경에서는 잠금 없이 기록
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+quota_bp = Blueprint('quota', __name__)
+
+# 보관 기간 동안 재시작/배포를 넘어 유지되어야 하므로 임시 디렉터리가 아닌 영구 디스크에 둔다
+# (Render는 render.yaml의 .data 디스크, 로컬은 api-method/.data - persistent_token_manager.py와 같은 위치)
+QUOTA_DATA_DIR = ('/opt/render/project/.data' if os.environ.get('RENDER')
+                  else os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data'))
+QUOTA_LEDGER_FILE = os.environ.get('QUOTA_LEDGER_FILE', os.path.join(QUOTA_DATA_DIR, 'quota_ledger.json'))
+QUOTA_LEDGER_HOURS = int(os.environ.get('QUOTA_LEDGER_HOURS', 168))  # 보관 기간 (시간)
+QUOTA_LEDGER_FLUSH_INTERVAL = int(os.environ.get('QUOTA_LEDGER_FLUSH_INTERVAL', 30))
+QUOTA_BUDGETS = os.environ.get('QUOTA_BUDGETS', '')
+
+UNATTRIBUTED = 'unattributed'
+FIELDS = ('calls', 'errors', 'throttled', 'blocked')
+
+_feature = contextvars.ContextVar('quota_feature', default=None)
+
+
+class QuotaBudgetExceeded(Exception):
+    """기능별 시간당 호출 예산 초과 - Cafe24로 요청을 보내지 않았다"""
+
+    def __init__(self, feature, budget, used):
+        self.feature = feature
+        self.budget = budget
+        self.used = used
+        super().__init__(f"Cafe24 호출 예산 초과 ({feature}): 이번 시간 {used}/{budget}회")
+
+
+def parse_budgets(text):
+    """'live_sync=600,health_check=120' → {'live_sync': 600, 'health_check': 120}"""
+    budgets = {}
+    for item in text.split(','):
+        name, _, limit = item.partition('=')
+        if name.strip() and limit.strip():
+            try:
+                budgets[name.strip()] = int(limit)
+            except ValueError:
+                logger.warning("QUOTA_BUDGETS 항목 무시: %s", item)
+    return budgets
+
+
+def hour_key(moment=None):
+    """KST 시간대 키 'YYYY-MM-DDTHH' (문자열 비교 = 시간 순서)"""
+    return (moment or datetime.now(KST)).strftime('%Y-%m-%dT%H')
+
+
+def group_of(name):
+    """기능 그룹 - 'precompute:get_worst_sellers' → 'precompute', 'margin.preview' → 'margin'"""
+    return name.replace(':', '.').split('.', 1)[0]
+
+
+def current_feature():
+    return _feature.get() or UNATTRIBUTED
+
+
+@contextmanager
+def feature(name):
+    """이 블록 안의 Cafe24 호출을 name 기능으로 집계"""
+    token = _feature.set(name)
+    try:
+        yield
+    finally:
+        _feature.reset(token)
+
+
+def tagged(name):
+    """함수 전체를 name 기능으로 집계하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with feature(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class QuotaLedger:
+    """기능별·시간대별 Cafe24 호출 장부"""
+
+    def __init__(self, path=QUOTA_LEDGER_FILE, retention_hours=QUOTA_LEDGER_HOURS, budgets=None):
+        self.path = path
+        self.retention_hours = retention_hours
+        self.budgets = parse_budgets(QUOTA_BUDGETS) if budgets is None else budgets
+        self.reset()
+
+    def reset(self):
+        """fork 직후 - 부모가 모은 미기록분은 부모가 기록하므로 버린다"""
+        self.pending = {}  # (시간대, 기능) -> [calls, errors, throttled, blocked]
+        self.persisted = {}  # 마지막 기록 시점의 현재 시간대 기능별 호출 수 (모든 워커 합)
+        self.persisted_hour = None
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def _add(self, name, index):
+        key = (hour_key(), name)
+        with self._lock:
+            counts = self.pending.get(key)
+            if counts is None:
+                counts = self.pending[key] = [0, 0, 0, 0]
+            counts[index] += 1
+        self._start_flusher()
+
+    def record(self, call):
+        """upstream 관찰자 - 호출 한 건 기록"""
+        name = current_feature()
+        self._add(name, 0)
+        if call['status'] == 0 or call['status'] >= 400:
+            self._add(name, 1)
+        if call['status'] == 429:
+            self._add(name, 2)
+
+    def _budget_for(self, name):
+        if name in self.budgets:
+            return name, self.budgets[name]
+        group = group_of(name)
+        if group in self.budgets:
+            return group, self.budgets[group]
+        return None, None
+
+    def used(self, budget_key, hour=None):
+        """이번 시간 호출 수 (기록된 값 + 이 워커의 미기록분) - budget_key는 기능 또는 그룹"""
+        hour = hour or hour_key()
+        matches = lambda name: name == budget_key or group_of(name) == budget_key  # noqa: E731
+        with self._lock:
+            total = sum(calls for name, calls in self.persisted.items()
+                        if self.persisted_hour == hour and matches(name))
+            total += sum(counts[0] for (pending_hour, name), counts in self.pending.items()
+                         if pending_hour == hour and matches(name))
+        return total
+
+    def check(self, method, url):
+        """upstream 가드 - 예산을 다 쓴 기능의 호출은 보내지 않는다"""
+        if not self.budgets:
+            return
+        name = current_feature()
+        budget_key, budget = self._budget_for(name)
+        if budget is None:
+            return
+        used = self.used(budget_key)
+        if used >= budget:
+            self._add(name, 3)
+            logger.warning("Cafe24 호출 예산 초과로 차단: %s %s (%s %d/%d)",
+                           method, upstream.endpoint_pattern(url), budget_key, used, budget)
+            raise QuotaBudgetExceeded(budget_key, budget, used)
+
+    # ------------------------------------------------------------------
+    # 파일 기록
+    # ------------------------------------------------------------------
+    def _start_flusher(self):
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name='quota-ledger', daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(QUOTA_LEDGER_FLUSH_INTERVAL)
+            self.flush()
+
+    @contextmanager
+    def _file_lock(self):
+        """워커 간 read-modify-write 직렬화"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'hours': {}}
+
+    def _write(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _merge_back(self, pending):
+        with self._lock:
+            for key, counts in pending.items():
+                target = self.pending.setdefault(key, [0, 0, 0, 0])
+                for index, value in enumerate(counts):
+                    target[index] += value
+
+    def flush(self):
+        """미기록분을 장부 파일에 합산하고 보관 기간이 지난 시간대 삭제 → 장부 전체 반환"""
+        with self._lock:
+            pending, self.pending = self.pending, {}
+        try:
+            if not pending:
+                data = self._read()
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with self._file_lock():
+                    data = self._read()
+                    hours = data.setdefault('hours', {})
+                    for (hour, name), counts in pending.items():
+                        row = hours.setdefault(hour, {}).setdefault(name, [0, 0, 0, 0])
+                        for index, value in enumerate(counts):
+                            row[index] += value
+                    cutoff = hour_key(datetime.now(KST) - timedelta(hours=self.retention_hours))
+                    for hour in [hour for hour in hours if hour < cutoff]:
+                        del hours[hour]
+                    data['updated_at'] = datetime.now(KST).isoformat()
+                    self._write(data)
+        except Exception as e:
+            self._merge_back(pending)
+            logger.warning("할당량 장부 기록 실패: %s", e)
+            return None
+
+        current = hour_key()
+        with self._lock:
+            self.persisted_hour = current
+            self.persisted = {name: row[0] for name, row in data.get('hours', {}).get(current, {}).items()}
+        return data
+
+    # ------------------------------------------------------------------
+    # 리포트
+    # ------------------------------------------------------------------
+    def report(self, hours=24):
+        """최근 hours시간 기능별 사용량과 점유율"""
+        data = self.flush() or self._read()
+        now = datetime.now(KST)
+        current = hour_key(now)
+        since = hour_key(now - timedelta(hours=hours - 1))
+        window = {hour: rows for hour, rows in data.get('hours', {}).items() if hour >= since}
+
+        features = {}
+        by_hour = []
+        for hour in sorted(window):
+            hour_calls = 0
+            for name, counts in window[hour].items():
+                entry = features.setdefault(name, dict.fromkeys(FIELDS, 0))
+                for field, value in zip(FIELDS, counts):
+                    entry[field] += value
+                if hour == current:
+                    entry['current_hour_calls'] = counts[0]
+                entry['peak_hour_calls'] = max(entry.get('peak_hour_calls', 0), counts[0])
+                hour_calls += counts[0]
+            by_hour.append({'hour': hour, 'calls': hour_calls,
+                            'features': {name: counts[0] for name, counts in window[hour].items()}})
+
+        total = sum(entry['calls'] for entry in features.values())
+        rows = []
+        for name, entry in features.items():
+            budget_key, budget = self._budget_for(name)
+            rows.append({
+                'feature': name,
+                'group': group_of(name),
+                **entry,
+                'current_hour_calls': entry.get('current_hour_calls', 0),
+                'share_pct': round(entry['calls'] / total * 100, 1) if total else 0.0,
+                'budget_key': budget_key,
+                'budget_per_hour': budget
+            })
+        rows.sort(key=lambda row: (-row['calls'], row['feature']))
+
+        groups = {}
+        for row in rows:
+            groups[row['group']] = groups.get(row['group'], 0) + row['calls']
+
+        return {
+            'hours': hours,
+            'since': since,
+            'total_calls': total,
+            'features': rows,
+            'groups': [{'group': group, 'calls': calls,
+                        'share_pct': round(calls / total * 100, 1) if total else 0.0}
+                       for group, calls in sorted(groups.items(), key=lambda item: -item[1])],
+            'budgets': [{'budget_key': key, 'budget_per_hour': budget, 'current_hour_calls': self.used(key, current)}
+                        for key, budget in sorted(self.budgets.items())],
+            'by_hour': by_hour,
+            'updated_at': data.get('updated_at')
+        }
+
+
+LEDGER = QuotaLedger()
+upstream.add_guard(LEDGER.check)
+upstream.add_observer(LEDGER.record)
+atexit.register(LEDGER.flush)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=LEDGER.reset)
+
+
+def register_quota_routes(bp, ledger=LEDGER):
+    """요청별 기능 태그 훅과 할당량 리포트 라우트 등록"""
+
+    @bp.before_app_request
+    def tag_request():
+        g.quota_feature_token = _feature.set(request.endpoint or UNATTRIBUTED)
+
+    @bp.teardown_app_request
+    def untag_request(exc):
+        token = g.pop('quota_feature_token', None)
+        if token is not None:
+            _feature.reset(token)
+
+    @bp.app_errorhandler(QuotaBudgetExceeded)
+    def budget_exceeded(error):
+        return jsonify({
+            'success': False,
+            'error': str(error),
+            'feature': error.feature,
+            'budget_per_hour': error.budget
+        }), 429
+
+    @bp.route('/report')
+    def quota_report():
+        """기능별 Cafe24 호출 사용량 (모든 워커 합산)"""
+        hours = max(1, min(request.args.get('hours', 24, type=int), ledger.retention_hours))
+        return jsonify({'success': True, **ledger.report(hours)})
@@ -5,7 +5,6 @@
 """
 import json
 from datetime import datetime, timedelta
-import pandas as pd
 import os
 
 class ReportGenerator:
@@ -147,6 +146,8 @@ class ReportGenerator:
     def export_to_excel(self, report_type='daily'):
         """리포트를 엑셀 파일로 내보내기"""
         try:
+            import pandas as pd
+
             if report_type == 'daily':
                 report = self.generate_daily_report()
             elif report_type == 'inventory':
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+리포트 사전 계산 스케줄러
+- 출근 시간대 전에(KST) 리포트/마진 구간/베스트·워스트셀러/재고 리포트를 미리 계산해 공유 캐시에 저장
+- 배포(재시작) 직후에도 한 번 계산해 첫 사용자가 콜드 스캔 비용을 내지 않게 한다
+  (공유 캐시의 warmed 플래그로 배포당 한 번 - max_requests로 재시작되는 워커는 건너뜀)
+- 예약 시각 구간(slot)마다 작업당 한 번만 계산한다: 이번 구간에 이미 계산된 결과가 있으면 건너뛰고,
+  구간별 공유 캐시 락은 끝나도 지우지 않아 뒤늦게 도착한 워커가 다시 계산하지 않는다
+- 캐시가 없거나 만료되면 기존처럼 실시간 계산
+"""
+from flask import Blueprint, jsonify, request, has_request_context
+from datetime import datetime, timedelta
+import threading
+import logging
+import json
+import time
+import os
+import pytz
+import schedule
+
+from metrics import bulk_job
+from upstream_trace import tracing
+from quota_ledger import QuotaBudgetExceeded, feature
+from profiler import admin_required
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+scheduler_bp = Blueprint('scheduler', __name__)
+
+# 사전 계산 시각 (KST, 쉼표 구분)
+PRECOMPUTE_TIMES = os.environ.get('PRECOMPUTE_TIMES', '08:30,09:30,13:00')
+# 사전 계산 결과 유효 시간 (초) - 다음 예약 시각까지 덮도록 설정
+PRECOMPUTE_TTL = int(os.environ.get('PRECOMPUTE_TTL', 3600))
+# 시작 직후 워밍업 여부 / 지연 (초)
+PRECOMPUTE_ON_START = os.environ.get('PRECOMPUTE_ON_START', 'true').lower() == 'true'
+PRECOMPUTE_WARMUP_DELAY = int(os.environ.get('PRECOMPUTE_WARMUP_DELAY', 5))
+# 한 작업이 락을 잡고 있을 수 있는 최대 시간 (초)
+PRECOMPUTE_LOCK_TTL = 600
+
+
+class ReportScheduler:
+    def __init__(self, app, shared_cache, times=PRECOMPUTE_TIMES, ttl=PRECOMPUTE_TTL):
+        self.app = app
+        self.shared_cache = shared_cache
+        self.times = [t.strip() for t in times.split(',') if t.strip()]
+        self.ttl = ttl
+
+        self.jobs = []
+        self.last_runs = {}
+        self.scheduler = schedule.Scheduler()  # 토큰 갱신용 기본 스케줄러와 분리
+        self._thread = None
+        self._pid = None
+        self._run_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 작업 등록 / 조회
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _key(name, args):
+        return f"precomputed:{name}:{json.dumps(list(args), ensure_ascii=False)}"
+
+    def register(self, name, func, args=(), json_response=False):
+        """사전 계산 작업 등록
+
+        Args:
+            name: 작업 이름 (캐시 키)
+            func: 계산 함수
+            args: 함수 인자 - 같은 인자의 요청만 캐시에서 응답
+            json_response: func가 Flask 응답을 반환하면 True
+        """
+        self.jobs.append({'name': name, 'func': func, 'args': tuple(args), 'json_response': json_response})
+
+    def get(self, name, *args):
+        """사전 계산 결과 반환 (없거나 만료 시 None)"""
+        entry = self.shared_cache.get(self._key(name, args))
+        return None if entry is None else entry['data']
+
+    def cached(self, name, func, json_response=False):
+        """사전 계산 결과가 있으면 그것을, 없으면 func 결과를 반환하는 래퍼"""
+        def wrapper(*args):
+            # ?refresh=true 요청은 항상 실시간 계산
+            if has_request_context() and request.args.get('refresh', '').lower() == 'true':
+                return func(*args)
+            data = self.get(name, *args)
+            if data is None:
+                return func(*args)
+            logger.debug("사전 계산 결과 사용: %s", name)
+            return jsonify(data) if json_response else data
+        wrapper.__name__ = getattr(func, '__name__', name)
+        return wrapper
+
+    def invalidate(self, prefix=''):
+        """사전 계산 결과 삭제 (상품/가격 변경 후)"""
+        for job in self.jobs:
+            if job['name'].startswith(prefix):
+                self.shared_cache.delete(self._key(job['name'], job['args']))
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def slot_start(self, now=None):
+        """now가 속한 예약 구간의 시작 시각 (가장 최근에 지난 예약 시각, KST)"""
+        now = now or datetime.now(KST)
+        if not self.times:
+            return now - timedelta(seconds=self.ttl)
+        starts = []
+        for at in self.times:
+            hour, minute = (int(part) for part in at.split(':')[:2])
+            starts.append(now.replace(hour=hour, minute=minute, second=0, microsecond=0))
+        past = [start for start in starts if start <= now]
+        return max(past) if past else max(starts) - timedelta(days=1)
+
+    @bulk_job('precompute')
+    def run_job(self, job, force=False):
+        """작업 하나 실행 - force가 아니면 이번 구간에 이미 계산됐거나 다른 워커가 맡은 작업은 건너뛴다"""
+        key = self._key(job['name'], job['args'])
+        if force:
+            # 수동 실행: 동시 실행만 막고 끝나면 락 해제
+            lock_key = f"precompute_lock:{key}"
+        else:
+            slot = self.slot_start()
+            entry = self.shared_cache.get(key)
+            if entry and datetime.fromisoformat(entry['computed_at']) >= slot:
+                return {'name': job['name'], 'status': 'skipped', 'reason': 'already computed in this slot'}
+            # 구간별 락은 TTL까지 유지 - 방금 끝난 작업을 다른 워커가 다시 계산하지 않도록
+            lock_key = f"precompute_lock:{key}:{slot.isoformat()}"
+        if not self.shared_cache.add(lock_key, os.getpid(), PRECOMPUTE_LOCK_TTL):
+            return {'name': job['name'], 'status': 'skipped', 'reason': 'claimed by another worker'}
+
+        started = time.time()
+        trace = None
+        try:
+            with self.app.app_context(), feature(f"precompute:{job['name']}"), \
+                    tracing(f"precompute:{job['name']}") as trace:
+                result = job['func'](*job['args'])
+                if job['json_response']:
+                    response, status = result if isinstance(result, tuple) else (result, 200)
+                    if status != 200:
+                        raise RuntimeError(f'status {status}')
+                    result = response.get_json()
+                if self._has_error(result):
+                    raise RuntimeError('결과에 오류 포함 - 캐시하지 않음')
+
+            self.shared_cache.set(key, {
+                'data': result,
+                'computed_at': datetime.now(KST).isoformat()
+            }, self.ttl)
+            run = {'name': job['name'], 'status': 'ok'}
+        except QuotaBudgetExceeded as e:
+            # 예산 초과로 막힌 작업은 결과가 비어 있으므로 캐시하지 않는다
+            logger.warning(f"사전 계산 차단 ({job['name']}): {str(e)}")
+            run = {'name': job['name'], 'status': 'blocked', 'error': str(e)}
+        except Exception as e:
+            logger.error(f"사전 계산 실패 ({job['name']}): {str(e)}")
+            run = {'name': job['name'], 'status': 'error', 'error': str(e)}
+        finally:
+            if force:
+                self.shared_cache.delete(lock_key)
+
+        run['duration'] = round(time.time() - started, 2)
+        run['upstream_calls'] = trace.calls if trace else 0
+        run['finished_at'] = datetime.now(KST).isoformat()
+        self.last_runs[key] = run
+        return run
+
+    @staticmethod
+    def _has_error(result):
+        """실패 응답이나 일부 섹션이 실패한 리포트는 캐시하지 않는다"""
+        if not isinstance(result, dict):
+            return False
+        if result.get('success') is False or 'error' in result:
+            return True
+        if 'sections' in result and not result['sections']:
+            return True
+        sections = result.get('sections') or {}
+        return any(isinstance(v, dict) and 'error' in v for v in sections.values())
+
+    def run_all(self, force=False):
+        """등록된 모든 작업 실행 (동시에 한 번만, force=True면 이번 구간 결과가 있어도 다시 계산)"""
+        if not self._run_lock.acquire(blocking=False):
+            return []
+        try:
+            logger.info(f"리포트 사전 계산 시작 ({len(self.jobs)}개 작업)")
+            runs = [self.run_job(job, force=force) for job in self.jobs]
+            logger.info(f"리포트 사전 계산 완료: {sum(1 for r in runs if r['status'] == 'ok')}/{len(runs)}")
+            return runs
+        finally:
+            self._run_lock.release()
+
+    def start(self):
+        """스케줄러 스레드 시작 (프로세스당 한 번 - fork 후 워커에서 호출)"""
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+
+        self.scheduler.clear()
+        for at in self.times:
+            self.scheduler.every().day.at(at, 'Asia/Seoul').do(self.run_all)
+
+        def loop():
+            if PRECOMPUTE_ON_START:
+                time.sleep(PRECOMPUTE_WARMUP_DELAY)
+                # 워커가 여럿이거나 재시작돼도 배포당(TTL 안에서) 한 워커만 워밍업
+                if self.shared_cache.add('precompute:warmed', os.getpid(), self.ttl):
+                    self.run_all()
+            while True:
+                self.scheduler.run_pending()
+                time.sleep(30)
+
+        self._thread = threading.Thread(target=loop, name='report-scheduler', daemon=True)
+        self._thread.start()
+        logger.info(f"리포트 사전 계산 예약 (KST): {', '.join(self.times)}")
+
+    def status(self):
+        jobs = []
+        for job in self.jobs:
+            entry = self.shared_cache.get(self._key(job['name'], job['args']))
+            jobs.append({
+                'name': job['name'],
+                'args': list(job['args']),
+                'cached': entry is not None,
+                'computed_at': entry['computed_at'] if entry else None,
+                'last_run': self.last_runs.get(self._key(job['name'], job['args']))
+            })
+        next_run = self.scheduler.next_run
+        return {
+            'times_kst': self.times,
+            'slot_start': self.slot_start().isoformat(),
+            'ttl': self.ttl,
+            'running': bool(self._thread and self._thread.is_alive()),
+            'next_run': next_run.isoformat() if next_run else None,
+            'jobs': jobs
+        }
+
+
+def register_scheduler_routes(bp, scheduler):
+    """사전 계산 상태/수동 실행 라우트 등록"""
+
+    def status():
+        return jsonify({'success': True, **scheduler.status()})
+
+    @admin_required
+    def run():
+        # 요청을 붙잡지 않도록 백그라운드에서 실행 (전체 카탈로그/주문 스캔이므로 관리자만)
+        threading.Thread(target=scheduler.run_all, kwargs={'force': True}, name='report-precompute',
+                         daemon=True).start()
+        return jsonify({'success': True, 'message': '사전 계산을 시작했습니다'}), 202
+
+    bp.add_url_rule('/status', 'precompute_status', status, methods=['GET'])
+    bp.add_url_rule('/run', 'precompute_run', run, methods=['POST'])
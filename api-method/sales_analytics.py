@@ -6,11 +6,13 @@
 from flask import Blueprint, jsonify, request
 from datetime import datetime, timedelta
 import pytz
-import requests
 import calendar
 from collections import defaultdict
 import logging
-import json
+from config import api_base_url
+import upstream
+from quota_ledger import QuotaBudgetExceeded
+from logging_setup import lazy_json
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +32,7 @@ class SalesAnalytics:
             headers = self.get_headers()
             mall_id = self.get_mall_id()
             
-            url = f"https://{mall_id}.cafe24api.com/api/v2/admin/orders"
+            url = f"{api_base_url(mall_id)}/admin/orders"
             params = {
                 'start_date': start_date.strftime('%Y-%m-%d'),
                 'end_date': end_date.strftime('%Y-%m-%d'),
@@ -45,18 +47,17 @@ class SalesAnalytics:
             
             while True:
                 params['offset'] = offset
-                response = requests.get(url, headers=headers, params=params)
+                response = upstream.get(url, headers=headers, params=params)
                 
-                logger.info(f"Orders API request: {url} with params: {params}")
-                logger.info(f"Orders API response status: {response.status_code}")
+                logger.debug("Orders API %s offset=%s: %s", url, offset, response.status_code)
                 
                 if response.status_code == 200:
                     data = response.json()
                     orders = data.get('orders', [])
                     
-                    # 주문 데이터 샘플 로깅
+                    # 주문 데이터 샘플 로깅 (DEBUG에서만 직렬화)
                     if orders and offset == 0:
-                        logger.info(f"Sample order data: {orders[0] if orders else 'No orders'}")
+                        logger.debug("Sample order data: %s", lazy_json(orders[0]))
                     
                     all_orders.extend(orders)
                     
@@ -64,11 +65,14 @@ class SalesAnalytics:
                         break
                     offset += params['limit']
                 else:
-                    logger.error(f"Orders API error: {response.status_code} - {response.text}")
+                    logger.error("Orders API error: %s - %s", response.status_code, response.text)
                     break
                     
             return all_orders
             
+        except QuotaBudgetExceeded:
+            # 예산 초과를 빈 결과로 바꾸지 않는다 - 요청은 429, 사전 계산은 실패로 처리된다
+            raise
         except Exception as e:
             print(f"Error fetching orders: {str(e)}")
             return []
@@ -85,9 +89,9 @@ class SalesAnalytics:
             if order_status.startswith('C'):  # 취소 주문 제외
                 continue
                 
-            # 첫 주문 상세 로깅
+            # 첫 주문 상세 로깅 (DEBUG에서만 직렬화)
             if idx == 0:
-                logger.info(f"First order full data: {json.dumps(order, ensure_ascii=False)[:1000]}...")
+                logger.debug("First order full data: %s", lazy_json(order))
             
             # 다양한 금액 필드 확인
             payment_amount = 0
@@ -116,7 +120,7 @@ class SalesAnalytics:
                 valid_order_count += 1
                 customer_set.add(order.get('buyer_name', ''))
         
-        logger.info(f"Total sales: {total_sales:,.0f} from {valid_order_count} valid orders (total: {len(orders)})")
+        logger.info("Total sales: %.0f from %d valid orders (total: %d)", total_sales, valid_order_count, len(orders))
         
         return {
             'total_sales': total_sales,
@@ -216,15 +220,15 @@ class SalesAnalytics:
             'period': f"{start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}"
         }
     
-    def get_best_sellers(self, days=30):
-        """베스트셀러 상품 - 한국 시간 기준"""
+    def _get_product_sales(self, days):
+        """기간 내 상품별 판매 집계 - 한국 시간 기준"""
         utc_now = datetime.now(pytz.UTC)
         end_date = utc_now.astimezone(KST)
         start_date = end_date - timedelta(days=days)
         
         orders = self.get_date_range_orders(start_date, end_date)
         
-        logger.info(f"Best sellers: Found {len(orders)} orders for {days} days")
+        logger.info("Product sales: Found %d orders for %d days", len(orders), days)
         
         # 상품별 집계
         product_sales = defaultdict(lambda: {
@@ -238,7 +242,7 @@ class SalesAnalytics:
         for order in orders:
             items = order.get('items', [])
             if items and not items_found:
-                logger.info(f"Sample item: {items[0] if items else 'No items'}")
+                logger.debug("Sample item: %s", lazy_json(items[0]))
                 items_found = True
                 
             for item in items:
@@ -274,20 +278,23 @@ class SalesAnalytics:
                         product_sales[product_no]['product_name'] = product_name
                         product_sales[product_no]['orders'] += 1
         
-        # 매출 기준 정렬
-        sorted_products = sorted(
-            product_sales.items(), 
-            key=lambda x: x[1]['revenue'], 
-            reverse=True
-        )[:10]
-        
         return [{
             'product_no': product_no,
             'product_name': data['product_name'],
             'quantity': data['quantity'],
             'revenue': data['revenue'],
             'orders': data['orders']
-        } for product_no, data in sorted_products]
+        } for product_no, data in product_sales.items()]
+    
+    def get_best_sellers(self, days=30):
+        """베스트셀러 상품 (매출 상위 10개)"""
+        products = self._get_product_sales(days)
+        return sorted(products, key=lambda x: x['revenue'], reverse=True)[:10]
+    
+    def get_worst_sellers(self, days=30):
+        """부진 상품 (기간 내 판매된 상품 중 매출 하위 10개)"""
+        products = self._get_product_sales(days)
+        return sorted(products, key=lambda x: x['revenue'])[:10]
     
     def get_hourly_distribution(self, days=7):
         """시간대별 주문 분포 - 한국 시간 기준"""
@@ -326,6 +333,8 @@ def register_sales_routes(blueprint, analytics):
                 'success': True,
                 **data
             })
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -342,6 +351,8 @@ def register_sales_routes(blueprint, analytics):
                 'success': True,
                 **data
             })
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -359,6 +370,27 @@ def register_sales_routes(blueprint, analytics):
                 'products': data,
                 'period_days': days
             })
+        except QuotaBudgetExceeded:
+            raise
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @blueprint.route('/worst-sellers')
+    def worst_sellers():
+        """부진 상품"""
+        try:
+            days = request.args.get('days', 30, type=int)
+            data = analytics.get_worst_sellers(days)
+            return jsonify({
+                'success': True,
+                'products': data,
+                'period_days': days
+            })
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -375,6 +407,8 @@ def register_sales_routes(blueprint, analytics):
                 'success': True,
                 **data
             })
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({
                 'success': False,
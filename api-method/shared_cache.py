@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+워커 간 공유 캐시
+gunicorn 워커가 여러 개일 때 모듈 전역 dict 캐시는 워커마다 따로 존재한다.
+REDIS_URL이 설정되어 있으면 Redis, 아니면 같은 호스트의 파일 캐시를 사용한다.
+값은 JSON으로 저장한다.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_DIR = os.environ.get(
+    'SHARED_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cafe24_shared_cache')
+)
+# 파일 캐시 만료 항목 일괄 삭제 주기 (초, 프로세스별) - set 할 때 주기가 지났으면 실행
+SHARED_CACHE_SWEEP_INTERVAL = int(os.environ.get('SHARED_CACHE_SWEEP_INTERVAL', 600))
+
+
+class RedisBackend:
+    def __init__(self, url, prefix):
+        import redis  # 선택 의존성 - REDIS_URL이 있을 때만 필요
+        self.client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+        self.client.ping()
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False, default=str), ex=int(ttl))
+
+    def add(self, key, value, ttl):
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        return bool(self.client.set(self.prefix + key, raw, ex=int(ttl), nx=True))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class FileBackend:
+    """같은 호스트의 모든 워커가 공유하는 파일 캐시 (원자적 교체로 쓰기)"""
+
+    def __init__(self, directory, prefix, sweep_interval=SHARED_CACHE_SWEEP_INTERVAL):
+        self.directory = directory
+        self.prefix = prefix
+        self.sweep_interval = sweep_interval
+        self._swept_at = time.time()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1((self.prefix + key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.json')
+
+    def _read(self, path, remove_expired=False):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # 다른 워커가 쓰는 중인 파일일 수 있으므로 지우지 않는다
+            return None
+        if entry['expires_at'] < time.time():
+            if remove_expired:
+                self._remove_if_unchanged(path, mtime)
+            return None
+        return entry
+
+    @staticmethod
+    def _remove_if_unchanged(path, mtime):
+        """읽은 뒤 다른 워커가 새 값으로 교체하지 않았을 때만 삭제"""
+        try:
+            if os.stat(path).st_mtime_ns == mtime:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def sweep(self):
+        """만료된 항목과 중단된 쓰기의 임시 파일 삭제 → 삭제한 파일 수"""
+        self._swept_at = time.time()
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                if self._read(entry.path, remove_expired=True) is None and not os.path.exists(entry.path):
+                    removed += 1
+            elif entry.name.endswith('.tmp'):
+                try:
+                    if entry.stat().st_mtime < self._swept_at - 3600:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def get(self, key):
+        entry = self._read(self._path(key), remove_expired=True)
+        return None if entry is None else entry['value']
+
+    def set(self, key, value, ttl):
+        path = self._path(key)
+        entry = {'value': value, 'expires_at': time.time() + ttl}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if time.time() - self._swept_at >= self.sweep_interval:
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug(f"공유 캐시 만료 항목 {removed}개 삭제")
+            except OSError as e:
+                logger.warning(f"공유 캐시 정리 실패: {str(e)}")
+
+    def add(self, key, value, ttl):
+        path = self._path(key)
+        # 만료된 항목은 지우고 다시 시도
+        if os.path.exists(path) and self._read(path) is None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'value': value, 'expires_at': time.time() + ttl}, f, default=str)
+        return True
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class SharedCache:
+    def __init__(self, redis_url=None, directory=SHARED_CACHE_DIR, prefix='cafe24:'):
+        self.backend = None
+        self.backend_name = 'file'
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        redis_url = redis_url or os.environ.get('REDIS_URL')
+        if redis_url:
+            try:
+                self.backend = RedisBackend(redis_url, prefix)
+                self.backend_name = 'redis'
+            except Exception as e:
+                logger.warning(f"Redis 연결 실패, 파일 캐시 사용: {str(e)}")
+
+        if self.backend is None:
+            self.backend = FileBackend(directory, prefix)
+
+        logger.info(f"공유 캐시 백엔드: {self.backend_name}")
+
+    def get(self, key):
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"공유 캐시 조회 실패 ({key}): {str(e)}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        record_cache(self.namespace(key), value is not None)
+        return value
+
+    @staticmethod
+    def namespace(key):
+        """메트릭용 캐시 이름 - 'precomputed:...' 같은 키 접두사, 접두사 없으면 API 응답 캐시"""
+        return key.split(':', 1)[0] if ':' in key else 'api'
+
+    def set(self, key, value, ttl):
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"공유 캐시 저장 실패 ({key}): {str(e)}")
+
+    def add(self, key, value, ttl):
+        """키가 없을 때만 저장 (워커 간 단일 실행 락 용도)"""
+        try:
+            return self.backend.add(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"공유 캐시 락 실패 ({key}): {str(e)}")
+            return True  # 캐시 장애 시에는 각자 실행
+
+    def delete(self, key):
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            logger.warning(f"공유 캐시 삭제 실패 ({key}): {str(e)}")
+
+    def get_or_set(self, key, fetch_function, ttl):
+        """캐시에 있으면 반환, 없으면 fetch 후 저장"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = fetch_function()
+        if value is not None:
+            self.set(key, value, ttl)
+        return value
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'backend': self.backend_name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 2) if total else 0.0
+            }
+
+
+_shared_cache = None
+
+
+def get_shared_cache():
+    """공유 캐시 싱글톤 인스턴스 반환"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SharedCache()
+    return _shared_cache
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cafe24 API 호출 공통 진입점
+모든 매니저는 requests 대신 이 모듈의 get/post/put/delete로 Cafe24를 호출한다.
+호출 전에는 등록된 가드(할당량 예산 등)가 호출을 막을 수 있고,
+호출마다 엔드포인트 패턴, 상태 코드, 소요 시간을 등록된 관찰자(메트릭 등)에게 알린다.
+"""
+import logging
+import re
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+_observers = []
+_guards = []
+
+# /api/v2/admin/products/123/variants/P000000A000A → products/{no}/variants/{code}
+_API_PREFIX = re.compile(r'^/api/v2/(admin/)?')
+_NUMBER_SEGMENT = re.compile(r'/\d+(?=/|$)')
+_CODE_SEGMENT = re.compile(r'/(?=[A-Z0-9]*\d)[A-Z0-9]{8,}(?=/|$)')
+
+
+def add_observer(observer):
+    """호출 완료 시 observer(call) 호출 - call: method, endpoint, status, duration, response, error"""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer):
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def add_guard(guard):
+    """호출 직전 guard(method, url) 호출 - 예외를 던지면 요청을 보내지 않는다 (관찰자에게도 알리지 않음)"""
+    if guard not in _guards:
+        _guards.append(guard)
+
+
+def remove_guard(guard):
+    if guard in _guards:
+        _guards.remove(guard)
+
+
+def endpoint_pattern(url):
+    """URL을 메트릭 라벨용 엔드포인트 패턴으로 변환 (상품번호/품목코드는 자리표시자로)"""
+    path = _API_PREFIX.sub('', urlsplit(url).path)
+    path = _NUMBER_SEGMENT.sub('/{no}', '/' + path.strip('/'))
+    return _CODE_SEGMENT.sub('/{code}', path).lstrip('/') or '/'
+
+
+def request(method, url, **kwargs):
+    """requests.request와 동일 - 결과와 소요 시간을 관찰자에게 알린다"""
+    for guard in list(_guards):
+        guard(method, url)
+    started = time.perf_counter()
+    response = None
+    error = None
+    try:
+        response = requests.request(method, url, **kwargs)
+        return response
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        if _observers:
+            call = {
+                'method': method.upper(),
+                'url': url,
+                'endpoint': endpoint_pattern(url),
+                'status': response.status_code if response is not None else 0,
+                'duration': time.perf_counter() - started,
+                'response': response,
+                'error': error
+            }
+            for observer in list(_observers):
+                try:
+                    observer(call)
+                except Exception as e:
+                    logger.warning(f"업스트림 관찰자 오류: {str(e)}")
+
+
+def get(url, params=None, **kwargs):
+    return request('GET', url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request('POST', url, data=data, json=json, **kwargs)
+
+
+def put(url, data=None, **kwargs):
+    return request('PUT', url, data=data, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
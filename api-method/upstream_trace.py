@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+요청 단위 Cafe24 호출 추적 (N+1 탐지)
+인바운드 요청 하나(또는 사전 계산 작업 하나)를 처리하는 동안 발생한 Cafe24 호출을
+엔드포인트 패턴별로 세고 시간을 잰다.
+
+- 요청이 끝나면 호출 수/시간 요약을 로그에 남긴다
+- UPSTREAM_TRACE_HEADER=true면 응답에 X-Upstream-Calls, Server-Timing 헤더 추가
+- 같은 엔드포인트 패턴을 UPSTREAM_FANOUT_THRESHOLD회 넘게 호출하면 N+1 의심 경고
+- GET /api/debug/upstream 으로 이 워커에서 발견된 N+1 의심 목록 조회
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import Blueprint, g, jsonify, request
+
+import upstream
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+trace_bp = Blueprint('upstream_trace', __name__)
+
+UPSTREAM_TRACE_HEADER = os.environ.get('UPSTREAM_TRACE_HEADER', 'false').lower() == 'true'
+# 한 요청에서 같은 엔드포인트 패턴을 이 횟수보다 많이 호출하면 경고
+UPSTREAM_FANOUT_THRESHOLD = int(os.environ.get('UPSTREAM_FANOUT_THRESHOLD', 10))
+
+UPSTREAM_CALLS_PER_REQUEST = REGISTRY.histogram(
+    'http_request_upstream_calls', 'Cafe24 calls made while serving one request or job', ('route',),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000))
+FANOUT_WARNINGS = REGISTRY.counter(
+    'cafe24_upstream_fanout_warnings_total',
+    'Requests or jobs that called one Cafe24 endpoint more than the fan-out threshold',
+    ('route', 'method', 'endpoint'))
+
+_current = contextvars.ContextVar('upstream_trace', default=None)
+
+
+class UpstreamTrace:
+    """요청 하나의 Cafe24 호출 집계"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.endpoints = {}  # (method, endpoint) -> [호출 수, 소요 시간]
+        self._lock = threading.Lock()
+
+    def record(self, call):
+        key = (call['method'], call['endpoint'])
+        with self._lock:
+            self.calls += 1
+            self.duration += call['duration']
+            if call['status'] == 0 or call['status'] >= 400:
+                self.errors += 1
+            entry = self.endpoints.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += call['duration']
+
+    def top(self, limit=None):
+        """호출 수가 많은 순 [(method, endpoint, 호출 수, 소요 시간)]"""
+        rows = sorted(((method, endpoint, count, seconds)
+                       for (method, endpoint), (count, seconds) in self.endpoints.items()),
+                      key=lambda row: (-row[2], -row[3]))
+        return rows[:limit] if limit else rows
+
+    def fanout(self, threshold=UPSTREAM_FANOUT_THRESHOLD):
+        return [row for row in self.top() if row[2] > threshold]
+
+    def describe(self, limit=3):
+        """로그/헤더용 한 줄 요약"""
+        parts = [f"{method} {endpoint} x{count}" for method, endpoint, count, _ in self.top(limit)]
+        return f"{self.calls}회 {self.duration * 1000:.0f}ms 오류 {self.errors} ({', '.join(parts)})"
+
+    def __str__(self):
+        return self.describe()
+
+    def summary(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'errors': self.errors,
+            'upstream_ms': round(self.duration * 1000, 1),
+            'endpoints': [
+                {'method': method, 'endpoint': endpoint, 'calls': count, 'upstream_ms': round(seconds * 1000, 1)}
+                for method, endpoint, count, seconds in self.top()
+            ]
+        }
+
+
+class FanoutLog:
+    """워커에서 발견된 N+1 의심 (라우트, 엔드포인트) 누적"""
+
+    def __init__(self):
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def add(self, route, method, endpoint, calls):
+        key = (route, method, endpoint)
+        with self._lock:
+            entry = self.entries.setdefault(key, {
+                'route': route, 'method': method, 'endpoint': endpoint,
+                'occurrences': 0, 'max_calls': 0, 'last_calls': 0
+            })
+            entry['occurrences'] += 1
+            entry['max_calls'] = max(entry['max_calls'], calls)
+            entry['last_calls'] = calls
+            entry['last_seen'] = datetime.now().isoformat()
+
+    def report(self):
+        with self._lock:
+            return sorted((dict(entry) for entry in self.entries.values()),
+                          key=lambda entry: (-entry['max_calls'], -entry['occurrences']))
+
+
+fanout_log = FanoutLog()
+
+
+def current():
+    """현재 요청/작업의 추적 (없으면 None)"""
+    return _current.get()
+
+
+def _observe(call):
+    trace = _current.get()
+    if trace is not None:
+        trace.record(call)
+
+
+upstream.add_observer(_observe)
+
+
+def finish(trace):
+    """추적 종료 - 메트릭, 요약 로그, N+1 경고"""
+    UPSTREAM_CALLS_PER_REQUEST.observe(trace.calls, route=trace.name)
+    if not trace.calls:
+        return
+    # trace는 리스너 스레드에서 기록될 때 describe()로 문자열화된다
+    logger.info("Cafe24 호출 요약 [%s] %s", trace.name, trace)
+    for method, endpoint, count, seconds in trace.fanout():
+        FANOUT_WARNINGS.inc(route=trace.name, method=method, endpoint=endpoint)
+        fanout_log.add(trace.name, method, endpoint, count)
+        logger.warning("N+1 의심 [%s]: %s %s %d회 (%.0fms, 기준 %d회)",
+                       trace.name, method, endpoint, count, seconds * 1000, UPSTREAM_FANOUT_THRESHOLD)
+
+
+@contextmanager
+def tracing(name):
+    """요청 밖(사전 계산 작업 등)에서 Cafe24 호출 추적"""
+    trace = UpstreamTrace(name)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        finish(trace)
+
+
+def register_trace_routes(bp):
+    """요청마다 추적을 시작/종료하는 앱 전체 훅과 조회 라우트 등록"""
+
+    @bp.before_app_request
+    def start_trace():
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        trace = UpstreamTrace(f"{request.method} {route}")
+        g.upstream_trace_token = _current.set(trace)
+
+    @bp.after_app_request
+    def finish_trace(response):
+        trace = _current.get()
+        if trace is None or 'upstream_trace_token' not in g:
+            return response
+        finish(trace)
+        if UPSTREAM_TRACE_HEADER:
+            response.headers['X-Upstream-Calls'] = str(trace.calls)
+            response.headers.add('Server-Timing', f'cafe24;dur={trace.duration * 1000:.1f};desc="{trace.calls} calls"')
+        return response
+
+    @bp.teardown_app_request
+    def clear_trace(exc):
+        token = g.pop('upstream_trace_token', None)
+        if token is not None:
+            _current.reset(token)
+
+    @bp.route('/api/debug/upstream')
+    def upstream_fanout():
+        """N+1 의심 목록 (이 워커 기준)"""
+        return jsonify({
+            'threshold': UPSTREAM_FANOUT_THRESHOLD,
+            'pid': os.getpid(),
+            'offenders': fanout_log.report()
+        })
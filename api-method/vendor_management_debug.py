@@ -4,9 +4,11 @@
 업체 관리 시스템 - 디버그 버전
 """
 from flask import Blueprint, request, jsonify
-import requests
 from datetime import datetime
 import json
+from config import api_base_url
+import upstream
+from quota_ledger import QuotaBudgetExceeded
 
 vendor_bp = Blueprint('vendor', __name__)
 
@@ -26,9 +28,9 @@ class VendorManager:
             print(f"Debug: Headers = {headers}")
             
             # 디버그: 실제 응답 확인을 위한 테스트 호출
-            test_url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+            test_url = f"{api_base_url(mall_id)}/admin/products"
             test_params = {'limit': 1, 'fields': 'product_no,product_name'}
-            test_response = requests.get(test_url, headers=headers, params=test_params)
+            test_response = upstream.get(test_url, headers=headers, params=test_params)
             print(f"Debug: Test API Response Status = {test_response.status_code}")
             if test_response.status_code == 200:
                 test_data = test_response.json()
@@ -36,13 +38,13 @@ class VendorManager:
                     print(f"Debug: Available fields in product = {list(test_data['products'][0].keys())}")
             
             # 먼저 상품에서 공급업체 정보 추출 시도
-            products_url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+            products_url = f"{api_base_url(mall_id)}/admin/products"
             params = {
                 'limit': 100,
                 'fields': 'product_no,product_name,supplier_code,supplier_name,supplier_product_code,origin_classification,manufacturer_code,manufacturer_name,brand_code,brand_name'
             }
             
-            response = requests.get(products_url, headers=headers, params=params)
+            response = upstream.get(products_url, headers=headers, params=params)
             print(f"Debug: Products API Response Status = {response.status_code}")
             
             suppliers_dict = {}
@@ -111,14 +113,14 @@ class VendorManager:
             try:
                 # 여러 가능한 공급업체 API 엔드포인트 시도
                 supplier_endpoints = [
-                    f"https://{mall_id}.cafe24api.com/api/v2/admin/suppliers",
-                    f"https://{mall_id}.cafe24api.com/api/v2/admin/vendors",
-                    f"https://{mall_id}.cafe24api.com/api/v2/admin/product/suppliers"
+                    f"{api_base_url(mall_id)}/admin/suppliers",
+                    f"{api_base_url(mall_id)}/admin/vendors",
+                    f"{api_base_url(mall_id)}/admin/product/suppliers"
                 ]
                 
                 for endpoint in supplier_endpoints:
                     try:
-                        suppliers_response = requests.get(endpoint, headers=headers, params={'limit': 100})
+                        suppliers_response = upstream.get(endpoint, headers=headers, params={'limit': 100})
                         print(f"Debug: Testing {endpoint} - Status = {suppliers_response.status_code}")
                         
                         if suppliers_response.status_code == 200:
@@ -162,10 +164,14 @@ class VendorManager:
                                             
                                             suppliers_dict[code] = supplier_info
                                 break
+                    except QuotaBudgetExceeded:
+                        raise
                     except Exception as endpoint_error:
                         print(f"Debug: Endpoint {endpoint} failed = {str(endpoint_error)}")
                         continue
                         
+            except QuotaBudgetExceeded:
+                raise
             except Exception as e:
                 print(f"Debug: Suppliers API Error = {str(e)}")
                 # 공급업체 API가 없어도 계속 진행
@@ -213,6 +219,8 @@ class VendorManager:
                 }
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             print(f"Debug: General Error = {str(e)}")
             return jsonify({
@@ -268,13 +276,13 @@ class VendorManager:
             mall_id = self.get_mall_id()
             
             # 상품에서 제조사 정보 추출
-            url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+            url = f"{api_base_url(mall_id)}/admin/products"
             params = {
                 'limit': 100,
                 'fields': 'product_no,manufacturer_code,manufacturer_name'
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = upstream.get(url, headers=headers, params=params)
             
             manufacturers_dict = {}
             
@@ -316,6 +324,8 @@ class VendorManager:
                 'count': len(manufacturers)
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -351,13 +361,13 @@ class VendorManager:
             mall_id = self.get_mall_id()
             
             # 상품에서 브랜드 정보 추출
-            url = f"https://{mall_id}.cafe24api.com/api/v2/admin/products"
+            url = f"{api_base_url(mall_id)}/admin/products"
             params = {
                 'limit': 100,
                 'fields': 'product_no,product_name,brand_code,brand_name'
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = upstream.get(url, headers=headers, params=params)
             
             brands_dict = {}
             
@@ -400,6 +410,8 @@ class VendorManager:
                 'count': len(brands)
             })
             
+        except QuotaBudgetExceeded:
+            raise
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+운영 서버용 WSGI 진입점
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, product_api, logger
+
+# preload_app 사용 시 fork 전에 마스터에서 상품 인덱스를 한 번 적재한다.
+# 워커는 같은 메모리를 공유(copy-on-write)하고, 이후 갱신은 공유 캐시 스냅샷을 사용한다.
+if os.environ.get('WARM_PRODUCT_INDEX', 'true').lower() == 'true':
+    try:
+        product_api.index.ensure_fresh()
+    except Exception as e:
+        logger.warning(f"상품 인덱스 사전 적재 실패 (첫 요청 시 적재): {str(e)}")
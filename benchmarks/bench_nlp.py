@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NLP intent matching benchmark
+
+Times NaturalLanguageProcessor.process over a corpus of Korean and English
+commands and compares it with the previous matcher (uncompiled re.search per
+pattern, first match in declaration order). Also reports commands where the
+two disagree, which is expected only where a more specific intent now wins.
+
+Usage:
+    python benchmarks/bench_nlp.py
+    python benchmarks/bench_nlp.py --repeat 2000 --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.nlp_processor import NaturalLanguageProcessor  # noqa: E402
+
+CORPUS = [
+    # Korean
+    "전체 상품 목록 보여줘",
+    "상품 목록",
+    "모든 상품 카테고리 식품 보여줘",
+    "상품 검색 만두 10000원 이상",
+    "오늘 주문 내역",
+    "신규 주문 보여줘",
+    "어제 주문 목록",
+    "이번달 주문 내역 배송중",
+    "재고 부족 상품 확인",
+    "재고 5개 이하 상품",
+    "품절 상품 알려줘",
+    "재고 점검 해줘",
+    "일일 리포트 생성",
+    "매출 보고서 작성",
+    "통계 보기",
+    "오늘 상품 주문 리포트 생성",
+    "상품 가격 10% 인상으로 수정",
+    "가격 변경 15000원으로",
+    "시스템 상태 확인",
+    "헬스 체크",
+    "알 수 없는 명령어",
+    "안녕하세요",
+    # English
+    "show all products",
+    "product list for category food",
+    "today's orders",
+    "order list new",
+    "inventory check",
+    "low stock products",
+    "generate report for sales",
+    "daily report",
+    "update product price 10% increase",
+    "change price to 5000",
+    "system health",
+    "health check please",
+    "what is the weather",
+]
+
+
+def legacy_process(nlp, command):
+    """Previous matcher: first re.search hit in declaration order"""
+    command = command.strip().lower()
+    for action, config in nlp.patterns.items():
+        for pattern in config['patterns']:
+            if re.search(pattern, command):
+                return action
+    return None
+
+
+def time_calls(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for command in CORPUS:
+            func(command)
+    elapsed = time.perf_counter() - started
+    return elapsed / (repeat * len(CORPUS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NLP intent matching benchmark')
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    nlp = NaturalLanguageProcessor()
+
+    results = {
+        'commands': len(CORPUS),
+        'repeat': args.repeat,
+        'legacy_match_us': round(time_calls(lambda c: legacy_process(nlp, c), args.repeat), 2),
+        'match_us': round(time_calls(nlp.match_intent, args.repeat), 2),
+        'process_us': round(time_calls(nlp.process, args.repeat), 2),
+        'changed': []
+    }
+    for command in CORPUS:
+        before = legacy_process(nlp, command)
+        after = nlp.process(command)
+        after = after['action'] if after else None
+        if before != after:
+            results['changed'].append({'command': command, 'legacy': before, 'now': after})
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"\n{results['commands']} commands x {results['repeat']}")
+    print(f"{'legacy matcher':<20} {results['legacy_match_us']:>8} us/command")
+    print(f"{'compiled matcher':<20} {results['match_us']:>8} us/command")
+    print(f"{'process (+params)':<20} {results['process_us']:>8} us/command")
+    for change in results['changed']:
+        print(f"  changed: {change['command']!r}: {change['legacy']} -> {change['now']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hot path benchmark suite
+
+Runs the app's heavy code paths against the local Cafe24 simulator
+(benchmarks/cafe24_simulator.py, started as a subprocess per catalog size)
+and reports latency percentiles, throughput and peak Python heap:
+
+    catalog_fetch        ProductIndex.refresh (full product scan)
+    margin_analysis      MarginManager.get_margin_analysis
+    best_sellers         SalesAnalytics.get_best_sellers (30 days)
+    monthly_comparison   SalesAnalytics.get_monthly_sales_comparison
+    csv_export           CSVProductManager.export_to_cafe24_csv (up to 2000 products)
+    csv_import           CSVProductManager.import_from_cafe24_csv (exported file)
+    cache_set            src CacheManager.set, one product per key
+    cache_get_memory     src CacheManager.get, memory hits
+    cache_get_file       src CacheManager.get, file hits
+    nlp_parse            src NaturalLanguageProcessor.process (catalog size independent)
+
+Throughput is items per second: products for the catalog and CSV paths,
+orders fetched for the sales paths, operations for cache and NLP.
+
+Results are written as JSON (one record per benchmark and catalog size, plus
+the commit and machine) so runs from different commits can be compared with
+benchmarks/compare_results.py, or directly with --baseline.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 --repeat 5 --latency-ms 20
+    python benchmarks/bench_suite.py --only catalog_fetch margin_analysis --output before.json
+    python benchmarks/bench_suite.py --baseline benchmarks/results/baseline.json
+
+Timings come from the untraced runs; peak memory comes from one extra run
+under tracemalloc, so it covers Python allocations only. The simulator runs
+in its own process, but shares the machine, so compare runs made on the
+same host.
+"""
+
+import argparse
+import http.client
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, 'api-method')
+BENCH_DIR = os.path.join(ROOT, 'benchmarks')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+SIMULATOR_TOKEN = 'bench-token'
+# File-backed cache benchmarks stop at this many keys per catalog size
+CACHE_MAX_OPS = 5000
+NLP_PASSES = 200
+# CSV export grows a DataFrame row by row (quadratic); larger catalogs take minutes per run
+CSV_MAX_SIZE = 2000
+
+BENCHMARKS = {}
+
+
+def benchmark(name, scales=True, max_size=None):
+    """Register a benchmark: func(ctx) -> (items processed, per-op samples or None)
+
+    max_size skips catalog sizes above it unless --uncapped is given.
+    """
+    def decorator(func):
+        BENCHMARKS[name] = {'func': func, 'scales': scales, 'max_size': max_size}
+        return func
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# Simulator
+# ----------------------------------------------------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_simulator(port: int, products: int, orders: int, latency_ms: float) -> subprocess.Popen:
+    cmd = [sys.executable, os.path.join(BENCH_DIR, 'cafe24_simulator.py'), '--port', str(port),
+           '--products', str(products), '--orders', str(orders), '--days', '400',
+           '--latency-ms', str(latency_ms)]
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/v2/admin/products/count',
+                         headers={'Authorization': f'Bearer {SIMULATOR_TOKEN}'})
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'Simulator on port {port} did not start')
+
+
+def stop_simulator(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+class Context:
+    """Managers wired to the simulator for one catalog size"""
+
+    def __init__(self, size: int, work_dir: str):
+        from flask import Flask
+        from margin_management import MarginManager
+        from sales_analytics import SalesAnalytics
+        from product_csv_import_export import CSVProductManager
+
+        self.size = size
+        self.work_dir = work_dir
+        self.app = Flask('bench')
+        self.margin = MarginManager(self.get_headers, self.get_mall_id)
+        self.sales = SalesAnalytics(self.get_headers, self.get_mall_id)
+        self.csv = CSVProductManager(self.get_headers, self.get_mall_id)
+        self.exported_csv = None
+        self.cache = None
+        self.orders_fetched = 0
+
+        fetch_orders = self.sales.get_date_range_orders
+
+        def counting_fetch(start_date, end_date):
+            orders = fetch_orders(start_date, end_date)
+            self.orders_fetched += len(orders)
+            return orders
+        self.sales.get_date_range_orders = counting_fetch
+
+    @staticmethod
+    def get_headers():
+        return {
+            'Authorization': f'Bearer {SIMULATOR_TOKEN}',
+            'Content-Type': 'application/json',
+            'X-Cafe24-Api-Version': '2025-06-01'
+        }
+
+    @staticmethod
+    def get_mall_id():
+        return 'bench'
+
+    def cache_manager(self):
+        if self.cache is None:
+            from src.cache_manager import CacheManager
+            self.cache = CacheManager({'enabled': True, 'ttl': 3600,
+                                       'cache_dir': os.path.join(self.work_dir, f'cache_{self.size}')})
+        return self.cache
+
+    def cache_items(self):
+        return [{'product_no': n, 'product_code': f'P{n:07d}', 'product_name': f'상품 {n}',
+                 'price': '15900.00', 'supply_price': '9800.00', 'quantity': n % 50}
+                for n in range(1, min(self.size, CACHE_MAX_OPS) + 1)]
+
+
+def _json_body(response):
+    if isinstance(response, tuple):
+        raise RuntimeError(f'HTTP {response[1]}: {response[0].get_json()}')
+    return response.get_json()
+
+
+@benchmark('catalog_fetch')
+def bench_catalog_fetch(ctx):
+    from product_index import ProductIndex
+    index = ProductIndex(ctx.get_headers, ctx.get_mall_id, ttl=0, max_size=ctx.size)
+    return index.refresh(), None
+
+
+@benchmark('margin_analysis')
+def bench_margin_analysis(ctx):
+    with ctx.app.app_context():
+        body = _json_body(ctx.margin.get_margin_analysis())
+    return body['total_products'], None
+
+
+@benchmark('best_sellers')
+def bench_best_sellers(ctx):
+    ctx.orders_fetched = 0
+    ctx.sales.get_best_sellers(30)
+    return ctx.orders_fetched, None
+
+
+@benchmark('monthly_comparison')
+def bench_monthly_comparison(ctx):
+    ctx.orders_fetched = 0
+    ctx.sales.get_monthly_sales_comparison()
+    return ctx.orders_fetched, None
+
+
+@benchmark('csv_export', max_size=CSV_MAX_SIZE)
+def bench_csv_export(ctx):
+    with ctx.app.test_request_context('/api/products/export/csv'):
+        response = ctx.csv.export_to_cafe24_csv()
+        if isinstance(response, tuple):
+            _json_body(response)
+        response.direct_passthrough = False
+        ctx.exported_csv = response.get_data()
+    return ctx.size, None
+
+
+@benchmark('csv_import', max_size=CSV_MAX_SIZE)
+def bench_csv_import(ctx):
+    if ctx.exported_csv is None:
+        bench_csv_export(ctx)
+    data = {'file': (io.BytesIO(ctx.exported_csv), 'products.csv')}
+    with ctx.app.test_request_context('/api/products/import/csv', method='POST', data=data,
+                                      content_type='multipart/form-data'):
+        body = _json_body(ctx.csv.import_from_cafe24_csv())
+    return body['results']['total'], None
+
+
+@benchmark('cache_set')
+def bench_cache_set(ctx):
+    cache = ctx.cache_manager()
+    samples = []
+    for item in ctx.cache_items():
+        start = time.perf_counter()
+        cache.set(f"product_{item['product_no']}", item)
+        samples.append(time.perf_counter() - start)
+    return len(samples), samples
+
+
+@benchmark('cache_get_memory')
+def bench_cache_get_memory(ctx):
+    cache = ctx.cache_manager()
+    items = ctx.cache_items()
+    for item in items:
+        cache.set(f"product_{item['product_no']}", item)
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        cache.get(f"product_{item['product_no']}")
+        samples.append(time.perf_counter() - start)
+    return len(samples), samples
+
+
+@benchmark('cache_get_file')
+def bench_cache_get_file(ctx):
+    cache = ctx.cache_manager()
+    items = ctx.cache_items()
+    for item in items:
+        cache.set(f"product_{item['product_no']}", item)
+    samples = []
+    for item in items:
+        with cache.lock:
+            cache.memory_cache.clear()
+        start = time.perf_counter()
+        cache.get(f"product_{item['product_no']}")
+        samples.append(time.perf_counter() - start)
+    return len(samples), samples
+
+
+@benchmark('nlp_parse', scales=False)
+def bench_nlp_parse(ctx):
+    from src.nlp_processor import NaturalLanguageProcessor
+    from bench_nlp import CORPUS
+    nlp = NaturalLanguageProcessor()
+    samples = []
+    for _ in range(NLP_PASSES):
+        for command in CORPUS:
+            start = time.perf_counter()
+            nlp.process(command)
+            samples.append(time.perf_counter() - start)
+    return len(samples), samples
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+def percentile(sorted_values, pct):
+    """Linear interpolation between closest ranks"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure(name, func, ctx, repeat, warmup, memory):
+    for _ in range(warmup):
+        func(ctx)
+
+    samples, items, elapsed, errors, error = [], 0, 0.0, 0, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            processed, op_samples = func(ctx)
+        except Exception as e:
+            errors += 1
+            error = f'{type(e).__name__}: {e}'[:200]
+            continue
+        duration = time.perf_counter() - start
+        items += processed
+        if op_samples is None:
+            elapsed += duration
+            samples.append(duration)
+        else:
+            # Per-operation benchmarks do setup work that should not count
+            elapsed += sum(op_samples)
+            samples.extend(op_samples)
+
+    peak = None
+    if memory and not errors:
+        tracemalloc.start()
+        try:
+            func(ctx)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    samples.sort()
+    ms = lambda value: round(value * 1000, 4) if value is not None else None  # noqa: E731
+    return {
+        'name': name,
+        'size': ctx.size if BENCHMARKS[name]['scales'] else None,
+        'repeat': repeat,
+        'samples': len(samples),
+        'items': items,
+        'mean_ms': ms(sum(samples) / len(samples)) if samples else None,
+        'min_ms': ms(samples[0]) if samples else None,
+        'p50_ms': ms(percentile(samples, 50)),
+        'p95_ms': ms(percentile(samples, 95)),
+        'p99_ms': ms(percentile(samples, 99)),
+        'max_ms': ms(samples[-1]) if samples else None,
+        'throughput': round(items / elapsed, 2) if elapsed else None,
+        'peak_memory_mb': round(peak / (1024 * 1024), 3) if peak is not None else None,
+        'errors': errors,
+        'error': error
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results):
+    print(f"\n{'benchmark':<20} {'size':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} "
+          f"{'items/s':>12} {'peak MB':>9} {'err':>4}")
+    for r in results:
+        size = r['size'] if r['size'] is not None else '-'
+        fmt = lambda value: '-' if value is None else value  # noqa: E731
+        print(f"{r['name']:<20} {size:>8} {fmt(r['p50_ms']):>10} {fmt(r['p95_ms']):>10} "
+              f"{fmt(r['p99_ms']):>10} {fmt(r['throughput']):>12} {fmt(r['peak_memory_mb']):>9} "
+              f"{r['errors']:>4}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot path benchmark suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='Catalog sizes')
+    parser.add_argument('--orders-per-product', type=float, default=4,
+                        help='Simulated orders per product (spread over 400 days)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated Cafe24 response latency')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--uncapped', action='store_true',
+                        help='Also run capped benchmarks (CSV) at sizes above their cap')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak memory run')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/bench_<time>.json)')
+    parser.add_argument('--baseline', help='Compare with this result file and exit 1 on regression')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"))
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+    port = free_port()
+    os.environ['CAFE24_API_BASE_URL'] = f'http://127.0.0.1:{port}'
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, API_DIR)  # api-method modules win over the root copies
+    # CSVProductManager reads its template relative to the app directory
+    os.chdir(API_DIR)
+    logging.disable(logging.CRITICAL)
+
+    names = args.only or list(BENCHMARKS)
+    work_dir = tempfile.mkdtemp(prefix='cafe24_bench_')
+    # Simulator calls would otherwise be added to the real quota ledger
+    os.environ['QUOTA_LEDGER_FILE'] = os.path.join(work_dir, 'quota_ledger.json')
+    results = []
+    try:
+        for index, size in enumerate(args.sizes):
+            todo = [n for n in names if (BENCHMARKS[n]['scales'] or index == 0)
+                    and (args.uncapped or not BENCHMARKS[n]['max_size'] or size <= BENCHMARKS[n]['max_size'])]
+            orders = max(1, int(size * args.orders_per_product))
+            print(f"catalog {size} products / {orders} orders: {', '.join(todo)}", file=sys.stderr)
+
+            simulator = start_simulator(port, size, orders, args.latency_ms)
+            try:
+                ctx = Context(size, work_dir)
+                for name in todo:
+                    # The managers print per-product debug lines; keep them out of the report
+                    stdout, sys.stdout = sys.stdout, io.StringIO()
+                    try:
+                        result = measure(name, BENCHMARKS[name]['func'], ctx, args.repeat, args.warmup,
+                                         not args.no_memory)
+                    finally:
+                        sys.stdout = stdout
+                    results.append(result)
+                    print(f"  {name}: p50 {result['p50_ms']} ms, {result['errors']} errors", file=sys.stderr)
+            finally:
+                stop_simulator(simulator)
+    finally:
+        if 'quota_ledger' in sys.modules:
+            # Flush now so the exit-time flush has nothing left to write into the removed directory
+            sys.modules['quota_ledger'].LEDGER.flush()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'sizes': args.sizes,
+            'repeat': args.repeat,
+            'latency_ms': args.latency_ms,
+            'orders_per_product': args.orders_per_product
+        },
+        'results': results
+    }
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_table(results)
+    print(f"\nResults: {output}")
+    if baseline:
+        from compare_results import main as compare_main
+        print()
+        return compare_main([baseline, output])
+    return 1 if any(r['errors'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local Cafe24 Admin API simulator
+
+A stand-in for https://{mall_id}.cafe24api.com so catalog scans, analytics and
+token handling can be measured offline and reproducibly. Point the app at it
+with CAFE24_API_BASE_URL=http://127.0.0.1:<port>.
+
+Served endpoints (under /api/v2):
+    POST oauth/token
+    GET  admin/products, admin/products/count, admin/products/{no}
+    PUT  admin/products/{no}
+    GET  admin/products/{no}/variants
+    PUT  admin/products/{no}/variants/{variant_code}
+    GET  admin/orders (embed=items), admin/orders/count
+    GET  admin/suppliers, admin/suppliers/count
+
+Cafe24 semantics: limit/offset paging (limit above the resource maximum or
+offset above --max-offset is a 422), fields= projection, embed=items on
+orders, X-Api-Call-Limit leaky bucket (429 when full) and 401 for expired or
+worn-out access tokens. GET /_simulator/stats returns the call counters.
+
+The catalog is synthetic and deterministic: product N and order N are derived
+from (seed, N) on demand, so 10k to 1M products cost no memory and every run
+sees the same data. Writes (PUT) are kept as overrides on top.
+
+Usage:
+    python benchmarks/cafe24_simulator.py --products 100000 --orders 200000
+    python benchmarks/cafe24_simulator.py --latency-ms 40 --jitter-ms 20 --bucket-size 40 --leak-rate 2
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Largest limit accepted per resource; the app pages products by 500
+MAX_LIMIT = {'products': 500, 'orders': 1000, 'suppliers': 100, 'variants': 100}
+DEFAULT_LIMIT = 10
+# Request counters (GET, outside /api/v2 so the app never hits it)
+STATS_PATH = '/_simulator/stats'
+
+ORDER_STATUSES = ['N00', 'N10', 'N20', 'N21', 'N22', 'N30', 'N40', 'C00', 'C40']
+ORDER_STATUS_WEIGHTS = [5, 10, 15, 3, 2, 20, 40, 3, 2]
+
+MENU = ['김치찌개', '된장찌개', '부대찌개', '순두부찌개', '갈비탕', '떡볶이', '짜장면',
+        '닭갈비', '불고기', '제육볶음', '감자탕', '냉면', '쌀국수', '카레', '마라탕']
+FORMATS = ['밀키트', '세트', '2인분', '대용량', '간편식']
+
+
+def _base36(number: int) -> str:
+    digits = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    out = ''
+    while number:
+        number, remainder = divmod(number, 36)
+        out = digits[remainder] + out
+    return out or '0'
+
+
+class SyntheticCatalog:
+    """Deterministic products, variants, suppliers and orders generated on demand"""
+
+    def __init__(self, products: int = 10000, orders: Optional[int] = None,
+                 suppliers: int = 50, days: int = 90, seed: int = 42,
+                 today: Optional[datetime] = None):
+        self.product_count = products
+        self.order_count = products if orders is None else orders
+        self.supplier_count = suppliers
+        self.days = days
+        self.seed = seed
+        today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        # Orders are spread evenly (in index order) from `days` ago until the end of today
+        self.order_start = today - timedelta(days=days - 1)
+        self.order_span = days * 86400.0
+
+        self.product_overrides: Dict[int, Dict[str, Any]] = {}
+        self.variant_overrides: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, kind: int, number: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + kind * 100_000_007 + number)
+
+    # ------------------------------------------------------------------
+    # Products
+    # ------------------------------------------------------------------
+    @staticmethod
+    def product_code(product_no: int) -> str:
+        return 'P' + _base36(product_no).rjust(7, '0')
+
+    @staticmethod
+    def product_no_from_code(code: str) -> Optional[int]:
+        if not re.fullmatch(r'P[0-9A-Z]{7}', code or ''):
+            return None
+        return int(code[1:], 36)
+
+    def _base_product(self, product_no: int) -> Dict[str, Any]:
+        rng = self._rng(1, product_no)
+        price = rng.randrange(50, 600) * 100
+        supply_price = int(price * rng.uniform(0.45, 0.8)) // 10 * 10
+        supplier = rng.randrange(1, self.supplier_count + 1)
+        created = self.order_start - timedelta(days=rng.randrange(0, 720))
+        selling = 'T' if rng.random() < 0.92 else 'F'
+        return {
+            'shop_no': 1,
+            'product_no': product_no,
+            'product_code': self.product_code(product_no),
+            'custom_product_code': f"MW-{product_no:07d}",
+            'product_name': f"만원요리 {rng.choice(MENU)} {rng.choice(FORMATS)} {product_no}",
+            'model_name': f"M{product_no}",
+            'price': f"{price:.2f}",
+            'retail_price': f"{int(price * 1.2):.2f}",
+            'supply_price': f"{supply_price:.2f}",
+            'display': 'T' if selling == 'T' and rng.random() < 0.95 else 'F',
+            'selling': selling,
+            'quantity': max(0, int(rng.expovariate(1 / 40)) - 3),
+            'has_option': 'T' if rng.random() < 0.3 else 'F',
+            'supplier_code': f"S{supplier:08d}",
+            'supplier_name': f"공급사 {supplier}",
+            'manufacturer_code': f"M{supplier:08d}",
+            'brand_code': 'B0000000',
+            'category': [{'category_no': 24 + rng.randrange(0, 12), 'recommend': 'F', 'new': 'F'}],
+            'created_date': created.strftime('%Y-%m-%dT%H:%M:%S+09:00'),
+            'updated_date': created.strftime('%Y-%m-%dT%H:%M:%S+09:00')
+        }
+
+    def product(self, product_no: int) -> Optional[Dict[str, Any]]:
+        if not 1 <= product_no <= self.product_count:
+            return None
+        product = self._base_product(product_no)
+        override = self.product_overrides.get(product_no)
+        if override:
+            product.update(override)
+        return product
+
+    def update_product(self, product_no: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.product(product_no) is None:
+            return None
+        changes = dict(changes)
+        for key in ('price', 'retail_price', 'supply_price'):
+            if key in changes:
+                changes[key] = f"{float(changes[key]):.2f}"
+        changes['updated_date'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S+09:00')
+        with self._lock:
+            self.product_overrides.setdefault(product_no, {}).update(changes)
+        return self.product(product_no)
+
+    def variants(self, product_no: int) -> List[Dict[str, Any]]:
+        product = self.product(product_no)
+        if product is None:
+            return []
+        rng = self._rng(2, product_no)
+        count = rng.randrange(2, 5) if product['has_option'] == 'T' else 1
+        variants = []
+        for i in range(count):
+            code = f"{product['product_code']}{i + 1:06d}"
+            variant = {
+                'shop_no': 1,
+                'variant_code': code,
+                'options': [{'name': '구성', 'value': f"옵션{i + 1}"}] if count > 1 else [],
+                'display': 'T',
+                'selling': 'T',
+                'additional_amount': f"{(i * 1000):.2f}",
+                'quantity': rng.randrange(0, 100),
+                'use_inventory': 'T'
+            }
+            variant.update(self.variant_overrides.get((product_no, code), {}))
+            variants.append(variant)
+        return variants
+
+    def update_variant(self, product_no: int, variant_code: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not any(v['variant_code'] == variant_code for v in self.variants(product_no)):
+            return None
+        with self._lock:
+            self.variant_overrides.setdefault((product_no, variant_code), {}).update(changes)
+        return next(v for v in self.variants(product_no) if v['variant_code'] == variant_code)
+
+    # ------------------------------------------------------------------
+    # Suppliers
+    # ------------------------------------------------------------------
+    def supplier(self, number: int) -> Dict[str, Any]:
+        return {
+            'shop_no': 1,
+            'supplier_code': f"S{number:08d}",
+            'supplier_name': f"공급사 {number}",
+            'status': 'A',
+            'commission': '10.00',
+            'use_supplier': 'T'
+        }
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+    def _order_time(self, index: int) -> datetime:
+        return self.order_start + timedelta(seconds=index * self.order_span / self.order_count)
+
+    def order_index_range(self, start_date: Optional[str], end_date: Optional[str]) -> range:
+        """Indexes of orders placed between start_date and end_date (inclusive days)"""
+        lo, hi = 0, self.order_count
+        per_second = self.order_count / self.order_span
+        if start_date:
+            seconds = (datetime.strptime(start_date[:10], '%Y-%m-%d') - self.order_start).total_seconds()
+            lo = min(hi, max(0, math.ceil(seconds * per_second)))
+        if end_date:
+            seconds = (datetime.strptime(end_date[:10], '%Y-%m-%d') + timedelta(days=1)
+                       - self.order_start).total_seconds()
+            hi = min(hi, max(0, math.ceil(seconds * per_second)))
+        return range(lo, max(lo, hi))
+
+    def _popular_product(self, rng: random.Random) -> int:
+        # Skewed so that a few products clearly sell best
+        return 1 + int(self.product_count * rng.random() ** 3)
+
+    def order(self, index: int, embed_items: bool = False) -> Dict[str, Any]:
+        rng = self._rng(3, index)
+        placed = self._order_time(index)
+        status = rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS)[0]
+
+        items = []
+        total = 0.0
+        for i in range(rng.randrange(1, 4)):
+            product_no = self._popular_product(rng)
+            base = self._base_product(product_no)
+            quantity = rng.randrange(1, 4)
+            price = float(base['price'])
+            total += price * quantity
+            items.append({
+                'shop_no': 1,
+                'item_no': i + 1,
+                'order_item_code': f"{placed:%Y%m%d}-{index:07d}-{i + 1:02d}",
+                'product_no': product_no,
+                'product_code': base['product_code'],
+                'product_name': base['product_name'],
+                'variant_code': f"{base['product_code']}000001",
+                'quantity': quantity,
+                'product_price': f"{price:.2f}",
+                'option_price': '0.00',
+                'supplier_code': base['supplier_code'],
+                'order_status': status
+            })
+
+        shipping = 0.0 if total >= 30000 else 3000.0
+        discount = float(int(total * rng.choice([0, 0, 0, 0.05, 0.1])) // 10 * 10)
+        order = {
+            'shop_no': 1,
+            'order_id': f"{placed:%Y%m%d}-{index:07d}",
+            'order_date': placed.strftime('%Y-%m-%dT%H:%M:%S+09:00'),
+            'payment_date': placed.strftime('%Y-%m-%dT%H:%M:%S+09:00'),
+            'order_status': status,
+            'member_id': f"member{rng.randrange(1, max(2, self.order_count // 3)):07d}",
+            'buyer_name': f"구매자{rng.randrange(1, 5000)}",
+            'order_price_amount': f"{total:.2f}",
+            'shipping_fee': f"{shipping:.2f}",
+            'payment_amount': f"{total + shipping - discount:.2f}",
+            'actual_payment_amount': f"{total + shipping - discount:.2f}",
+            'payment_method': [rng.choice(['card', 'cash', 'naverpay', 'kakaopay'])],
+            'paid': 'T',
+            'canceled': 'T' if status.startswith('C') else 'F'
+        }
+        if embed_items:
+            order['items'] = items
+        return order
+
+
+class CallLimiter:
+    """Cafe24-style leaky bucket per access token"""
+
+    def __init__(self, bucket_size: int = 40, leak_rate: float = 2.0):
+        self.bucket_size = bucket_size
+        self.leak_rate = leak_rate
+        self._levels: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> Tuple[bool, int]:
+        """Returns (allowed, bucket level after the call)"""
+        if self.bucket_size <= 0:
+            return True, 0
+        now = time.monotonic()
+        with self._lock:
+            level, updated = self._levels.get(key, (0.0, now))
+            level = max(0.0, level - (now - updated) * self.leak_rate)
+            allowed = level + 1 <= self.bucket_size
+            if allowed:
+                level += 1
+            self._levels[key] = (level, now)
+        return allowed, int(math.ceil(level))
+
+
+class TokenStore:
+    """Issued access tokens, their expiry and remaining call allowance"""
+
+    def __init__(self, ttl: int = 7200, calls_per_token: int = 0, strict: bool = False):
+        self.ttl = ttl
+        self.calls_per_token = calls_per_token
+        self.strict = strict
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def issue(self, mall_id: str, client_id: str) -> Dict[str, Any]:
+        now = datetime.now()
+        token = {
+            'access_token': secrets.token_urlsafe(16),
+            'expires_at': (now + timedelta(seconds=self.ttl)).strftime('%Y-%m-%dT%H:%M:%S.000'),
+            'refresh_token': secrets.token_urlsafe(16),
+            'refresh_token_expires_at': (now + timedelta(days=14)).strftime('%Y-%m-%dT%H:%M:%S.000'),
+            'client_id': client_id,
+            'mall_id': mall_id,
+            'user_id': 'simulator',
+            'scopes': ['mall.read_product', 'mall.write_product', 'mall.read_order', 'mall.read_supply'],
+            'issued_at': now.strftime('%Y-%m-%dT%H:%M:%S.000')
+        }
+        with self._lock:
+            self._tokens[token['access_token']] = {'expires': time.time() + self.ttl, 'calls': 0}
+        return token
+
+    def check(self, access_token: Optional[str]) -> bool:
+        if not access_token:
+            return False
+        with self._lock:
+            entry = self._tokens.get(access_token)
+            if entry is None:
+                if self.strict:
+                    return False
+                # Tokens from a real login are accepted, then age like issued ones
+                entry = self._tokens[access_token] = {'expires': time.time() + self.ttl, 'calls': 0}
+            entry['calls'] += 1
+            if time.time() > entry['expires']:
+                return False
+            if self.calls_per_token and entry['calls'] > self.calls_per_token:
+                return False
+        return True
+
+
+class Cafe24Simulator:
+    """Request routing and Cafe24 response semantics"""
+
+    def __init__(self, catalog: SyntheticCatalog, latency_ms: float = 0, jitter_ms: float = 0,
+                 limiter: Optional[CallLimiter] = None, tokens: Optional[TokenStore] = None,
+                 max_offset: int = 0, max_limit: Optional[Dict[str, int]] = None, seed: int = 42):
+        self.catalog = catalog
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.limiter = limiter or CallLimiter(bucket_size=0)
+        self.tokens = tokens or TokenStore()
+        self.max_offset = max_offset
+        self.max_limit = dict(MAX_LIMIT, **(max_limit or {}))
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.stats = {'requests': 0, 'status': {}}
+        self._stats_lock = threading.Lock()
+
+    def delay(self):
+        if self.latency or self.jitter:
+            with self._rng_lock:
+                extra = self._rng.uniform(0, self.jitter) if self.jitter else 0
+            time.sleep(self.latency + extra)
+
+    def record(self, status: int):
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['status'][status] = self.stats['status'].get(status, 0) + 1
+
+    @staticmethod
+    def error(status: int, message: str) -> Tuple[int, Dict[str, Any]]:
+        return status, {'error': {'code': status, 'message': message}}
+
+    # ------------------------------------------------------------------
+    # Paging helpers
+    # ------------------------------------------------------------------
+    def _paging(self, query: Dict[str, str], resource: str) -> Tuple[int, int]:
+        limit = int(query.get('limit', DEFAULT_LIMIT))
+        offset = int(query.get('offset', 0))
+        if not 1 <= limit <= self.max_limit[resource]:
+            raise ValueError(f"limit must be between 1 and {self.max_limit[resource]}")
+        if offset < 0 or (self.max_offset and offset > self.max_offset):
+            raise ValueError(f"offset must be between 0 and {self.max_offset}")
+        return limit, offset
+
+    @staticmethod
+    def _project(item: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+        if not fields:
+            return item
+        wanted = set(f.strip() for f in fields.split(',')) | {'shop_no'}
+        return {k: v for k, v in item.items() if k in wanted}
+
+    @staticmethod
+    def _split(value: Optional[str]) -> Optional[List[str]]:
+        return [v.strip() for v in value.split(',') if v.strip()] if value else None
+
+    def _product_candidates(self, query: Dict[str, str]):
+        """Product numbers matching the cheap filters, or None for the whole catalog"""
+        numbers = None
+        if query.get('product_no'):
+            numbers = [int(n) for n in self._split(query['product_no']) if n.isdigit()]
+        if query.get('product_code'):
+            by_code = [self.catalog.product_no_from_code(c) for c in self._split(query['product_code'])]
+            by_code = [n for n in by_code if n]
+            numbers = by_code if numbers is None else [n for n in numbers if n in set(by_code)]
+        return numbers
+
+    def _product_filters(self, query: Dict[str, str]):
+        checks = []
+        if query.get('product_name'):
+            name = query['product_name']
+            checks.append(lambda p: name in p['product_name'])
+        for key in ('display', 'selling', 'supplier_code'):
+            if query.get(key):
+                values = set(self._split(query[key]))
+                checks.append(lambda p, key=key, values=values: p[key] in values)
+        return checks
+
+    def _iter_products(self, query: Dict[str, str], offset: int = 0):
+        """Matching products from `offset` on (unfiltered scans skip straight to it)"""
+        numbers = self._product_candidates(query)
+        numbers = numbers if numbers is not None else range(1, self.catalog.product_count + 1)
+        checks = self._product_filters(query)
+        if not checks:
+            numbers, offset = numbers[offset:], 0
+        for number in numbers:
+            if offset:
+                offset -= 1
+                continue
+            product = self.catalog.product(number)
+            if product is not None and all(check(product) for check in checks):
+                yield product
+
+    def _count_products(self, query: Dict[str, str]) -> int:
+        candidates = self._product_candidates(query)
+        if not self._product_filters(query):
+            if candidates is None:
+                return self.catalog.product_count
+            return sum(1 for n in candidates if 1 <= n <= self.catalog.product_count)
+        return sum(1 for _ in self._iter_products(query))
+
+    def _iter_orders(self, query: Dict[str, str], embed_items: bool, offset: int = 0):
+        """Orders in the date range from `offset` on (status filters need a scan)"""
+        statuses = set(self._split(query.get('order_status')) or [])
+        indexes = self.catalog.order_index_range(query.get('start_date'), query.get('end_date'))
+        if not statuses:
+            indexes, offset = indexes[offset:], 0
+        for index in indexes:
+            order = self.catalog.order(index, embed_items)
+            if statuses and order['order_status'] not in statuses:
+                continue
+            if offset:
+                offset -= 1
+                continue
+            yield order
+
+    def _count_orders(self, query: Dict[str, str]) -> int:
+        if not query.get('order_status'):
+            return len(self.catalog.order_index_range(query.get('start_date'), query.get('end_date')))
+        return sum(1 for _ in self._iter_orders(query, False))
+
+    @staticmethod
+    def _changes(body: bytes, resource: str) -> Dict[str, Any]:
+        """PUT fields from {"request": {...}}, also taking the nested {"request": {resource: {...}}} form"""
+        payload = json.loads(body or b'{}')
+        changes = payload.get('request', payload)
+        return changes.get(resource, changes) if isinstance(changes.get(resource), dict) else changes
+
+    @staticmethod
+    def _page(iterator, limit: int) -> List[Dict[str, Any]]:
+        page = []
+        for item in iterator:
+            page.append(item)
+            if len(page) >= limit:
+                break
+        return page
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    def handle(self, method: str, path: str, query: Dict[str, str], headers: Dict[str, str],
+               body: bytes) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        self.delay()
+        extra_headers: Dict[str, str] = {}
+
+        if path.rstrip('/') == '/api/v2/oauth/token' and method == 'POST':
+            form = {k: v[0] for k, v in parse_qs(body.decode('utf-8', 'replace')).items()}
+            if form.get('grant_type') not in ('authorization_code', 'refresh_token'):
+                return (*self.error(400, 'invalid_grant'), extra_headers)
+            return 200, self.tokens.issue('simulator', form.get('client_id', 'simulator')), extra_headers
+
+        if not path.startswith('/api/v2/admin/'):
+            return (*self.error(404, 'No API found'), extra_headers)
+
+        auth = headers.get('authorization', '')
+        access_token = auth[7:] if auth.lower().startswith('bearer ') else None
+        if not self.tokens.check(access_token):
+            return (*self.error(401, 'Invalid access_token'), extra_headers)
+
+        allowed, level = self.limiter.hit(access_token)
+        if self.limiter.bucket_size:
+            extra_headers['X-Api-Call-Limit'] = f"{level}/{self.limiter.bucket_size}"
+        if not allowed:
+            return (*self.error(429, 'Too Many Requests'), extra_headers)
+
+        parts = path[len('/api/v2/admin/'):].strip('/').split('/')
+        try:
+            status, payload = self._route(method, parts, query, body)
+        except ValueError as e:
+            status, payload = self.error(422, str(e))
+        return status, payload, extra_headers
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, str],
+               body: bytes) -> Tuple[int, Dict[str, Any]]:
+        resource = parts[0]
+        fields = query.get('fields')
+
+        if resource == 'products':
+            if len(parts) == 1 and method == 'GET':
+                limit, offset = self._paging(query, 'products')
+                page = self._page(self._iter_products(query, offset), limit)
+                return 200, {'products': [self._project(p, fields) for p in page]}
+            if parts[1:] == ['count']:
+                return 200, {'count': self._count_products(query)}
+
+            if not parts[1].isdigit():
+                return self.error(404, 'No API found')
+            product_no = int(parts[1])
+            if self.catalog.product(product_no) is None:
+                return self.error(404, 'Product not found')
+
+            if len(parts) == 2:
+                if method == 'PUT':
+                    return 200, {'product': self.catalog.update_product(product_no, self._changes(body, 'product'))}
+                return 200, {'product': self._project(self.catalog.product(product_no), fields)}
+
+            if parts[2] == 'variants':
+                if len(parts) == 3:
+                    return 200, {'variants': self.catalog.variants(product_no)}
+                if method == 'PUT':
+                    variant = self.catalog.update_variant(product_no, parts[3], self._changes(body, 'variant'))
+                    if variant is None:
+                        return self.error(404, 'Variant not found')
+                    return 200, {'variant': variant}
+                variant = next((v for v in self.catalog.variants(product_no) if v['variant_code'] == parts[3]), None)
+                return (200, {'variant': variant}) if variant else self.error(404, 'Variant not found')
+
+        if resource == 'orders' and method == 'GET':
+            if parts[1:] == ['count']:
+                return 200, {'count': self._count_orders(query)}
+            if len(parts) == 1:
+                limit, offset = self._paging(query, 'orders')
+                embed = 'items' in (self._split(query.get('embed')) or [])
+                page = self._page(self._iter_orders(query, embed, offset), limit)
+                return 200, {'orders': [self._project(o, fields) for o in page]}
+
+        if resource == 'suppliers' and method == 'GET':
+            if parts[1:] == ['count']:
+                return 200, {'count': self.catalog.supplier_count}
+            if len(parts) == 1:
+                limit, offset = self._paging(query, 'suppliers')
+                numbers = range(offset + 1, min(self.catalog.supplier_count, offset + limit) + 1)
+                return 200, {'suppliers': [self._project(self.catalog.supplier(n), fields) for n in numbers]}
+
+        return self.error(404, 'No API found')
+
+
+def make_handler(simulator: Cafe24Simulator):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _dispatch(self, method):
+            parsed = urlparse(self.path)
+            if parsed.path == STATS_PATH:
+                # Call counters for load tests; not counted themselves
+                with simulator._stats_lock:
+                    stats = json.loads(json.dumps(simulator.stats))
+                return self._send(200, stats, {})
+            query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            headers = {k.lower(): v for k, v in self.headers.items()}
+
+            try:
+                status, payload, extra_headers = simulator.handle(method, parsed.path, query, headers, body)
+            except Exception as e:  # a simulator bug should not look like a hung upstream
+                status, payload, extra_headers = 500, {'error': {'code': 500, 'message': str(e)}}, {}
+            simulator.record(status)
+            self._send(status, payload, extra_headers)
+
+        def _send(self, status, payload, extra_headers):
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            for key, value in extra_headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._dispatch('GET')
+
+        def do_POST(self):
+            self._dispatch('POST')
+
+        def do_PUT(self):
+            self._dispatch('PUT')
+
+    return Handler
+
+
+def start_simulator(port: int = 0, **options) -> Tuple[ThreadingHTTPServer, Cafe24Simulator, str]:
+    """Run a simulator in a background thread
+
+    Keyword options are those of build_simulator. Returns (server, simulator,
+    base_url); use base_url as CAFE24_API_BASE_URL and call server.shutdown()
+    when done.
+    """
+    simulator = build_simulator(**options)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(simulator))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='cafe24-simulator', daemon=True).start()
+    return server, simulator, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def build_simulator(products: int = 10000, orders: Optional[int] = None, suppliers: int = 50,
+                    days: int = 90, seed: int = 42, latency_ms: float = 0, jitter_ms: float = 0,
+                    bucket_size: int = 0, leak_rate: float = 2.0, token_ttl: int = 7200,
+                    calls_per_token: int = 0, strict_tokens: bool = False,
+                    max_offset: int = 0) -> Cafe24Simulator:
+    catalog = SyntheticCatalog(products, orders, suppliers, days, seed)
+    return Cafe24Simulator(
+        catalog,
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        limiter=CallLimiter(bucket_size, leak_rate),
+        tokens=TokenStore(token_ttl, calls_per_token, strict_tokens),
+        max_offset=max_offset,
+        seed=seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Cafe24 Admin API simulator')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--orders', type=int, help='Number of orders (default: same as products)')
+    parser.add_argument('--suppliers', type=int, default=50)
+    parser.add_argument('--days', type=int, default=90, help='Orders are spread over this many days up to today')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--bucket-size', type=int, default=0,
+                        help='Call-limit bucket size (Cafe24 uses 40); 0 disables rate limiting')
+    parser.add_argument('--leak-rate', type=float, default=2.0, help='Calls drained from the bucket per second')
+    parser.add_argument('--token-ttl', type=int, default=7200, help='Access token lifetime in seconds')
+    parser.add_argument('--calls-per-token', type=int, default=0,
+                        help='Expire an access token after this many calls (0 = never)')
+    parser.add_argument('--strict-tokens', action='store_true',
+                        help='Reject access tokens not issued by this simulator')
+    parser.add_argument('--max-offset', type=int, default=0,
+                        help='Largest accepted offset (the live API stops at 8000); 0 = unlimited')
+    args = parser.parse_args()
+
+    options = {k: v for k, v in vars(args).items() if k != 'port'}
+    server, simulator, base_url = start_simulator(args.port, **options)
+    print(f"Cafe24 simulator on {base_url} ({args.products} products, "
+          f"{simulator.catalog.order_count} orders over {args.days} days)")
+    print(f"  export CAFE24_API_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
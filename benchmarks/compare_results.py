@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark regression gate
+
+Compares a result file from benchmarks/bench_suite.py with a stored baseline,
+benchmark by benchmark (name and catalog size), and prints a table of p50
+latency and peak memory deltas (--json also carries p95 and throughput).
+
+A benchmark regresses when its p50 latency grows by more than --threshold
+percent and by more than --min-delta-ms, or when its peak memory grows by
+more than --memory-threshold percent and --min-delta-mb. Both conditions must
+hold, so sub-millisecond jitter on fast paths and small relative noise on
+slow ones are ignored. New errors count as regressions too.
+
+Exit codes: 0 no regression, 1 regression, 2 unreadable input.
+
+Usage:
+    python benchmarks/compare_results.py benchmarks/results/baseline.json benchmarks/results/bench_20250101_120000.json
+    python benchmarks/compare_results.py baseline.json new.json --threshold 15 --json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_THRESHOLD = 10.0         # % slower p50
+DEFAULT_MIN_DELTA_MS = 0.05      # absolute p50 change below this is noise
+DEFAULT_MEMORY_THRESHOLD = 20.0  # % more peak memory
+DEFAULT_MIN_DELTA_MB = 0.5
+
+
+def load_results(path: str) -> Dict[Tuple[str, Optional[int]], Dict[str, Any]]:
+    """Result records keyed by (benchmark, catalog size)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    return {(r['name'], r.get('size')): r for r in report['results']}
+
+
+def _change(before: Optional[float], after: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+    """(absolute delta, percent delta) or Nones when either side is missing"""
+    if before is None or after is None:
+        return None, None
+    delta = after - before
+    return delta, (delta / before * 100 if before else None)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+            memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+            min_delta_mb: float = DEFAULT_MIN_DELTA_MB) -> List[Dict[str, Any]]:
+    """
+    Per-benchmark comparison rows
+
+    status is one of: regression, improved, ok, new (no baseline),
+    missing (not in this run).
+    """
+    rows = []
+    for key in sorted(set(baseline) | set(current), key=lambda k: (k[1] or 0, k[0])):
+        name, size = key
+        before, after = baseline.get(key), current.get(key)
+        row = {'name': name, 'size': size, 'status': 'ok', 'reasons': []}
+
+        if before is None or after is None:
+            row['status'] = 'new' if before is None else 'missing'
+            rows.append(row)
+            continue
+
+        for field in ('p50_ms', 'p95_ms', 'throughput', 'peak_memory_mb'):
+            row[field] = (before.get(field), after.get(field))
+        p50_delta, p50_pct = _change(before.get('p50_ms'), after.get('p50_ms'))
+        mem_delta, mem_pct = _change(before.get('peak_memory_mb'), after.get('peak_memory_mb'))
+        row['p50_pct'], row['memory_pct'] = p50_pct, mem_pct
+
+        if p50_pct is not None and p50_pct > threshold and p50_delta > min_delta_ms:
+            row['reasons'].append(f"p50 +{p50_pct:.1f}%")
+        if mem_pct is not None and mem_pct > memory_threshold and mem_delta > min_delta_mb:
+            row['reasons'].append(f"memory +{mem_pct:.1f}%")
+        if after.get('errors') and not before.get('errors'):
+            row['reasons'].append(f"{after['errors']} errors")
+
+        if row['reasons']:
+            row['status'] = 'regression'
+        elif p50_pct is not None and p50_pct < -threshold and -p50_delta > min_delta_ms:
+            row['status'] = 'improved'
+        rows.append(row)
+    return rows
+
+
+def _fmt(value, digits=2):
+    return '-' if value is None else f"{value:.{digits}f}"
+
+
+def _pct(value):
+    return '' if value is None else f"{value:+.1f}%"
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<20} {'size':>8} {'p50 ms (base → new)':>26} {'Δ':>8} "
+             f"{'peak MB (base → new)':>22} {'Δ':>8}  status"]
+    unmatched = {'new': [], 'missing': []}
+    for row in rows:
+        size = '-' if row['size'] is None else row['size']
+        if 'p50_ms' not in row:
+            unmatched[row['status']].append(f"{row['name']}@{size}")
+            continue
+        p50 = f"{_fmt(row['p50_ms'][0], 3)} → {_fmt(row['p50_ms'][1], 3)}"
+        memory = f"{_fmt(row['peak_memory_mb'][0])} → {_fmt(row['peak_memory_mb'][1])}"
+        status = row['status'] + (f" ({', '.join(row['reasons'])})" if row['reasons'] else '')
+        lines.append(f"{row['name']:<20} {size:>8} {p50:>26} {_pct(row['p50_pct']):>8} "
+                     f"{memory:>22} {_pct(row['memory_pct']):>8}  {status}")
+
+    for status, names in unmatched.items():
+        if names:
+            lines.append(f"{status} (not compared): {', '.join(names)}")
+
+    counts = {}
+    for row in rows:
+        counts[row['status']] = counts.get(row['status'], 0) + 1
+    lines += ['', ', '.join(f"{count} {status}" for status, count in sorted(counts.items()))]
+    return '\n'.join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark regression gate')
+    parser.add_argument('baseline', help='Baseline result file')
+    parser.add_argument('current', help='New result file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed p50 slowdown (%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help='Ignore p50 changes smaller than this')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help='Allowed peak memory growth (%%)')
+    parser.add_argument('--min-delta-mb', type=float, default=DEFAULT_MIN_DELTA_MB,
+                        help='Ignore memory changes smaller than this')
+    parser.add_argument('--json', action='store_true', help='Print rows as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        baseline, current = load_results(args.baseline), load_results(args.current)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Cannot read results: {e}", file=sys.stderr)
+        return 2
+
+    rows = compare(baseline, current, args.threshold, args.min_delta_ms,
+                   args.memory_threshold, args.min_delta_mb)
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print(format_table(rows))
+    return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
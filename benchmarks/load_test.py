@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP load test for the web apps
+
+Starts the Cafe24 simulator and the app under gunicorn pointed at it, then
+ramps virtual users through scripted flows (dashboard poll, product search,
+margin view, CSV upload) and reports, per concurrency stage:
+
+    requests per second, p50/p95/p99 latency, error rate, and upstream
+    amplification (simulated Cafe24 calls per inbound request)
+
+plus the highest stage that stayed within --slo-ms p95 and --max-error-rate.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --stages 1 4 16 32 --stage-duration 20 --workers 2 --threads 8
+    python benchmarks/load_test.py --app web --mix dashboard_poll=5 product_search=1
+    python benchmarks/load_test.py --products 50000 --latency-ms 80 --output load.json
+
+--app api runs api-method (wsgi.py), --app web runs src/web_app.py (root
+wsgi.py). The app's background jobs (report precompute, live sync, upstream
+health checks) are pushed out of the run so they do not count as
+amplification. Client threads share the machine with the server and the
+simulator, so compare configurations rather than reading absolute numbers.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, 'benchmarks')
+SIMULATOR_TOKEN = 'load-token'
+STATS_PATH = '/_simulator/stats'
+
+APPS = {
+    'api': {'cwd': os.path.join(ROOT, 'api-method'), 'health': '/health'},
+    'web': {'cwd': ROOT, 'health': '/health'}
+}
+
+
+def price_csv(rows: int) -> bytes:
+    """Price update CSV in the upload format (상품코드, 판매가)"""
+    lines = ['상품코드,판매가']
+    for product_no in range(1, rows + 1):
+        code = 'P' + _base36(product_no).rjust(7, '0')
+        lines.append(f"{code},{15000 + product_no * 100}")
+    return ('\n'.join(lines) + '\n').encode('utf-8-sig')
+
+
+def _base36(number: int) -> str:
+    digits = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    out = ''
+    while number:
+        number, remainder = divmod(number, 36)
+        out = digits[remainder] + out
+    return out or '0'
+
+
+def multipart(field: str, filename: str, content: bytes, content_type: str = 'text/csv'):
+    boundary = uuid.uuid4().hex
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n').encode('utf-8') + content + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def build_flows(app: str, csv_rows: int):
+    """Scripted user flows: name -> [(label, method, path, body, content_type)]"""
+    search_terms = ['김치', '만두', '찌개', '세트', '2인분']
+    if app == 'api':
+        csv_body, csv_type = multipart('file', 'prices.csv', price_csv(csv_rows))
+        return {
+            'dashboard_poll': lambda rng: [
+                ('status', 'GET', '/api/status', None, None),
+                ('orders_today', 'GET', '/api/orders/today', None, None),
+                ('live_snapshot', 'GET', '/api/live/snapshot', None, None)
+            ],
+            'product_search': lambda rng: [
+                ('products', 'GET', '/api/products?' + urlencode({'search': rng.choice(search_terms), 'limit': 20}),
+                 None, None)
+            ],
+            'margin_view': lambda rng: [
+                ('margin_analysis', 'GET', '/api/margin/analysis', None, None),
+                ('best_sellers', 'GET', '/api/sales/best-sellers?period=30', None, None)
+            ],
+            'csv_upload': lambda rng: [
+                ('upload_price_csv', 'POST', '/api/upload-price-csv', csv_body, csv_type)
+            ]
+        }
+
+    return {
+        'dashboard_poll': lambda rng: [
+            ('health', 'GET', '/health', None, None),
+            ('orders', 'GET', '/api/orders', None, None),
+            ('inventory', 'GET', '/api/inventory', None, None)
+        ],
+        'product_search': lambda rng: [
+            ('execute', 'POST', '/api/execute',
+             json.dumps({'command': f"상품 검색 {rng.choice(search_terms)}"}).encode('utf-8'), 'application/json')
+        ],
+        'margin_view': lambda rng: [
+            ('products', 'GET', '/api/products?limit=100', None, None),
+            ('sales_report', 'GET', '/api/report/sales', None, None)
+        ]
+    }
+
+
+DEFAULT_MIX = {'dashboard_poll': 6, 'product_search': 3, 'margin_view': 1, 'csv_upload': 0.2}
+
+
+# ----------------------------------------------------------------------
+# Processes
+# ----------------------------------------------------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(port: int, path: str, headers: dict = None, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', path, headers=headers or {})
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'Nothing answering {path} on port {port}')
+
+
+def start_simulator(port: int, args) -> subprocess.Popen:
+    cmd = [sys.executable, os.path.join(BENCH_DIR, 'cafe24_simulator.py'), '--port', str(port),
+           '--products', str(args.products), '--latency-ms', str(args.latency_ms),
+           '--jitter-ms', str(args.jitter_ms), '--bucket-size', str(args.bucket_size)]
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for(port, STATS_PATH)
+    return process
+
+
+def start_app(port: int, simulator_port: int, args) -> subprocess.Popen:
+    env = dict(os.environ,
+               PORT=str(port),
+               CAFE24_API_BASE_URL=f'http://127.0.0.1:{simulator_port}',
+               CAFE24_ACCESS_TOKEN=SIMULATOR_TOKEN,
+               CAFE24_MALL_ID='loadtest', CAFE24_CLIENT_ID='loadtest', CAFE24_CLIENT_SECRET='loadtest',
+               WEB_CONCURRENCY=str(args.workers), GUNICORN_THREADS=str(args.threads),
+               GUNICORN_MAX_REQUESTS='0', LOG_LEVEL='warning', CAFE24_LOG_LEVEL='WARNING',
+               # Background jobs would show up as upstream calls nobody asked for
+               PRECOMPUTE_ON_START='false', LIVE_SYNC_INTERVAL='86400', HEALTH_UPSTREAM_INTERVAL='86400')
+    cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+           '--access-logfile', '/dev/null', '--log-level', 'warning', 'wsgi:app']
+    process = subprocess.Popen(cmd, cwd=APPS[args.app]['cwd'], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    wait_for(port, APPS[args.app]['health'])
+    return process
+
+
+def stop(process: subprocess.Popen):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except (OSError, AttributeError):
+        process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def upstream_calls(port: int) -> int:
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.request('GET', STATS_PATH)
+    return json.loads(conn.getresponse().read())['requests']
+
+
+# ----------------------------------------------------------------------
+# Load
+# ----------------------------------------------------------------------
+def run_stage(port: int, users: int, duration: float, flows, mix, think: float, seed: int):
+    """Run `users` looping virtual users for `duration` seconds"""
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    samples = [[] for _ in range(users)]  # (flow, label, seconds, status)
+    stop_at = time.time() + duration
+
+    def user(i):
+        rng = random.Random(seed * 1000 + i)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+        while time.time() < stop_at:
+            flow = rng.choices(names, weights)[0]
+            for label, method, path, body, content_type in flows[flow](rng):
+                headers = {'Content-Type': content_type} if content_type else {}
+                start = time.perf_counter()
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException):
+                    status = 0
+                    conn.close()
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+                samples[i].append((flow, label, time.perf_counter() - start, status))
+                if time.time() >= stop_at:
+                    break
+            if think:
+                time.sleep(rng.uniform(0, 2 * think))
+        conn.close()
+
+    started = time.time()
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [s for per_user in samples for s in per_user], time.time() - started
+
+
+def warm_up(port: int, flows, mix, seed: int):
+    """One untimed pass through every flow so index builds and lazy imports are not billed to stage 1"""
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+    for name in mix:
+        for _, method, path, body, content_type in flows[name](rng):
+            conn.request(method, path, body=body, headers={'Content-Type': content_type} if content_type else {})
+            conn.getresponse().read()
+    conn.close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(samples, elapsed: float, upstream: int = None):
+    latencies = sorted(s[2] for s in samples)
+    errors = sum(1 for s in samples if s[3] == 0 or s[3] >= 500)
+    ms = lambda value: round(value * 1000, 2) if value is not None else None  # noqa: E731
+    summary = {
+        'requests': len(samples),
+        'rps': round(len(samples) / elapsed, 2) if elapsed else None,
+        'p50_ms': ms(percentile(latencies, 50)),
+        'p95_ms': ms(percentile(latencies, 95)),
+        'p99_ms': ms(percentile(latencies, 99)),
+        'error_rate': round(errors / len(samples), 4) if samples else None,
+        'statuses': {}
+    }
+    for s in samples:
+        summary['statuses'][str(s[3])] = summary['statuses'].get(str(s[3]), 0) + 1
+    if upstream is not None:
+        summary['upstream_calls'] = upstream
+        summary['amplification'] = round(upstream / len(samples), 2) if samples else None
+    return summary
+
+
+def print_report(stages, sustainable):
+    print(f"\n{'users':>6} {'requests':>9} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'errors':>7} {'upstream/req':>13}")
+    for stage in stages:
+        s = stage['summary']
+        print(f"{stage['users']:>6} {s['requests']:>9} {s['rps']:>8} {s['p50_ms']:>9} {s['p95_ms']:>9} "
+              f"{s['p99_ms']:>9} {s['error_rate'] * 100:>6.1f}% {s['amplification']:>13}")
+
+    print(f"\n{'request':<32} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}   (all stages)")
+    totals = {}
+    for stage in stages:
+        for key, s in stage['by_request'].items():
+            totals.setdefault(key, []).append(s)
+    for key, parts in sorted(totals.items()):
+        count = sum(p['requests'] for p in parts)
+        worst_p95 = max(p['p95_ms'] for p in parts)
+        errors = sum(p['error_rate'] * p['requests'] for p in parts) / count
+        print(f"{key:<32} {count:>7} {parts[0]['p50_ms']:>9} {worst_p95:>9} {errors * 100:>6.1f}%")
+
+    print(f"\nHighest stage within SLO: {sustainable if sustainable else 'none'} users")
+
+
+def parse_mix(values, flows):
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition('=')
+        if name not in flows:
+            raise SystemExit(f"Unknown flow {name!r}; available: {', '.join(flows)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP load test against the Cafe24 simulator')
+    parser.add_argument('--app', choices=sorted(APPS), default='api')
+    parser.add_argument('--stages', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='Concurrent users per stage')
+    parser.add_argument('--stage-duration', type=float, default=10)
+    parser.add_argument('--mix', nargs='+', metavar='FLOW=WEIGHT', help='Flow weights (default: %s)' %
+                        ' '.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()))
+    parser.add_argument('--think-ms', type=float, default=0, help='Mean pause between flows per user')
+    parser.add_argument('--csv-rows', type=int, default=20, help='Rows per uploaded price CSV')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker')
+    parser.add_argument('--products', type=int, default=10000, help='Simulated catalog size')
+    parser.add_argument('--latency-ms', type=float, default=30, help='Simulated Cafe24 latency')
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--bucket-size', type=int, default=0, help='Simulated call limit bucket (0 = off)')
+    parser.add_argument('--slo-ms', type=float, default=1000, help='p95 target for the sustainable stage')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the full report as JSON')
+    args = parser.parse_args()
+
+    flows = build_flows(args.app, args.csv_rows)
+    mix = parse_mix(args.mix, flows) if args.mix else {k: v for k, v in DEFAULT_MIX.items() if k in flows}
+
+    simulator_port, app_port = free_port(), free_port()
+    simulator = start_simulator(simulator_port, args)
+    try:
+        app = start_app(app_port, simulator_port, args)
+    except Exception:
+        stop(simulator)
+        raise
+
+    stages = []
+    try:
+        warm_up(app_port, flows, mix, args.seed)
+        for users in args.stages:
+            print(f"{users} users for {args.stage_duration}s ...", file=sys.stderr)
+            before = upstream_calls(simulator_port)
+            samples, elapsed = run_stage(app_port, users, args.stage_duration, flows, mix,
+                                         args.think_ms / 1000, args.seed + users)
+            upstream = upstream_calls(simulator_port) - before
+
+            by_request = {}
+            for flow, label, seconds, status in samples:
+                by_request.setdefault(f"{flow}/{label}", []).append((flow, label, seconds, status))
+            stages.append({
+                'users': users,
+                'summary': summarize(samples, elapsed, upstream),
+                'by_request': {key: summarize(group, elapsed) for key, group in by_request.items()}
+            })
+    finally:
+        stop(app)
+        stop(simulator)
+
+    sustainable = None
+    for stage in stages:
+        s = stage['summary']
+        if s['requests'] and s['p95_ms'] <= args.slo_ms and s['error_rate'] <= args.max_error_rate:
+            sustainable = stage['users']
+        else:
+            break
+
+    print_report(stages, sustainable)
+    if args.output:
+        report = {
+            'meta': {'created_at': datetime.now().isoformat(timespec='seconds'), 'cpu_count': os.cpu_count(),
+                     'args': vars(args), 'mix': mix},
+            'stages': stages,
+            'sustainable_users': sustainable
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Report: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
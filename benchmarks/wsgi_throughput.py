@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WSGI throughput benchmark
+
+Starts the web service under the Flask development server and under gunicorn
+with a few worker counts, drives it with keep-alive client threads and reports
+requests per second and requests per second per core.
+
+Usage:
+    python benchmarks/wsgi_throughput.py
+    python benchmarks/wsgi_throughput.py --path /api/products?limit=10 --duration 10 --workers 1 2 4
+
+The app runs in demo mode (no Cafe24 credentials) so only our own request
+handling is measured. Client threads share the machine with the server, so
+compare configurations against each other rather than reading absolute numbers.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+def start_server(kind: str, port: int, workers: int, threads: int) -> subprocess.Popen:
+    env = dict(os.environ, PORT=str(port), PYTHONPATH=ROOT, CAFE24_LOG_LEVEL='WARNING')
+    # Demo mode: make sure no real credentials are picked up
+    for key in ('CAFE24_MALL_ID', 'CAFE24_CLIENT_ID', 'CAFE24_CLIENT_SECRET'):
+        env.pop(key, None)
+
+    if kind == 'flask-dev':
+        cmd = [sys.executable, 'run_web.py']
+    else:
+        # No worker recycling during the run (it shows up as connection resets)
+        env.update(WEB_CONCURRENCY=str(workers), GUNICORN_THREADS=str(threads), GUNICORN_MAX_REQUESTS='0')
+        cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+               '--access-logfile', '/dev/null', '--log-level', 'warning', 'wsgi:app']
+
+    return subprocess.Popen(cmd, cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def drive(port: int, path: str, clients: int, duration: float) -> dict:
+    """Send requests from keep-alive client threads for `duration` seconds"""
+    counts = [0] * clients
+    errors = [0] * clients
+    stop_at = time.time() + duration
+
+    def client(i):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        while time.time() < stop_at:
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status == 200:
+                    counts[i] += 1
+                else:
+                    errors[i] += 1
+            except (OSError, http.client.HTTPException):
+                errors[i] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        conn.close()
+
+    started = time.time()
+    pool = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.time() - started
+
+    return {'requests': sum(counts), 'errors': sum(errors), 'seconds': round(elapsed, 2)}
+
+
+def run_case(kind: str, workers: int, threads: int, args) -> dict:
+    port = free_port()
+    server = start_server(kind, port, workers, threads)
+    try:
+        wait_until_up(port)
+        drive(port, args.path, args.clients, 1.0)  # warm-up
+        result = drive(port, args.path, args.clients, args.duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    cores_used = min(workers, os.cpu_count() or 1)
+    rps = result['requests'] / result['seconds']
+    return dict(
+        result,
+        server=kind,
+        workers=workers,
+        threads=threads,
+        rps=round(rps, 1),
+        rps_per_core=round(rps / cores_used, 1)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WSGI throughput benchmark')
+    parser.add_argument('--path', default='/api/products?limit=10')
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = [run_case('flask-dev', 1, 1, args)]
+    for workers in args.workers:
+        results.append(run_case('gunicorn', workers, args.threads, args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"\nGET {args.path}  clients={args.clients}  duration={args.duration}s  cores={os.cpu_count()}")
+    print(f"{'server':<10} {'workers':>7} {'threads':>7} {'req/s':>9} {'req/s/core':>11} {'errors':>7}")
+    for r in results:
+        print(f"{r['server']:<10} {r['workers']:>7} {r['threads']:>7} {r['rps']:>9} {r['rps_per_core']:>11} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
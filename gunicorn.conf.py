@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Gunicorn configuration for the Cafe24 web service
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+All settings can be overridden with environment variables.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'src'))  # same module path the app uses (utils.metrics)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Workers are processes (one per core scales CPU-bound work such as JSON
+# encoding and NLP parsing); threads cover requests waiting on the Cafe24 API
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+# Import the app (and warm caches) once in the master before forking
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = 100
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('CAFE24_LOG_LEVEL', 'info').lower()
+
+# Per-worker metrics snapshots - /metrics sums every worker's file (src/utils/metrics.py)
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'cafe24_web_metrics'))
+
+
+def on_starting(server):
+    """Remove metrics snapshots of the previous run"""
+    from utils.metrics import REGISTRY
+    REGISTRY.clear_directory()
+
+
+def worker_exit(server, worker):
+    """Write the exiting worker's last metrics snapshot"""
+    from utils.metrics import REGISTRY
+    REGISTRY.flush()
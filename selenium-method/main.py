@@ -18,9 +18,12 @@ from modules.browser import create_browser_manager
 from modules.login import create_login_manager
 from modules.price_updater import create_price_updater
 from modules.csv_uploader import create_csv_uploader
+from modules.browser_pool import create_browser_pool
+from modules.http_executor import create_http_executor
 from utils.logger import setup_logger, create_session_logger
 from utils.error_handler import SeleniumErrorHandler, safe_screenshot
 from utils.wait_helper import create_wait_helper
+from utils.tracer import tracer, summarize, format_summary
 
 # 메인 로거 설정
 logger = setup_logger(__name__)
@@ -36,11 +39,14 @@ class Cafe24SeleniumAutomation:
         Args:
             config_path: 설정 파일 경로
         """
+        self.config_path = config_path
         self.config = self._load_config(config_path)
+        self.headless = None
         self.browser_manager = None
         self.login_manager = None
         self.price_updater = None
         self.csv_uploader = None
+        self.http_executor = None
         self.wait_helper = None
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
@@ -58,26 +64,37 @@ class Cafe24SeleniumAutomation:
                 "cafe24": {"admin_url": "https://manwonyori.cafe24.com/admin"}
             }
     
-    def initialize(self, headless: bool = None) -> bool:
-        """시스템 초기화"""
+    def initialize(self, headless: bool = None, profile: str = None) -> bool:
+        """
+        시스템 초기화
+        
+        Args:
+            headless: 헤드리스 모드 여부 (None이면 설정값)
+            profile: 브라우저 프로필 "default"/"fast" (None이면 설정값)
+        """
         try:
             logger.info("=== Cafe24 Selenium 자동화 시스템 초기화 ===")
             
             # 브라우저 매니저 생성
-            self.browser_manager = create_browser_manager()
+            self.browser_manager = create_browser_manager(self.config_path)
             
             # 브라우저 시작
             browser_headless = headless if headless is not None else self.config.get("browser", {}).get("headless", False)
-            self.browser_manager.create_driver(headless=browser_headless, undetected=True)
+            self.headless = browser_headless
+            self.browser_manager.create_driver(headless=browser_headless, undetected=True, profile=profile)
             
             # 로그인 매니저 생성
             self.login_manager = create_login_manager(self.browser_manager)
             
-            # 가격 수정 매니저 생성
-            self.price_updater = create_price_updater(self.browser_manager, self.login_manager)
+            # 하이브리드 HTTP 실행기 (로그인 쿠키로 폼 제출/검색을 HTTP로 처리)
+            if self.config.get("cafe24", {}).get("hybrid_http", True):
+                self.http_executor = create_http_executor(self.browser_manager, self.login_manager)
             
             # CSV 업로더 생성
-            self.csv_uploader = create_csv_uploader(self.browser_manager, self.login_manager)
+            self.csv_uploader = create_csv_uploader(self.browser_manager, self.login_manager, self.http_executor)
+            
+            # 가격 수정 매니저 생성 (일괄 모드는 CSV 업로더 사용)
+            self.price_updater = create_price_updater(self.browser_manager, self.login_manager, self.csv_uploader)
             
             # 대기 헬퍼 생성
             self.wait_helper = create_wait_helper(self.browser_manager)
@@ -92,6 +109,8 @@ class Cafe24SeleniumAutomation:
     def cleanup(self):
         """시스템 정리"""
         try:
+            if self.http_executor:
+                self.http_executor.close()
             if self.browser_manager:
                 self.browser_manager.close()
             logger.info("시스템 정리 완료")
@@ -113,8 +132,15 @@ class Cafe24SeleniumAutomation:
             return {"success": False, "error": "로그인 실패"}
     
     @SeleniumErrorHandler.handle_common_errors
-    def update_price_csv(self, csv_file_path: str) -> Dict[str, Any]:
-        """CSV 파일을 이용한 가격 수정"""
+    def update_price_csv(self, csv_file_path: str, mode: str = "bulk", workers: int = None) -> Dict[str, Any]:
+        """
+        CSV 파일을 이용한 가격 수정
+        
+        Args:
+            csv_file_path: 가격표 CSV 경로
+            mode: "bulk" (수정 CSV 일괄 업로드) 또는 "ui" (상품별 화면 수정)
+            workers: 병렬 브라우저 수 (None이면 performance.parallel_workers)
+        """
         if not self.price_updater:
             return {"success": False, "error": "시스템이 초기화되지 않았습니다"}
         
@@ -122,7 +148,18 @@ class Cafe24SeleniumAutomation:
         if not os.path.exists(csv_file_path):
             return {"success": False, "error": f"CSV 파일을 찾을 수 없습니다: {csv_file_path}"}
         
-        return self.price_updater.update_prices_from_csv(csv_file_path)
+        workers = workers or self.config.get("performance", {}).get("parallel_workers", 1)
+        if workers <= 1:
+            if mode == "bulk":
+                return self.price_updater.update_prices_bulk(csv_file_path)
+            return self.price_updater.update_prices_from_csv(csv_file_path)
+        
+        # 기존 브라우저의 로그인 세션을 공유하는 헤드리스 워커 풀
+        with create_browser_pool(self.config_path, workers, headless=True) as pool:
+            pool.start(self.browser_manager, self.login_manager)
+            if mode == "bulk":
+                return self.price_updater.update_prices_bulk(csv_file_path, pool=pool)
+            return self.price_updater.update_prices_parallel(csv_file_path, pool)
     
     @SeleniumErrorHandler.handle_common_errors
     def update_single_price(self, product_code: str, new_price: str) -> Dict[str, Any]:
@@ -171,6 +208,8 @@ def parse_arguments():
 사용 예제:
   python main.py --task login
   python main.py --task price_update --csv data/csv/price_list.csv
+  python main.py --task price_update --csv data/csv/price_list.csv --mode ui
+  python main.py --task price_update --csv data/csv/price_list.csv --mode ui --workers 4
   python main.py --task single_price --product-code P00000IB --price 13500
   python main.py --task csv_upload --csv data/csv/new_products.csv --upload-type register
   python main.py --task create_sample
@@ -206,6 +245,31 @@ def parse_arguments():
         help="CSV 업로드 타입 (modify: 수정, register: 등록)"
     )
     
+    parser.add_argument(
+        "--mode", 
+        choices=["bulk", "ui"],
+        default="bulk",
+        help="가격 수정 방식 (bulk: 수정 CSV 일괄 업로드, ui: 상품별 화면 수정)"
+    )
+    
+    parser.add_argument(
+        "--workers", 
+        type=int,
+        help="병렬 브라우저 수 (기본: settings.json의 performance.parallel_workers)"
+    )
+    
+    parser.add_argument(
+        "--profile", 
+        choices=["default", "fast"],
+        help="브라우저 프로필 (fast: 이미지/폰트/분석 스크립트 차단, eager 로딩)"
+    )
+    
+    parser.add_argument(
+        "--no-trace", 
+        action="store_true",
+        help="단계별 실행 추적 파일을 남기지 않음"
+    )
+    
     parser.add_argument(
         "--headless", 
         action="store_true",
@@ -244,9 +308,14 @@ def main():
     # 자동화 시스템 생성
     automation = Cafe24SeleniumAutomation(args.config)
     
+    # 단계별 실행 추적 (페이지 이동/대기/클릭/sleep)
+    trace_enabled = automation.config.get("logging", {}).get("trace", True) and not args.no_trace
+    if trace_enabled:
+        tracer.start_run()
+    
     try:
         # 시스템 초기화
-        if not automation.initialize(headless=args.headless):
+        if not automation.initialize(headless=args.headless, profile=args.profile):
             session_logger.error("시스템 초기화 실패")
             return 1
         
@@ -262,8 +331,8 @@ def main():
                 session_logger.error("CSV 파일 경로가 필요합니다 (--csv)")
                 return 1
             
-            session_logger.info(f"가격 수정 작업 시작: {args.csv}")
-            result = automation.update_price_csv(args.csv)
+            session_logger.info(f"가격 수정 작업 시작: {args.csv} ({args.mode})")
+            result = automation.update_price_csv(args.csv, args.mode, args.workers)
             
         elif args.task == "single_price":
             if not args.product_code or not args.price:
@@ -324,6 +393,12 @@ def main():
     finally:
         # 시스템 정리
         automation.cleanup()
+        
+        if trace_enabled:
+            trace_dir = automation.config.get("paths", {}).get("trace_folder", "./logs/traces")
+            trace_path = tracer.write(trace_dir)
+            session_logger.info(f"실행 추적 저장: {trace_path}\n{format_summary(summarize(tracer.to_dict()))}")
+        
         session_logger.info("=== Selenium 자동화 세션 종료 ===")
 
 
@@ -17,9 +17,35 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 import undetected_chromedriver as uc
 from utils.logger import setup_logger
+from utils.tracer import tracer, traced_sleep
 
 logger = setup_logger(__name__)
 
+# fast 프로필에서 차단할 리소스 (CDP Network.setBlockedURLs 패턴)
+# 관리자 작업은 폼/테이블만 쓰므로 이미지·폰트·미디어와 분석 스크립트는 필요 없다
+FAST_PROFILE_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*analytics.naver.com*",
+    "*wcs.naver.net*", "*kakao.com/sdk*", "*hotjar.com*", "*clarity.ms*",
+]
+
+# fast 프로필에서 끄는 Chrome 기능
+FAST_PROFILE_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+]
+
 
 class BrowserManager:
     """Chrome WebDriver 관리 클래스"""
@@ -34,6 +60,8 @@ class BrowserManager:
         self.config = self._load_config(config_path)
         self.driver: Optional[webdriver.Chrome] = None
         self.wait: Optional[WebDriverWait] = None
+        self.profile = "default"
+        self.page_load_strategy = "normal"
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """설정 파일 로드"""
@@ -67,13 +95,16 @@ class BrowserManager:
             }
         }
     
-    def create_driver(self, headless: bool = None, undetected: bool = True) -> webdriver.Chrome:
+    def create_driver(self, headless: bool = None, undetected: bool = True,
+                      profile: str = None) -> webdriver.Chrome:
         """
         Chrome WebDriver 생성
         
         Args:
             headless: 헤드리스 모드 여부 (None이면 설정파일 값 사용)
             undetected: 탐지 우회 ChromeDriver 사용 여부
+            profile: "default" 또는 "fast" (None이면 설정파일 browser.profile 값 사용)
+                     fast는 이미지/폰트/미디어/분석 스크립트를 차단하고 eager 로딩을 사용
             
         Returns:
             Chrome WebDriver 인스턴스
@@ -92,6 +123,17 @@ class BrowserManager:
                 options.add_argument("--headless")
                 logger.info("헤드리스 모드로 브라우저 시작")
             
+            self.profile = profile or browser_config.get("profile", "default")
+            fast = self.profile == "fast"
+            
+            # eager: DOMContentLoaded 시점에 driver.get() 반환 (이미지/서브리소스 대기 안 함)
+            self.page_load_strategy = "eager" if fast else "normal"
+            options.page_load_strategy = self.page_load_strategy
+            if fast:
+                for argument in FAST_PROFILE_ARGUMENTS:
+                    options.add_argument(argument)
+                logger.info("fast 프로필로 브라우저 시작 (리소스 차단, eager 로딩)")
+            
             # 기본 옵션들
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
@@ -120,6 +162,12 @@ class BrowserManager:
                 "profile.default_content_setting_values.notifications": 2,
                 "profile.default_content_settings.popups": 0
             }
+            if fast:
+                prefs.update({
+                    "profile.managed_default_content_settings.images": 2,
+                    "profile.managed_default_content_settings.media_stream": 2,
+                    "profile.managed_default_content_settings.geolocation": 2
+                })
             options.add_experimental_option("prefs", prefs)
             
             # 창 크기 설정
@@ -151,6 +199,9 @@ class BrowserManager:
             # WebDriverWait 객체 생성
             self.wait = WebDriverWait(self.driver, implicit_wait)
             
+            if fast:
+                self._block_resources(browser_config.get("blocked_url_patterns", []))
+            
             logger.info(f"브라우저 시작 완료 - Chrome {self.driver.capabilities['browserVersion']}")
             return self.driver
             
@@ -158,6 +209,17 @@ class BrowserManager:
             logger.error(f"브라우저 생성 실패: {e}")
             raise WebDriverException(f"브라우저 초기화 실패: {e}")
     
+    def _block_resources(self, extra_patterns: list = None) -> None:
+        """CDP로 불필요한 리소스 요청 차단 (폰트/미디어/분석 도메인은 환경설정으로 막을 수 없음)"""
+        patterns = FAST_PROFILE_BLOCKED_URLS + list(extra_patterns or [])
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            logger.info(f"리소스 차단 패턴 {len(patterns)}개 적용")
+        except Exception as e:
+            # 차단 실패는 속도만 손해 - 작업은 계속 진행
+            logger.warning(f"리소스 차단 설정 실패: {e}")
+    
     def take_screenshot(self, filename: str = None) -> str:
         """
         스크린샷 촬영
@@ -209,11 +271,12 @@ class BrowserManager:
             raise ValueError("WebDriverWait이 초기화되지 않았습니다.")
         
         try:
-            if timeout:
-                wait = WebDriverWait(self.driver, timeout)
-                element = wait.until(EC.presence_of_element_located(locator))
-            else:
-                element = self.wait.until(EC.presence_of_element_located(locator))
+            with tracer.span("wait_for_element", "wait", locator=locator[1], timeout=timeout):
+                if timeout:
+                    wait = WebDriverWait(self.driver, timeout)
+                    element = wait.until(EC.presence_of_element_located(locator))
+                else:
+                    element = self.wait.until(EC.presence_of_element_located(locator))
             
             return element
             
@@ -237,11 +300,12 @@ class BrowserManager:
             raise ValueError("WebDriverWait이 초기화되지 않았습니다.")
         
         try:
-            if timeout:
-                wait = WebDriverWait(self.driver, timeout)
-                element = wait.until(EC.element_to_be_clickable(locator))
-            else:
-                element = self.wait.until(EC.element_to_be_clickable(locator))
+            with tracer.span("wait_for_clickable", "wait", locator=locator[1], timeout=timeout):
+                if timeout:
+                    wait = WebDriverWait(self.driver, timeout)
+                    element = wait.until(EC.element_to_be_clickable(locator))
+                else:
+                    element = self.wait.until(EC.element_to_be_clickable(locator))
             
             return element
             
@@ -257,8 +321,7 @@ class BrowserManager:
         
         try:
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            import time
-            time.sleep(0.5)  # 스크롤 완료 대기
+            traced_sleep(0.5, "scroll_to_element")  # 스크롤 완료 대기
             
         except Exception as e:
             logger.error(f"스크롤 실패: {e}")
@@ -341,7 +404,8 @@ class BrowserManager:
         
         try:
             logger.info(f"페이지 이동: {url}")
-            self.driver.get(url)
+            with tracer.span("navigate_to", "navigation", url=url):
+                self.driver.get(url)
             
         except Exception as e:
             logger.error(f"페이지 이동 실패 ({url}): {e}")
@@ -0,0 +1,264 @@
+"""
+브라우저 풀 모듈
+헤드리스 Chrome 여러 개를 띄워 로그인 세션(쿠키)을 공유하고 작업을 나눠 처리
+"""
+
+import os
+import time
+import queue
+import threading
+from typing import List, Dict, Any, Callable, Optional, Iterable
+
+try:
+    import psutil
+except ImportError:  # 선택 패키지 - 없으면 실행 중 메모리 감시를 건너뛴다
+    psutil = None
+
+from modules.browser import BrowserManager, create_browser_manager
+from modules.login import LoginManager
+from modules.csv_uploader import CSVUploader
+from modules.price_updater import PriceUpdater
+from modules.session_store import SessionStore
+from modules.http_executor import AdminHttpExecutor
+from utils.logger import setup_logger, LogContext
+
+logger = setup_logger(__name__)
+
+# Chrome 인스턴스 하나가 쓰는 메모리 추정치 (MB) - performance.driver_memory_mb로 변경 가능
+DEFAULT_DRIVER_MEMORY_MB = 350
+
+
+class BrowserWorker:
+    """풀에 속한 브라우저 하나와 그 브라우저에 묶인 매니저들"""
+
+    def __init__(self, index: int, browser: BrowserManager, login: LoginManager):
+        self.index = index
+        self.browser = browser
+        self.login = login
+        hybrid = browser.config.get("cafe24", {}).get("hybrid_http", True)
+        self.http = AdminHttpExecutor(browser, login) if hybrid else None
+        self.csv_uploader = CSVUploader(browser, login, self.http)
+        self.price_updater = PriceUpdater(browser, login, self.csv_uploader)
+        self.processed = 0
+
+
+class BrowserPool:
+    """로그인 세션을 공유하는 Chrome 워커 풀"""
+
+    def __init__(self, config_path: str = "config/settings.json", workers: int = None,
+                 headless: bool = True):
+        """
+        브라우저 풀 초기화
+
+        Args:
+            config_path: 설정 파일 경로
+            workers: 요청 워커 수 (None이면 performance.parallel_workers)
+            headless: 추가 워커를 헤드리스로 띄울지 여부
+        """
+        self.config_path = config_path
+        self.config = create_browser_manager(config_path).config
+        self.performance = self.config.get("performance", {})
+        self.headless = headless
+        self.batch_size = self.performance.get("batch_size", 100)
+        self.memory_limit_mb = self.performance.get("memory_limit_mb", 2048)
+        self.cpu_limit_percent = self.performance.get("cpu_limit_percent", 80)
+        self.size = self.plan_workers(workers or self.performance.get("parallel_workers", 1))
+        self.workers: List[BrowserWorker] = []
+        self._owns_primary = False
+        self._lock = threading.Lock()
+
+    def plan_workers(self, requested: int) -> int:
+        """
+        설정된 CPU/메모리 한도 안에서 띄울 수 있는 워커 수 계산
+
+        Args:
+            requested: 요청 워커 수
+
+        Returns:
+            실제 워커 수 (최소 1)
+        """
+        cpu_slots = int((os.cpu_count() or 1) * self.cpu_limit_percent / 100)
+        driver_memory = self.performance.get("driver_memory_mb", DEFAULT_DRIVER_MEMORY_MB)
+        memory_slots = self.memory_limit_mb // driver_memory
+        size = max(1, min(requested, cpu_slots, memory_slots))
+
+        if size < requested:
+            logger.warning(f"워커 수 제한: 요청 {requested} → {size} "
+                           f"(CPU {cpu_slots}개, 메모리 {memory_slots}개 한도)")
+        return size
+
+    def start(self, primary: BrowserManager = None, primary_login: LoginManager = None) -> List[BrowserWorker]:
+        """
+        워커 브라우저 시작
+
+        첫 번째 워커는 이미 로그인한 기존 브라우저를 그대로 쓰고, 나머지는 새로
+        띄운 뒤 첫 번째 워커의 쿠키/localStorage를 복원해 로그인 과정을 건너뛴다.
+
+        Args:
+            primary: 기존 브라우저 매니저 (None이면 새로 생성)
+            primary_login: 기존 로그인 매니저
+
+        Returns:
+            워커 목록
+        """
+        with LogContext(logger, f"브라우저 풀 시작 ({self.size}개)"):
+            if primary is None:
+                primary = create_browser_manager(self.config_path)
+                primary.create_driver(headless=self.headless)
+                self._owns_primary = True
+            primary_login = primary_login or LoginManager(primary)
+
+            if not primary_login.ensure_logged_in():
+                raise RuntimeError("브라우저 풀 시작 실패: 로그인 실패")
+
+            session = SessionStore.capture(primary.driver)
+            self.workers = [BrowserWorker(0, primary, primary_login)]
+
+            # undetected_chromedriver는 시작할 때 드라이버 파일을 패치하므로 순서대로 띄운다
+            for index in range(1, self.size):
+                browser = create_browser_manager(self.config_path)
+                try:
+                    browser.create_driver(headless=self.headless, profile=primary.profile)
+                    login = LoginManager(browser)
+                    login.session_store.restore(browser, session)
+                    login.is_logged_in = True
+                    self.workers.append(BrowserWorker(index, browser, login))
+                except Exception as e:
+                    logger.error(f"워커 {index} 시작 실패 - 나머지 워커로 진행: {e}")
+                    browser.close()
+
+            logger.info(f"브라우저 풀 준비 완료: {len(self.workers)}개 워커")
+            return self.workers
+
+    def _memory_used_mb(self) -> Optional[float]:
+        """이 프로세스가 띄운 Chrome/드라이버 프로세스의 메모리 합계 (MB)"""
+        if psutil is None:
+            return None
+        try:
+            processes = psutil.Process().children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def _over_memory_limit(self) -> bool:
+        used = self._memory_used_mb()
+        return used is not None and used > self.memory_limit_mb
+
+    def map(self, task: Callable[[BrowserWorker, Any], Any], items: Iterable[Any],
+            batch_size: int = None) -> List[Any]:
+        """
+        작업 항목을 워커들에 나눠 처리
+
+        항목은 batch_size개씩 묶어 공유 큐에 넣고, 각 워커가 끝나는 대로 다음
+        묶음을 가져간다. 메모리 한도를 넘으면 워커를 하나씩 줄이고 그 브라우저를 종료한다 (최소 1개 유지).
+
+        Args:
+            task: (워커, 항목) → 결과 함수
+            items: 작업 항목
+            batch_size: 묶음 크기 (None이면 performance.batch_size를 워커 수에 맞춰 조정)
+
+        Returns:
+            입력 순서대로 정렬된 결과 목록 (실패 항목은 {"success": False, "error": ...})
+        """
+        if not self.workers:
+            raise RuntimeError("브라우저 풀이 시작되지 않았습니다")
+
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        if not items:
+            return results
+
+        # 워커마다 최소 한 묶음은 가져가도록 묶음 크기 조정
+        batch_size = batch_size or max(1, min(self.batch_size, -(-len(items) // len(self.workers))))
+        batches: "queue.Queue" = queue.Queue()
+        for start in range(0, len(items), batch_size):
+            batches.put(range(start, min(start + batch_size, len(items))))
+
+        active = {"count": len(self.workers)}
+
+        def run(worker: BrowserWorker):
+            while True:
+                try:
+                    batch = batches.get_nowait()
+                except queue.Empty:
+                    return
+                for i in batch:
+                    try:
+                        results[i] = task(worker, items[i])
+                    except Exception as e:
+                        logger.error(f"워커 {worker.index} 작업 실패: {e}")
+                        results[i] = {"success": False, "error": str(e)}
+                    worker.processed += 1
+
+                with self._lock:
+                    # 호출자가 관리하는 기존 브라우저는 닫을 수 없으므로 줄이지 않는다
+                    retire = (active["count"] > 1 and self._owns(worker) and self._over_memory_limit())
+                    if retire:
+                        active["count"] -= 1
+                        self.workers.remove(worker)
+                if retire:
+                    logger.warning(f"메모리 한도({self.memory_limit_mb}MB) 초과 - 워커 {worker.index} 종료")
+                    self._close_worker(worker)
+                    return
+
+        started = time.time()
+        workers = len(self.workers)
+        threads = [threading.Thread(target=run, args=(w,), name=f"browser-worker-{w.index}", daemon=True)
+                   for w in self.workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        logger.info(f"{len(items)}개 작업 완료 ({workers}개 워커, {time.time() - started:.1f}초)")
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """워커별 처리 현황"""
+        return {
+            "workers": len(self.workers),
+            "processed": {w.index: w.processed for w in self.workers},
+            "memory_used_mb": self._memory_used_mb(),
+            "memory_limit_mb": self.memory_limit_mb
+        }
+
+    def _owns(self, worker: BrowserWorker) -> bool:
+        """풀이 띄운 브라우저인지 (기존 브라우저는 호출자가 관리)"""
+        return worker.index > 0 or self._owns_primary
+
+    def _close_worker(self, worker: BrowserWorker) -> None:
+        """워커의 HTTP 세션과 (풀이 띄운) 브라우저 종료"""
+        if worker.http is not None:
+            worker.http.close()
+        if self._owns(worker):
+            worker.browser.close()
+
+    def close(self) -> None:
+        """추가로 띄운 브라우저 종료 (기존 브라우저는 호출자가 관리)"""
+        for worker in self.workers:
+            self._close_worker(worker)
+        self.workers = []
+
+    def __enter__(self):
+        """컨텍스트 매니저 진입"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """컨텍스트 매니저 종료"""
+        self.close()
+
+
+def create_browser_pool(config_path: str = "config/settings.json", workers: int = None,
+                        headless: bool = True) -> BrowserPool:
+    """
+    브라우저 풀 생성 팩토리 함수
+
+    Args:
+        config_path: 설정 파일 경로
+        workers: 워커 수 (None이면 설정값)
+        headless: 추가 워커 헤드리스 여부
+
+    Returns:
+        BrowserPool 인스턴스
+    """
+    return BrowserPool(config_path, workers, headless)
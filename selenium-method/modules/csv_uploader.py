@@ -4,7 +4,6 @@ CSV 업로드 자동화 모듈
 """
 
 import os
-import time
 import pandas as pd
 from typing import Dict, Any, Optional
 from selenium.webdriver.common.by import By
@@ -12,6 +11,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from modules.browser import BrowserManager
 from modules.login import LoginManager
+from modules.http_executor import AdminHttpExecutor, BrowserRequired
+from utils.tracer import traced_click, traced_sleep
 from utils.logger import setup_logger, log_execution_time, LogContext
 
 logger = setup_logger(__name__)
@@ -20,16 +21,19 @@ logger = setup_logger(__name__)
 class CSVUploader:
     """CSV 업로드 자동화 클래스"""
     
-    def __init__(self, browser_manager: BrowserManager, login_manager: LoginManager):
+    def __init__(self, browser_manager: BrowserManager, login_manager: LoginManager,
+                 http_executor: Optional[AdminHttpExecutor] = None):
         """
         CSV 업로더 초기화
         
         Args:
             browser_manager: 브라우저 매니저 인스턴스
             login_manager: 로그인 매니저 인스턴스
+            http_executor: 하이브리드 HTTP 실행기 (있으면 업로드 폼을 HTTP로 먼저 제출)
         """
         self.browser = browser_manager
         self.login = login_manager
+        self.http = http_executor
         
     @log_execution_time
     def upload_product_csv(self, csv_file_path: str, upload_type: str = "modify") -> Dict[str, Any]:
@@ -53,6 +57,14 @@ class CSVUploader:
                 if not os.path.exists(csv_file_path):
                     return {"success": False, "error": f"CSV 파일을 찾을 수 없습니다: {csv_file_path}"}
                 
+                # 하이브리드 모드: 폼을 HTTP로 바로 제출 (화면 로딩/폴링 없음)
+                # BrowserRequired는 제출 전에만 발생 - 제출 후 판정 불가(success None)는 그대로 반환
+                if self.http is not None:
+                    try:
+                        return self.http.upload_product_csv(csv_file_path, upload_type)
+                    except BrowserRequired as e:
+                        logger.info(f"HTTP 업로드 불가 - 브라우저로 진행: {e}")
+                
                 # CSV 업로드 페이지로 이동
                 if not self._navigate_to_csv_upload_page():
                     return {"success": False, "error": "CSV 업로드 페이지 이동 실패"}
@@ -95,7 +107,7 @@ class CSVUploader:
             self.browser.navigate_to(csv_upload_url)
             
             # 페이지 로딩 대기
-            time.sleep(3)
+            traced_sleep(3)
             
             # CSV 업로드 페이지 확인
             current_url = self.browser.get_current_url()
@@ -128,8 +140,8 @@ class CSVUploader:
                     for element in elements:
                         if element.is_displayed():
                             logger.info(f"CSV 메뉴 찾음: {element.text}")
-                            element.click()
-                            time.sleep(3)
+                            traced_click(element)
+                            traced_sleep(3)
                             return True
                 except (NoSuchElementException, TimeoutException):
                     continue
@@ -170,7 +182,7 @@ class CSVUploader:
             
             if radio_button:
                 if not radio_button.is_selected():
-                    radio_button.click()
+                    traced_click(radio_button)
                     logger.info(f"업로드 타입 선택: {upload_type}")
                 return True
             else:
@@ -215,7 +227,7 @@ class CSVUploader:
             logger.info(f"파일 선택 완료: {abs_file_path}")
             
             # 파일 선택 후 잠시 대기
-            time.sleep(1)
+            traced_sleep(1)
             
             return True
             
@@ -251,8 +263,8 @@ class CSVUploader:
             
             # 업로드 버튼 클릭
             self.browser.scroll_to_element(upload_button)
-            time.sleep(0.5)
-            upload_button.click()
+            traced_sleep(0.5)
+            traced_click(upload_button)
             logger.info("업로드 버튼 클릭")
             
             # 업로드 처리 대기 (CSV 파일 크기에 따라 시간이 걸릴 수 있음)
@@ -273,7 +285,7 @@ class CSVUploader:
             check_interval = 10   # 10초마다 확인
             
             for i in range(0, max_wait_time, check_interval):
-                time.sleep(check_interval)
+                traced_sleep(check_interval)
                 
                 current_url = self.browser.get_current_url()
                 page_source = self.browser.get_page_source()
@@ -427,15 +439,17 @@ class CSVUploader:
             }
 
 
-def create_csv_uploader(browser_manager: BrowserManager, login_manager: LoginManager) -> CSVUploader:
+def create_csv_uploader(browser_manager: BrowserManager, login_manager: LoginManager,
+                        http_executor: Optional[AdminHttpExecutor] = None) -> CSVUploader:
     """
     CSV 업로더 생성 팩토리 함수
     
     Args:
         browser_manager: 브라우저 매니저 인스턴스
         login_manager: 로그인 매니저 인스턴스
+        http_executor: 하이브리드 HTTP 실행기 (None이면 브라우저만 사용)
         
     Returns:
         CSVUploader 인스턴스
     """
-    return CSVUploader(browser_manager, login_manager)
\ No newline at end of file
+    return CSVUploader(browser_manager, login_manager, http_executor)
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+하이브리드 HTTP 실행 모듈
+Selenium 로그인 쿠키를 재사용해 화면 렌더링이 필요 없는 관리자 작업(CSV 업로드 제출,
+상품 검색 목록)을 HTTP 세션으로 직접 처리하고, JavaScript가 필요한 경우에만 브라우저로 돌아간다
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Any, List, Optional
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from modules.browser import BrowserManager
+from modules.login import LoginManager
+from utils.logger import setup_logger, log_execution_time
+
+logger = setup_logger(__name__)
+
+HTTP_TIMEOUT = 30
+UPLOAD_TIMEOUT = 300  # CSV 처리는 서버에서 최대 수 분 걸린다
+
+# CSVUploader 화면 판정과 같은 키워드
+SUCCESS_KEYWORDS = ["완료", "성공", "등록되었습니다", "처리되었습니다", "success"]
+ERROR_KEYWORDS = ["오류", "실패", "error", "fail", "잘못"]
+PROCESSED_COUNT_PATTERNS = [
+    r'(\d+)\s*건.*처리',
+    r'(\d+)\s*개.*등록',
+    r'(\d+)\s*건.*완료',
+    r'총\s*(\d+)\s*건'
+]
+
+
+class BrowserRequired(Exception):
+    """HTTP만으로 처리할 수 없어 브라우저로 돌아가야 하는 경우"""
+
+
+class AdminHttpExecutor:
+    """브라우저 세션 쿠키를 공유하는 관리자 HTTP 클라이언트"""
+
+    def __init__(self, browser_manager: BrowserManager, login_manager: LoginManager,
+                 pool_size: int = 10):
+        """
+        하이브리드 실행기 초기화
+
+        Args:
+            browser_manager: 로그인된 브라우저 매니저 (쿠키 공급원)
+            login_manager: 로그인 매니저 (세션 만료 시 재로그인)
+            pool_size: 연결 풀 크기
+        """
+        self.browser = browser_manager
+        self.login = login_manager
+        cafe24_config = self.browser.config.get("cafe24", {})
+        self.csv_upload_url = cafe24_config.get("csv_upload_url")
+        self.product_list_url = cafe24_config.get("product_list_url")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._synced = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 세션
+    # ------------------------------------------------------------------
+    def sync_cookies(self) -> None:
+        """브라우저의 쿠키와 User-Agent를 HTTP 세션으로 복사"""
+        with self._lock:
+            driver = self.browser.driver
+            self.session.cookies.clear()
+            for cookie in driver.get_cookies():
+                self.session.cookies.set(cookie["name"], cookie["value"],
+                                         domain=cookie.get("domain"), path=cookie.get("path", "/"))
+            self.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+            self._synced = True
+            logger.info(f"브라우저 쿠키 {len(self.session.cookies)}개를 HTTP 세션에 복사")
+
+    @staticmethod
+    def _is_login_page(response: requests.Response) -> bool:
+        return "login" in response.url.lower() or 'type="password"' in response.text
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """쿠키를 공유한 요청 - 로그인 페이지가 오면 브라우저로 재로그인 후 한 번 재시도"""
+        if not self._synced:
+            self.sync_cookies()
+        kwargs.setdefault("timeout", HTTP_TIMEOUT)
+
+        response = self.session.request(method, url, **kwargs)
+        if self._is_login_page(response):
+            logger.info("HTTP 세션 만료 - 브라우저 로그인 확인 후 쿠키 재동기화")
+            self.login.is_logged_in = False
+            if not self.login.ensure_logged_in():
+                raise BrowserRequired("재로그인 실패")
+            self.sync_cookies()
+            response = self.session.request(method, url, **kwargs)
+            if self._is_login_page(response):
+                raise BrowserRequired("쿠키 재사용 불가 (로그인 페이지 반환)")
+
+        response.raise_for_status()
+        return response
+
+    # ------------------------------------------------------------------
+    # CSV 업로드
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _form_fields(form) -> Dict[str, str]:
+        """폼의 기본 제출값 (hidden/text/선택된 radio·checkbox·select)"""
+        fields = {}
+        for field in form.find_all(["input", "select", "textarea"]):
+            name = field.get("name")
+            if not name:
+                continue
+            if field.name == "select":
+                option = field.find("option", selected=True) or field.find("option")
+                fields[name] = option.get("value", option.text) if option else ""
+            elif field.name == "textarea":
+                fields[name] = field.text
+            else:
+                field_type = (field.get("type") or "text").lower()
+                if field_type in ("file", "submit", "button", "image", "reset"):
+                    continue
+                if field_type in ("radio", "checkbox") and not field.has_attr("checked"):
+                    continue
+                fields[name] = field.get("value", "")
+        return fields
+
+    @staticmethod
+    def _select_upload_type(form, fields: Dict[str, str], upload_type: str) -> None:
+        """CSVUploader._select_upload_type과 같은 라디오 값 선택"""
+        values = ("modify", "update") if upload_type == "modify" else ("register", "add")
+        for radio in form.find_all("input", type="radio"):
+            if radio.get("value") in values and radio.get("name"):
+                fields[radio["name"]] = radio["value"]
+                return
+        logger.warning(f"업로드 타입 라디오를 찾을 수 없음 - 기본값으로 진행: {upload_type}")
+
+    @log_execution_time
+    def upload_product_csv(self, csv_file_path: str, upload_type: str = "modify") -> Dict[str, Any]:
+        """
+        CSV 업로드 폼을 HTTP로 직접 제출
+
+        Args:
+            csv_file_path: 업로드할 CSV 파일 경로
+            upload_type: 업로드 타입 ("modify": 수정, "register": 등록)
+
+        Returns:
+            CSVUploader.upload_product_csv와 같은 형식의 결과.
+            제출 후 결과 화면을 판정할 수 없으면 success가 None (업로드됐을 수 있음)
+
+        Raises:
+            BrowserRequired: 제출 전에 HTTP로 처리할 수 없다고 판단된 경우
+                (폼이 JavaScript로 만들어지거나 제출됨, 재로그인 실패).
+                폼을 제출한 뒤에는 같은 파일을 다시 올리지 않도록 절대 던지지 않는다
+        """
+        page = self._request("GET", self.csv_upload_url)
+        soup = BeautifulSoup(page.text, "html.parser")
+
+        file_input = soup.find("input", type="file")
+        form = file_input.find_parent("form") if file_input else None
+        if form is None or not file_input.get("name"):
+            raise BrowserRequired("CSV 업로드 폼을 HTML에서 찾을 수 없음 (스크립트로 생성)")
+        if form.get("onsubmit") and "return" in form["onsubmit"]:
+            raise BrowserRequired("업로드 폼이 스크립트 검증 후 제출됨")
+
+        fields = self._form_fields(form)
+        self._select_upload_type(form, fields, upload_type)
+        action = urljoin(page.url, form.get("action") or page.url)
+
+        logger.info(f"CSV 업로드 HTTP 제출: {action} ({upload_type})")
+        with open(csv_file_path, "rb") as f:
+            files = {file_input["name"]: (os.path.basename(csv_file_path), f, "text/csv")}
+            response = self._request("POST", action, data=fields, files=files, timeout=UPLOAD_TIMEOUT)
+
+        text = response.text
+        if any(keyword in text for keyword in SUCCESS_KEYWORDS):
+            return {
+                "success": True,
+                "message": "CSV 업로드 완료",
+                "processed_count": self._extract_processed_count(text),
+                "details": [],
+                "via": "http"
+            }
+        if any(keyword in text for keyword in ERROR_KEYWORDS):
+            return {"success": False, "error": "업로드 처리 중 오류 발생", "via": "http"}
+
+        # 결과 화면이 스크립트로 갱신되는 경우 - 이미 제출했으므로 브라우저로 다시 올리지 않는다
+        # (등록 업로드라면 상품이 두 번 만들어진다). 결과는 상품 검색/표본 검증으로 확인
+        logger.warning(f"CSV 업로드 결과를 HTML에서 판정할 수 없음 - 재업로드하지 않음: {csv_file_path}")
+        return {"success": None, "error": "결과 판정 불가", "via": "http"}
+
+    @staticmethod
+    def _extract_processed_count(page_source: str) -> int:
+        for pattern in PROCESSED_COUNT_PATTERNS:
+            matches = re.findall(pattern, page_source)
+            if matches:
+                return int(matches[0])
+        return 0
+
+    # ------------------------------------------------------------------
+    # 상품 검색
+    # ------------------------------------------------------------------
+    def search_products(self, keyword: str) -> List[Dict[str, Any]]:
+        """
+        상품 목록 검색 결과를 HTTP로 조회
+
+        Args:
+            keyword: 검색어 (상품코드 등)
+
+        Returns:
+            검색어가 들어 있는 목록 행 [{"text": 행 텍스트, "numbers": [숫자...]}]
+
+        Raises:
+            BrowserRequired: 검색 폼이나 결과 목록이 스크립트로 그려지는 경우
+        """
+        page = self._request("GET", self.product_list_url)
+        soup = BeautifulSoup(page.text, "html.parser")
+
+        # PriceUpdater._search_product와 같은 검색 필드
+        search_field = None
+        for name in ("keyword", "search_keyword"):
+            search_field = soup.find("input", attrs={"name": name})
+            if search_field:
+                break
+        form = search_field.find_parent("form") if search_field else None
+        if form is None:
+            raise BrowserRequired("상품 검색 폼을 HTML에서 찾을 수 없음")
+
+        fields = self._form_fields(form)
+        fields[search_field["name"]] = keyword
+        action = urljoin(page.url, form.get("action") or page.url)
+        method = (form.get("method") or "get").upper()
+
+        if method == "POST":
+            response = self._request("POST", action, data=fields)
+        else:
+            response = self._request("GET", action, params=fields)
+
+        rows = []
+        for row in BeautifulSoup(response.text, "html.parser").find_all("tr"):
+            text = " ".join(row.get_text(" ").split())
+            if keyword in text and not row.find("tr"):
+                numbers = [int(n.replace(",", "")) for n in re.findall(r"\d[\d,]*", text)]
+                rows.append({"text": text, "numbers": numbers})
+        return rows
+
+    def lookup_price(self, product_code: str) -> Optional[List[int]]:
+        """상품코드 검색 결과 행에 표시된 숫자 목록 (가격 확인용, 없으면 None)"""
+        rows = self.search_products(product_code)
+        if not rows:
+            return None
+        return [n for row in rows for n in row["numbers"]]
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def create_http_executor(browser_manager: BrowserManager, login_manager: LoginManager) -> AdminHttpExecutor:
+    """
+    하이브리드 HTTP 실행기 생성 팩토리 함수
+
+    Args:
+        browser_manager: 브라우저 매니저 인스턴스
+        login_manager: 로그인 매니저 인스턴스
+
+    Returns:
+        AdminHttpExecutor 인스턴스
+    """
+    return AdminHttpExecutor(browser_manager, login_manager)
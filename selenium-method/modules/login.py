@@ -3,20 +3,24 @@
 """
 import os
 import json
-import time
+import logging
 from typing import Dict, Any, Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from utils.logger import get_logger
+from modules.session_store import SessionStore
+from utils.tracer import traced_click, traced_sleep
+from utils.logger import setup_logger
 
-logger = get_logger(__name__)
+logger = setup_logger(__name__)
 
 class LoginManager:
-    def __init__(self, browser_manager, config_path: str = "config/credentials.json"):
+    def __init__(self, browser_manager, config_path: str = "config/credentials.json",
+                 session_store: Optional[SessionStore] = None):
         self.browser_manager = browser_manager
         self.credentials = self._load_credentials(config_path)
+        self.session_store = session_store or SessionStore(browser_manager.config)
         self.is_logged_in = False
         
     def _load_credentials(self, config_path: str) -> Dict[str, Any]:
@@ -38,9 +42,19 @@ class LoginManager:
             logger.error(f"인증 정보 로드 실패: {e}")
             return {"cafe24": {"admin_id": "", "admin_password": "", "mall_id": "manwonyori"}}
 
-    def login(self) -> bool:
-        """카페24 관리자 로그인"""
+    def login(self, force_relogin: bool = False) -> bool:
+        """
+        카페24 관리자 로그인
+        
+        저장된 세션이 유효하면 복원만 하고, 만료됐거나 force_relogin이면 전체 로그인 후
+        세션을 다시 저장한다.
+        """
         try:
+            if force_relogin:
+                self.session_store.clear()
+            elif self.restore_session():
+                return True
+            
             logger.info("=== 카페24 관리자 로그인 시작 ===")
             
             # 1단계: 로그인 페이지 접근 시도
@@ -53,6 +67,7 @@ class LoginManager:
             if self._verify_login_success():
                 self.is_logged_in = True
                 logger.info("✅ 로그인 성공!")
+                self.session_store.save(self.browser_manager.driver)
                 return True
             else:
                 logger.error("로그인 실패 - 관리자 페이지로 이동하지 못함")
@@ -62,6 +77,31 @@ class LoginManager:
             logger.error(f"로그인 중 오류 발생: {e}")
             return False
 
+    def restore_session(self) -> bool:
+        """저장된 세션을 요청 한 번으로 확인한 뒤 브라우저에 복원"""
+        session = self.session_store.load()
+        if session is None or not self.session_store.validate(session):
+            return False
+        
+        try:
+            self.session_store.restore(self.browser_manager, session)
+        except Exception as e:
+            logger.warning(f"세션 복원 실패 - 전체 로그인 진행: {e}")
+            return False
+        
+        self.is_logged_in = True
+        logger.info("✅ 저장된 세션으로 로그인")
+        return True
+
+    def ensure_logged_in(self) -> bool:
+        """로그인 상태 확인 - 로그인 페이지로 튕겼으면 다시 로그인"""
+        if self.is_logged_in and self.browser_manager.is_alive():
+            if "login" not in self.browser_manager.get_current_url().lower():
+                return True
+            logger.info("로그인 페이지 감지 - 세션 만료")
+            self.is_logged_in = False
+        return self.login()
+
     def _try_multiple_login_methods(self) -> bool:
         """다양한 로그인 방법 시도"""
         mall_id = self.credentials["cafe24"]["mall_id"]
@@ -91,8 +131,8 @@ class LoginManager:
             
             try:
                 # 페이지 접근
-                self.browser_manager.driver.get(method['url'])
-                time.sleep(method['wait_time'])
+                self.browser_manager.navigate_to(method['url'])
+                traced_sleep(method['wait_time'])
                 
                 # 알림창 처리
                 self._handle_alerts()
@@ -108,7 +148,7 @@ class LoginManager:
                     # 로그인 버튼 클릭
                     if self._submit_login():
                         logger.info(f"로그인 시도 완료: {method['name']}")
-                        time.sleep(3)  # 로그인 처리 대기
+                        traced_sleep(3)  # 로그인 처리 대기
                         return True
                         
             except Exception as e:
@@ -118,7 +158,9 @@ class LoginManager:
         return False
 
     def _save_page_source(self, filename: str):
-        """페이지 소스 저장 (디버깅용)"""
+        """페이지 소스 저장 (디버깅용 - DEBUG 로그 레벨에서만)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         try:
             page_source = self.browser_manager.driver.page_source
             os.makedirs("data/debug", exist_ok=True)
@@ -137,7 +179,7 @@ class LoginManager:
             alert_text = alert.text
             logger.info(f"알림창 감지: {alert_text}")
             alert.accept()
-            time.sleep(1)
+            traced_sleep(1)
         except TimeoutException:
             pass  # 알림창이 없는 경우
         except Exception as e:
@@ -234,11 +276,11 @@ class LoginManager:
             
             # 기존 값 지우고 입력
             id_field.clear()
-            time.sleep(0.5)
+            traced_sleep(0.5)
             id_field.send_keys(admin_id)
             
             password_field.clear()
-            time.sleep(0.5)
+            traced_sleep(0.5)
             password_field.send_keys(admin_password)
             
             logger.info("로그인 정보 입력 완료")
@@ -281,10 +323,10 @@ class LoginManager:
             
             # 버튼 클릭
             logger.info("로그인 버튼 클릭")
-            login_button.click()
+            traced_click(login_button)
             
             # 클릭 후 알림창 처리
-            time.sleep(1)
+            traced_sleep(1)
             self._handle_alerts()
             
             return True
@@ -396,8 +438,9 @@ class LoginManager:
                 try:
                     logout_element = self.browser_manager.driver.find_element(By.CSS_SELECTOR, selector)
                     if logout_element.is_displayed():
-                        logout_element.click()
+                        traced_click(logout_element)
                         self.is_logged_in = False
+                        self.session_store.clear()
                         logger.info("로그아웃 완료")
                         return True
                 except:
@@ -408,4 +451,18 @@ class LoginManager:
             
         except Exception as e:
             logger.error(f"로그아웃 중 오류: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+def create_login_manager(browser_manager, config_path: str = "config/credentials.json") -> LoginManager:
+    """
+    로그인 매니저 생성 팩토리 함수
+    
+    Args:
+        browser_manager: 브라우저 매니저 인스턴스
+        config_path: 인증 정보 파일 경로
+        
+    Returns:
+        LoginManager 인스턴스
+    """
+    return LoginManager(browser_manager, config_path)
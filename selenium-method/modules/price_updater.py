@@ -3,32 +3,282 @@
 카페24 관리자 페이지에서 상품 가격을 자동으로 수정
 """
 
-import time
+import os
+import re
+import random
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from modules.browser import BrowserManager
 from modules.login import LoginManager
+from modules.csv_uploader import CSVUploader
+from modules.http_executor import BrowserRequired
+from utils.tracer import traced_click, traced_sleep
+from utils.csv_stream import CSVReadError, sniff_encoding, read_csv_header, read_csv_chunks, to_int_prices
 from utils.logger import setup_logger, log_execution_time, LogContext
 
 logger = setup_logger(__name__)
 
+# 일괄(bulk) 모드 기본값 - settings.json의 cafe24 섹션에서 변경 가능
+DEFAULT_CSV_CHUNK_SIZE = 1000
+DEFAULT_BULK_VERIFY_SAMPLE = 5
+
 
 class PriceUpdater:
     """가격 수정 자동화 클래스"""
     
-    def __init__(self, browser_manager: BrowserManager, login_manager: LoginManager):
+    def __init__(self, browser_manager: BrowserManager, login_manager: LoginManager,
+                 csv_uploader: Optional[CSVUploader] = None):
         """
         가격 수정 매니저 초기화
         
         Args:
             browser_manager: 브라우저 매니저 인스턴스
             login_manager: 로그인 매니저 인스턴스
+            csv_uploader: 일괄 모드에서 사용할 CSV 업로더 (None이면 생성)
         """
         self.browser = browser_manager
         self.login = login_manager
+        self.csv_uploader = csv_uploader or CSVUploader(browser_manager, login_manager)
+        
+        cafe24_config = self.browser.config.get("cafe24", {})
+        self.csv_chunk_size = cafe24_config.get("csv_chunk_size", DEFAULT_CSV_CHUNK_SIZE)
+        self.bulk_verify_sample = cafe24_config.get("bulk_verify_sample", DEFAULT_BULK_VERIFY_SAMPLE)
+        
+    @log_execution_time
+    def update_prices_bulk(self, csv_file_path: str, chunk_size: int = None,
+                           verify_sample: int = None, pool=None) -> Dict[str, Any]:
+        """
+        가격표 전체를 카페24 상품 수정용 CSV로 변환해 일괄 업로드
+        
+        상품마다 검색 → 편집 → 저장을 반복하는 대신, 가격표를 카페24 수정 CSV
+        (크기 제한이 있으면 여러 조각)로 만들어 CSVUploader로 한 번에 올린다.
+        업로드 후 조각별 처리 건수를 확인하고 일부 상품을 표본 검증한다.
+        
+        Args:
+            csv_file_path: 가격표 CSV 파일 경로 (상품코드/판매가 또는 product_code/price)
+            chunk_size: 업로드 파일 하나당 최대 행 수 (None이면 설정값)
+            verify_sample: 표본 검증할 상품 수 (0이면 검증 안 함, None이면 설정값)
+            pool: 시작된 BrowserPool - 주어지면 조각들을 여러 브라우저에서 나눠 업로드
+            
+        Returns:
+            실행 결과 딕셔너리
+        """
+        chunk_size = chunk_size or self.csv_chunk_size
+        verify_sample = self.bulk_verify_sample if verify_sample is None else verify_sample
+        
+        with LogContext(logger, f"CSV 가격 일괄 수정: {csv_file_path}"):
+            try:
+                # 로그인 확인
+                if not self.login.ensure_logged_in():
+                    return {"success": False, "error": "로그인 실패"}
+                
+                # CSV 파일 읽기
+                price_data = self._read_price_csv(csv_file_path)
+                if price_data is None:
+                    return {"success": False, "error": "CSV 파일 읽기 실패"}
+                
+                try:
+                    prices, skipped = self._build_bulk_prices(price_data)
+                except CSVReadError as e:
+                    # 업로드 전이므로 반영된 것이 없다
+                    logger.error(f"CSV 읽기 중단: {e}")
+                    return {"success": False, "error": str(e)}
+                if not prices:
+                    return {"success": False, "error": "수정할 상품이 없습니다", "skipped": skipped}
+                
+                # 카페24 수정 CSV 조각 생성 및 업로드
+                chunk_files = self._write_bulk_chunks(prices, chunk_size)
+                if pool is not None and len(chunk_files) > 1:
+                    uploads = pool.map(lambda worker, chunk: worker.csv_uploader.upload_product_csv(
+                        chunk[0], upload_type="modify"), chunk_files, batch_size=1)
+                else:
+                    uploads = [self.csv_uploader.upload_product_csv(chunk_file, upload_type="modify")
+                               for chunk_file, _ in chunk_files]
+                    
+                chunks = []
+                for (chunk_file, chunk_prices), upload in zip(chunk_files, uploads):
+                    processed = upload.get("processed_count", 0)
+                    # 결과 페이지에서 건수를 읽지 못하면 0 - 그때는 행 수와 비교하지 않는다
+                    count_matches = processed in (0, len(chunk_prices))
+                    uploaded_ok = upload.get("success", False)
+                    # 처리 건수가 행 수와 다르면 일부만 반영된 조각 - 어느 상품인지 모르므로 성공으로 세지 않는다
+                    partial = bool(uploaded_ok) and not count_matches
+                    if partial:
+                        logger.warning(f"조각 일부만 반영: {chunk_file} ({processed}/{len(chunk_prices)}건)")
+                    chunks.append({
+                        "file": chunk_file,
+                        "rows": len(chunk_prices),
+                        "success": False if partial else uploaded_ok,
+                        "partial": partial,
+                        "processed_count": processed,
+                        "count_matches": count_matches,
+                        "error": upload.get("error") or (
+                            f"처리 건수 불일치: {processed}/{len(chunk_prices)}" if partial else None)
+                    })
+                    
+                uploaded = {code: price for (_, chunk_prices), chunk in zip(chunk_files, chunks)
+                            if chunk["success"] for code, price in chunk_prices.items()}
+                
+                # 업로드된 상품 중 일부만 표본 검증
+                verification = self._verify_bulk_sample(uploaded, verify_sample) if uploaded else []
+                
+                success_count = len(uploaded)
+                total_count = len(prices)
+                logger.info(f"가격 일괄 수정 완료: {success_count}/{total_count} 업로드, "
+                            f"조각 {sum(1 for c in chunks if c['success'])}/{len(chunks)} 성공")
+                
+                return {
+                    "success": all(c["success"] for c in chunks),
+                    "mode": "bulk",
+                    "total_count": total_count,
+                    "success_count": success_count,
+                    "skipped": skipped,
+                    "partial_chunks": sum(1 for c in chunks if c["partial"]),
+                    "chunks": chunks,
+                    "verification": verification,
+                    "verified_ok": all(v["matches"] for v in verification)
+                }
+                
+            except Exception as e:
+                logger.error(f"CSV 가격 일괄 수정 중 오류: {e}")
+                self.browser.take_screenshot("price_bulk_update_error.png")
+                return {"success": False, "error": str(e)}
+    
+    @log_execution_time
+    def update_prices_parallel(self, csv_file_path: str, pool) -> Dict[str, Any]:
+        """
+        상품별 화면 수정을 여러 브라우저에서 나눠 실행
+        
+        Args:
+            csv_file_path: 가격표 CSV 파일 경로
+            pool: 시작된 BrowserPool (워커들이 로그인 세션을 공유)
+            
+        Returns:
+            실행 결과 딕셔너리
+        """
+        with LogContext(logger, f"CSV 가격 병렬 수정: {csv_file_path} ({len(pool.workers)}개 워커)"):
+            price_data = self._read_price_csv(csv_file_path)
+            if price_data is None:
+                return {"success": False, "error": "CSV 파일 읽기 실패"}
+            
+            try:
+                prices, skipped = self._build_bulk_prices(price_data)
+            except CSVReadError as e:
+                logger.error(f"CSV 읽기 중단: {e}")
+                return {"success": False, "error": str(e)}
+            
+            def update(worker, item):
+                product_code, new_price = item
+                result = worker.price_updater.update_single_price(product_code, new_price)
+                traced_sleep(self.browser.config.get("cafe24", {}).get("action_delay", 1))
+                return result
+            
+            outcomes = pool.map(update, list(prices.items()))
+            results = [{
+                "product_code": product_code,
+                "new_price": new_price,
+                "success": outcome.get("success", False),
+                "message": outcome.get("message", outcome.get("error", ""))
+            } for (product_code, new_price), outcome in zip(prices.items(), outcomes)]
+            
+            success_count = sum(1 for r in results if r["success"])
+            logger.info(f"가격 병렬 수정 완료: {success_count}/{len(results)} 성공")
+            
+            return {
+                "success": True,
+                "mode": "ui",
+                "total_count": len(results),
+                "success_count": success_count,
+                "skipped": skipped,
+                "workers": pool.stats(),
+                "results": results
+            }
+    
+    @staticmethod
+    def _build_bulk_prices(price_chunks: Iterable[pd.DataFrame]) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+        """
+        가격표 조각들 → {상품코드: 판매가} (같은 상품이 여러 번 나오면 마지막 행 사용)
+        
+        Args:
+            price_chunks: _read_price_csv가 반환한 정규화된 조각 반복자
+            
+        Returns:
+            (가격 딕셔너리, 건너뛴 행 목록)
+        """
+        prices = {}
+        skipped = []
+        for chunk in price_chunks:
+            valid = chunk["reason"].eq("")
+            prices.update(zip(chunk["product_code"][valid], chunk["price"][valid].astype(str)))
+            # 건너뛴 행은 드물다 - 그 행들만 하나씩 기록
+            for idx, product_code, reason in zip(chunk.index[~valid], chunk["product_code"][~valid],
+                                                 chunk["reason"][~valid]):
+                entry = {"row": int(idx), "product_code": product_code, "reason": reason}
+                if not product_code:
+                    del entry["product_code"]
+                skipped.append(entry)
+            
+        if skipped:
+            logger.warning(f"건너뛴 행: {len(skipped)}개")
+        return prices, skipped
+    
+    def _write_bulk_chunks(self, prices: Dict[str, str], chunk_size: int) -> List[Tuple[str, Dict[str, str]]]:
+        """가격 딕셔너리를 chunk_size 행 단위의 카페24 수정 CSV 파일로 저장"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        codes = list(prices)
+        chunk_files = []
+        
+        for number, start in enumerate(range(0, len(codes), chunk_size), 1):
+            chunk_prices = {code: prices[code] for code in codes[start:start + chunk_size]}
+            output_path = f"data/csv/price_bulk_{timestamp}_{number:02d}.csv"
+            chunk_files.append((self.csv_uploader.create_price_update_csv(chunk_prices, output_path), chunk_prices))
+            
+        logger.info(f"일괄 수정 CSV {len(chunk_files)}개 생성 ({len(codes)}개 상품, 조각당 최대 {chunk_size}행)")
+        return chunk_files
+    
+    def _verify_bulk_sample(self, uploaded: Dict[str, str], sample_size: int) -> List[Dict[str, Any]]:
+        """업로드된 상품 일부를 목록 페이지에서 검색해 가격 반영 여부 확인"""
+        if sample_size <= 0:
+            return []
+        sample = random.sample(list(uploaded), min(sample_size, len(uploaded)))
+        
+        # 하이브리드 모드: 검색 목록을 HTTP로 조회 (실패하면 브라우저 검색)
+        http = self.csv_uploader.http
+        if http is not None:
+            try:
+                results = []
+                for product_code in sample:
+                    shown = http.lookup_price(product_code) or []
+                    results.append({"product_code": product_code, "expected_price": uploaded[product_code],
+                                    "matches": int(uploaded[product_code]) in shown})
+                logger.info(f"표본 검증(HTTP): {sum(1 for r in results if r['matches'])}/{len(results)} 일치")
+                return results
+            except BrowserRequired as e:
+                logger.info(f"HTTP 검색 불가 - 브라우저로 검증: {e}")
+        
+        if not self._navigate_to_product_list():
+            return []
+        
+        results = []
+        for product_code in sample:
+            expected = uploaded[product_code]
+            matches = False
+            try:
+                if self._search_product(product_code):
+                    rows = self.browser.driver.find_elements(By.XPATH, f"//tr[contains(., '{product_code}')]")
+                    # 가격은 "13,500" 형태로 표시된다
+                    shown = {re.sub(r'[^\d]', '', m) for row in rows for m in re.findall(r'[\d,]+', row.text)}
+                    matches = expected in shown
+            except Exception as e:
+                logger.warning(f"표본 검증 실패 ({product_code}): {e}")
+            results.append({"product_code": product_code, "expected_price": expected, "matches": matches})
+            
+        logger.info(f"표본 검증: {sum(1 for r in results if r['matches'])}/{len(results)} 일치")
+        return results
         
     @log_execution_time
     def update_prices_from_csv(self, csv_file_path: str) -> Dict[str, Any]:
@@ -49,33 +299,38 @@ class PriceUpdater:
                 
                 # CSV 파일 읽기
                 price_data = self._read_price_csv(csv_file_path)
-                if not price_data:
+                if price_data is None:
                     return {"success": False, "error": "CSV 파일 읽기 실패"}
                 
                 # 상품 목록 페이지로 이동
                 if not self._navigate_to_product_list():
                     return {"success": False, "error": "상품 목록 페이지 이동 실패"}
                 
-                # 각 상품별 가격 수정
+                # 각 상품별 가격 수정 - 조각을 읽는 대로 바로 처리
                 results = []
-                for idx, row in price_data.iterrows():
-                    product_code = row.get('상품코드') or row.get('product_code')
-                    new_price = row.get('판매가') or row.get('price')
-                    
-                    if pd.isna(product_code) or pd.isna(new_price):
-                        logger.warning(f"행 {idx}: 필수 데이터 누락 - 상품코드: {product_code}, 가격: {new_price}")
-                        continue
-                    
-                    result = self._update_single_product_price(str(product_code), str(int(new_price)))
-                    results.append({
-                        "product_code": product_code,
-                        "new_price": new_price,
-                        "success": result["success"],
-                        "message": result.get("message", "")
-                    })
-                    
-                    # 각 상품 처리 후 잠시 대기
-                    time.sleep(1)
+                read_error = None
+                try:
+                    for chunk in price_data:
+                        for idx, product_code, new_price, reason in zip(
+                                chunk.index, chunk["product_code"], chunk["price"], chunk["reason"]):
+                            if reason:
+                                logger.warning(f"행 {idx}: {reason} - 상품코드: {product_code}")
+                                continue
+                            
+                            result = self._update_single_product_price(product_code, str(new_price))
+                            results.append({
+                                "product_code": product_code,
+                                "new_price": str(new_price),
+                                "success": result["success"],
+                                "message": result.get("message", "")
+                            })
+                            
+                            # 각 상품 처리 후 잠시 대기
+                            traced_sleep(1)
+                except CSVReadError as e:
+                    # 이미 수정한 상품은 되돌릴 수 없으므로 그때까지의 결과와 함께 중단
+                    logger.error(f"CSV 읽기 중단 ({e.rows}행 처리 후): {e}")
+                    read_error = str(e)
                 
                 # 결과 집계
                 success_count = sum(1 for r in results if r["success"])
@@ -83,53 +338,80 @@ class PriceUpdater:
                 
                 logger.info(f"가격 수정 완료: {success_count}/{total_count} 성공")
                 
-                return {
-                    "success": True,
+                summary = {
+                    "success": read_error is None,
                     "total_count": total_count,
                     "success_count": success_count,
                     "results": results
                 }
+                if read_error:
+                    summary["error"] = read_error
+                return summary
                 
             except Exception as e:
                 logger.error(f"CSV 가격 수정 중 오류: {e}")
                 self.browser.take_screenshot("price_update_error.png")
                 return {"success": False, "error": str(e)}
     
-    def _read_price_csv(self, csv_file_path: str) -> Optional[pd.DataFrame]:
-        """CSV 파일 읽기"""
+    def _read_price_csv(self, csv_file_path: str) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        가격표 CSV를 조각 단위로 읽는 반복자 반환
+        
+        인코딩은 파일 앞부분으로 한 번만 판별하고, 헤더 확인은 바로 한다.
+        조각은 product_code / price(Int64) / reason(건너뛸 사유, 정상이면 '') 컬럼으로 정규화된다.
+        
+        Returns:
+            정규화된 DataFrame 조각 반복자 (읽기 실패 시 None)
+        """
         try:
-            # 다양한 인코딩으로 시도
-            encodings = ['utf-8', 'cp949', 'euc-kr', 'utf-8-sig']
-            
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(csv_file_path, encoding=encoding)
-                    logger.info(f"CSV 파일 읽기 성공 ({encoding}): {len(df)}행")
-                    
-                    # 컬럼명 확인
-                    required_columns = ['상품코드', '판매가']
-                    alt_columns = ['product_code', 'price']
-                    
-                    has_required = all(col in df.columns for col in required_columns)
-                    has_alt = all(col in df.columns for col in alt_columns)
-                    
-                    if not has_required and not has_alt:
-                        logger.error(f"필수 컬럼이 없습니다. 필요: {required_columns} 또는 {alt_columns}")
-                        logger.error(f"현재 컬럼: {list(df.columns)}")
-                        return None
-                    
-                    return df
-                    
-                except UnicodeDecodeError:
-                    continue
+            encoding = sniff_encoding(csv_file_path)
+            if encoding is None:
+                logger.error("CSV 인코딩을 판별할 수 없습니다 (UTF-8 또는 CP949/EUC-KR만 지원)")
+                return None
+            columns = read_csv_header(csv_file_path, encoding)
+            
+            # 컬럼명 확인
+            required_columns = ['상품코드', '판매가']
+            alt_columns = ['product_code', 'price']
+            
+            if all(col in columns for col in required_columns):
+                code_column, price_column = required_columns
+            elif all(col in columns for col in alt_columns):
+                code_column, price_column = alt_columns
+            else:
+                logger.error(f"필수 컬럼이 없습니다. 필요: {required_columns} 또는 {alt_columns}")
+                logger.error(f"현재 컬럼: {columns}")
+                return None
             
-            logger.error("모든 인코딩으로 CSV 파일 읽기 실패")
-            return None
+            logger.info(f"CSV 파일 읽기 시작 ({encoding}): {csv_file_path}")
+            chunks = read_csv_chunks(csv_file_path, encoding, [code_column, price_column])
+            return self._normalize_price_chunks(chunks, code_column, price_column)
             
         except Exception as e:
             logger.error(f"CSV 파일 읽기 오류: {e}")
             return None
     
+    @staticmethod
+    def _normalize_price_chunks(chunks: Iterable[pd.DataFrame], code_column: str,
+                                price_column: str) -> Iterator[pd.DataFrame]:
+        """
+        조각마다 상품코드/판매가를 열 단위로 검증·변환
+        
+        Raises:
+            CSVReadError: 파일 중간에서 읽기 실패 - 호출한 쪽은 그때까지의 결과와 함께 중단한다
+        """
+        for chunk in chunks:
+            raw_prices = chunk[price_column]
+            codes = chunk[code_column].fillna("").str.strip()
+            prices = to_int_prices(raw_prices)
+            
+            reason = pd.Series("", index=chunk.index)
+            reason = reason.mask((prices <= 0).fillna(False), "가격 범위 오류: " + prices.astype(str))
+            reason = reason.mask(prices.isna(), "가격 형식 오류: " + raw_prices.astype(str))
+            reason = reason.mask(codes.eq("") | raw_prices.isna(), "필수 데이터 누락")
+            
+            yield pd.DataFrame({"product_code": codes, "price": prices, "reason": reason})
+    
     def _navigate_to_product_list(self) -> bool:
         """상품 목록 페이지로 이동"""
         try:
@@ -148,7 +430,7 @@ class PriceUpdater:
             self.browser.navigate_to(product_list_url)
             
             # 페이지 로딩 대기
-            time.sleep(3)
+            traced_sleep(3)
             
             # 상품 목록 페이지 확인
             if "product_list" in self.browser.get_current_url():
@@ -238,7 +520,7 @@ class PriceUpdater:
                     continue
             
             if search_button:
-                search_button.click()
+                traced_click(search_button)
                 logger.info("검색 버튼 클릭")
             else:
                 # Enter 키로 검색
@@ -247,7 +529,7 @@ class PriceUpdater:
                 logger.info("Enter 키로 검색 실행")
             
             # 검색 결과 로딩 대기
-            time.sleep(2)
+            traced_sleep(2)
             
             return True
             
@@ -287,12 +569,12 @@ class PriceUpdater:
             
             # 편집 버튼 클릭
             self.browser.scroll_to_element(edit_button)
-            time.sleep(0.5)
-            edit_button.click()
+            traced_sleep(0.5)
+            traced_click(edit_button)
             logger.info("편집 버튼 클릭 완료")
             
             # 편집 페이지 로딩 대기
-            time.sleep(3)
+            traced_sleep(3)
             
             return True
             
@@ -366,12 +648,12 @@ class PriceUpdater:
             
             # 저장 버튼 클릭
             self.browser.scroll_to_element(save_button)
-            time.sleep(0.5)
-            save_button.click()
+            traced_sleep(0.5)
+            traced_click(save_button)
             logger.info("저장 버튼 클릭")
             
             # 저장 완료 대기
-            time.sleep(3)
+            traced_sleep(3)
             
             # 저장 성공 확인
             current_url = self.browser.get_current_url()
@@ -415,15 +697,17 @@ class PriceUpdater:
             return {"success": False, "error": str(e)}
 
 
-def create_price_updater(browser_manager: BrowserManager, login_manager: LoginManager) -> PriceUpdater:
+def create_price_updater(browser_manager: BrowserManager, login_manager: LoginManager,
+                         csv_uploader: Optional[CSVUploader] = None) -> PriceUpdater:
     """
     가격 수정 매니저 생성 팩토리 함수
     
     Args:
         browser_manager: 브라우저 매니저 인스턴스
         login_manager: 로그인 매니저 인스턴스
+        csv_uploader: 일괄 모드용 CSV 업로더 (None이면 생성)
         
     Returns:
         PriceUpdater 인스턴스
     """
-    return PriceUpdater(browser_manager, login_manager)
\ No newline at end of file
+    return PriceUpdater(browser_manager, login_manager, csv_uploader)
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+관리자 세션 저장 모듈
+로그인 후 쿠키와 localStorage를 파일로 저장하고 다음 실행에서 복원
+"""
+
+import os
+import json
+import time
+import tempfile
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+import requests
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_SESSION_FILE = "data/session/admin_session.json"
+DEFAULT_SESSION_MAX_AGE_HOURS = 12
+VALIDATE_TIMEOUT = 10
+
+
+class SessionStore:
+    """쿠키/localStorage 저장 및 복원"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        세션 저장소 초기화
+
+        Args:
+            config: settings.json 설정 (paths.session_file, cafe24.session_max_age_hours 사용)
+        """
+        cafe24_config = config.get("cafe24", {})
+        self.path = config.get("paths", {}).get("session_file", DEFAULT_SESSION_FILE)
+        self.admin_url = cafe24_config.get("admin_url")
+        self.max_age = cafe24_config.get("session_max_age_hours", DEFAULT_SESSION_MAX_AGE_HOURS) * 3600
+        self.user_agent = config.get("browser", {}).get("user_agent")
+
+    @staticmethod
+    def capture(driver) -> Dict[str, Any]:
+        """현재 브라우저의 쿠키/localStorage 수집"""
+        return {
+            "saved_at": time.time(),
+            "url": driver.current_url,
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(
+                "var items = {};"
+                "for (var i = 0; i < window.localStorage.length; i++) {"
+                "  var key = window.localStorage.key(i);"
+                "  items[key] = window.localStorage.getItem(key);"
+                "}"
+                "return items;"
+            ) or {}
+        }
+
+    def save(self, driver) -> bool:
+        """
+        현재 브라우저 세션 저장
+
+        Args:
+            driver: 로그인된 WebDriver
+
+        Returns:
+            저장 성공 여부
+        """
+        try:
+            session = self.capture(driver)
+
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            # 인증 쿠키가 들어 있으므로 원자적으로 쓰고 소유자만 읽을 수 있게 한다
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(session, f, ensure_ascii=False)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+
+            logger.info(f"세션 저장: {self.path} (쿠키 {len(session['cookies'])}개)")
+            return True
+
+        except Exception as e:
+            logger.warning(f"세션 저장 실패: {e}")
+            return False
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """저장된 세션 반환 (없거나 만료 시 None)"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                session = json.load(f)
+        except Exception as e:
+            logger.warning(f"세션 파일 읽기 실패: {e}")
+            return None
+
+        age = time.time() - session.get("saved_at", 0)
+        if age > self.max_age:
+            logger.info(f"저장된 세션 만료 ({age / 3600:.1f}시간 경과)")
+            return None
+        return session
+
+    def clear(self) -> None:
+        """저장된 세션 삭제"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            logger.info("저장된 세션 삭제")
+
+    def validate(self, session: Dict[str, Any]) -> bool:
+        """
+        브라우저 페이지 로드 없이 요청 한 번으로 세션 유효성 확인
+
+        관리자 페이지가 로그인 페이지로 리다이렉트하지 않고 그대로 열리면 유효.
+
+        Args:
+            session: load()가 반환한 세션
+
+        Returns:
+            유효 여부
+        """
+        url = session.get("url") or self.admin_url
+        host = urlparse(url).hostname or ""
+        jar = requests.cookies.RequestsCookieJar()
+        for cookie in session.get("cookies", []):
+            domain = cookie.get("domain", "")
+            if domain and not host.endswith(domain.lstrip(".")):
+                continue
+            jar.set(cookie["name"], cookie["value"], domain=domain, path=cookie.get("path", "/"))
+
+        headers = {"User-Agent": self.user_agent} if self.user_agent else {}
+        try:
+            response = requests.get(url, cookies=jar, headers=headers,
+                                    allow_redirects=False, timeout=VALIDATE_TIMEOUT)
+        except requests.RequestException as e:
+            logger.warning(f"세션 확인 요청 실패: {e}")
+            return False
+
+        if response.is_redirect:
+            location = response.headers.get("Location", "").lower()
+            valid = "login" not in location
+        else:
+            valid = response.status_code == 200 and 'type="password"' not in response.text
+
+        logger.info(f"저장된 세션 확인: {'유효' if valid else '만료'} ({response.status_code})")
+        return valid
+
+    def restore(self, browser_manager, session: Dict[str, Any]) -> None:
+        """
+        세션을 브라우저에 복원
+
+        Args:
+            browser_manager: 브라우저 매니저
+            session: load() 또는 capture()가 반환한 세션
+        """
+        driver = browser_manager.driver
+        url = session.get("url") or self.admin_url
+
+        # 쿠키/localStorage는 같은 도메인 페이지에 있을 때만 설정할 수 있다
+        browser_manager.navigate_to(url)
+        driver.delete_all_cookies()
+        for cookie in session.get("cookies", []):
+            cookie = dict(cookie)
+            if "expiry" in cookie:
+                cookie["expiry"] = int(cookie["expiry"])
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug(f"쿠키 복원 실패 ({cookie.get('name')}): {e}")
+
+        local_storage = session.get("local_storage") or {}
+        if local_storage:
+            driver.execute_script(
+                "var items = arguments[0];"
+                "for (var key in items) { window.localStorage.setItem(key, items[key]); }",
+                local_storage
+            )
+
+        browser_manager.navigate_to(url)
+        logger.info(f"세션 복원 완료 (쿠키 {len(session.get('cookies', []))}개, "
+                    f"localStorage {len(local_storage)}개)")
+
+
+def create_session_store(config: Dict[str, Any]) -> SessionStore:
+    """
+    세션 저장소 생성 팩토리 함수
+
+    Args:
+        config: settings.json 설정
+
+    Returns:
+        SessionStore 인스턴스
+    """
+    return SessionStore(config)
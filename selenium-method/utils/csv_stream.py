@@ -0,0 +1,88 @@
+"""
+대용량 CSV 스트리밍 읽기 유틸리티
+가격표/상품 CSV를 한 번에 DataFrame으로 올리지 않고 조각 단위로 읽는다
+인코딩은 앞부분만 보고 판별하므로, 뒤쪽에서 읽을 수 없는 행을 만나면 CSVReadError로 멈춘다
+"""
+
+import codecs
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# 한 번에 읽는 행 수 - 메모리 사용량은 파일 크기가 아니라 이 값에 비례
+CSV_READ_ROWS = 5000
+SNIFF_BYTES = 64 * 1024
+ENCODINGS = ('utf-8-sig', 'cp949')  # cp949는 euc-kr 상위 호환
+READ_ERRORS = (UnicodeDecodeError, pd.errors.ParserError, pd.errors.EmptyDataError)
+
+
+class CSVReadError(ValueError):
+    """CSV를 끝까지 읽을 수 없음 (rows: 오류 전까지 읽은 데이터 행 수)"""
+
+    def __init__(self, message: str, rows: int = 0):
+        super().__init__(message)
+        self.rows = rows
+
+
+def sniff_encoding(csv_file_path: str, sample_size: int = SNIFF_BYTES) -> Optional[str]:
+    """
+    파일 앞부분 바이트로 인코딩 판별
+
+    Args:
+        csv_file_path: CSV 파일 경로
+        sample_size: 판별에 사용할 바이트 수
+
+    Returns:
+        인코딩 이름 (판별 실패 시 None)
+    """
+    with open(csv_file_path, 'rb') as f:
+        head = f.read(sample_size)
+
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    for encoding in ENCODINGS:
+        try:
+            head.decode(encoding)
+            return encoding
+        except UnicodeDecodeError as e:
+            # 샘플 경계에서 잘린 멀티바이트 문자는 판별 실패로 보지 않는다
+            if len(head) == sample_size and e.start >= len(head) - 3:
+                return encoding
+    return None
+
+
+def read_csv_header(csv_file_path: str, encoding: str) -> List[str]:
+    """헤더(컬럼명)만 읽기"""
+    try:
+        return list(pd.read_csv(csv_file_path, encoding=encoding, nrows=0).columns)
+    except READ_ERRORS as e:
+        raise CSVReadError(f"CSV 헤더를 읽을 수 없습니다: {e}")
+
+
+def read_csv_chunks(csv_file_path: str, encoding: str, columns: Optional[Sequence[str]] = None,
+                    chunk_rows: int = CSV_READ_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    CSV를 chunk_rows행씩 읽기 (값은 모두 문자열, 빈 칸은 NaN)
+
+    조각의 index는 파일 전체 기준 행 번호(0부터)이며, 파일은 반복이 끝나면 닫힌다.
+
+    Raises:
+        CSVReadError: 파일 중간에서 인코딩/형식 오류 (그 전 조각들은 이미 넘겨짐)
+    """
+    rows = 0
+    with pd.read_csv(csv_file_path, encoding=encoding, dtype=str, usecols=columns,
+                     chunksize=chunk_rows) as reader:
+        try:
+            for chunk in reader:
+                rows += len(chunk)
+                yield chunk
+        except READ_ERRORS as e:
+            raise CSVReadError(f"{rows + 1}번째 데이터 행 이후를 읽을 수 없어 중단했습니다: {e}", rows)
+
+
+def to_int_prices(values: pd.Series) -> pd.Series:
+    """'12,000' / '12000.0' → 12000 (Int64, 소수점 버림). 빈 칸과 형식 오류는 <NA>"""
+    numbers = pd.to_numeric(values.str.replace(',', '', regex=False).str.strip(), errors='coerce')
+    numbers = numbers.where(np.isfinite(numbers))
+    return np.trunc(numbers).astype('Int64')
@@ -11,6 +11,7 @@ from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from typing import Optional
 import colorlog
+from utils.tracer import tracer
 
 
 def setup_logger(
@@ -154,14 +155,15 @@ def _parse_file_size(size_str: str) -> int:
 
 
 def log_execution_time(func):
-    """함수 실행 시간을 로깅하는 데코레이터"""
+    """함수 실행 시간을 로깅하는 데코레이터 (추적 중이면 step span으로도 기록)"""
     def wrapper(*args, **kwargs):
         logger = logging.getLogger(func.__module__)
         start_time = datetime.now()
         
         try:
             logger.info(f"{func.__name__} 시작")
-            result = func(*args, **kwargs)
+            with tracer.span(func.__name__, "step"):
+                result = func(*args, **kwargs)
             
             execution_time = (datetime.now() - start_time).total_seconds()
             logger.info(f"{func.__name__} 완료 (실행시간: {execution_time:.2f}초)")
@@ -234,15 +236,19 @@ class LogContext:
         self.message = message
         self.level = level.upper()
         self.start_time = None
+        self._span = None
     
     def __enter__(self):
         self.start_time = datetime.now()
+        self._span = tracer.span(self.message, "step")
+        self._span.__enter__()
         log_func = getattr(self.logger, self.level.lower())
         log_func(f"시작: {self.message}")
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         execution_time = (datetime.now() - self.start_time).total_seconds()
+        self._span.__exit__(exc_type, exc_val, exc_tb)
         
         if exc_type is None:
             log_func = getattr(self.logger, self.level.lower())
@@ -0,0 +1,301 @@
+"""
+단계별 실행 추적 모듈
+페이지 이동, 대기, 클릭, sleep 구간(span)의 시간과 결과를 기록하고
+실행별 추적 파일과 요약 리포트(시간을 가장 많이 쓴 구간, sleep 합계, 재시도 횟수)를 만든다
+
+사용법:
+    python -m utils.tracer logs/traces/trace_20250101_120000.json
+"""
+
+import os
+import sys
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+from selenium.common.exceptions import TimeoutException
+
+SPAN_KINDS = ("step", "navigation", "wait", "click", "sleep", "retry")
+
+
+class Span:
+    """추적 구간 하나"""
+
+    __slots__ = ("id", "parent", "name", "kind", "thread", "start", "duration", "outcome", "attrs")
+
+    def __init__(self, span_id: int, parent: Optional[int], name: str, kind: str, attrs: Dict[str, Any]):
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.kind = kind
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.outcome = "ok"
+        self.attrs = attrs
+
+    def set(self, outcome: str = None, **attrs) -> None:
+        """결과/속성 기록"""
+        if outcome is not None:
+            self.outcome = outcome
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "parent": self.parent,
+            "name": self.name,
+            "kind": self.kind,
+            "thread": self.thread,
+            "start": round(self.start - origin, 4),
+            "duration": round(self.duration, 4),
+            "outcome": self.outcome,
+            "attrs": self.attrs
+        }
+
+
+class Tracer:
+    """실행 단위 span 수집기 (스레드별 부모 span 추적)"""
+
+    def __init__(self):
+        self.enabled = False
+        self.run_id = None
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        self._started_at = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start_run(self, run_id: str = None) -> None:
+        """새 실행 추적 시작"""
+        with self._lock:
+            self.enabled = True
+            self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.spans = []
+            self._origin = time.perf_counter()
+            self._started_at = datetime.now().isoformat()
+            self._next_id = 0
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, kind: str = "step", **attrs):
+        """
+        구간 기록 컨텍스트 매니저
+
+        예외가 나면 outcome을 timeout/error로 기록하고 예외는 그대로 전달한다.
+        """
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        stack = self._stack()
+        with self._lock:
+            self._next_id += 1
+            span = Span(self._next_id, stack[-1].id if stack else None, name, kind, attrs)
+            self.spans.append(span)
+        stack.append(span)
+        try:
+            yield span
+        except TimeoutException:
+            span.outcome = "timeout"
+            raise
+        except Exception as e:
+            span.set("error", error=f"{type(e).__name__}: {e}"[:200])
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+
+    # ------------------------------------------------------------------
+    # 저장 / 요약
+    # ------------------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = [s.to_dict(self._origin) for s in self.spans]
+        return {
+            "run_id": self.run_id,
+            "started_at": self._started_at,
+            "elapsed": round(time.perf_counter() - self._origin, 4),
+            "spans": spans
+        }
+
+    def write(self, trace_dir: str = "logs/traces") -> str:
+        """
+        추적 파일 저장
+
+        Args:
+            trace_dir: 저장 폴더
+
+        Returns:
+            저장된 파일 경로
+        """
+        os.makedirs(trace_dir, exist_ok=True)
+        path = os.path.join(trace_dir, f"trace_{self.run_id}.json")
+        trace = self.to_dict()
+        trace["summary"] = summarize(trace)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False, indent=1, default=str)
+        return path
+
+
+class _NullSpan:
+    """추적이 꺼져 있을 때 쓰는 빈 span"""
+
+    def set(self, outcome: str = None, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+# 프로세스 전역 추적기
+tracer = Tracer()
+
+
+def summarize(trace: Dict[str, Any], top: int = 10) -> Dict[str, Any]:
+    """
+    추적 데이터 요약
+
+    Args:
+        trace: Tracer.to_dict() 또는 저장된 추적 파일 내용
+        top: 시간 상위 항목 수
+
+    Returns:
+        종류별 합계, 이름별 상위 구간, sleep 합계, 재시도/타임아웃 횟수
+    """
+    spans = trace.get("spans", [])
+    children: Dict[Any, float] = {}
+    for s in spans:
+        if s["parent"] is not None:
+            children[s["parent"]] = children.get(s["parent"], 0.0) + s["duration"]
+
+    by_kind: Dict[str, Dict[str, Any]] = {}
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for s in spans:
+        # 자기 시간 = 전체 시간 - 자식 span 시간 (이중 계산 방지)
+        self_time = max(0.0, s["duration"] - children.get(s["id"], 0.0))
+        kind = by_kind.setdefault(s["kind"], {"count": 0, "self_time": 0.0})
+        kind["count"] += 1
+        kind["self_time"] += self_time
+
+        entry = by_name.setdefault(f"{s['kind']}:{s['name']}", {
+            "count": 0, "total_time": 0.0, "self_time": 0.0, "outcomes": {}
+        })
+        entry["count"] += 1
+        entry["total_time"] += s["duration"]
+        entry["self_time"] += self_time
+        entry["outcomes"][s["outcome"]] = entry["outcomes"].get(s["outcome"], 0) + 1
+
+    sleeps = [s for s in spans if s["kind"] == "sleep"]
+    top_sinks = sorted(by_name.items(), key=lambda item: item[1]["self_time"], reverse=True)[:top]
+
+    return {
+        "elapsed": trace.get("elapsed"),
+        "span_count": len(spans),
+        "by_kind": {k: {"count": v["count"], "self_time": round(v["self_time"], 3)} for k, v in by_kind.items()},
+        "top_time_sinks": [
+            {"name": name, "count": v["count"], "self_time": round(v["self_time"], 3),
+             "total_time": round(v["total_time"], 3), "outcomes": v["outcomes"]}
+            for name, v in top_sinks
+        ],
+        "sleep": {
+            "count": len(sleeps),
+            "total_time": round(sum(s["duration"] for s in sleeps), 3),
+            "by_caller": _sum_by(sleeps, lambda s: s["name"])
+        },
+        "retries": sum(1 for s in spans if s["kind"] == "retry"),
+        "timeouts": sum(1 for s in spans if s["outcome"] == "timeout"),
+        "errors": sum(1 for s in spans if s["outcome"] == "error")
+    }
+
+
+def _sum_by(spans: List[Dict[str, Any]], key: Callable) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for s in spans:
+        totals[key(s)] = round(totals.get(key(s), 0.0) + s["duration"], 3)
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """요약을 사람이 읽는 표 형태로 변환"""
+    lines = [
+        f"전체 {summary['elapsed']}초, span {summary['span_count']}개, "
+        f"재시도 {summary['retries']}회, 타임아웃 {summary['timeouts']}회, 오류 {summary['errors']}회",
+        "",
+        f"{'종류':<12} {'횟수':>6} {'자기 시간(초)':>14}"
+    ]
+    for kind, v in sorted(summary["by_kind"].items(), key=lambda item: item[1]["self_time"], reverse=True):
+        lines.append(f"{kind:<12} {v['count']:>6} {v['self_time']:>14}")
+
+    lines += ["", "시간을 가장 많이 쓴 구간:"]
+    for v in summary["top_time_sinks"]:
+        lines.append(f"  {v['self_time']:>9}초  {v['count']:>5}회  {v['name']}  {v['outcomes']}")
+
+    sleep = summary["sleep"]
+    lines += ["", f"sleep 합계: {sleep['total_time']}초 ({sleep['count']}회)"]
+    for caller, seconds in list(sleep["by_caller"].items())[:10]:
+        lines.append(f"  {seconds:>9}초  {caller}")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# 계측 헬퍼
+# ----------------------------------------------------------------------
+def traced(kind: str = "step", name: str = None):
+    """
+    함수 호출을 span으로 기록하는 데코레이터
+
+    반환값이 False/None이면 outcome을 "failed"로 기록한다 (대기 함수의 실패 반환).
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, kind) as span:
+                result = func(*args, **kwargs)
+                if result is False or (result is None and kind == "wait"):
+                    span.set("failed")
+                return result
+        return wrapper
+    return decorator
+
+
+def traced_sleep(seconds: float, reason: str = None) -> None:
+    """기록되는 time.sleep (reason이 없으면 호출한 함수 이름)"""
+    if reason is None and tracer.enabled:
+        reason = sys._getframe(1).f_code.co_name
+    with tracer.span(reason or "sleep", "sleep", seconds=seconds):
+        time.sleep(seconds)
+
+
+def traced_click(element, label: str = None) -> None:
+    """기록되는 element.click()"""
+    if label is None and tracer.enabled:
+        label = sys._getframe(1).f_code.co_name
+    with tracer.span(label or "click", "click"):
+        element.click()
+
+
+def main(argv: List[str] = None) -> int:
+    """저장된 추적 파일 요약 출력"""
+    argv = argv if argv is not None else sys.argv[1:]
+    if not argv:
+        print("사용법: python -m utils.tracer <추적 파일>")
+        return 1
+    with open(argv[0], "r", encoding="utf-8") as f:
+        trace = json.load(f)
+    print(format_summary(summarize(trace)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from utils.logger import setup_logger
+from utils.tracer import tracer, traced, traced_click, traced_sleep
 
 logger = setup_logger(__name__)
 
@@ -46,13 +47,15 @@ def retry_on_exception(
                         raise
                     
                     logger.warning(f"{func.__name__} 실패 (시도 {attempt + 1}/{max_retries + 1}): {e}")
-                    time.sleep(current_delay)
+                    with tracer.span(func.__name__, "retry", attempt=attempt + 1, error=str(e)[:200]):
+                        time.sleep(current_delay)
                     current_delay *= backoff
             
         return wrapper
     return decorator
 
 
+@traced("wait")
 def wait_for_condition(
     condition: Callable[[], bool],
     timeout: float = 30.0,
@@ -88,6 +91,7 @@ def wait_for_condition(
     raise TimeoutException(error_message)
 
 
+@traced("wait")
 def smart_wait(
     browser_manager,
     locator: tuple,
@@ -129,6 +133,7 @@ def smart_wait(
         raise
 
 
+@traced("wait")
 def wait_for_page_load(
     browser_manager,
     timeout: float = 30.0,
@@ -145,11 +150,17 @@ def wait_for_page_load(
     Returns:
         페이지 로딩 완료 여부
     """
+    # eager 로딩(fast 프로필)에서는 차단된 리소스 때문에 complete를 기다리지 않는다
+    if getattr(browser_manager, "page_load_strategy", "normal") == "eager":
+        ready_states = ("interactive", "complete")
+    else:
+        ready_states = ("complete",)
+    
     def page_loaded():
         try:
             # JavaScript 실행 완료 확인
             ready_state = browser_manager.execute_script("return document.readyState")
-            if ready_state != "complete":
+            if ready_state not in ready_states:
                 return False
             
             # jQuery 로딩 확인 (있는 경우)
@@ -183,6 +194,7 @@ def wait_for_page_load(
         return False
 
 
+@traced("wait")
 def wait_for_element_stable(
     browser_manager,
     locator: tuple,
@@ -234,6 +246,7 @@ def wait_for_element_stable(
     return element
 
 
+@traced("wait")
 def progressive_wait(
     condition: Callable[[], bool],
     max_timeout: float = 60.0,
@@ -293,9 +306,9 @@ class WaitHelper:
             
             if scroll_to:
                 self.browser.scroll_to_element(element)
-                time.sleep(0.5)
+                traced_sleep(0.5, "wait_and_click")
             
-            element.click()
+            traced_click(element, f"wait_and_click {locator[1]}")
             return True
             
         except Exception as e:
@@ -6,10 +6,24 @@ A comprehensive e-commerce automation solution for Cafe24 platform
 __version__ = "2.0.0"
 __author__ = "Cafe24 Automation Team"
 
-from .cafe24_system import Cafe24System
-from .api_client import Cafe24APIClient
-from .nlp_processor import NaturalLanguageProcessor
-from .cache_manager import CacheManager
+import importlib
+
+# Public classes are imported on first access so that importing a single
+# submodule (e.g. src.web_app) does not pull in every component.
+_LAZY_EXPORTS = {
+    'Cafe24System': '.cafe24_system',
+    'Cafe24APIClient': '.api_client',
+    'NaturalLanguageProcessor': '.nlp_processor',
+    'CacheManager': '.cache_manager',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'Cafe24System',
@@ -19,6 +19,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from oauth_manager import Cafe24OAuthManager
+from utils.metrics import record_upstream_response
 
 
 def retry_on_error(max_retries: int = 3, delay: int = 2):
@@ -56,7 +57,8 @@ class Cafe24APIClient:
         """Initialize API client with configuration"""
         self.config = config
         self.mall_id = config['mall_id']
-        self.base_url = f"https://{self.mall_id}.cafe24api.com/api/v2"
+        host = (config.get('api_base_url') or f"https://{self.mall_id}.cafe24api.com").rstrip('/')
+        self.base_url = f"{host}/api/v2/admin"
         self.api_version = config.get('api_version', '2025-06-01')
         
         # Setup logging
@@ -71,6 +73,8 @@ class Cafe24APIClient:
             'Content-Type': 'application/json',
             'X-Cafe24-Api-Version': self.api_version
         })
+        # Every response (token-refresh retries included) feeds the /metrics upstream histograms
+        self.session.hooks['response'].append(record_upstream_response)
         
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with valid token"""
@@ -93,7 +97,7 @@ class Cafe24APIClient:
                  data: Optional[Dict] = None, 
                  params: Optional[Dict] = None) -> requests.Response:
         """Make API request with retry logic"""
-        url = urljoin(self.base_url, endpoint.lstrip('/'))
+        url = urljoin(self.base_url + '/', endpoint.lstrip('/'))
         
         self.logger.info(f"API {method} {endpoint}")
         
@@ -9,6 +9,8 @@ import os
 import sys
 import json
 import logging
+import threading
+import importlib.util
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
@@ -16,13 +18,6 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from api_client import Cafe24APIClient
-from nlp_processor import NaturalLanguageProcessor
-from cache_manager import CacheManager
-from utils.health_checker import HealthChecker
-from utils.report_generator import ReportGenerator
-from demo_mode import DemoAPIClient
-
 
 class Cafe24System:
     """Main Cafe24 automation system"""
@@ -35,34 +30,114 @@ class Cafe24System:
         # Verify environment
         self._check_environment()
         
-        # Initialize components
+        # Components are constructed on first use so importing or creating
+        # the system stays cheap (web cold start, health probes)
+        self._api_client = None
+        self._demo_mode = None
+        self._nlp_processor = None
+        self._cache_manager = None
+        self._health_checker = None
+        self._report_generator = None
+        self._command_executor = None
+        self._component_lock = threading.RLock()
+        
+        self.logger.info("Cafe24 System initialized successfully")
+        
+    def _create_api_client(self):
+        """Create the API client, falling back to demo mode"""
+        from demo_mode import DemoAPIClient
+        
         # Use demo mode if credentials are not properly configured
         if not self.config.get('mall_id') or not self.config.get('client_id') or not self.config.get('client_secret'):
             self.logger.warning("Using demo mode - missing API credentials")
-            self.api_client = DemoAPIClient(self.config)
-            self.demo_mode = True
-        else:
-            try:
-                self.api_client = Cafe24APIClient(self.config)
-                # Test connection
-                if self.api_client.oauth_manager.is_authenticated():
-                    self.demo_mode = False
-                    self.logger.info("API client initialized with OAuth authentication")
-                else:
-                    self.logger.warning("OAuth authentication not available, using demo mode")
-                    self.api_client = DemoAPIClient(self.config)
-                    self.demo_mode = True
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize API client: {e}, using demo mode")
-                self.api_client = DemoAPIClient(self.config)
-                self.demo_mode = True
-                
-        self.nlp_processor = NaturalLanguageProcessor()
-        self.cache_manager = CacheManager(self.config.get('cache', {}))
-        self.health_checker = HealthChecker()
-        self.report_generator = ReportGenerator()
-        
-        self.logger.info("Cafe24 System initialized successfully")
+            return DemoAPIClient(self.config), True
+            
+        try:
+            from api_client import Cafe24APIClient
+            api_client = Cafe24APIClient(self.config)
+            # Test connection
+            if api_client.oauth_manager.is_authenticated():
+                self.logger.info("API client initialized with OAuth authentication")
+                return api_client, False
+            self.logger.warning("OAuth authentication not available, using demo mode")
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize API client: {e}, using demo mode")
+            
+        return DemoAPIClient(self.config), True
+        
+    @property
+    def api_client(self):
+        if self._api_client is None:
+            with self._component_lock:
+                if self._api_client is None:
+                    self._api_client, self._demo_mode = self._create_api_client()
+        return self._api_client
+        
+    @api_client.setter
+    def api_client(self, value):
+        self._api_client = value
+        
+    @property
+    def demo_mode(self) -> bool:
+        if self._demo_mode is None:
+            self.api_client
+        return self._demo_mode
+        
+    @demo_mode.setter
+    def demo_mode(self, value: bool):
+        self._demo_mode = value
+        
+    @property
+    def nlp_processor(self):
+        if self._nlp_processor is None:
+            with self._component_lock:
+                if self._nlp_processor is None:
+                    from nlp_processor import NaturalLanguageProcessor
+                    self._nlp_processor = NaturalLanguageProcessor()
+        return self._nlp_processor
+        
+    @property
+    def command_executor(self):
+        if self._command_executor is None:
+            with self._component_lock:
+                if self._command_executor is None:
+                    from command_executor import CommandExecutor
+                    self._command_executor = CommandExecutor(
+                        parse=self.nlp_processor.process,
+                        execute_intent=self._execute_intent,
+                        normalize=self.nlp_processor.normalize,
+                        config=self.config.get('executor', {})
+                    )
+        return self._command_executor
+        
+    @property
+    def cache_manager(self):
+        if self._cache_manager is None:
+            with self._component_lock:
+                if self._cache_manager is None:
+                    from cache_manager import CacheManager
+                    self._cache_manager = CacheManager(self.config.get('cache', {}))
+        return self._cache_manager
+        
+    @property
+    def health_checker(self):
+        if self._health_checker is None:
+            with self._component_lock:
+                if self._health_checker is None:
+                    from utils.health_checker import HealthChecker
+                    self._health_checker = HealthChecker()
+        return self._health_checker
+        
+    @property
+    def report_generator(self):
+        if self._report_generator is None:
+            with self._component_lock:
+                if self._report_generator is None:
+                    from utils.report_generator import ReportGenerator
+                    self._report_generator = ReportGenerator(
+                        snapshot_dir=os.path.join(self.config.get('cache', {}).get('cache_dir', 'cache'), 'reports')
+                    )
+        return self._report_generator
         
     def _load_config(self, config_path: Optional[str] = None) -> Dict:
         """Load configuration from file or environment"""
@@ -71,6 +146,8 @@ class Cafe24System:
             'client_id': os.getenv('CAFE24_CLIENT_ID'),
             'client_secret': os.getenv('CAFE24_CLIENT_SECRET'),
             'api_version': os.getenv('CAFE24_API_VERSION', '2025-06-01'),
+            # Override the API host, e.g. a local simulator at http://127.0.0.1:8089
+            'api_base_url': os.getenv('CAFE24_API_BASE_URL'),
             'cache': {
                 'enabled': os.getenv('CAFE24_CACHE_ENABLED', 'true').lower() == 'true',
                 'ttl': int(os.getenv('CAFE24_CACHE_TTL', '3600'))
@@ -79,6 +156,11 @@ class Cafe24System:
                 'count': int(os.getenv('CAFE24_RETRY_COUNT', '3')),
                 'delay': int(os.getenv('CAFE24_RETRY_DELAY', '2'))
             },
+            'executor': {
+                'intent_cache_size': int(os.getenv('CAFE24_INTENT_CACHE_SIZE', '512')),
+                'max_workers': int(os.getenv('CAFE24_BATCH_WORKERS', '4')),
+                'max_batch': int(os.getenv('CAFE24_BATCH_MAX', '20'))
+            },
             'log_level': os.getenv('CAFE24_LOG_LEVEL', 'INFO')
         }
         
@@ -116,11 +198,11 @@ class Cafe24System:
             'requests', 'pandas', 'flask', 'python-dotenv'
         ]
         
+        # Only locate the packages; importing pandas/flask here dominated startup
         missing = []
         for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
-            except ImportError:
+            module_name = 'dotenv' if package == 'python-dotenv' else package
+            if importlib.util.find_spec(module_name) is None:
                 missing.append(package)
                 
         if missing:
@@ -131,36 +213,14 @@ class Cafe24System:
                 subprocess.check_call([sys.executable, '-m', 'pip', 'install'] + missing)
                 
     def execute(self, command: str) -> Dict[str, Any]:
-        """Execute a natural language command"""
-        try:
-            # Process natural language
-            intent = self.nlp_processor.process(command)
-            
-            if not intent:
-                return {
-                    'success': False,
-                    'error': 'Command not understood',
-                    'command': command
-                }
-                
-            # Execute based on intent
-            result = self._execute_intent(intent)
-            
-            return {
-                'success': True,
-                'command': command,
-                'intent': intent,
-                'result': result
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Command execution failed: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'command': command
-            }
-            
+        """Execute a natural language command (intent and result cached)"""
+        return self.command_executor.execute(command)
+        
+    def execute_batch(self, commands: List[str]) -> Dict[str, Any]:
+        """Execute several commands, running identical intents once"""
+        return self.command_executor.execute_batch(commands)
+        
+
     def _execute_intent(self, intent: Dict[str, Any]) -> Any:
         """Execute the identified intent"""
         action = intent.get('action')
@@ -257,14 +317,22 @@ class Cafe24System:
                 
         return results
         
-    def generate_report(self, report_type: str = 'daily') -> Dict[str, Any]:
-        """Generate various reports"""
+    def generate_report(self, report_type: str = 'daily', period: Optional[str] = None) -> Dict[str, Any]:
+        """Generate various reports
+        
+        period ('yesterday', 'last_week', 'last_month') selects a closed
+        period; those reports are served from materialised snapshots.
+        """
+        from utils.report_generator import period_range
+        
         if report_type == 'daily':
-            return self.report_generator.generate_daily_report(self)
+            date = period_range('yesterday')[0] if period == 'yesterday' else None
+            return self.report_generator.generate_daily_report(self, date=date)
         elif report_type == 'inventory':
             return self.report_generator.generate_inventory_report(self)
         elif report_type == 'sales':
-            return self.report_generator.generate_sales_report(self)
+            start_date, end_date = period_range(period) if period else (None, None)
+            return self.report_generator.generate_sales_report(self, start_date, end_date)
         else:
             raise ValueError(f"Unknown report type: {report_type}")
             
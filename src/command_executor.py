@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Command Executor
+Caches parsed intents and intent results for natural language commands and
+executes batches of commands with deduplication
+"""
+
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Seconds a result stays valid per action. Actions with a TTL of 0 are
+# never cached; MUTATING_ACTIONS also clear every cached result.
+DEFAULT_RESULT_TTLS = {
+    'get_products': 300,
+    'get_orders': 60,
+    'check_inventory': 120,
+    'generate_report': 600,
+    'check_health': 30,
+    'update_products': 0
+}
+MUTATING_ACTIONS = {'update_products'}
+
+
+class CommandExecutor:
+    """Execute natural language commands with intent and result caching"""
+
+    def __init__(self, parse: Callable[[str], Optional[Dict[str, Any]]],
+                 execute_intent: Callable[[Dict[str, Any]], Any],
+                 normalize: Callable[[str], str],
+                 config: Optional[Dict[str, Any]] = None):
+        """Initialize executor
+
+        Args:
+            parse: Command -> intent function (NaturalLanguageProcessor.process)
+            execute_intent: Intent -> result function (Cafe24System._execute_intent)
+            normalize: Command normalization used for intent cache keys
+            config: intent_cache_size, result_ttls, max_workers, max_batch
+        """
+        config = config or {}
+        self.parse = parse
+        self.execute_intent = execute_intent
+        self.normalize = normalize
+        self.intent_cache_size = config.get('intent_cache_size', 512)
+        self.result_ttls = dict(DEFAULT_RESULT_TTLS, **config.get('result_ttls', {}))
+        self.max_workers = config.get('max_workers', 4)
+        self.max_batch = config.get('max_batch', 20)
+
+        self.logger = logging.getLogger('CommandExecutor')
+
+        self._intents: OrderedDict = OrderedDict()
+        self._results: Dict[str, Tuple[Any, float]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = None
+        self._stats = {
+            'intent_hits': 0, 'intent_misses': 0,
+            'result_hits': 0, 'result_misses': 0,
+            'batches': 0, 'deduplicated': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Intent cache
+    # ------------------------------------------------------------------
+    def get_intent(self, command: str) -> Optional[Dict[str, Any]]:
+        """Parse a command, reusing the intent of an identical earlier command"""
+        normalized = self.normalize(command)
+        # Relative dates ('오늘', '어제') resolve at parse time, so entries
+        # are only reused on the same day
+        key = (datetime.now().strftime('%Y-%m-%d'), normalized)
+
+        with self._lock:
+            intent = self._intents.get(key)
+            if intent is not None:
+                self._intents.move_to_end(key)
+                self._stats['intent_hits'] += 1
+                return intent
+            self._stats['intent_misses'] += 1
+
+        intent = self.parse(command)
+        if intent is None:
+            return None
+
+        with self._lock:
+            self._intents[key] = intent
+            while len(self._intents) > self.intent_cache_size:
+                self._intents.popitem(last=False)
+        return intent
+
+    # ------------------------------------------------------------------
+    # Result cache
+    # ------------------------------------------------------------------
+    @staticmethod
+    def result_key(intent: Dict[str, Any]) -> str:
+        """Cache key for an intent: action plus canonical parameters"""
+        params = json.dumps(intent.get('params', {}), sort_keys=True, ensure_ascii=False, default=str)
+        return f"{intent.get('action')}:{params}"
+
+    def run_intent(self, intent: Dict[str, Any], fresh: bool = False) -> Tuple[Any, bool]:
+        """Execute an intent through the result cache
+
+        Concurrent callers with the same intent share one execution.
+        fresh skips cached and in-flight results (the new result is stored).
+
+        Returns:
+            (result, cached) tuple
+        """
+        action = intent.get('action')
+        ttl = self.result_ttls.get(action, 0)
+
+        if action in MUTATING_ACTIONS or ttl <= 0:
+            result = self.execute_intent(intent)
+            if action in MUTATING_ACTIONS:
+                self.invalidate()
+            return result, False
+
+        key = self.result_key(intent)
+        if fresh:
+            result = self.execute_intent(intent)
+            with self._lock:
+                self._stats['result_misses'] += 1
+                self._results[key] = (result, time.time() + ttl)
+            return result, False
+
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._stats['result_hits'] += 1
+                return entry[0], True
+            self._stats['result_misses'] += 1
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = self.execute_intent(intent)
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._results[key] = (result, time.time() + ttl)
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result, False
+
+    def invalidate(self, action: Optional[str] = None) -> int:
+        """Drop cached results (all, or one action's)"""
+        with self._lock:
+            if action is None:
+                count = len(self._results)
+                self._results.clear()
+            else:
+                keys = [k for k in self._results if k.startswith(f"{action}:")]
+                for k in keys:
+                    del self._results[k]
+                count = len(keys)
+        return count
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def execute(self, command: str) -> Dict[str, Any]:
+        """Execute a natural language command"""
+        try:
+            intent = self.get_intent(command)
+
+            if not intent:
+                return {
+                    'success': False,
+                    'error': 'Command not understood',
+                    'command': command
+                }
+
+            result, cached = self.run_intent(intent)
+
+            return {
+                'success': True,
+                'command': command,
+                'intent': intent,
+                'result': result,
+                'cached': cached
+            }
+
+        except Exception as e:
+            self.logger.error(f"Command execution failed: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'command': command
+            }
+
+    def execute_batch(self, commands: List[str]) -> Dict[str, Any]:
+        """Execute several commands
+
+        Commands run in request order: each mutating intent runs on its own,
+        and the read-only intents between two mutations run concurrently.
+        Identical reads within such a segment run once; reads after a
+        mutation bypass the result cache so they see its effect.
+
+        Returns:
+            Dictionary with per-command responses in input order
+        """
+        if len(commands) > self.max_batch:
+            raise ValueError(f"Too many commands: {len(commands)} (max {self.max_batch})")
+
+        started = time.time()
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(commands)
+        groups: "OrderedDict[str, List[int]]" = OrderedDict()
+        intents: Dict[str, Dict[str, Any]] = {}
+        segments: List[List[str]] = []
+        fresh = set()
+        writes = 0
+        reading = False
+
+        for i, command in enumerate(commands):
+            try:
+                intent = self.get_intent(command)
+            except Exception as e:
+                responses[i] = {'success': False, 'error': str(e), 'command': command}
+                continue
+            if not intent:
+                responses[i] = {'success': False, 'error': 'Command not understood', 'command': command}
+                continue
+            key = self.result_key(intent)
+            if intent.get('action') in MUTATING_ACTIONS:
+                # Every mutation runs, even if it repeats an earlier one
+                key = f"{key}#{i}"
+                segments.append([key])
+                writes += 1
+                reading = False
+            else:
+                # Reads only share an execution within the segment since the last mutation
+                key = f"{key}@{writes}"
+                if key not in groups:
+                    if not reading:
+                        segments.append([])
+                        reading = True
+                    segments[-1].append(key)
+                    if writes:
+                        fresh.add(key)
+            groups.setdefault(key, []).append(i)
+            intents[key] = intent
+
+        def run(key):
+            try:
+                result, cached = self.run_intent(intents[key], fresh=key in fresh)
+                outcome = {'success': True, 'result': result, 'cached': cached}
+            except Exception as e:
+                self.logger.error(f"Batch command failed: {e}")
+                outcome = {'success': False, 'error': str(e)}
+            for position, i in enumerate(groups[key]):
+                response = dict(outcome, command=commands[i], intent=intents[key])
+                if position > 0:
+                    response['deduplicated'] = True
+                responses[i] = response
+
+        for segment in segments:
+            if len(segment) > 1:
+                list(self._executor().map(run, segment))
+            else:
+                run(segment[0])
+
+        deduplicated = sum(len(indexes) - 1 for indexes in groups.values())
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['deduplicated'] += deduplicated
+
+        return {
+            'success': all(r['success'] for r in responses),
+            'count': len(commands),
+            'executed': len(groups),
+            'deduplicated': deduplicated,
+            'elapsed_ms': round((time.time() - started) * 1000, 1),
+            'results': responses
+        }
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='command'
+                    )
+        return self._pool
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache and batch statistics"""
+        with self._lock:
+            return dict(
+                self._stats,
+                cached_intents=len(self._intents),
+                cached_results=len(self._results)
+            )
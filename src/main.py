@@ -185,6 +185,14 @@ Examples:
     setup_logging(args.log_level)
     
     try:
+        # Web service mode - the web app creates its system on first request
+        if args.web:
+            print("Starting web service...")
+            from web_app import app
+            port = int(os.environ.get('PORT', 5000))
+            app.run(host='0.0.0.0', port=port)
+            return 0
+            
         # Initialize system
         print("Initializing Cafe24 Automation System...")
         system = Cafe24System(config_path=args.config)
@@ -196,14 +204,6 @@ Examples:
             print(f"System Status: {result['status']}")
             return 0 if result['status'] == 'healthy' else 1
             
-        # Web service mode
-        if args.web:
-            print("Starting web service...")
-            from web_app import app
-            port = int(os.environ.get('PORT', 5000))
-            app.run(host='0.0.0.0', port=port)
-            return 0
-            
         # Batch mode
         if args.command:
             return batch_mode(system, args.command)
@@ -7,10 +7,21 @@ Processes Korean and English commands for Cafe24 operations
 
 import re
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
 
+# Parameter extractors (compiled once at import)
+CATEGORY_RE = re.compile(r'카테고리\s*[:\s]*(\S+)')
+SEARCH_RE = re.compile(r'검색\s*[:\s]*(\S+)')
+MIN_PRICE_RE = re.compile(r'(\d+)\s*원?\s*이상')
+MAX_PRICE_RE = re.compile(r'(\d+)\s*원?\s*이하')
+THRESHOLD_RE = re.compile(r'(\d+)\s*개?\s*이하')
+PERCENT_RE = re.compile(r'(\d+)\s*%')
+FIXED_PRICE_RE = re.compile(r'(\d+)\s*원으로')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
 class NaturalLanguageProcessor:
     """Process natural language commands for Cafe24 operations"""
     
@@ -48,6 +59,7 @@ class NaturalLanguageProcessor:
                     r'재고.*부족',
                     r'품절.*상품',
                     r'재고.*점검',
+                    r'재고.*이하',
                     r'inventory.*check',
                     r'low.*stock'
                 ],
@@ -96,29 +108,120 @@ class NaturalLanguageProcessor:
             '지난달': lambda: (datetime.now().replace(day=1) - timedelta(days=1)).replace(day=1)
         }
         
+        self._compile_matcher()
+        
+    def _compile_matcher(self):
+        """Compile all intent patterns into a single keyword scanner
+        
+        Every pattern is an ordered keyword sequence ('재고.*부족' -> ['재고', '부족']).
+        All keywords go into one alternation wrapped in a lookahead, so a single
+        finditer over the command reports every keyword occurrence, overlapping
+        ones included. Patterns that are not plain keyword sequences are
+        precompiled and searched individually.
+        """
+        keywords = set()
+        # Keyword sequences indexed by their first keyword, so only sequences
+        # whose first keyword occurs in the command are evaluated
+        self._rules: Dict[str, List[Tuple[str, int, List[str], int]]] = {}
+        self._regex_rules: List[Tuple[str, int, Any]] = []
+        
+        for order, (action, config) in enumerate(self.patterns.items()):
+            for pattern in config['patterns']:
+                parts = pattern.split('.*')
+                if all(part and re.escape(part) == part for part in parts):
+                    weight = sum(len(part) for part in parts)
+                    self._rules.setdefault(parts[0], []).append((action, order, parts, weight))
+                    keywords.update(parts)
+                else:
+                    self._regex_rules.append((action, order, re.compile(pattern)))
+                    
+        # A match reports only the longest keyword at its position; keywords
+        # that are prefixes of it ('product' in 'products') start there too
+        self._prefixes = {k: [p for p in keywords if k.startswith(p)] for k in keywords}
+        alternation = '|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+        self._keyword_re = re.compile(f'(?=({alternation}))') if keywords else None
+        
+    def _scan(self, command: str) -> Dict[str, List[int]]:
+        """Return start positions of every keyword found in the command"""
+        positions: Dict[str, List[int]] = {}
+        if self._keyword_re is None:
+            return positions
+        for match in self._keyword_re.finditer(command):
+            start = match.start()
+            for keyword in self._prefixes[match.group(1)]:
+                positions.setdefault(keyword, []).append(start)
+        return positions
+        
+    def match_intent(self, command: str) -> Optional[Tuple[str, float]]:
+        """Score every intent in one pass and return (action, score) of the best one
+        
+        A keyword sequence matches when its keywords occur in order. Its weight
+        is the number of matched characters, so '재고.*이하' beats a one-word hit.
+        An action scores its best sequence plus a small bonus per extra matching
+        sequence; ties go to the action declared first.
+        """
+        positions = self._scan(command)
+        scores: Dict[str, List[float]] = {}
+        
+        for first, starts in positions.items():
+            for action, order, parts, weight in self._rules.get(first, ()):
+                cursor = starts[0] + len(first)
+                for part in parts[1:]:
+                    # Later keywords must start after the previous one ends
+                    for start in positions.get(part, ()):
+                        if start >= cursor:
+                            cursor = start + len(part)
+                            break
+                    else:
+                        break
+                else:
+                    entry = scores.setdefault(action, [0, 0, order])
+                    entry[0] = max(entry[0], weight)
+                    entry[1] += 1
+                    
+        for action, order, regex in self._regex_rules:
+            match = regex.search(command)
+            if match:
+                entry = scores.setdefault(action, [0, 0, order])
+                entry[0] = max(entry[0], len(match.group(0)))
+                entry[1] += 1
+                
+        if not scores:
+            return None
+            
+        action, (weight, count, _) = min(
+            scores.items(), key=lambda item: (-(item[1][0] + 0.1 * (item[1][1] - 1)), item[1][2])
+        )
+        return action, weight + 0.1 * (count - 1)
+        
+    @staticmethod
+    def normalize(command: str) -> str:
+        """Lowercase and collapse whitespace"""
+        return WHITESPACE_RE.sub(' ', command.strip().lower())
+        
     def process(self, command: str) -> Optional[Dict[str, Any]]:
         """Process natural language command"""
         try:
             # Normalize command
-            command = command.strip().lower()
-            
-            # Find matching pattern
-            for action, config in self.patterns.items():
-                for pattern in config['patterns']:
-                    if re.search(pattern, command):
-                        self.logger.info(f"Matched action: {action} for command: {command}")
-                        
-                        # Extract parameters
-                        params = config['extractor'](command)
-                        
-                        return {
-                            'action': action,
-                            'params': params,
-                            'original_command': command
-                        }
-                        
-            self.logger.warning(f"No pattern matched for command: {command}")
-            return None
+            command = self.normalize(command)
+            
+            matched = self.match_intent(command)
+            if matched is None:
+                self.logger.warning("No pattern matched for command: %s", command)
+                return None
+                
+            action, score = matched
+            # Lazy formatting: this runs on every /api/execute call
+            self.logger.info("Matched action: %s (score %.1f) for command: %s", action, score, command)
+            
+            # Extract parameters
+            params = self.patterns[action]['extractor'](command)
+            
+            return {
+                'action': action,
+                'params': params,
+                'original_command': command
+            }
             
         except Exception as e:
             self.logger.error(f"NLP processing error: {e}")
@@ -129,21 +232,21 @@ class NaturalLanguageProcessor:
         params = {}
         
         # Check for category
-        category_match = re.search(r'카테고리\s*[:\s]*(\S+)', command)
+        category_match = CATEGORY_RE.search(command)
         if category_match:
             params['category'] = category_match.group(1)
             
         # Check for search keyword
-        search_match = re.search(r'검색\s*[:\s]*(\S+)', command)
+        search_match = SEARCH_RE.search(command)
         if search_match:
             params['keyword'] = search_match.group(1)
             
         # Check for price range
-        price_match = re.search(r'(\d+)\s*원?\s*이상', command)
+        price_match = MIN_PRICE_RE.search(command)
         if price_match:
             params['min_price'] = int(price_match.group(1))
             
-        price_match = re.search(r'(\d+)\s*원?\s*이하', command)
+        price_match = MAX_PRICE_RE.search(command)
         if price_match:
             params['max_price'] = int(price_match.group(1))
             
@@ -195,7 +298,7 @@ class NaturalLanguageProcessor:
         params = {}
         
         # Extract threshold
-        threshold_match = re.search(r'(\d+)\s*개?\s*이하', command)
+        threshold_match = THRESHOLD_RE.search(command)
         if threshold_match:
             params['threshold'] = int(threshold_match.group(1))
         else:
@@ -218,6 +321,19 @@ class NaturalLanguageProcessor:
         else:
             params['report_type'] = 'daily'  # Default
             
+        # Closed periods are served from materialised snapshots
+        if '어제' in command or 'yesterday' in command:
+            params['period'] = 'yesterday'
+        elif '지난주' in command or 'last week' in command:
+            params['period'] = 'last_week'
+        elif '지난달' in command or 'last month' in command:
+            params['period'] = 'last_month'
+            
+        # A daily report covers one day; multi-day periods get a sales report
+        if params.get('period') in ('last_week', 'last_month') and params['report_type'] == 'daily' \
+                and '일일' not in command and 'daily' not in command:
+            params['report_type'] = 'sales'
+            
         return params
         
     def _extract_update_params(self, command: str) -> Dict[str, Any]:
@@ -225,7 +341,7 @@ class NaturalLanguageProcessor:
         params = {}
         
         # Extract percentage change
-        percent_match = re.search(r'(\d+)\s*%', command)
+        percent_match = PERCENT_RE.search(command)
         if percent_match:
             params['percentage'] = int(percent_match.group(1))
             
@@ -235,7 +351,7 @@ class NaturalLanguageProcessor:
                 params['operation'] = 'decrease'
                 
         # Extract fixed price
-        price_match = re.search(r'(\d+)\s*원으로', command)
+        price_match = FIXED_PRICE_RE.search(command)
         if price_match:
             params['fixed_price'] = int(price_match.group(1))
             params['operation'] = 'fixed'
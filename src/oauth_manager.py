@@ -25,7 +25,8 @@ class Cafe24OAuthManager:
         self.redirect_uri = config.get('redirect_uri', 'https://localhost:8000/callback')
         self.scope = config.get('scope', 'mall.read_product,mall.write_product,mall.read_order,mall.write_order,mall.read_customer,mall.read_supply')
         
-        self.auth_base_url = f"https://{self.mall_id}.cafe24api.com/api/v2/oauth"
+        host = (config.get('api_base_url') or f"https://{self.mall_id}.cafe24api.com").rstrip('/')
+        self.auth_base_url = f"{host}/api/v2/oauth"
         self.token_url = f"{self.auth_base_url}/token"
         
         self.logger = logging.getLogger('Cafe24OAuth')
@@ -1,6 +1,6 @@
 """Utility modules for Cafe24 Automation System"""
 
-from .health_checker import HealthChecker
+from .health_checker import HealthChecker, HealthMonitor
 from .report_generator import ReportGenerator
 
-__all__ = ['HealthChecker', 'ReportGenerator']
\ No newline at end of file
+__all__ = ['HealthChecker', 'HealthMonitor', 'ReportGenerator']
\ No newline at end of file
@@ -5,10 +5,14 @@ Health Checker
 System health monitoring and diagnostics
 """
 
+import os
 import sys
+import time
 import logging
-import importlib
-from typing import Dict, Any
+import threading
+import importlib.util
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
 
 
 class HealthChecker:
@@ -34,11 +38,11 @@ class HealthChecker:
             'python-dotenv'
         ]
         
+        # Locate packages without importing them (health probes run often)
         missing = []
         for package in required:
-            try:
-                importlib.import_module(package.replace('-', '_'))
-            except ImportError:
+            module_name = 'dotenv' if package == 'python-dotenv' else package
+            if importlib.util.find_spec(module_name) is None:
                 missing.append(package)
                 
         return {
@@ -51,7 +55,12 @@ class HealthChecker:
         """Check API connectivity"""
         # Skip actual API call for health check
         # Just verify API client is initialized
-        if api_client and hasattr(api_client, 'mall_id') and api_client.mall_id:
+        if getattr(api_client, 'demo_mode', False):
+            return {
+                'passed': True,
+                'message': 'Demo API client configured'
+            }
+        elif api_client and hasattr(api_client, 'mall_id') and api_client.mall_id:
             return {
                 'passed': True,
                 'message': 'API client configured'
@@ -88,4 +97,137 @@ class HealthChecker:
             return {
                 'passed': False,
                 'message': f'Cache error: {str(e)}'
-            }
\ No newline at end of file
+            }
+                
+    def check_api_live(self, api_client) -> Dict[str, Any]:
+        """Make a live API call (diagnostics only - consumes API quota)"""
+        if getattr(api_client, 'demo_mode', False):
+            return {
+                'passed': True,
+                'message': 'Demo mode - live API check skipped'
+            }
+            
+        started = time.time()
+        try:
+            passed = bool(api_client.test_connection())
+            return {
+                'passed': passed,
+                'latency_ms': round((time.time() - started) * 1000, 1),
+                'message': 'API reachable' if passed else 'API connection test failed'
+            }
+        except Exception as e:
+            return {
+                'passed': False,
+                'message': f'API error: {str(e)}'
+            }
+
+
+class HealthMonitor:
+    """Tiered health probes
+    
+    - liveness: no I/O, answers whether the process is serving requests
+    - readiness: results of cheap checks refreshed by a background thread
+    - diagnostics: expensive checks, run at most once per min_deep_interval
+    """
+    
+    def __init__(self, checks: Dict[str, Callable[[], Dict[str, Any]]],
+                 deep_checks: Optional[Dict[str, Callable[[], Dict[str, Any]]]] = None,
+                 interval: Optional[int] = None,
+                 min_deep_interval: Optional[int] = None):
+        self.logger = logging.getLogger('HealthMonitor')
+        self.checks = checks
+        self.deep_checks = deep_checks or {}
+        self.interval = interval or int(os.getenv('CAFE24_HEALTH_INTERVAL', '30'))
+        self.min_deep_interval = min_deep_interval or int(os.getenv('CAFE24_HEALTH_DEEP_INTERVAL', '300'))
+        
+        self.started_at = time.time()
+        self._readiness: Optional[Dict[str, Any]] = None
+        self._diagnostics: Optional[Dict[str, Any]] = None
+        self._diagnostics_at = 0.0
+        self._lock = threading.Lock()
+        self._deep_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        
+    def liveness(self) -> Dict[str, Any]:
+        """Zero-I/O liveness probe"""
+        return {
+            'status': 'alive',
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    def _run(self, checks: Dict[str, Callable[[], Dict[str, Any]]]) -> Dict[str, Any]:
+        results = {}
+        for name, check in checks.items():
+            try:
+                results[name] = check()
+            except Exception as e:
+                results[name] = {'passed': False, 'message': f'Check error: {str(e)}'}
+        return results
+        
+    def refresh(self) -> Dict[str, Any]:
+        """Run the readiness checks now and store the result"""
+        results = self._run(self.checks)
+        readiness = {
+            'status': 'ready' if all(r.get('passed') for r in results.values()) else 'not_ready',
+            'checks': results,
+            'checked_at': time.time()
+        }
+        with self._lock:
+            self._readiness = readiness
+        return readiness
+        
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.error(f"Background health check failed: {e}")
+            self._stop.wait(self.interval)
+            
+    def start(self):
+        """Start the background checker (once per process)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='health-monitor', daemon=True)
+            self._thread.start()
+            
+    def stop(self):
+        self._stop.set()
+        
+    def readiness(self) -> Dict[str, Any]:
+        """Readiness from the cached background results"""
+        self.start()
+        with self._lock:
+            readiness = self._readiness
+            
+        if readiness is None:
+            return {'status': 'starting', 'checks': {}, 'age_seconds': None}
+            
+        age = time.time() - readiness['checked_at']
+        result = dict(readiness, age_seconds=round(age, 1))
+        # Results older than a few intervals mean the checker is stuck
+        if age > self.interval * 3:
+            result['status'] = 'stale'
+        return result
+        
+    def diagnostics(self) -> Dict[str, Any]:
+        """Run deep checks, serving the cached result inside the rate limit"""
+        with self._deep_lock:
+            now = time.time()
+            wait = self.min_deep_interval - (now - self._diagnostics_at)
+            if self._diagnostics is not None and wait > 0:
+                return dict(self._diagnostics, cached=True, next_run_in=round(wait, 1))
+                
+            results = self._run(dict(self.checks, **self.deep_checks))
+            self._diagnostics = {
+                'status': 'healthy' if all(r.get('passed') for r in results.values()) else 'unhealthy',
+                'checks': results,
+                'timestamp': datetime.now().isoformat()
+            }
+            self._diagnostics_at = now
+            return dict(self._diagnostics, cached=False, next_run_in=self.min_deep_interval)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrics
+Prometheus text-format metrics for the web service (GET /metrics)
+
+- http_request_duration_seconds: inbound latency by method, route rule and status
+- cafe24_upstream_request_duration_seconds: Cafe24 API latency by endpoint pattern
+- cafe24_upstream_requests_total: Cafe24 API calls by endpoint pattern and status
+
+Under gunicorn every worker keeps its own values. When METRICS_DIR is set
+(gunicorn.conf.py) each worker writes a snapshot there every
+METRICS_FLUSH_INTERVAL seconds and /metrics sums all snapshots. Files of
+recycled workers are kept so counters never go backwards; the master clears
+the directory on start.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# /api/v2/admin/products/123/variants/P000000A000A -> products/{no}/variants/{code}
+_API_PREFIX = re.compile(r'^/api/v2/(admin/)?')
+_NUMBER_SEGMENT = re.compile(r'/\d+(?=/|$)')
+_CODE_SEGMENT = re.compile(r'/(?=[A-Z0-9]*\d)[A-Z0-9]{8,}(?=/|$)')
+
+
+def endpoint_pattern(url: str) -> str:
+    """Collapse product numbers and variant codes so each endpoint is one label value"""
+    path = _API_PREFIX.sub('', urlsplit(url).path)
+    path = _NUMBER_SEGMENT.sub('/{no}', '/' + path.strip('/'))
+    return _CODE_SEGMENT.sub('/{code}', path).lstrip('/') or '/'
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Counters and histograms kept per process, optionally shared through METRICS_DIR"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.definitions: Dict[str, Dict[str, Any]] = {}
+        self.samples: Dict[str, Dict[Tuple[str, ...], Any]] = {}
+        self.lock = threading.Lock()
+        self._flusher = None
+        self._pid = None
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> str:
+        self.definitions[name] = {'kind': 'counter', 'help': documentation, 'labels': list(labelnames)}
+        self.samples[name] = {}
+        return name
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> str:
+        self.definitions[name] = {'kind': 'histogram', 'help': documentation, 'labels': list(labelnames),
+                                  'buckets': list(buckets)}
+        self.samples[name] = {}
+        return name
+
+    def inc(self, name: str, *labelvalues: Any, amount: float = 1) -> None:
+        key = tuple(str(value) for value in labelvalues)
+        with self.lock:
+            self.samples[name][key] = self.samples[name].get(key, 0) + amount
+        self._touch()
+
+    def observe(self, name: str, value: float, *labelvalues: Any) -> None:
+        """Record one observation - stored as per-bucket counts (last bucket +Inf) plus the sum"""
+        key = tuple(str(label) for label in labelvalues)
+        buckets = self.definitions[name]['buckets']
+        with self.lock:
+            counts = self.samples[name].get(key)
+            if counts is None:
+                counts = self.samples[name][key] = [0] * (len(buckets) + 1) + [0.0]
+            index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+            counts[index] += 1
+            counts[-1] += value
+        self._touch()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {name: dict(definition, samples=[[list(key), value if not isinstance(value, list) else list(value)]
+                                                    for key, value in self.samples[name].items()])
+                    for name, definition in self.definitions.items()}
+
+    # ------------------------------------------------------------------
+    # Multi-worker snapshots
+    # ------------------------------------------------------------------
+    def _touch(self) -> None:
+        """Start the snapshot writer in this process (after fork the parent's thread is gone)"""
+        if not self.directory or (self._pid == os.getpid() and self._flusher and self._flusher.is_alive()):
+            return
+        with self.lock:
+            if self._pid == os.getpid() and self._flusher and self._flusher.is_alive():
+                return
+            self._pid = os.getpid()
+            self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except OSError as e:
+                logging.getLogger('Metrics').warning(f"Metrics snapshot write failed: {e}")
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f'{pid}.json')
+
+    def flush(self) -> None:
+        """Write this process's snapshot atomically"""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, self._path(os.getpid()))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear_directory(self) -> None:
+        """Remove snapshots of a previous run (called by the gunicorn master on start)"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            if filename.endswith(('.json', '.tmp')):
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+    def collect(self) -> Dict[str, Any]:
+        """This process's values plus every other worker's last snapshot, summed"""
+        snapshots = [self.snapshot()]
+        if self.directory and os.path.isdir(self.directory):
+            own = f'{os.getpid()}.json'
+            for filename in os.listdir(self.directory):
+                if not filename.endswith('.json') or filename == own:
+                    continue
+                try:
+                    with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return merge_snapshots(snapshots)
+
+
+def merge_snapshots(snapshots):
+    """Sum counters and histogram buckets across snapshots"""
+    merged: Dict[str, Any] = {}
+    for snapshot in snapshots:
+        for name, data in snapshot.items():
+            target = merged.setdefault(name, dict(data, samples={}))
+            for labelvalues, value in data['samples']:
+                key = tuple(labelvalues)
+                current = target['samples'].get(key)
+                if current is None:
+                    target['samples'][key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    target['samples'][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target['samples'][key] = current + value
+    return merged
+
+
+def render(merged: Dict[str, Any]) -> str:
+    """Prometheus text exposition format"""
+    lines = []
+    for name in sorted(merged):
+        data = merged[name]
+        if not data['samples']:
+            continue
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['kind']}")
+        names = data['labels']
+        for labelvalues, value in sorted(data['samples'].items()):
+            if data['kind'] == 'histogram':
+                cumulative = 0
+                for bound, count in zip(list(data['buckets']) + [float('inf')], value[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(names, labelvalues, [('le', _number(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(names, labelvalues)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(names, labelvalues)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(names, labelvalues)} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry(os.environ.get('METRICS_DIR') or None)
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Inbound request latency by route', ('method', 'route', 'status'))
+UPSTREAM_REQUEST_DURATION = REGISTRY.histogram(
+    'cafe24_upstream_request_duration_seconds', 'Cafe24 API call latency by endpoint', ('method', 'endpoint'))
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    'cafe24_upstream_requests_total', 'Cafe24 API calls by endpoint and status', ('method', 'endpoint', 'status'))
+
+
+def record_upstream_response(response, *args, **kwargs):
+    """requests response hook - records every Cafe24 API response of a session"""
+    endpoint = endpoint_pattern(response.url)
+    method = response.request.method if response.request is not None else 'GET'
+    REGISTRY.observe(UPSTREAM_REQUEST_DURATION, response.elapsed.total_seconds(), method, endpoint)
+    REGISTRY.inc(UPSTREAM_REQUESTS, method, endpoint, response.status_code)
+    return response
+
+
+def register_metrics(app) -> None:
+    """Time every request of a Flask app and expose GET /metrics"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None and request.endpoint != 'metrics':
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            REGISTRY.observe(HTTP_REQUEST_DURATION, time.perf_counter() - started,
+                             request.method, route, response.status_code)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(render(REGISTRY.collect()), mimetype='text/plain; version=0.0.4')
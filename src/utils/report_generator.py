@@ -5,28 +5,155 @@ Report Generator
 Generates various reports for Cafe24 data
 """
 
+import os
+import json
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+# get_orders page size and the most pages fetched for one range; a range that
+# does not end on a short page is reported but never materialised
+ORDERS_PAGE_SIZE = 100
+ORDERS_MAX_PAGES = 100
+
+
+def period_range(period: str, today: Optional[datetime] = None) -> Tuple[str, str]:
+    """Return (start_date, end_date) for a named closed period"""
+    today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'yesterday':
+        start = end = today - timedelta(days=1)
+    elif period == 'last_week':
+        start = today - timedelta(days=today.weekday() + 7)
+        end = start + timedelta(days=6)
+    elif period == 'last_month':
+        end = today.replace(day=1) - timedelta(days=1)
+        start = end.replace(day=1)
+    else:
+        raise ValueError(f"Unknown period: {period}")
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
 
 
 class ReportGenerator:
-    """Generate business reports"""
+    """Generate business reports
     
-    def __init__(self):
+    Independent fetches run concurrently. Data for closed days (before today)
+    cannot change any more, so it is materialised under snapshot_dir and only
+    the open day is fetched again. A day is only materialised when its orders
+    were fetched completely from the live API (a day without orders is a valid
+    result); inventory is never materialised.
+    """
+    
+    def __init__(self, snapshot_dir: Optional[str] = None, max_workers: int = 4):
         self.logger = logging.getLogger('ReportGenerator')
+        self.snapshot_dir = snapshot_dir or os.getenv(
+            'CAFE24_REPORT_SNAPSHOT_DIR', os.path.join('cache', 'reports')
+        )
+        self.max_workers = max_workers
+        
+    def _gather(self, **fetches: Callable[[], Any]) -> Dict[str, Any]:
+        """Run independent fetches concurrently and return their results by name"""
+        if len(fetches) == 1:
+            name, fetch = next(iter(fetches.items()))
+            return {name: fetch()}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(fetches))) as pool:
+            futures = {name: pool.submit(fetch) for name, fetch in fetches.items()}
+            return {name: future.result() for name, future in futures.items()}
+            
+    def _snapshot_path(self, kind: str, key: str) -> str:
+        return os.path.join(self.snapshot_dir, kind, f"{key}.json")
         
-    def generate_daily_report(self, system) -> Dict[str, Any]:
-        """Generate daily business report"""
+    def _load_snapshot(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        path = self._snapshot_path(kind, key)
+        if not os.path.exists(path):
+            return None
         try:
-            # Get today's data
-            today = datetime.now().strftime('%Y-%m-%d')
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Unreadable report snapshot {path}: {e}")
+            return None
             
-            # Fetch orders
-            orders = system.get_orders(start_date=today, end_date=today)
+    def _save_snapshot(self, kind: str, key: str, data: Dict[str, Any]):
+        """Write atomically so concurrent readers never see a partial file"""
+        directory = os.path.join(self.snapshot_dir, kind)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self._snapshot_path(kind, key))
+        except Exception as e:
+            self.logger.warning(f"Failed to save report snapshot {kind}/{key}: {e}")
             
-            # Fetch inventory status
-            inventory = system.check_inventory()
+    @staticmethod
+    def _is_closed(date: str) -> bool:
+        return date < datetime.now().strftime('%Y-%m-%d')
+        
+    @staticmethod
+    def _can_materialise(system) -> bool:
+        """Demo data must never become a permanent snapshot"""
+        return not getattr(system, 'demo_mode', False)
+        
+    def _fetch_orders(self, system, start_date: str, end_date: str) -> Tuple[List[Dict], bool]:
+        """All orders in a date range, paging through get_orders
+        
+        Returns:
+            (orders, complete) - complete is False when a fetch failed or the
+            range did not end on a short page within ORDERS_MAX_PAGES
+        """
+        orders = []
+        try:
+            for page in range(ORDERS_MAX_PAGES):
+                batch = system.get_orders(start_date=start_date, end_date=end_date,
+                                          limit=ORDERS_PAGE_SIZE, offset=page * ORDERS_PAGE_SIZE)
+                orders.extend(batch)
+                if len(batch) < ORDERS_PAGE_SIZE:
+                    return orders, True
+        except Exception as e:
+            self.logger.warning(f"Order fetch {start_date}..{end_date} failed after {len(orders)} orders: {e}")
+            return orders, False
+        self.logger.warning(f"Order fetch {start_date}..{end_date} stopped at {len(orders)} orders")
+        return orders, False
+        
+    @staticmethod
+    def _add_inventory(report: Dict[str, Any], inventory: Dict[str, Any]):
+        """Attach current inventory alerts (not part of the materialised report)"""
+        report['summary']['low_stock_items'] = len(inventory['low_stock'])
+        report['summary']['out_of_stock_items'] = len(inventory['out_of_stock'])
+        report['inventory_alerts'] = {
+            'low_stock': inventory['low_stock'][:5],
+            'out_of_stock': inventory['out_of_stock'][:5]
+        }
+        
+    def generate_daily_report(self, system, date: Optional[str] = None) -> Dict[str, Any]:
+        """Generate daily business report
+        
+        Args:
+            system: Cafe24System providing get_orders/check_inventory
+            date: Report date (YYYY-MM-DD), today if omitted. Reports for
+                  closed days are materialised and reused.
+        """
+        try:
+            today = datetime.now().strftime('%Y-%m-%d')
+            date = date or today
+            closed = self._is_closed(date)
+            
+            if closed:
+                report = self._load_snapshot('daily', date)
+                if report is not None:
+                    self._add_inventory(report, system.check_inventory())
+                    report['materialized'] = True
+                    return report
+                    
+            # Orders and inventory are independent - fetch both at once
+            data = self._gather(
+                orders=lambda: self._fetch_orders(system, date, date),
+                inventory=system.check_inventory
+            )
+            orders, complete = data['orders']
+            inventory = data['inventory']
             
             # Calculate metrics
             total_sales = sum(float(order.get('total_price', 0)) for order in orders)
@@ -35,23 +162,23 @@ class ReportGenerator:
             
             report = {
                 'report_type': 'daily',
-                'date': today,
+                'date': date,
                 'generated_at': datetime.now().isoformat(),
                 'summary': {
                     'total_orders': order_count,
                     'total_sales': total_sales,
-                    'average_order_value': avg_order_value,
-                    'low_stock_items': len(inventory['low_stock']),
-                    'out_of_stock_items': len(inventory['out_of_stock'])
+                    'average_order_value': avg_order_value
                 },
                 'orders': orders[:10],  # Top 10 orders
-                'inventory_alerts': {
-                    'low_stock': inventory['low_stock'][:5],
-                    'out_of_stock': inventory['out_of_stock'][:5]
-                }
+                'complete': complete
             }
             
-            self.logger.info(f"Daily report generated for {today}")
+            if closed and complete and self._can_materialise(system):
+                self._save_snapshot('daily', date, report)
+            self._add_inventory(report, inventory)
+            report['materialized'] = False
+            
+            self.logger.info(f"Daily report generated for {date}")
             return report
             
         except Exception as e:
@@ -103,40 +230,127 @@ class ReportGenerator:
             self.logger.error(f"Inventory report generation failed: {e}")
             raise
             
-    def generate_sales_report(self, system) -> Dict[str, Any]:
-        """Generate sales analysis report"""
+    @staticmethod
+    def _aggregate_day(orders: List[Dict]) -> Dict[str, Any]:
+        """Aggregate one day's orders (count, revenue, per-product sales)"""
+        day = {'count': 0, 'total': 0.0, 'products': {}}
+        for order in orders:
+            day['count'] += 1
+            day['total'] += float(order.get('total_price', 0))
+            
+            for item in order.get('items', []):
+                product_name = item.get('product_name', 'Unknown')
+                if product_name not in day['products']:
+                    day['products'][product_name] = {'quantity': 0, 'revenue': 0}
+                    
+                day['products'][product_name]['quantity'] += item.get('quantity', 0)
+                day['products'][product_name]['revenue'] += float(item.get('price', 0)) * item.get('quantity', 0)
+        return day
+        
+    def _daily_aggregates(self, system, start_date: str, end_date: str) -> Tuple[Dict[str, Dict], int, List[str]]:
+        """Per-day aggregates for a date range
+        
+        Closed days come from their snapshots; each run of consecutive missing
+        closed days is fetched as one paged range and its days are materialised
+        if the fetch was complete, including days without orders. Today, if in
+        range, is always fetched. All fetches run concurrently.
+        
+        Returns:
+            (aggregates by date, number of days served from snapshots,
+             days whose orders could not be fetched completely)
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        days = []
+        current = datetime.strptime(start_date, '%Y-%m-%d')
+        last = datetime.strptime(end_date, '%Y-%m-%d')
+        while current <= last:
+            days.append(current.strftime('%Y-%m-%d'))
+            current += timedelta(days=1)
+            
+        aggregates = {}
+        missing = []
+        for day in days:
+            if day >= today:
+                continue
+            snapshot = self._load_snapshot('sales_days', day)
+            if snapshot is None:
+                missing.append(day)
+            else:
+                aggregates[day] = snapshot
+        materialized = len(aggregates)
+        
+        # Only the gaps are fetched - one paged range per run of consecutive missing days
+        runs: List[List[str]] = []
+        for day in missing:
+            if runs and datetime.strptime(day, '%Y-%m-%d') - datetime.strptime(runs[-1][-1], '%Y-%m-%d') == timedelta(days=1):
+                runs[-1].append(day)
+            else:
+                runs.append([day])
+        fetches = {f'closed_{i}': (lambda run=run: self._fetch_orders(system, run[0], run[-1]))
+                   for i, run in enumerate(runs)}
+        if today in days:
+            fetches['open'] = lambda: self._fetch_orders(system, today, today)
+        fetched = self._gather(**fetches) if fetches else {}
+        open_orders, open_complete = fetched.get('open', ([], True))
+        
+        by_day: Dict[str, List[Dict]] = {}
+        incomplete = []
+        can_materialise = self._can_materialise(system)
+        for i, run in enumerate(runs):
+            run_orders, run_complete = fetched[f'closed_{i}']
+            for order in run_orders:
+                by_day.setdefault(order.get('order_date', '')[:10], []).append(order)
+            if not run_complete:
+                incomplete.extend(run)
+            # A complete fetch of a closed day is final, even when it had no orders
+            for day in run:
+                aggregates[day] = self._aggregate_day(by_day.get(day, []))
+                if run_complete and can_materialise:
+                    self._save_snapshot('sales_days', day, aggregates[day])
+        if today in days:
+            aggregates[today] = self._aggregate_day([
+                order for order in open_orders if order.get('order_date', '')[:10] == today
+            ])
+            if not open_complete:
+                incomplete.append(today)
+        return aggregates, materialized, incomplete
+        
+    def generate_sales_report(self, system, start_date: Optional[str] = None,
+                              end_date: Optional[str] = None) -> Dict[str, Any]:
+        """Generate sales analysis report
+        
+        Args:
+            system: Cafe24System providing get_orders
+            start_date: Period start (YYYY-MM-DD), 30 days ago if omitted
+            end_date: Period end (YYYY-MM-DD), today if omitted
+        """
         try:
-            # Get date range (last 30 days)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=30)
-            
-            # Fetch orders
-            orders = system.get_orders(
-                start_date=start_date.strftime('%Y-%m-%d'),
-                end_date=end_date.strftime('%Y-%m-%d')
-            )
+            # Get date range (last 30 days by default)
+            end_date = end_date or datetime.now().strftime('%Y-%m-%d')
+            start_date = start_date or (
+                datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=30)
+            ).strftime('%Y-%m-%d')
             
-            # Analyze sales
+            aggregates, materialized, incomplete = self._daily_aggregates(system, start_date, end_date)
+            
+            # Merge per-day aggregates
             daily_sales = {}
             product_sales = {}
+            total_orders = 0
+            total_revenue = 0.0
             
-            for order in orders:
-                # Daily aggregation
-                order_date = order.get('order_date', '')[:10]
-                if order_date not in daily_sales:
-                    daily_sales[order_date] = {'count': 0, 'total': 0}
-                    
-                daily_sales[order_date]['count'] += 1
-                daily_sales[order_date]['total'] += float(order.get('total_price', 0))
+            for day in sorted(aggregates):
+                data = aggregates[day]
+                if data['count']:
+                    daily_sales[day] = {'count': data['count'], 'total': data['total']}
+                total_orders += data['count']
+                total_revenue += data['total']
                 
-                # Product aggregation
-                for item in order.get('items', []):
-                    product_name = item.get('product_name', 'Unknown')
+                for product_name, sales in data['products'].items():
                     if product_name not in product_sales:
                         product_sales[product_name] = {'quantity': 0, 'revenue': 0}
-                        
-                    product_sales[product_name]['quantity'] += item.get('quantity', 0)
-                    product_sales[product_name]['revenue'] += float(item.get('price', 0)) * item.get('quantity', 0)
+                    product_sales[product_name]['quantity'] += sales['quantity']
+                    product_sales[product_name]['revenue'] += sales['revenue']
                     
             # Top products
             top_products = sorted(
@@ -148,14 +362,14 @@ class ReportGenerator:
             report = {
                 'report_type': 'sales',
                 'period': {
-                    'start': start_date.strftime('%Y-%m-%d'),
-                    'end': end_date.strftime('%Y-%m-%d')
+                    'start': start_date,
+                    'end': end_date
                 },
                 'generated_at': datetime.now().isoformat(),
                 'summary': {
-                    'total_orders': len(orders),
-                    'total_revenue': sum(float(order.get('total_price', 0)) for order in orders),
-                    'average_order_value': sum(float(order.get('total_price', 0)) for order in orders) / len(orders) if orders else 0,
+                    'total_orders': total_orders,
+                    'total_revenue': total_revenue,
+                    'average_order_value': total_revenue / total_orders if total_orders else 0,
                     'unique_products_sold': len(product_sales)
                 },
                 'daily_trends': daily_sales,
@@ -166,10 +380,12 @@ class ReportGenerator:
                         'revenue': data['revenue']
                     }
                     for name, data in top_products
-                ]
+                ],
+                'materialized_days': materialized,
+                'incomplete_days': incomplete
             }
             
-            self.logger.info("Sales report generated")
+            self.logger.info(f"Sales report generated ({materialized}/{len(aggregates)} days from snapshots)")
             return report
             
         except Exception as e:
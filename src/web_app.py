@@ -8,6 +8,7 @@ Provides REST API and health check endpoints
 import os
 import json
 import logging
+import threading
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
 from datetime import datetime
@@ -16,74 +17,96 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from cafe24_system import Cafe24System
+from utils.health_checker import HealthChecker, HealthMonitor
+from utils.metrics import register_metrics
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
+register_metrics(app)
 
-# Initialize Cafe24 system with improved error handling
-try:
-    system = Cafe24System()
-    system_initialized = True
-    logging.info("Cafe24 system initialized successfully")
-except Exception as e:
-    logging.error(f"Failed to initialize Cafe24 system: {e}")
-    # Create a fallback demo system
-    try:
-        from demo_mode import DemoAPIClient
-        class FallbackSystem:
-            def __init__(self):
-                self.api_client = DemoAPIClient({})
-                self.demo_mode = True
-                self.logger = logging.getLogger('FallbackSystem')
-                
-            def get_products(self, **kwargs):
-                return self.api_client.get_products(**kwargs)
-                
-            def get_orders(self, **kwargs):
-                return self.api_client.get_orders(**kwargs)
-                
-            def check_inventory(self, threshold=10):
-                products = self.api_client.get_products()
-                low_stock = [p for p in products if p.get('inventory_quantity', 0) <= threshold]
-                out_of_stock = [p for p in products if p.get('inventory_quantity', 0) == 0]
-                return {
-                    'low_stock': low_stock,
-                    'out_of_stock': out_of_stock,
-                    'total_products': len(products),
-                    'threshold': threshold
-                }
-                
-            def get_customers(self, **kwargs):
-                return self.api_client.get_customers(**kwargs)
-                
-            def get_sales_statistics(self, **kwargs):
-                return self.api_client.get_sales_statistics(**kwargs)
-                
-            def generate_report(self, report_type='daily'):
-                if report_type == 'daily':
-                    return {
-                        'report_type': 'daily',
-                        'date': datetime.now().strftime('%Y-%m-%d'),
-                        'summary': 'Demo mode - System operational'
-                    }
-                return {'report_type': report_type, 'status': 'demo_mode'}
-                
-            def execute(self, command):
+# The Cafe24 system is created by the first request that needs it, so importing
+# this module (server boot, health probes) does not build the API client
+_system = None
+_system_failed = False
+_system_lock = threading.Lock()
+
+
+def _create_fallback_system():
+    """Create a demo-only system used when Cafe24System cannot start"""
+    from demo_mode import DemoAPIClient
+    
+    class FallbackSystem:
+        def __init__(self):
+            self.api_client = DemoAPIClient({})
+            self.demo_mode = True
+            self.logger = logging.getLogger('FallbackSystem')
+
+        def get_products(self, **kwargs):
+            return self.api_client.get_products(**kwargs)
+
+        def get_orders(self, **kwargs):
+            return self.api_client.get_orders(**kwargs)
+
+        def check_inventory(self, threshold=10):
+            products = self.api_client.get_products()
+            low_stock = [p for p in products if p.get('inventory_quantity', 0) <= threshold]
+            out_of_stock = [p for p in products if p.get('inventory_quantity', 0) == 0]
+            return {
+                'low_stock': low_stock,
+                'out_of_stock': out_of_stock,
+                'total_products': len(products),
+                'threshold': threshold
+            }
+
+        def get_customers(self, **kwargs):
+            return self.api_client.get_customers(**kwargs)
+
+        def get_sales_statistics(self, **kwargs):
+            return self.api_client.get_sales_statistics(**kwargs)
+
+        def generate_report(self, report_type='daily', period=None):
+            if report_type == 'daily':
                 return {
-                    'success': True,
-                    'message': 'Demo mode active - Command processed',
-                    'command': command,
-                    'mode': 'demo'
+                    'report_type': 'daily',
+                    'date': datetime.now().strftime('%Y-%m-%d'),
+                    'summary': 'Demo mode - System operational'
                 }
-        
-        system = FallbackSystem()
-        system_initialized = True
-        logging.info("Fallback demo system initialized")
-    except Exception as fallback_error:
-        logging.error(f"Failed to initialize fallback system: {fallback_error}")
-        system_initialized = False
-        system = None
+            return {'report_type': report_type, 'status': 'demo_mode'}
+
+        def execute(self, command):
+            return {
+                'success': True,
+                'message': 'Demo mode active - Command processed',
+                'command': command,
+                'mode': 'demo'
+            }
+
+        def execute_batch(self, commands):
+            results = [self.execute(command) for command in commands]
+            return {'success': True, 'count': len(commands), 'results': results}
+
+    return FallbackSystem()
+
+
+def get_system():
+    """Return the shared system instance, initializing it on first use"""
+    global _system, _system_failed
+    if _system is None and not _system_failed:
+        with _system_lock:
+            if _system is None and not _system_failed:
+                try:
+                    _system = Cafe24System()
+                    logging.info("Cafe24 system initialized successfully")
+                except Exception as e:
+                    logging.error(f"Failed to initialize Cafe24 system: {e}")
+                    try:
+                        _system = _create_fallback_system()
+                        logging.info("Fallback demo system initialized")
+                    except Exception as fallback_error:
+                        logging.error(f"Failed to initialize fallback system: {fallback_error}")
+                        _system_failed = True
+    return _system
 
 @app.route('/')
 def home():
@@ -93,13 +116,14 @@ def home():
         return render_template('dashboard.html')
     
     # Return JSON for API requests
+    system = get_system()
     mode = 'demo' if hasattr(system, 'demo_mode') and system.demo_mode else 'production'
     
     return jsonify({
         'name': 'Cafe24 Automation System',
         'version': '2.0.0',
         'description': '카페24 쇼핑몰 완전 자동화 시스템',
-        'status': 'online' if system_initialized else 'error',
+        'status': 'online' if system is not None else 'error',
         'mode': mode,
         'features': {
             'natural_language': '한국어/영어 자연어 명령 지원',
@@ -109,7 +133,11 @@ def home():
         },
         'endpoints': {
             'health': '/health',
+            'readiness': '/health/ready',
+            'diagnostics': '/health/deep',
+            'metrics': '/metrics',
             'execute': '/api/execute',
+            'execute_batch': '/api/execute/batch',
             'products': '/api/products',
             'orders': '/api/orders', 
             'inventory': '/api/inventory',
@@ -117,27 +145,77 @@ def home():
         },
         'examples': {
             'execute': 'POST /api/execute {"command": "오늘 주문 확인"}',
+            'execute_batch': 'POST /api/execute/batch {"commands": ["오늘 주문 확인", "재고 확인"]}',
             'products': 'GET /api/products?limit=10',
             'inventory': 'GET /api/inventory?threshold=5'
         }
     })
 
+# Health probes: /health (liveness), /health/ready (cached), /health/deep (rate-limited)
+_health_checker = HealthChecker()
+
+
+def _check_system():
+    system = get_system()
+    if system is None:
+        return {'passed': False, 'message': 'System not initialized'}
+    demo_mode = getattr(system, 'demo_mode', False)
+    return {
+        'passed': True,
+        'demo_mode': demo_mode,
+        'message': 'Demo mode' if demo_mode else 'OK'
+    }
+
+
+def _check_cache():
+    cache_manager = getattr(get_system(), 'cache_manager', None)
+    if cache_manager is None:
+        return {'passed': True, 'message': 'Cache not in use'}
+    return _health_checker.check_cache(cache_manager)
+
+
+health_monitor = HealthMonitor(
+    checks={
+        'system': _check_system,
+        'api_connection': lambda: _health_checker.check_api_connection(getattr(get_system(), 'api_client', None)),
+        'cache_status': _check_cache,
+        'environment': _health_checker.check_environment,
+        'dependencies': _health_checker.check_dependencies
+    },
+    deep_checks={
+        'api_live': lambda: _health_checker.check_api_live(getattr(get_system(), 'api_client', None))
+    }
+)
+
+
 @app.route('/health')
 def health():
-    """Health check endpoint for monitoring"""
-    # Simple health check without API calls
-    return jsonify({
-        'status': 'healthy',
-        'service': 'cafe24-automation',
-        'version': '2.0.0',
-        'timestamp': datetime.now().isoformat(),
-        'system_initialized': system_initialized
-    }), 200
+    """Liveness probe - no I/O, never touches the Cafe24 API"""
+    return jsonify(dict(
+        health_monitor.liveness(),
+        status='healthy',
+        service='cafe24-automation',
+        version='2.0.0',
+        system_initialized=_system is not None
+    )), 200
+
+@app.route('/health/ready')
+def health_ready():
+    """Readiness probe - served from the background checker's cached results"""
+    readiness = health_monitor.readiness()
+    return jsonify(readiness), 200 if readiness['status'] == 'ready' else 503
+
+@app.route('/health/deep')
+def health_deep():
+    """Deep diagnostics including a live API call, rate-limited per process"""
+    diagnostics = health_monitor.diagnostics()
+    return jsonify(diagnostics), 200 if diagnostics['status'] == 'healthy' else 503
 
 @app.route('/api/execute', methods=['POST'])
 def execute_command():
     """Execute natural language command"""
-    if not system_initialized:
+    system = get_system()
+    if system is None:
         return jsonify({'error': 'System not initialized'}), 503
     
     try:
@@ -156,10 +234,35 @@ def execute_command():
             'error': str(e)
         }), 500
 
+@app.route('/api/execute/batch', methods=['POST'])
+def execute_batch():
+    """Execute several natural language commands in one request"""
+    system = get_system()
+    if system is None:
+        return jsonify({'error': 'System not initialized'}), 503
+    
+    try:
+        data = request.get_json() or {}
+        commands = data.get('commands', [])
+        
+        if not isinstance(commands, list) or not commands:
+            return jsonify({'error': 'No commands provided'}), 400
+        
+        return jsonify(system.execute_batch([str(c) for c in commands]))
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/products', methods=['GET'])
 def get_products():
     """Get products list"""
-    if not system_initialized or not system:
+    system = get_system()
+    if system is None:
         return jsonify({
             'error': 'System not initialized',
             'message': 'The Cafe24 automation system is not properly initialized'
@@ -208,7 +311,8 @@ def get_products():
 @app.route('/api/orders', methods=['GET'])
 def get_orders():
     """Get orders list"""
-    if not system_initialized or not system:
+    system = get_system()
+    if system is None:
         return jsonify({
             'error': 'System not initialized',
             'message': 'The Cafe24 automation system is not properly initialized'
@@ -258,7 +362,8 @@ def get_orders():
 @app.route('/api/inventory', methods=['GET'])
 def check_inventory():
     """Check inventory status"""
-    if not system_initialized or not system:
+    system = get_system()
+    if system is None:
         return jsonify({
             'error': 'System not initialized',
             'message': 'The Cafe24 automation system is not properly initialized'
@@ -296,14 +401,19 @@ def check_inventory():
 @app.route('/api/report/<report_type>', methods=['GET'])
 def generate_report(report_type):
     """Generate various reports"""
-    if not system_initialized:
+    system = get_system()
+    if system is None:
         return jsonify({'error': 'System not initialized'}), 503
     
     try:
         if report_type not in ['daily', 'inventory', 'sales']:
             return jsonify({'error': 'Invalid report type'}), 400
             
-        report = system.generate_report(report_type)
+        period = request.args.get('period')
+        if period and period not in ['yesterday', 'last_week', 'last_month']:
+            return jsonify({'error': 'Invalid period'}), 400
+            
+        report = system.generate_report(report_type, period=period)
         
         return jsonify({
             'success': True,
@@ -319,7 +429,8 @@ def generate_report(report_type):
 @app.route('/api/customers', methods=['GET'])
 def get_customers():
     """Get customers list"""
-    if not system_initialized or not system:
+    system = get_system()
+    if system is None:
         return jsonify({
             'error': 'System not initialized',
             'message': 'The Cafe24 automation system is not properly initialized'
@@ -358,7 +469,8 @@ def get_customers():
 @app.route('/api/sales/statistics', methods=['GET'])
 def get_sales_statistics():
     """Get sales statistics"""
-    if not system_initialized or not system:
+    system = get_system()
+    if system is None:
         return jsonify({
             'error': 'System not initialized',
             'message': 'The Cafe24 automation system is not properly initialized'
@@ -401,7 +513,7 @@ def test_all_endpoints():
     """Test all API endpoints"""
     results = {
         'timestamp': datetime.now().isoformat(),
-        'system_initialized': system_initialized,
+        'system_initialized': get_system() is not None,
         'tests': []
     }
     
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Keep the global quota ledger (api-method/quota_ledger.py) out of the repo:
+# it is created at import time and flushed at exit, so point it at a scratch file first
+os.environ['QUOTA_LEDGER_FILE'] = os.path.join(tempfile.mkdtemp(prefix='cafe24_test_'), 'quota_ledger.json')
@@ -0,0 +1,22 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from src.api_client import Cafe24APIClient
+
+
+CONFIG = {'mall_id': 'mall', 'client_id': 'id', 'client_secret': 'secret'}
+
+
+class TestCafe24APIClient:
+    """Test Admin API URL construction"""
+
+    @pytest.mark.parametrize('config,expected', [
+        (CONFIG, 'https://mall.cafe24api.com/api/v2/admin/products/count'),
+        (dict(CONFIG, api_base_url='http://127.0.0.1:8080/'), 'http://127.0.0.1:8080/api/v2/admin/products/count'),
+    ])
+    def test_requests_go_to_admin_api(self, config, expected):
+        client = Cafe24APIClient(config)
+        response = MagicMock(status_code=200)
+        with patch.object(client.session, 'request', return_value=response) as send:
+            assert client._request('GET', '/products/count') is response
+        assert send.call_args.kwargs['url'] == expected
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from cafe24_simulator import SyntheticCatalog, build_simulator  # noqa: E402
+
+
+AUTH = {'authorization': 'Bearer test-token'}
+
+
+class TestCafe24Simulator:
+    """Test the local Cafe24 API simulator"""
+
+    @pytest.fixture
+    def simulator(self):
+        return build_simulator(products=1200, orders=3000, days=30)
+
+    def test_catalog_is_deterministic(self):
+        """Same seed gives the same products and orders"""
+        first, second = SyntheticCatalog(1000, seed=7), SyntheticCatalog(1000, seed=7)
+        assert first.product(123) == second.product(123)
+        assert first.order(42, True) == second.order(42, True)
+        assert SyntheticCatalog(1000, seed=8).product(123) != first.product(123)
+
+    def test_limit_offset_and_fields(self, simulator):
+        """Paging and projection follow the Cafe24 query semantics"""
+        status, body, _ = simulator.handle('GET', '/api/v2/admin/products',
+                                           {'limit': '5', 'offset': '1198', 'fields': 'product_no,price'},
+                                           AUTH, b'')
+        assert status == 200
+        assert [p['product_no'] for p in body['products']] == [1199, 1200]
+        assert set(body['products'][0]) == {'shop_no', 'product_no', 'price'}
+
+        status, _, _ = simulator.handle('GET', '/api/v2/admin/products', {'limit': '501'}, AUTH, b'')
+        assert status == 422
+
+    def test_order_count_matches_pages(self, simulator):
+        """Paging through orders returns every order counted, with items embedded"""
+        query = {'limit': '1000', 'embed': 'items'}
+        _, count, _ = simulator.handle('GET', '/api/v2/admin/orders/count', {}, AUTH, b'')
+        orders = []
+        for offset in range(0, count['count'], 1000):
+            _, body, _ = simulator.handle('GET', '/api/v2/admin/orders', dict(query, offset=str(offset)), AUTH, b'')
+            orders.extend(body['orders'])
+        assert len(orders) == count['count'] == 3000
+        assert all(order['items'] for order in orders)
+
+    def test_faults(self):
+        """Call limit returns 429 and worn-out tokens return 401"""
+        simulator = build_simulator(products=10, bucket_size=2, leak_rate=0.001, calls_per_token=5)
+        statuses = [simulator.handle('GET', '/api/v2/admin/products/count', {}, AUTH, b'')[0] for _ in range(6)]
+        assert statuses[:3] == [200, 200, 429]
+        assert statuses[-1] == 401
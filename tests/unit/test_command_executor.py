@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+from src.nlp_processor import NaturalLanguageProcessor
+from src.command_executor import CommandExecutor
+
+
+class TestCommandExecutor:
+    """Test intent/result caching and batch execution"""
+    
+    @pytest.fixture
+    def calls(self):
+        return []
+    
+    @pytest.fixture
+    def executor(self, calls):
+        nlp = NaturalLanguageProcessor()
+        parses = {'count': 0}
+        
+        def parse(command):
+            parses['count'] += 1
+            return nlp.process(command)
+        
+        def execute_intent(intent):
+            calls.append(intent['action'])
+            time.sleep(0.05)
+            return {'action': intent['action'], 'n': len(calls)}
+        
+        executor = CommandExecutor(parse, execute_intent, nlp.normalize, {'max_workers': 4})
+        executor.parses = parses
+        return executor
+    
+    def test_repeated_command_served_from_cache(self, executor, calls):
+        """Same command parses and executes once"""
+        first = executor.execute("오늘 주문 확인")
+        second = executor.execute("  오늘   주문 확인 ")
+        
+        assert first['success'] and second['success']
+        assert first['cached'] is False
+        assert second['cached'] is True
+        assert calls == ['get_orders']
+        assert executor.parses['count'] == 1
+        
+    def test_concurrent_identical_intents_execute_once(self, executor, calls):
+        """In-flight executions are shared"""
+        threads = [threading.Thread(target=executor.execute, args=("재고 확인",)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert calls == ['check_inventory']
+        
+    def test_batch_deduplicates_and_keeps_order(self, executor, calls):
+        """Batch runs each distinct intent once and answers in input order"""
+        result = executor.execute_batch(["오늘 주문 확인", "재고 확인", "오늘 주문 확인", "모르는 말"])
+        
+        assert result['count'] == 4
+        assert result['executed'] == 2
+        assert result['deduplicated'] == 1
+        assert sorted(calls) == ['check_inventory', 'get_orders']
+        assert [r['success'] for r in result['results']] == [True, True, True, False]
+        assert result['results'][2]['deduplicated'] is True
+        assert result['results'][1]['intent']['action'] == 'check_inventory'
+        
+    def test_mutation_is_not_cached_and_invalidates(self, executor, calls):
+        """Updates always run and clear cached reads"""
+        executor.execute("재고 확인")
+        executor.execute("가격 변경 10% 인상")
+        executor.execute("가격 변경 10% 인상")
+        executor.execute("재고 확인")
+        
+        assert calls == ['check_inventory', 'update_products', 'update_products', 'check_inventory']
+        
+    def test_batch_reads_after_mutation_see_its_effect(self, executor, calls):
+        """Mutations keep their position; later reads are not served from cache"""
+        executor.execute("재고 확인")
+        calls.clear()
+        
+        result = executor.execute_batch(["재고 확인", "가격 변경 10% 인상", "재고 확인", "오늘 주문 확인"])
+        
+        assert calls[0] == 'update_products'
+        assert sorted(calls) == ['check_inventory', 'get_orders', 'update_products']
+        assert result['executed'] == 4
+        assert result['results'][0]['cached'] is True
+        assert result['results'][2]['cached'] is False
+        assert result['results'][2]['result']['n'] > result['results'][1]['result']['n']
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from compare_results import compare, main  # noqa: E402
+
+
+def result(name, size, p50_ms, peak_memory_mb=1.0, errors=0):
+    return {'name': name, 'size': size, 'p50_ms': p50_ms, 'p95_ms': p50_ms,
+            'throughput': 1.0, 'peak_memory_mb': peak_memory_mb, 'errors': errors}
+
+
+def keyed(*records):
+    return {(r['name'], r['size']): r for r in records}
+
+
+class TestCompareResults:
+    """Test the benchmark regression gate"""
+
+    def test_slowdown_beyond_threshold_is_regression(self):
+        rows = compare(keyed(result('catalog_fetch', 1000, 100.0)),
+                       keyed(result('catalog_fetch', 1000, 125.0)))
+        assert rows[0]['status'] == 'regression'
+
+    def test_noise_is_ignored(self):
+        """Small relative changes and sub-threshold absolute changes pass"""
+        baseline = keyed(result('catalog_fetch', 1000, 100.0), result('nlp_parse', None, 0.01))
+        current = keyed(result('catalog_fetch', 1000, 105.0), result('nlp_parse', None, 0.03))
+        assert [row['status'] for row in compare(baseline, current)] == ['ok', 'ok']
+
+    def test_memory_growth_and_new_errors(self):
+        baseline = keyed(result('margin_analysis', 1000, 50.0, peak_memory_mb=10.0),
+                         result('csv_import', 1000, 50.0))
+        current = keyed(result('margin_analysis', 1000, 50.0, peak_memory_mb=15.0),
+                        result('csv_import', 1000, 50.0, errors=2))
+        statuses = {row['name']: row['status'] for row in compare(baseline, current)}
+        assert statuses == {'margin_analysis': 'regression', 'csv_import': 'regression'}
+
+    def test_exit_code(self, tmp_path):
+        baseline, current = tmp_path / 'baseline.json', tmp_path / 'current.json'
+        baseline.write_text(json.dumps({'results': [result('best_sellers', 1000, 10.0)]}))
+        current.write_text(json.dumps({'results': [result('best_sellers', 1000, 9.5)]}))
+        assert main([str(baseline), str(current)]) == 0
+        assert main([str(current), str(baseline)]) == 0
+        current.write_text(json.dumps({'results': [result('best_sellers', 1000, 20.0)]}))
+        assert main([str(baseline), str(current)]) == 1
+        assert main([str(baseline), str(tmp_path / 'missing.json')]) == 2
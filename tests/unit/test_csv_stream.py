@@ -0,0 +1,101 @@
+import io
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Blueprint, Flask
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+from csv_stream import CSVFormatError, CSVReadError, read_csv_chunks, sniff_encoding, to_int_prices  # noqa: E402
+import product_csv_import_export  # noqa: E402
+
+
+PRICE_CSV = '상품코드,판매가,메모\nP0000001,"12,000",가\nP0000002,abc,나\n,3000,다\nP0000003,4500.9,라\n'
+
+
+class TestCSVStream:
+    """Test chunked CSV ingestion for product and price uploads"""
+
+    @pytest.mark.parametrize('encoding,expected', [
+        ('utf-8-sig', 'utf-8-sig'), ('utf-8', 'utf-8-sig'), ('cp949', 'cp949'), ('euc-kr', 'cp949')])
+    def test_encoding_sniffed_once_and_chunks_keep_row_numbers(self, encoding, expected):
+        stream = io.BytesIO(PRICE_CSV.encode(encoding))
+        assert sniff_encoding(stream) == expected
+
+        chunks = list(read_csv_chunks(stream, required=['상품코드', '판매가'], columns=['판매가'], chunk_rows=2))
+        assert [list(chunk.index) for chunk in chunks] == [[0, 1], [2, 3]]
+        assert list(chunks[0].columns) == ['상품코드', '판매가']
+        prices = [to_int_prices(chunk['판매가']).tolist() for chunk in chunks]
+        assert str(prices) == '[[12000, <NA>], [3000, 4500]]'
+
+    def test_missing_required_column_rejected_before_reading(self):
+        with pytest.raises(CSVFormatError):
+            read_csv_chunks(io.BytesIO('product,price\n1,2\n'.encode('utf-8')), required=['상품코드', '판매가'])
+        with pytest.raises(CSVFormatError):
+            sniff_encoding(io.BytesIO(b'\xff\xfe\x00\x00\xff'))
+
+    def test_mid_file_decode_error_stops_reading(self):
+        rows = ''.join(f'P{i:07d},{i}000\n' for i in range(30000)).encode('utf-8')
+        body = '상품코드,판매가\n'.encode('utf-8') + rows + 'P9999999,한글\n'.encode('cp949') + rows
+        chunks = read_csv_chunks(io.BytesIO(body), required=['상품코드', '판매가'], chunk_rows=1000)
+
+        read = []
+        with pytest.raises(CSVReadError) as error:
+            for chunk in chunks:
+                read.append(len(chunk))
+        assert 0 < sum(read) <= 30000
+        assert error.value.rows == sum(read) and str(sum(read) + 1) in str(error.value)
+        with pytest.raises(CSVFormatError):
+            read_csv_chunks(io.BytesIO(b''))
+
+    def test_import_converts_chunks_and_reports_bad_rows(self):
+        app = Flask(__name__)
+        bp = Blueprint('csv', __name__)
+        manager = product_csv_import_export.CSVProductManager(lambda: {}, lambda: 'mall')
+        product_csv_import_export.register_csv_routes(bp, manager)
+        app.register_blueprint(bp, url_prefix='/api/csv')
+
+        body = ('상품코드,상품명,판매가,진열상태,과세구분,기타\n'
+                'P0000001,사과,"12,000.5",Y,A|10,x\n'
+                ',배,abc,N,B,y\n'
+                ',귤,3000,,,z\n').encode('cp949')
+        with patch('upstream.requests.request',
+                   side_effect=lambda method, url, **kwargs: MagicMock(status_code=200 if method == 'PUT' else 201)) as send:
+            result = app.test_client().post('/api/csv/import', data={'file': (io.BytesIO(body), 'products.csv')}).get_json()
+
+        assert result['results'] == {
+            'total': 3, 'created': 1, 'updated': 1, 'failed': 1,
+            'errors': [{'row': 3, 'error': 'price 형식 오류: abc'}]
+        }
+        sent = [(call.args[0], call.kwargs['json']['product']) for call in send.call_args_list]
+        assert sent == [
+            ('PUT', {'product_code': 'P0000001', 'product_name': '사과', 'price': '12000',
+                     'display': 'T', 'tax_type': 'A'}),
+            ('POST', {'product_name': '귤', 'price': '3000'})
+        ]
+
+    def test_import_stopped_mid_file_is_reported_with_partial_results(self):
+        import pandas as pd
+
+        app = Flask(__name__)
+        bp = Blueprint('csv', __name__)
+        manager = product_csv_import_export.CSVProductManager(lambda: {}, lambda: 'mall')
+        product_csv_import_export.register_csv_routes(bp, manager)
+        app.register_blueprint(bp, url_prefix='/api/csv')
+
+        def chunks(stream, **kwargs):
+            yield pd.DataFrame({'상품명': ['사과'], '판매가': ['1000']})
+            raise CSVReadError('2번째 데이터 행 이후를 읽을 수 없어 중단했습니다', 1)
+
+        with patch('product_csv_import_export.read_csv_chunks', chunks), \
+                patch('upstream.requests.request', return_value=MagicMock(status_code=201)):
+            response = app.test_client().post('/api/csv/import', data={'file': (io.BytesIO(b'x'), 'products.csv')})
+
+        assert response.status_code == 400
+        result = response.get_json()
+        assert result['success'] is False and '2번째' in result['error']
+        assert result['results']['created'] == 1
@@ -0,0 +1,67 @@
+import pytest
+from src.utils.health_checker import HealthMonitor
+
+
+class TestHealthMonitor:
+    """Test tiered health probes"""
+
+    @pytest.fixture
+    def calls(self):
+        return {'cheap': 0, 'deep': 0}
+
+    @pytest.fixture
+    def monitor(self, calls):
+        def cheap():
+            calls['cheap'] += 1
+            return {'passed': True}
+
+        def deep():
+            calls['deep'] += 1
+            return {'passed': True}
+
+        return HealthMonitor(
+            checks={'cheap': cheap},
+            deep_checks={'deep': deep},
+            interval=60,
+            min_deep_interval=60
+        )
+
+    def test_liveness_runs_no_checks(self, monitor, calls):
+        """Liveness must not run any check"""
+        result = monitor.liveness()
+        assert result['status'] == 'alive'
+        assert calls == {'cheap': 0, 'deep': 0}
+
+    def test_readiness_uses_cached_results(self, monitor, calls):
+        """Readiness serves the last background result"""
+        monitor.refresh()
+        before = calls['cheap']
+
+        for _ in range(5):
+            result = monitor.readiness()
+
+        assert result['status'] == 'ready'
+        assert 'cheap' in result['checks']
+        # The background thread may have run once, requests never do
+        assert calls['cheap'] <= before + 1
+        monitor.stop()
+
+    def test_diagnostics_rate_limited(self, monitor, calls):
+        """Deep checks run at most once per interval"""
+        first = monitor.diagnostics()
+        second = monitor.diagnostics()
+
+        assert first['cached'] is False
+        assert second['cached'] is True
+        assert calls['deep'] == 1
+
+    def test_failed_check_marks_not_ready(self):
+        """A failing or raising check makes the service not ready"""
+        def broken():
+            raise RuntimeError('boom')
+
+        monitor = HealthMonitor(checks={'broken': broken}, interval=60)
+        result = monitor.refresh()
+
+        assert result['status'] == 'not_ready'
+        assert result['checks']['broken']['passed'] is False
@@ -0,0 +1,71 @@
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+from health_monitor import HealthMonitor  # noqa: E402
+
+
+def fake_response(status=200):
+    response = MagicMock()
+    response.status_code = status
+    return response
+
+
+class TestHealthMonitor:
+    """Test the tiered health probes of the production app"""
+
+    @pytest.fixture
+    def monitor(self):
+        token_manager = MagicMock(token_data={'access_token': 'x'}, running=True)
+        token_manager.get_remaining_time.return_value = 3600
+        monitor = HealthMonitor(lambda: {}, lambda: 'mall', token_manager)
+        monitor.start = lambda: None
+        return monitor
+
+    def test_liveness_and_readiness_do_not_call_cafe24(self, monitor):
+        with patch('upstream.requests.request', return_value=fake_response()) as send:
+            assert monitor.liveness()['token_status'] is True
+            assert monitor.readiness()['status'] == 'starting'
+
+            monitor.refresh()
+            monitor.refresh()
+            for _ in range(5):
+                assert monitor.readiness()['status'] == 'ready'
+        # 백그라운드 점검도 Cafe24는 HEALTH_UPSTREAM_INTERVAL마다 한 번만 호출
+        assert send.call_count == 1
+
+        monitor._readiness['checked_at'] -= 3600
+        assert monitor.readiness()['status'] == 'stale'
+
+    def test_deep_check_is_rate_limited_and_feeds_readiness(self, monitor):
+        with patch('upstream.requests.request', return_value=fake_response(401)) as send:
+            first = monitor.diagnostics()
+            second = monitor.diagnostics()
+            assert send.call_count == 1
+            assert (first['cached'], second['cached']) == (False, True)
+            assert first['checks']['cafe24_api']['authenticated'] is False
+
+            monitor.refresh()
+            assert send.call_count == 1
+            assert monitor.readiness()['status'] == 'not_ready'
+
+    def test_concurrent_refreshes_probe_once(self, monitor):
+        def slow_request(method, url, **kwargs):
+            time.sleep(0.05)
+            return fake_response()
+
+        with patch('upstream.requests.request', side_effect=slow_request) as send:
+            threads = [threading.Thread(target=monitor.refresh) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert send.call_count == 1
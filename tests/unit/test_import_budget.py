@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Wall-clock budget for importing a web entry point in a fresh interpreter
+IMPORT_BUDGET_SECONDS = float(os.getenv('CAFE24_IMPORT_BUDGET', '1.5'))
+
+# Modules that must only be loaded on first use
+HEAVY_MODULES = ['pandas', 'numpy', 'openpyxl', 'anthropic']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module, cwd, pythonpath):
+    """Import a module in a fresh interpreter and report time and heavy modules"""
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+class TestImportBudget:
+    """Web entry points must start without loading heavy dependencies"""
+
+    def test_src_web_app(self):
+        result = measure_import('src.web_app', ROOT, ROOT)
+        assert result['loaded'] == []
+        assert result['elapsed'] < IMPORT_BUDGET_SECONDS
+
+    def test_api_method_app(self, tmp_path):
+        # Run from a scratch directory: the app writes app.log and token files to cwd
+        result = measure_import('app', str(tmp_path), os.path.join(ROOT, 'api-method'))
+        assert result['loaded'] == []
+        assert result['elapsed'] < IMPORT_BUDGET_SECONDS
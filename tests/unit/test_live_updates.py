@@ -0,0 +1,63 @@
+import os
+import queue
+import sys
+
+from flask import Blueprint, Flask
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+from live_updates import LiveSyncHub, register_live_routes  # noqa: E402
+from shared_cache import SharedCache  # noqa: E402
+
+
+def drain(q):
+    events = []
+    while True:
+        try:
+            events.append(q.get_nowait())
+        except queue.Empty:
+            return events
+
+
+class TestLiveSyncHub:
+    """Test cross-worker event log replay and stream limits"""
+
+    def test_first_load_does_not_replay_existing_log(self, tmp_path):
+        cache = SharedCache(directory=str(tmp_path))
+        leader = LiveSyncHub(lambda: {}, lambda: 'mall', shared_cache=cache)
+        leader._append_events([('today_total', {'total_amount': 1000, 'count': 1}),
+                               ('stock_summary', {'total_products': 3})])
+
+        # 나중에 뜬 워커는 이미 발행된 이벤트를 다시 보내지 않는다
+        follower = LiveSyncHub(lambda: {}, lambda: 'mall', shared_cache=cache)
+        q = queue.Queue()
+        follower.subscribers.add(q)
+        follower._apply_log(cache.get('live:events'))
+        assert drain(q) == []
+        assert follower.snapshot()['today_total'] == {'total_amount': 1000, 'count': 1}
+
+        leader._append_events([('today_total', {'total_amount': 2000, 'count': 2})])
+        follower._apply_log(cache.get('live:events'))
+        assert [event['id'] for event in drain(q)] == [3]
+
+        # 리더가 바뀌어도 새 리더는 이번 동기화 이벤트만 보낸다
+        successor = LiveSyncHub(lambda: {}, lambda: 'mall', shared_cache=cache)
+        q = queue.Queue()
+        successor.subscribers.add(q)
+        successor._append_events([('stock_low', {'product_no': 1})])
+        assert [event['type'] for event in drain(q)] == ['stock_low']
+
+    def test_streams_over_limit_are_rejected(self):
+        hub = LiveSyncHub(lambda: {}, lambda: 'mall', max_streams=1)
+        hub.start = lambda: None
+        app = Flask(__name__)
+        bp = Blueprint('live', __name__)
+        register_live_routes(bp, hub)
+        app.register_blueprint(bp, url_prefix='/api/live')
+
+        assert hub.subscribe() is not None
+        response = app.test_client().get('/api/live/stream')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == str(hub.interval)
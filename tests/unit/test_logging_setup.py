@@ -0,0 +1,47 @@
+import logging
+import os
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+from logging_setup import RateLimitFilter, lazy_json  # noqa: E402
+
+
+def make_record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord('test', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError('payload serialized')
+
+
+class TestLoggingSetup:
+    """Test log sampling, rate limiting and lazy payloads"""
+
+    def test_rate_limit_per_template_and_suppressed_count(self):
+        log_filter = RateLimitFilter(limit=2, window=3600)
+        passed = [log_filter.filter(make_record('page %d', n)) for n in range(5)]
+        assert passed == [True, True, False, False, False]
+        assert log_filter.filter(make_record('other %d', 1))
+        assert log_filter.filter(make_record('failed %d', 1, level=logging.ERROR))
+
+        log_filter._windows[('test', 'page %d')][0] -= 3600
+        record = make_record('page %d', 6)
+        assert log_filter.filter(record)
+        assert record.getMessage() == 'page 6 (같은 로그 3건 생략)'
+
+    def test_sampling(self):
+        log_filter = RateLimitFilter(limit=0)
+        passed = [log_filter.filter(make_record('order %s', n, sample=10)) for n in range(25)]
+        assert passed.count(True) == 3
+
+    def test_payload_is_serialized_only_when_emitted(self):
+        logger = logging.getLogger('test_logging_setup')
+        logger.setLevel(logging.INFO)
+        logger.debug('order: %s', lazy_json(Exploding()))
+        assert str(lazy_json({'a': 'x' * 20}, limit=10)) == '{"a": "xxx...'
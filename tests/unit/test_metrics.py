@@ -0,0 +1,57 @@
+import os
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+from metrics import MetricsRegistry, add_cache_hit_ratio, merge_snapshots, render  # noqa: E402
+from upstream import endpoint_pattern  # noqa: E402
+
+
+def worker_registry(directory=None):
+    registry = MetricsRegistry(directory)
+    registry.histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1))
+    registry.counter('cache_requests_total', 'Cache lookups', ('cache', 'result'))
+    registry.gauge('jobs_in_flight', 'Jobs', ('job',))
+    return registry
+
+
+class TestMetrics:
+    """Test the Prometheus metrics registry"""
+
+    def test_workers_merge_into_one_exposition(self):
+        first, second = worker_registry(), worker_registry()
+        for value in (0.05, 0.5):
+            first.metrics['latency_seconds'].observe(value, route='/api/products')
+        second.metrics['latency_seconds'].observe(5, route='/api/products')
+        first.metrics['cache_requests_total'].inc(3, cache='api', result='hit')
+        second.metrics['cache_requests_total'].inc(cache='api', result='miss')
+
+        text = render(add_cache_hit_ratio(merge_snapshots([first.snapshot(), second.snapshot()])))
+        assert 'latency_seconds_bucket{route="/api/products",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{route="/api/products",le="1"} 2' in text
+        assert 'latency_seconds_bucket{route="/api/products",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{route="/api/products"} 3' in text
+        assert 'cache_hit_ratio{cache="api"} 0.75' in text
+
+    def test_dead_worker_keeps_counters_but_not_gauges(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(MetricsRegistry, 'touch', lambda self: None)
+        registry, dead = worker_registry(str(tmp_path)), worker_registry()
+        dead.metrics['cache_requests_total'].inc(2, cache='api', result='hit')
+        dead.metrics['jobs_in_flight'].inc(job='csv_import')
+        registry._write(registry._path(999999), dead.snapshot())
+
+        registry.mark_process_dead(999999)
+        registry.metrics['cache_requests_total'].inc(cache='api', result='hit')
+        text = render(registry.collect())
+        assert 'cache_requests_total{cache="api",result="hit"} 3' in text
+        assert 'jobs_in_flight' not in text
+        assert not os.path.exists(registry._path(999999))
+
+    def test_endpoint_pattern(self):
+        base = 'https://mall.cafe24api.com/api/v2'
+        assert endpoint_pattern(f'{base}/admin/products/123/variants/P000000A000A?limit=1') \
+            == 'products/{no}/variants/{code}'
+        assert endpoint_pattern(f'{base}/admin/products/count') == 'products/count'
+        assert endpoint_pattern(f'{base}/oauth/token') == 'oauth/token'
@@ -49,4 +49,13 @@ class TestNLPProcessor:
     def test_unknown_command(self, nlp):
         """Test unknown command handling"""
         result = nlp.process("알 수 없는 명령어")
-        assert result is None
\ No newline at end of file
+        assert result is None
+
+    def test_most_specific_intent_wins(self, nlp):
+        """Longer keyword matches beat earlier-declared actions"""
+        result = nlp.process("오늘 상품 주문 리포트 생성")
+        assert result['action'] == 'generate_report'
+        
+        result = nlp.process("  재고\n부족   상품 ")
+        assert result['action'] == 'check_inventory'
+        assert result['original_command'] == '재고 부족 상품'
@@ -0,0 +1,44 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from flask import Blueprint, Flask
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+import enhanced_products_api  # noqa: E402
+from product_index import FilterError, parse_filters  # noqa: E402
+
+
+class TestProductIndexFilters:
+    """Test validation of numeric product filters"""
+
+    def test_numeric_filters_are_converted(self):
+        assert parse_filters({'price_min': '1000.5', 'stock_max': '3', 'search': '', 'display': 'T'}) == {
+            'price_min': 1000.5, 'stock_max': 3, 'display': 'T'
+        }
+
+    @pytest.mark.parametrize('parameter,value', [
+        ('price_min', 'abc'), ('price_max', 'nan'), ('stock_min', '1.5'), ('stock_max', '열')])
+    def test_invalid_numeric_filter_is_rejected_with_its_name(self, parameter, value):
+        with pytest.raises(FilterError) as error:
+            parse_filters({parameter: value})
+        assert error.value.parameter == parameter
+
+    def test_advanced_endpoint_answers_400_before_refreshing_index(self):
+        app = Flask(__name__)
+        bp = Blueprint('products', __name__)
+        api = enhanced_products_api.ProductAPI(lambda: {}, lambda: 'mall')
+        enhanced_products_api.register_routes(bp, api)
+        app.register_blueprint(bp, url_prefix='/api/products')
+
+        with patch.object(api.index, 'ensure_fresh') as ensure_fresh:
+            response = app.test_client().get('/api/products/advanced?stock_min=abc')
+
+        assert response.status_code == 400
+        assert response.get_json()['parameter'] == 'stock_min'
+        assert 'stock_min' in response.get_json()['error']
+        ensure_fresh.assert_not_called()
@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+import profiler  # noqa: E402
+
+
+ADMIN = {'X-Admin-Token': 'secret'}
+
+
+def slow_margin_analysis():
+    return sum(i * i for i in range(20000))
+
+
+class TestProfiler:
+    """Test the on-demand admin profiler"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(profiler, 'ADMIN_TOKEN', 'secret')
+        app = Flask(__name__)
+        bp = Blueprint('profiler', __name__)
+        profiler.register_profiler_routes(bp, profiler.RequestProfiler())
+        app.register_blueprint(bp, url_prefix='/api/admin/profile')
+
+        @app.route('/api/margin/analysis')
+        def margin_analysis():
+            return jsonify({'total': slow_margin_analysis()})
+
+        return app.test_client()
+
+    def test_admin_token_required(self, client, monkeypatch):
+        assert client.get('/api/admin/profile/requests').status_code == 403
+        monkeypatch.setattr(profiler, 'ADMIN_TOKEN', '')
+        assert client.get('/api/admin/profile/requests', headers=ADMIN).status_code == 404
+
+    def test_profiles_next_requests_to_route(self, client):
+        response = client.post('/api/admin/profile/requests', headers=ADMIN,
+                               json={'route': '/api/margin/analysis', 'count': 2})
+        assert response.status_code == 202
+        for _ in range(3):
+            client.get('/api/margin/analysis')
+
+        result = client.get('/api/admin/profile/requests', headers=ADMIN).get_json()
+        assert result['status'] == 'done'
+        assert result['profiled'] == 2
+        assert any('slow_margin_analysis' in row['function'] for row in result['functions'])
+        text = client.get('/api/admin/profile/requests?format=text', headers=ADMIN).get_data(as_text=True)
+        assert 'slow_margin_analysis' in text
+
+    def test_thread_sampling_collapsed_stacks(self, client):
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                slow_margin_analysis()
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=busy_worker, name='busy', daemon=True)
+        thread.start()
+        try:
+            response = client.post('/api/admin/profile/sample', headers=ADMIN,
+                                   json={'seconds': 0.3, 'interval_ms': 5, 'format': 'collapsed'})
+        finally:
+            stop.set()
+        lines = response.get_data(as_text=True).splitlines()
+        assert any(line.startswith('busy;') and 'busy_worker' in line for line in lines)
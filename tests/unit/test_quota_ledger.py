@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+import upstream  # noqa: E402
+from report_scheduler import ReportScheduler  # noqa: E402
+from sales_analytics import SalesAnalytics, register_sales_routes  # noqa: E402
+from shared_cache import SharedCache  # noqa: E402
+from quota_ledger import QuotaLedger, QuotaBudgetExceeded, feature, register_quota_routes  # noqa: E402
+
+
+def fake_response(status=200):
+    response = MagicMock()
+    response.status_code = status
+    return response
+
+
+class TestQuotaLedger:
+    """Test per-feature Cafe24 call accounting and budgets"""
+
+    @pytest.fixture
+    def ledger(self, tmp_path):
+        ledger = QuotaLedger(str(tmp_path / 'quota_ledger.json'), budgets={'live_sync': 3, 'precompute': 2})
+        upstream.add_guard(ledger.check)
+        upstream.add_observer(ledger.record)
+        yield ledger
+        upstream.remove_guard(ledger.check)
+        upstream.remove_observer(ledger.record)
+
+    @pytest.fixture
+    def client(self, ledger):
+        app = Flask(__name__)
+        bp = Blueprint('quota', __name__)
+        register_quota_routes(bp, ledger)
+        app.register_blueprint(bp, url_prefix='/api/quota')
+
+        @app.route('/api/orders/today')
+        def get_today_orders():
+            upstream.get('https://mall.cafe24api.com/api/v2/admin/orders')
+            return jsonify({'success': True})
+
+        return app.test_client()
+
+    def test_calls_are_attributed_and_persisted(self, ledger, client):
+        with patch('upstream.requests.request', side_effect=[fake_response()] * 3 + [fake_response(429)]):
+            client.get('/api/orders/today')
+            client.get('/api/orders/today')
+            with feature('live_sync'):
+                upstream.get('https://mall.cafe24api.com/api/v2/admin/orders')
+                upstream.get('https://mall.cafe24api.com/api/v2/admin/orders')
+
+        report = client.get('/api/quota/report?hours=1').get_json()
+        rows = {row['feature']: row for row in report['features']}
+        assert report['total_calls'] == 4
+        assert rows['get_today_orders']['calls'] == 2
+        assert rows['get_today_orders']['share_pct'] == 50.0
+        assert rows['live_sync']['throttled'] == 1
+        assert rows['live_sync']['budget_per_hour'] == 3
+
+        # 다른 워커의 장부 기록이 파일에 합산된다
+        other = QuotaLedger(ledger.path, budgets={})
+        with feature('live_sync'):
+            other.record({'status': 200})
+        other.flush()
+        with open(ledger.path, encoding='utf-8') as f:
+            hours = json.load(f)['hours']
+        assert sum(rows['live_sync'][0] for rows in hours.values()) == 3
+
+    def test_budget_blocks_without_calling_cafe24(self, ledger, client):
+        with patch('upstream.requests.request', return_value=fake_response()) as send:
+            for name in ('precompute:get_best_sellers', 'precompute:get_worst_sellers'):
+                with feature(name):
+                    upstream.get('https://mall.cafe24api.com/api/v2/admin/orders')
+            with feature('precompute:get_worst_sellers'), pytest.raises(QuotaBudgetExceeded):
+                upstream.get('https://mall.cafe24api.com/api/v2/admin/orders')
+            assert send.call_count == 2
+
+            ledger.budgets['get_today_orders'] = 0
+            response = client.get('/api/orders/today')
+        assert response.status_code == 429
+        assert response.get_json()['feature'] == 'get_today_orders'
+
+        report = ledger.report(hours=1)
+        blocked = {row['feature']: row['blocked'] for row in report['features']}
+        assert blocked == {'precompute:get_best_sellers': 0, 'precompute:get_worst_sellers': 1,
+                           'get_today_orders': 1}
+        assert {'budget_key': 'precompute', 'budget_per_hour': 2, 'current_hour_calls': 2} in report['budgets']
+
+    def test_blocked_calls_are_not_turned_into_empty_results(self, ledger, client, tmp_path):
+        analytics = SalesAnalytics(lambda: {}, lambda: 'mall')
+        app = client.application
+        bp = Blueprint('sales', __name__)
+        register_sales_routes(bp, analytics)
+        app.register_blueprint(bp, url_prefix='/api/sales')
+        ledger.budgets.update({'sales.best_sellers': 0, 'precompute': 0})
+
+        with patch('upstream.requests.request', return_value=fake_response()) as send:
+            response = client.get('/api/sales/best-sellers')
+            assert response.status_code == 429
+
+            # 막힌 사전 계산은 0건 매출 결과로 캐시되지 않는다
+            scheduler = ReportScheduler(app, SharedCache(directory=str(tmp_path / 'cache')))
+            scheduler.register('sales_get_best_sellers', analytics.get_best_sellers, (30,))
+            assert scheduler.run_all()[0]['status'] == 'blocked'
+            assert scheduler.get('sales_get_best_sellers', 30) is None
+        assert send.call_count == 0
@@ -0,0 +1,136 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from src.utils.report_generator import ReportGenerator, period_range
+
+
+class FakeSystem:
+    """Records get_orders calls; orders_per_day orders each day, paged like the API"""
+    
+    def __init__(self, orders_per_day=1, fail=False):
+        self.calls = []
+        self.threads = set()
+        self.orders_per_day = orders_per_day
+        self.fail = fail
+        self.low_stock = []
+        
+    def get_orders(self, start_date, end_date, limit=100, offset=0):
+        if offset == 0:
+            self.calls.append((start_date, end_date))
+        self.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        if self.fail:
+            raise ConnectionError('Cafe24 unavailable')
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        orders = []
+        while start <= end:
+            orders.extend({
+                'order_date': start.strftime('%Y-%m-%dT10:00:00'),
+                'total_price': 1000,
+                'items': [{'product_name': 'A', 'price': 1000, 'quantity': 1}]
+            } for _ in range(self.orders_per_day))
+            start += timedelta(days=1)
+        return orders[offset:offset + limit]
+        
+    def check_inventory(self):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        return {'low_stock': list(self.low_stock), 'out_of_stock': []}
+
+
+class TestReportGenerator:
+    """Test concurrent fetches and materialised closed periods"""
+    
+    @pytest.fixture
+    def generator(self, tmp_path):
+        return ReportGenerator(snapshot_dir=str(tmp_path))
+    
+    def test_daily_report_fetches_concurrently(self, generator):
+        """Orders and inventory are fetched on different threads"""
+        system = FakeSystem()
+        report = generator.generate_daily_report(system)
+        
+        assert report['summary']['total_orders'] == 1
+        assert len(system.threads) == 2
+        
+    def test_closed_days_are_materialised(self, generator):
+        """Second sales report only fetches the open day"""
+        system = FakeSystem()
+        today = datetime.now().strftime('%Y-%m-%d')
+        start = (datetime.now() - timedelta(days=6)).strftime('%Y-%m-%d')
+        
+        first = generator.generate_sales_report(system, start, today)
+        system.calls.clear()
+        second = generator.generate_sales_report(system, start, today)
+        
+        assert first['summary'] == second['summary']
+        assert second['summary']['total_orders'] == 7
+        assert second['materialized_days'] == 6
+        assert system.calls == [(today, today)]
+        
+    def test_closed_daily_report_served_from_snapshot(self, generator):
+        """A past day's report is computed once"""
+        system = FakeSystem()
+        yesterday = period_range('yesterday')[0]
+        
+        assert generator.generate_daily_report(system, date=yesterday)['materialized'] is False
+        system.calls.clear()
+        assert generator.generate_daily_report(system, date=yesterday)['materialized'] is True
+        assert system.calls == []
+        
+    def test_busy_range_is_paged(self, generator):
+        """Ranges with more orders than one page are fetched completely"""
+        system = FakeSystem(orders_per_day=30)
+        yesterday = period_range('yesterday')[0]
+        start = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+        
+        report = generator.generate_sales_report(system, start, yesterday)
+        assert report['summary']['total_orders'] == 7 * 30
+        assert report['incomplete_days'] == []
+        assert generator.generate_sales_report(system, start, yesterday)['materialized_days'] == 7
+        
+    def test_failed_and_demo_days_are_not_materialised(self, generator):
+        yesterday = period_range('yesterday')[0]
+        
+        failing = FakeSystem(fail=True)
+        report = generator.generate_sales_report(failing, yesterday, yesterday)
+        assert report['incomplete_days'] == [yesterday]
+        assert generator.generate_daily_report(failing, date=yesterday)['complete'] is False
+        
+        demo = FakeSystem()
+        demo.demo_mode = True
+        generator.generate_sales_report(demo, yesterday, yesterday)
+        generator.generate_daily_report(demo, date=yesterday)
+        
+        system = FakeSystem()
+        assert generator.generate_sales_report(system, yesterday, yesterday)['materialized_days'] == 0
+        assert generator.generate_daily_report(system, date=yesterday)['materialized'] is False
+        
+    def test_empty_days_are_materialised_and_only_gaps_fetched(self, generator):
+        """A closed day without orders is final; later reports fetch only the missing runs"""
+        day = lambda n: (datetime.now() - timedelta(days=n)).strftime('%Y-%m-%d')
+        empty = FakeSystem(orders_per_day=0)
+        generator.generate_sales_report(empty, day(5), day(5))
+        generator.generate_sales_report(empty, day(2), day(2))
+        generator.generate_daily_report(empty, date=day(5))
+        assert generator.generate_daily_report(empty, date=day(5))['materialized'] is True
+        
+        system = FakeSystem()
+        report = generator.generate_sales_report(system, day(7), day(1))
+        assert report['materialized_days'] == 2
+        assert report['summary']['total_orders'] == 5
+        assert sorted(system.calls) == [(day(7), day(6)), (day(4), day(3)), (day(1), day(1))]
+        
+    def test_inventory_is_not_materialised(self, generator):
+        system = FakeSystem()
+        yesterday = period_range('yesterday')[0]
+        generator.generate_daily_report(system, date=yesterday)
+        
+        system.low_stock = [{'product_name': 'B', 'inventory_quantity': 3}]
+        report = generator.generate_daily_report(system, date=yesterday)
+        assert report['materialized'] is True
+        assert report['summary']['low_stock_items'] == 1
+        assert report['inventory_alerts']['low_stock'] == system.low_stock
@@ -0,0 +1,67 @@
+import os
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from flask import Blueprint, Flask
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+from report_scheduler import KST, ReportScheduler, register_scheduler_routes  # noqa: E402
+from shared_cache import SharedCache  # noqa: E402
+
+
+class TestReportScheduler:
+    """Test that precompute jobs run once per schedule slot across workers"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return SharedCache(directory=str(tmp_path))
+
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    def worker(self, cache, calls):
+        scheduler = ReportScheduler(Flask(__name__), cache, times='08:30,13:00')
+        scheduler.register('best', lambda days: calls.append(days) or {'products': []}, (30,))
+        return scheduler
+
+    def test_slot_start(self, cache):
+        scheduler = ReportScheduler(Flask(__name__), cache, times='08:30,13:00')
+        at = lambda hour, minute, day=19: KST.localize(datetime(2026, 10, day, hour, minute))
+        assert scheduler.slot_start(at(9, 0)) == at(8, 30)
+        assert scheduler.slot_start(at(13, 0)) == at(13, 0)
+        assert scheduler.slot_start(at(7, 0)) == at(13, 0, day=18)
+
+    def test_job_runs_once_per_slot_across_workers(self, cache, calls):
+        workers = [self.worker(cache, calls) for _ in range(3)]
+        runs = [worker.run_all() for worker in workers]
+        assert calls == [30]
+        assert [run[0]['status'] for run in runs] == ['ok', 'skipped', 'skipped']
+
+        # 수동 실행은 이번 구간 결과가 있어도 다시 계산
+        assert workers[1].run_all(force=True)[0]['status'] == 'ok'
+        assert calls == [30, 30]
+
+    def test_failed_job_is_not_retried_by_other_workers_within_lock_ttl(self, cache, calls):
+        failing = ReportScheduler(Flask(__name__), cache, times='08:30,13:00')
+        failing.register('best', lambda days: {'success': False, 'error': 'boom'}, (30,))
+        assert failing.run_all()[0]['status'] == 'error'
+        assert self.worker(cache, calls).run_all()[0]['status'] == 'skipped'
+        assert calls == []
+
+    def test_manual_run_requires_admin(self, cache, calls):
+        app = Flask(__name__)
+        bp = Blueprint('scheduler', __name__)
+        register_scheduler_routes(bp, self.worker(cache, calls))
+        app.register_blueprint(bp, url_prefix='/api/precompute')
+        client = app.test_client()
+
+        with patch('profiler.ADMIN_TOKEN', 'secret'):
+            assert client.post('/api/precompute/run').status_code == 403
+            response = client.post('/api/precompute/run', headers={'X-Admin-Token': 'secret'})
+        assert response.status_code == 202
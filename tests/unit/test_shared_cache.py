@@ -0,0 +1,32 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+from shared_cache import FileBackend  # noqa: E402
+
+
+class TestFileBackend:
+    """Test expiry cleanup of the cross-worker file cache"""
+
+    def test_expired_entries_are_removed(self, tmp_path):
+        backend = FileBackend(str(tmp_path), 'cafe24:', sweep_interval=3600)
+        backend.set('old', 1, ttl=-1)
+        backend.set('stale', 2, ttl=-1)
+        backend.set('fresh', 3, ttl=60)
+        (tmp_path / 'abandoned.tmp').write_text('{}')
+        os.utime(tmp_path / 'abandoned.tmp', (time.time() - 7200,) * 2)
+        assert len(os.listdir(tmp_path)) == 4
+
+        # 조회한 만료 항목은 그 자리에서 삭제
+        assert backend.get('old') is None
+        assert not os.path.exists(backend._path('old'))
+
+        # 정리 주기가 지나면 set 할 때 나머지 만료 항목과 버려진 임시 파일도 삭제
+        backend._swept_at -= 3600
+        backend.set('new', 4, ttl=60)
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            os.path.basename(backend._path(key)) for key in ('fresh', 'new'))
+        assert backend.get('fresh') == 3
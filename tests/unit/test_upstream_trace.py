@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'api-method'))
+
+import upstream  # noqa: E402
+import upstream_trace  # noqa: E402
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+
+class TestUpstreamTrace:
+    """Test per-request Cafe24 call accounting"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(upstream.requests, 'request', lambda method, url, **kwargs: FakeResponse())
+        monkeypatch.setattr(upstream_trace, 'UPSTREAM_TRACE_HEADER', True)
+        monkeypatch.setattr(upstream_trace, 'fanout_log', upstream_trace.FanoutLog())
+
+        app = Flask(__name__)
+        bp = Blueprint('trace', __name__)
+        upstream_trace.register_trace_routes(bp)
+        app.register_blueprint(bp)
+
+        @app.route('/preview/<int:count>')
+        def preview(count):
+            upstream.get('https://mall.cafe24api.com/api/v2/admin/products', params={'limit': 100})
+            for product_no in range(count):
+                upstream.get(f'https://mall.cafe24api.com/api/v2/admin/products/{product_no}')
+            return jsonify({'ok': True})
+
+        return app.test_client()
+
+    def test_calls_are_counted_per_request(self, client):
+        response = client.get('/preview/3')
+        assert response.headers['X-Upstream-Calls'] == '4'
+        assert 'cafe24;dur=' in response.headers['Server-Timing']
+        assert client.get('/preview/0').headers['X-Upstream-Calls'] == '1'
+        assert upstream_trace.current() is None
+
+    def test_fanout_beyond_threshold_is_reported(self, client):
+        client.get('/preview/3')
+        client.get(f'/preview/{upstream_trace.UPSTREAM_FANOUT_THRESHOLD + 1}')
+        offenders = client.get('/api/debug/upstream').get_json()['offenders']
+        assert [(o['route'], o['endpoint'], o['max_calls']) for o in offenders] == [
+            ('GET /preview/<int:count>', 'products/{no}', upstream_trace.UPSTREAM_FANOUT_THRESHOLD + 1)
+        ]
@@ -0,0 +1,58 @@
+import os
+
+import requests
+from requests.adapters import BaseAdapter
+
+from src.api_client import Cafe24APIClient
+from src.web_app import app
+from utils.metrics import MetricsRegistry, merge_snapshots, render  # same module the app uses
+
+
+class FakeAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = b'{}'
+        return response
+
+    def close(self):
+        pass
+
+
+class TestWebMetrics:
+    """Test Cafe24 client and route metrics of the web service"""
+
+    def test_client_calls_and_routes_are_exposed(self):
+        client = Cafe24APIClient({'mall_id': 'mall', 'client_id': 'id', 'client_secret': 'secret'})
+        client.session.mount('https://', FakeAdapter())
+        client._request('GET', 'products/123')
+        client._request('GET', 'products/456')
+        client._request('GET', 'products/count')
+
+        app.test_client().get('/health')
+        body = app.test_client().get('/metrics').get_data(as_text=True)
+        assert 'cafe24_upstream_request_duration_seconds_count{method="GET",endpoint="products/{no}"}' in body
+        assert 'cafe24_upstream_requests_total{method="GET",endpoint="products/count",status="200"}' in body
+        assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+        assert 'route="/metrics"' not in body
+
+    def test_worker_snapshots_are_summed(self, tmp_path):
+        workers = []
+        for value in (0.05, 2):
+            registry = MetricsRegistry()
+            name = registry.histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1))
+            registry.observe(name, value, '/api/products')
+            workers.append(registry.snapshot())
+
+        body = render(merge_snapshots(workers))
+        assert 'latency_seconds_bucket{route="/api/products",le="0.1"} 1' in body
+        assert 'latency_seconds_bucket{route="/api/products",le="+Inf"} 2' in body
+        assert 'latency_seconds_sum{route="/api/products"} 2.05' in body
+
+        shared = MetricsRegistry(str(tmp_path))
+        name = shared.counter('calls_total', 'Calls')
+        shared.inc(name, amount=2)
+        shared.flush()
+        assert [path.name for path in tmp_path.iterdir()] == [f'{os.getpid()}.json']
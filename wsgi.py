@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WSGI entry point for production serving
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.web_app import app, get_system
+
+# With preload_app the master builds the system once before forking, so
+# workers start with it already in memory (copy-on-write)
+if os.environ.get('CAFE24_WARM_ON_PRELOAD', 'true').lower() == 'true':
+    getattr(get_system(), 'nlp_processor', None)